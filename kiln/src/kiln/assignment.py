@@ -0,0 +1,181 @@
+"""One-to-one assignment solver for matching jobs to printers.
+
+Given a score matrix (rows = jobs, columns = printers), finds the set of
+``(row, column)`` pairs that maximises the total score with each row and
+column used at most once.  ``None`` marks a forbidden pairing (e.g. a job
+pinned to a different printer, or a printer without enough build volume).
+
+Small problems are solved exactly with the Hungarian (Kuhn–Munkres)
+algorithm in O(n²·m).  Very large matrices fall back to a greedy
+best-pair-first pass, which is O(n·m·log(n·m)) and typically within a few
+percent of optimal for the near-uniform score matrices a print farm
+produces.
+
+Usage::
+
+    from kiln.assignment import solve_assignment
+
+    pairs = solve_assignment([
+        [0.9, 0.5],    # job 0 on printer 0 / printer 1
+        [None, 0.8],   # job 1 can only run on printer 1
+    ])
+    # -> [(0, 0), (1, 1)]
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+# Above this many cells the exact solver is replaced by the greedy pass.
+_HUNGARIAN_MAX_CELLS = 40_000
+
+# Cost used for forbidden pairings inside the Hungarian solver.  Scores
+# are expected to be small (success rates, normalised fitness), so this
+# dominates any real pairing.
+_FORBIDDEN_COST = 1e12
+
+
+def solve_assignment(
+    scores: Sequence[Sequence[float | None]],
+    *,
+    method: str = "auto",
+) -> list[tuple[int, int]]:
+    """Return the maximum-score one-to-one assignment of rows to columns.
+
+    Ties are broken in favour of pairing row *i* with column *i* (i.e.
+    preserving the callers' own ordering), so an all-equal matrix yields
+    the identity assignment.
+
+    :param scores: ``scores[row][col]`` — higher is better, ``None`` forbids
+        the pairing.  All rows must have the same length.
+    :param method: ``"hungarian"``, ``"greedy"``, or ``"auto"`` (Hungarian
+        unless the matrix is very large).
+    :returns: ``(row, col)`` pairs sorted by row.  Rows with no permitted
+        column (or that lose every contested column) are omitted.
+    :raises ValueError: If *method* is unknown or rows differ in length.
+    """
+    n_rows = len(scores)
+    if n_rows == 0:
+        return []
+    n_cols = len(scores[0])
+    if any(len(row) != n_cols for row in scores):
+        raise ValueError("All score rows must have the same length")
+    if n_cols == 0:
+        return []
+
+    if method == "auto":
+        method = "hungarian" if n_rows * n_cols <= _HUNGARIAN_MAX_CELLS else "greedy"
+    if method == "hungarian":
+        return _hungarian(scores, n_rows, n_cols)
+    if method == "greedy":
+        return _greedy(scores, n_rows, n_cols)
+    raise ValueError(f"Unknown assignment method {method!r}")
+
+
+def _tie_break(row: int, col: int) -> float:
+    # Tiny penalty for straying from the diagonal; far below any
+    # meaningful score difference.
+    return 1e-9 * abs(row - col)
+
+
+def _greedy(
+    scores: Sequence[Sequence[float | None]],
+    n_rows: int,
+    n_cols: int,
+) -> list[tuple[int, int]]:
+    cells = [
+        (score - _tie_break(r, c), r, c)
+        for r in range(n_rows)
+        for c in range(n_cols)
+        if (score := scores[r][c]) is not None
+    ]
+    cells.sort(key=lambda cell: (-cell[0], cell[1], cell[2]))
+    used_rows: set[int] = set()
+    used_cols: set[int] = set()
+    pairs: list[tuple[int, int]] = []
+    for _, r, c in cells:
+        if r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        pairs.append((r, c))
+    pairs.sort()
+    return pairs
+
+
+def _hungarian(
+    scores: Sequence[Sequence[float | None]],
+    n_rows: int,
+    n_cols: int,
+) -> list[tuple[int, int]]:
+    # The potentials formulation below needs rows <= columns; transpose
+    # otherwise and swap the pairs back at the end.
+    transposed = n_rows > n_cols
+    if transposed:
+        n, m = n_cols, n_rows
+
+        def cost(i: int, j: int) -> float:
+            s = scores[j][i]
+            return _FORBIDDEN_COST if s is None else -s + _tie_break(j, i)
+    else:
+        n, m = n_rows, n_cols
+
+        def cost(i: int, j: int) -> float:
+            s = scores[i][j]
+            return _FORBIDDEN_COST if s is None else -s + _tie_break(i, j)
+
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)  # p[j] = row (1-based) matched to column j
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = cost(i0 - 1, j - 1) - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    pairs: list[tuple[int, int]] = []
+    for j in range(1, m + 1):
+        if p[j] == 0:
+            continue
+        i = p[j] - 1
+        r, c = (j - 1, i) if transposed else (i, j - 1)
+        if scores[r][c] is not None:
+            pairs.append((r, c))
+    pairs.sort()
+    return pairs
+
+
+__all__ = ["solve_assignment"]
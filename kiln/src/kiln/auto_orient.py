@@ -2,7 +2,8 @@
 
 Determines the optimal print orientation to minimize supports, maximize
 bed adhesion, and reduce print time. Pure Python implementation using
-only stdlib math.
+only stdlib math; the shared mesh analyses in :mod:`kiln.printability`
+switch to numpy arrays when numpy is installed.
 """
 
 from __future__ import annotations
@@ -21,6 +22,7 @@ from kiln.printability import (
     _analyze_bed_adhesion,
     _analyze_overhangs,
     _analyze_supports,
+    _mesh_faces,
     _normalize,
     _triangle_normal,
 )
@@ -70,6 +72,11 @@ class SupportEstimate:
     overhang_triangle_count: int
     overhang_percentage: float
     needs_supports: bool
+    # From the rasterized support map (see kiln.printability.SupportMap).
+    support_footprint_area_mm2: float = 0.0
+    mapped_support_volume_mm3: float = 0.0
+    max_support_height_mm: float = 0.0
+    peak_overhang_layer_mm: float = 0.0  # layer printing the most overhang area
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -234,9 +241,11 @@ def _score_orientation(
     z_min = bbox["z_min"]
     print_height = bbox["z_max"] - z_min
 
-    overhangs = _analyze_overhangs(triangles)
-    bed_adhesion = _analyze_bed_adhesion(triangles, z_min, bbox)
-    supports = _analyze_supports(triangles, z_min)
+    # Face normals, areas and centroids are computed once for all three analyses.
+    faces = _mesh_faces(triangles)
+    overhangs = _analyze_overhangs(triangles, faces=faces)
+    bed_adhesion = _analyze_bed_adhesion(triangles, z_min, bbox, faces=faces)
+    supports = _analyze_supports(triangles, z_min, faces=faces)
 
     # Normalize metrics to 0-100 scale.
     # Bed contact: higher is better (0-100).
@@ -427,21 +436,33 @@ def estimate_supports(
     file_path: str,
     *,
     max_overhang_angle: float = 45.0,
+    resolution_mm: float = 1.0,
 ) -> SupportEstimate:
     """Estimate support volume for a mesh in its current orientation.
 
     :param file_path: Path to an STL or OBJ file.
     :param max_overhang_angle: Max overhang angle (degrees) before
         supports are needed.
+    :param resolution_mm: Cell size of the support footprint map.
     :returns: A :class:`SupportEstimate`.
     :raises ValueError: If the file cannot be parsed.
     """
+    if resolution_mm <= 0:
+        raise ValueError(f"Support map resolution must be positive, got {resolution_mm}")
+
     triangles, vertices = _parse_mesh(file_path)
 
     z_min = min(v[2] for v in vertices)
 
-    overhangs = _analyze_overhangs(triangles, max_overhang_angle=max_overhang_angle)
-    supports = _analyze_supports(triangles, z_min, max_overhang_angle=max_overhang_angle)
+    faces = _mesh_faces(triangles)
+    overhangs = _analyze_overhangs(triangles, max_overhang_angle=max_overhang_angle, faces=faces)
+    supports = _analyze_supports(
+        triangles,
+        z_min,
+        max_overhang_angle=max_overhang_angle,
+        resolution_mm=resolution_mm,
+        faces=faces,
+    )
 
     return SupportEstimate(
         estimated_support_volume_mm3=supports.estimated_support_volume_mm3,
@@ -449,6 +470,10 @@ def estimate_supports(
         overhang_triangle_count=overhangs.overhang_triangle_count,
         overhang_percentage=overhangs.overhang_percentage,
         needs_supports=overhangs.needs_supports,
+        support_footprint_area_mm2=supports.footprint_area_mm2,
+        mapped_support_volume_mm3=supports.mapped_volume_mm3,
+        max_support_height_mm=supports.max_support_height_mm,
+        peak_overhang_layer_mm=overhangs.peak_layer_height_mm,
     )
 
 
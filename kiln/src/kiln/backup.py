@@ -5,21 +5,66 @@ credential redaction, and to restore from a backup file.  Includes a
 :class:`BackupScheduler` for periodic automated backups via a daemon
 thread.  Designed to be called from both the CLI and MCP tools.
 
-Only stdlib modules are used.
+Scheduled backups come in two modes:
+
+* ``snapshot`` -- :func:`snapshot_database` writes a full ``VACUUM INTO``
+  copy each cycle.
+* ``incremental`` -- :func:`incremental_backup` copies the live database
+  with the SQLite online backup API in small, throttled page steps (so
+  the server is never locked out and the WAL can keep checkpointing),
+  then stores only the fixed-size chunks that changed since the previous
+  backup in a content-addressed chunk store.  Each backup is a JSON
+  manifest of chunk hashes plus a whole-file SHA-256, so any retained
+  manifest is a restore point and :func:`restore_database` verifies every
+  chunk before replacing the database.  Only *storage* is incremental:
+  every cycle still reads the whole database, writes a full staging copy
+  and reads it back to hash it, so per-cycle disk I/O is about three
+  times the database size.
+
+Several databases may share one backup directory (and its chunk store);
+restore points are told apart by the source database's file stem.  A
+lock file in the directory keeps one backup's chunk garbage collection
+from deleting chunks another backup has stored but not yet referenced.
+
+Backup duration, bytes written and lag are returned in
+:class:`ScheduledBackupResult` and exported via :mod:`kiln.metrics`.
+Apart from that, only stdlib modules are used.
+
+Usage::
+
+    from kiln.backup import incremental_backup, restore_database
+
+    result = incremental_backup("~/.kiln/kiln.db", "/srv/kiln-backups")
+    print(result.bytes_copied, result.duration_seconds)
+
+    # Point-in-time restore: newest backup taken at or before *at*.
+    restore_database("/srv/kiln-backups", "/tmp/kiln.db", at=1760000000.0)
 """
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import json
 import logging
 import os
 import shutil
 import sqlite3
+import sys
 import threading
 import time
+from collections.abc import Iterator
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
+from kiln.metrics import BACKUP_BYTES, BACKUP_DURATION, BACKUP_LAST_SUCCESS
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
 logger = logging.getLogger(__name__)
 
 
@@ -115,27 +160,55 @@ def restore_database(
     db_path: str,
     *,
     force: bool = False,
+    at: float | None = None,
 ) -> str:
     """Restore a Kiln database from a backup file.
 
-    :param backup_path: Path to the backup SQLite file.
+    :param backup_path: Path to the backup SQLite file, an incremental
+        backup manifest, or a directory of incremental backups.
     :param db_path: Destination path for the restored database.
     :param force: If False and db_path already exists, raise an error.
+    :param at: When *backup_path* is a directory, restore the newest
+        incremental backup taken at or before this Unix time (default:
+        the newest backup).  If the directory holds backups of several
+        databases, only those of the database named like *db_path* (same
+        file stem) are considered.
     :returns: The absolute path of the restored database.
-    :raises BackupError: If the backup is not a valid SQLite file or the
+    :raises BackupError: If the backup is not a valid SQLite file, an
+        incremental backup fails checksum verification, or the
         destination already exists (when force is False).
     """
+    if os.path.isdir(backup_path):
+        backup_path = _select_restore_point(backup_path, at, db_path)
+
     if not os.path.isfile(backup_path):
         raise BackupError(f"Backup file not found: {backup_path}")
 
-    _validate_sqlite(backup_path)
+    incremental = backup_path.endswith(_MANIFEST_SUFFIX)
+    if not incremental:
+        _validate_sqlite(backup_path)
 
     if os.path.isfile(db_path) and not force:
         raise BackupError(f"Database already exists at {db_path}. Use --force to overwrite.")
 
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
+    if incremental:
+        staging = db_path + ".restore-tmp"
+        try:
+            _assemble_incremental(backup_path, staging)
+            _validate_sqlite(staging)
+            _remove_wal_files(db_path)
+            os.replace(staging, db_path)
+        except OSError as exc:
+            raise BackupError(f"Failed to restore database: {exc}") from exc
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(staging)
+        return os.path.abspath(db_path)
+
     try:
+        _remove_wal_files(db_path)
         shutil.copy2(backup_path, db_path)
     except OSError as exc:
         raise BackupError(f"Failed to restore database: {exc}") from exc
@@ -143,6 +216,14 @@ def restore_database(
     return os.path.abspath(db_path)
 
 
+def _remove_wal_files(db_path: str) -> None:
+    """Delete a database's ``-wal``/``-shm`` files so they are not replayed
+    over a restored copy."""
+    for suffix in ("-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(db_path + suffix)
+
+
 def _validate_sqlite(path: str) -> None:
     """Check that path is a valid SQLite database file.
 
@@ -173,6 +254,13 @@ class ScheduledBackupResult:
     :param size_bytes: Size of the backup in bytes.
     :param timestamp: ISO-formatted timestamp of the backup.
     :param error: Error message if the backup failed.
+    :param mode: ``"snapshot"`` or ``"incremental"``.
+    :param duration_seconds: Wall-clock time the backup took.
+    :param bytes_copied: Bytes written to backup storage (for incremental
+        backups, only the chunks that changed).
+    :param lag_seconds: How far the backup trailed the live database when
+        it finished, i.e. seconds since its consistency point.
+    :param sha256: Checksum of the backed-up database image.
     """
 
     success: bool
@@ -180,6 +268,11 @@ class ScheduledBackupResult:
     size_bytes: int = 0
     timestamp: str = ""
     error: str | None = None
+    mode: str = "snapshot"
+    duration_seconds: float = 0.0
+    bytes_copied: int = 0
+    lag_seconds: float = 0.0
+    sha256: str = ""
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -233,13 +326,13 @@ def verify_integrity(db_path: str) -> IntegrityResult:
 # ---------------------------------------------------------------------------
 
 
-def _generate_backup_filename(db_path: str) -> str:
+def _generate_backup_filename(db_path: str, *, kind: str = "backup", suffix: str = ".db") -> str:
     """Generate a timestamped backup filename from the source database name."""
     base = Path(db_path).stem
     now = time.time()
     timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
     micros = int((now % 1) * 1_000_000)
-    return f"{base}_backup_{timestamp}_{micros:06d}.db"
+    return f"{base}_{kind}_{timestamp}_{micros:06d}{suffix}"
 
 
 def _rotate_backups(backup_dir: str, *, keep: int = 5, prefix: str = "") -> list[str]:
@@ -292,22 +385,29 @@ def snapshot_database(
     :param keep: Number of most recent backups to retain.
     :returns: :class:`ScheduledBackupResult` with the outcome.
     """
+    started = time.monotonic()
     timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
 
     if not os.path.isfile(db_path):
-        return ScheduledBackupResult(
-            success=False,
-            timestamp=timestamp,
-            error=f"Source database not found: {db_path}",
+        return _finish_result(
+            ScheduledBackupResult(
+                success=False,
+                timestamp=timestamp,
+                error=f"Source database not found: {db_path}",
+            ),
+            started,
         )
 
     try:
         os.makedirs(backup_dir, exist_ok=True)
     except OSError as exc:
-        return ScheduledBackupResult(
-            success=False,
-            timestamp=timestamp,
-            error=f"Cannot create backup directory: {exc}",
+        return _finish_result(
+            ScheduledBackupResult(
+                success=False,
+                timestamp=timestamp,
+                error=f"Cannot create backup directory: {exc}",
+            ),
+            started,
         )
 
     backup_filename = _generate_backup_filename(db_path)
@@ -317,22 +417,29 @@ def snapshot_database(
         conn = sqlite3.connect(db_path)
         try:
             conn.execute(f"VACUUM INTO '{backup_path}'")
+            captured_at = time.time()
         finally:
             conn.close()
     except sqlite3.Error as exc:
-        return ScheduledBackupResult(
-            success=False,
-            path=backup_path,
-            timestamp=timestamp,
-            error=f"Backup failed: {exc}",
+        return _finish_result(
+            ScheduledBackupResult(
+                success=False,
+                path=backup_path,
+                timestamp=timestamp,
+                error=f"Backup failed: {exc}",
+            ),
+            started,
         )
 
     if not os.path.isfile(backup_path):
-        return ScheduledBackupResult(
-            success=False,
-            path=backup_path,
-            timestamp=timestamp,
-            error="Backup file was not created",
+        return _finish_result(
+            ScheduledBackupResult(
+                success=False,
+                path=backup_path,
+                timestamp=timestamp,
+                error="Backup file was not created",
+            ),
+            started,
         )
 
     size_bytes = os.path.getsize(backup_path)
@@ -342,12 +449,381 @@ def snapshot_database(
 
     logger.info("Scheduled backup created: %s (%d bytes)", backup_path, size_bytes)
 
-    return ScheduledBackupResult(
-        success=True,
-        path=backup_path,
-        size_bytes=size_bytes,
-        timestamp=timestamp,
+    return _finish_result(
+        ScheduledBackupResult(
+            success=True,
+            path=backup_path,
+            size_bytes=size_bytes,
+            timestamp=timestamp,
+            bytes_copied=size_bytes,
+        ),
+        started,
+        captured_at=captured_at,
+    )
+
+
+def _finish_result(
+    result: ScheduledBackupResult,
+    started: float,
+    *,
+    captured_at: float | None = None,
+) -> ScheduledBackupResult:
+    """Fill in timing for *result* and record backup metrics."""
+    result.duration_seconds = time.monotonic() - started
+    status = "success" if result.success else "failed"
+    BACKUP_DURATION.observe(result.duration_seconds, labels={"mode": result.mode, "status": status})
+    if result.success and captured_at is not None:
+        result.lag_seconds = max(0.0, time.time() - captured_at)
+        BACKUP_BYTES.inc(result.bytes_copied, labels={"mode": result.mode})
+        BACKUP_LAST_SUCCESS.set(captured_at, labels={"mode": result.mode})
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Incremental backups (online backup API + content-addressed chunks)
+# ---------------------------------------------------------------------------
+
+_MANIFEST_SUFFIX = ".json"
+_MANIFEST_VERSION = 1
+_CHUNK_DIR = "chunks"
+_LOCK_FILE = ".lock"
+
+# Chunk granularity of the change detection: a modified page re-stores the
+# chunk containing it.
+_DEFAULT_CHUNK_SIZE = 256 * 1024
+
+# Online copy throttling: pages copied per step and pause between steps.
+_DEFAULT_PAGES_PER_STEP = 256
+_DEFAULT_STEP_SLEEP = 0.005
+
+# A write from another connection restarts a stepped copy.  After this
+# many restarts the copy finishes in a single step instead.
+_MAX_COPY_RESTARTS = 8
+
+
+class _CopyRestarted(Exception):
+    """Raised from the backup progress callback to abandon a stepped copy."""
+
+
+def _online_copy(
+    db_path: str,
+    dest_path: str,
+    *,
+    pages_per_step: int,
+    step_sleep: float,
+    max_restarts: int = _MAX_COPY_RESTARTS,
+) -> int:
+    """Copy *db_path* to *dest_path* with the SQLite online backup API.
+
+    The source is only locked while each step of *pages_per_step* pages
+    is copied, so writers and WAL checkpoints proceed between steps.
+    Returns the number of times the copy restarted.
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(dest_path)
+    restarts = 0
+    last_remaining: int | None = None
+
+    def progress(_status: int, remaining: int, _total: int) -> None:
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining >= last_remaining:
+            restarts += 1
+            if restarts > max_restarts:
+                raise _CopyRestarted
+        last_remaining = remaining
+
+    src = sqlite3.connect(db_path)
+    dst = sqlite3.connect(dest_path)
+    try:
+        if pages_per_step <= 0:
+            src.backup(dst)
+        else:
+            try:
+                src.backup(dst, pages=pages_per_step, progress=progress, sleep=step_sleep)
+            except _CopyRestarted:
+                logger.info("Backup of %s kept restarting under writes; copying in one step", db_path)
+                src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return restarts
+
+
+@contextlib.contextmanager
+def _locked_chunk_store(backup_dir: str) -> Iterator[None]:
+    """Hold the exclusive lock on *backup_dir*'s chunk store.
+
+    Taken from storing a backup's chunks until its manifest is written,
+    and for rotation, so garbage collection never sees a backup whose
+    chunks are stored but not yet referenced by a manifest.  The lock
+    works across processes and threads.
+    """
+    with open(os.path.join(backup_dir, _LOCK_FILE), "a+b") as fh:
+        if sys.platform == "win32":
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _chunk_path(backup_dir: str, digest: str) -> str:
+    return os.path.join(backup_dir, _CHUNK_DIR, digest[:2], digest)
+
+
+def _store_chunks(image_path: str, backup_dir: str, chunk_size: int) -> tuple[list[str], str, int, int]:
+    """Split *image_path* into chunks and store the ones not already present.
+
+    :returns: ``(chunk_digests, file_sha256, size_bytes, bytes_written)``.
+    """
+    digests: list[str] = []
+    whole = hashlib.sha256()
+    size = 0
+    written = 0
+    with open(image_path, "rb") as fh:
+        while block := fh.read(chunk_size):
+            whole.update(block)
+            size += len(block)
+            digest = hashlib.sha256(block).hexdigest()
+            digests.append(digest)
+            path = _chunk_path(backup_dir, digest)
+            if os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as out:
+                out.write(block)
+            os.replace(tmp, path)
+            written += len(block)
+    return digests, whole.hexdigest(), size, written
+
+
+def _load_manifest(path: str) -> dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError) as exc:
+        raise BackupError(f"Cannot read backup manifest {path}: {exc}") from exc
+    if not isinstance(manifest, dict) or manifest.get("version") != _MANIFEST_VERSION:
+        raise BackupError(f"Unsupported backup manifest: {path}")
+    return manifest
+
+
+def list_incremental_backups(backup_dir: str, *, prefix: str = "") -> list[dict[str, Any]]:
+    """Return the incremental backups (restore points) in *backup_dir*.
+
+    :param backup_dir: Directory passed to :func:`incremental_backup`.
+    :param prefix: Only consider backups of the database with this file
+        stem (``"kiln"`` matches ``kiln_incr_*`` but not ``kiln2_incr_*``).
+    :returns: Dicts with ``path``, ``database`` (source file stem),
+        ``created_at``, ``size_bytes`` and ``sha256``, oldest first.
+        Unreadable manifests are skipped.
+    """
+    if not os.path.isdir(backup_dir):
+        return []
+    points: list[dict[str, Any]] = []
+    for entry in os.listdir(backup_dir):
+        if not entry.endswith(_MANIFEST_SUFFIX) or "_incr_" not in entry:
+            continue
+        stem = entry.rpartition("_incr_")[0]
+        if prefix and stem != prefix:
+            continue
+        path = os.path.join(backup_dir, entry)
+        try:
+            manifest = _load_manifest(path)
+        except BackupError as exc:
+            logger.warning("Skipping backup manifest: %s", exc)
+            continue
+        points.append(
+            {
+                "path": path,
+                "database": stem,
+                "created_at": manifest["created_at"],
+                "size_bytes": manifest["size"],
+                "sha256": manifest["sha256"],
+            }
+        )
+    points.sort(key=lambda p: p["created_at"])
+    return points
+
+
+def _select_restore_point(backup_dir: str, at: float | None, db_path: str) -> str:
+    points = list_incremental_backups(backup_dir)
+    databases = sorted({p["database"] for p in points})
+    if len(databases) > 1:
+        stem = Path(db_path).stem
+        if stem not in databases:
+            raise BackupError(
+                f"{backup_dir} holds incremental backups of several databases "
+                f"({', '.join(databases)}); none is named {stem!r}. Pass a manifest path instead."
+            )
+        points = [p for p in points if p["database"] == stem]
+    if at is not None:
+        points = [p for p in points if p["created_at"] <= at]
+    if not points:
+        when = f" at or before {time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(at))}" if at is not None else ""
+        raise BackupError(f"No incremental backup{when} in {backup_dir}")
+    return points[-1]["path"]
+
+
+def _assemble_incremental(manifest_path: str, dest_path: str) -> None:
+    """Rebuild the database image of a manifest, verifying every checksum."""
+    manifest = _load_manifest(manifest_path)
+    backup_dir = os.path.dirname(os.path.abspath(manifest_path))
+    whole = hashlib.sha256()
+    size = 0
+    with open(dest_path, "wb") as out:
+        for digest in manifest["chunks"]:
+            try:
+                with open(_chunk_path(backup_dir, digest), "rb") as fh:
+                    block = fh.read()
+            except OSError as exc:
+                raise BackupError(f"Backup chunk {digest} is missing: {exc}") from exc
+            if hashlib.sha256(block).hexdigest() != digest:
+                raise BackupError(f"Backup chunk {digest} failed checksum verification")
+            whole.update(block)
+            size += len(block)
+            out.write(block)
+    if size != manifest["size"] or whole.hexdigest() != manifest["sha256"]:
+        raise BackupError(f"Restored image does not match the checksum in {manifest_path}")
+
+
+def _rotate_incremental(backup_dir: str, *, keep: int, prefix: str) -> list[str]:
+    """Delete all but the newest *keep* manifests, then unreferenced chunks.
+
+    Caller holds :func:`_locked_chunk_store`.
+    """
+    points = list_incremental_backups(backup_dir, prefix=prefix)
+    deleted: list[str] = []
+    for point in points[: max(0, len(points) - keep)]:
+        try:
+            os.remove(point["path"])
+            deleted.append(point["path"])
+        except OSError as exc:
+            logger.warning("Failed to delete old backup %s: %s", point["path"], exc)
+    if not deleted:
+        return deleted
+
+    # Chunks may be shared with other databases backed up to this directory.
+    referenced: set[str] = set()
+    for point in list_incremental_backups(backup_dir):
+        referenced.update(_load_manifest(point["path"])["chunks"])
+    chunk_root = os.path.join(backup_dir, _CHUNK_DIR)
+    for dirpath, _dirnames, filenames in os.walk(chunk_root):
+        for name in filenames:
+            if name not in referenced:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(dirpath, name))
+    return deleted
+
+
+def incremental_backup(
+    db_path: str,
+    backup_dir: str,
+    *,
+    keep: int = 5,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    pages_per_step: int = _DEFAULT_PAGES_PER_STEP,
+    step_sleep: float = _DEFAULT_STEP_SLEEP,
+) -> ScheduledBackupResult:
+    """Back up a live SQLite database, storing only chunks that changed.
+
+    The database is copied with the online backup API in throttled steps
+    to a staging file, which is split into *chunk_size* chunks.  Chunks
+    already in the backup directory's chunk store are not written again,
+    so ``bytes_copied`` (and storage growth) is proportional to what
+    changed since the previous backup.  The staging copy and hashing
+    still read and write the whole database every cycle.  The resulting
+    manifest is a restore point for
+    :func:`restore_database`.  Like :func:`snapshot_database`, this does
+    not redact credentials.
+
+    :param db_path: Path to the source SQLite database.
+    :param backup_dir: Directory holding manifests and the chunk store.
+    :param keep: Number of most recent restore points to retain.
+    :param chunk_size: Bytes per stored chunk.
+    :param pages_per_step: Database pages copied per backup step; ``0``
+        copies in one step.
+    :param step_sleep: Seconds to pause between steps.
+    :returns: :class:`ScheduledBackupResult` with the outcome.
+    """
+    started = time.monotonic()
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def failed(error: str) -> ScheduledBackupResult:
+        result = ScheduledBackupResult(success=False, timestamp=timestamp, error=error, mode="incremental")
+        return _finish_result(result, started)
+
+    if not os.path.isfile(db_path):
+        return failed(f"Source database not found: {db_path}")
+    try:
+        os.makedirs(backup_dir, exist_ok=True)
+    except OSError as exc:
+        return failed(f"Cannot create backup directory: {exc}")
+
+    stem = Path(db_path).stem
+    staging = os.path.join(backup_dir, f".{stem}.staging.db")
+    try:
+        restarts = _online_copy(db_path, staging, pages_per_step=pages_per_step, step_sleep=step_sleep)
+        captured_at = time.time()
+        with _locked_chunk_store(backup_dir):
+            digests, sha256, size, written = _store_chunks(staging, backup_dir, chunk_size)
+            manifest_path = os.path.join(
+                backup_dir,
+                _generate_backup_filename(db_path, kind="incr", suffix=_MANIFEST_SUFFIX),
+            )
+            manifest = {
+                "version": _MANIFEST_VERSION,
+                "database": os.path.abspath(db_path),
+                "created_at": captured_at,
+                "size": size,
+                "sha256": sha256,
+                "chunk_size": chunk_size,
+                "chunks": digests,
+            }
+            tmp = manifest_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(manifest, fh)
+            os.replace(tmp, manifest_path)
+    except (sqlite3.Error, OSError) as exc:
+        return failed(f"Backup failed: {exc}")
+    finally:
+        for path in (staging, staging + "-journal"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    with _locked_chunk_store(backup_dir):
+        _rotate_incremental(backup_dir, keep=keep, prefix=stem)
+
+    result = _finish_result(
+        ScheduledBackupResult(
+            success=True,
+            path=manifest_path,
+            size_bytes=size,
+            timestamp=timestamp,
+            mode="incremental",
+            bytes_copied=written,
+            sha256=sha256,
+        ),
+        started,
+        captured_at=captured_at,
+    )
+    logger.info(
+        "Incremental backup created: %s (%d bytes, %d new, %.2fs, %d copy restarts)",
+        manifest_path,
+        size,
+        written,
+        result.duration_seconds,
+        restarts,
     )
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -356,18 +832,21 @@ def snapshot_database(
 
 _DEFAULT_INTERVAL: float = 3600.0
 _DEFAULT_KEEP: int = 5
+_BACKUP_MODES = ("snapshot", "incremental")
 
 
 class BackupScheduler:
     """Runs periodic database backups in a background daemon thread.
 
-    Uses ``VACUUM INTO`` for consistent snapshots and rotates old backups
-    by modification time.
+    In ``snapshot`` mode each cycle writes a ``VACUUM INTO`` copy and old
+    backups are rotated by modification time; in ``incremental`` mode each
+    cycle runs :func:`incremental_backup`.
 
     Configuration is read from environment variables at construction time:
 
     - ``KILN_BACKUP_INTERVAL`` — seconds between backups (default 3600).
     - ``KILN_BACKUP_KEEP`` — number of backups to retain (default 5).
+    - ``KILN_BACKUP_MODE`` — ``snapshot`` (default) or ``incremental``.
 
     :param db_path: Path to the database to back up.
     :param backup_dir: Directory to store backups.
@@ -375,6 +854,8 @@ class BackupScheduler:
         ``KILN_BACKUP_INTERVAL`` env var, then the default (3600).
     :param keep: Number of backups to retain.  Falls back to
         ``KILN_BACKUP_KEEP`` env var, then the default (5).
+    :param mode: ``"snapshot"`` or ``"incremental"``.  Falls back to
+        ``KILN_BACKUP_MODE`` env var, then ``"snapshot"``.
     """
 
     def __init__(
@@ -384,6 +865,7 @@ class BackupScheduler:
         *,
         interval_seconds: float | None = None,
         keep: int | None = None,
+        mode: str | None = None,
     ) -> None:
         self._db_path = db_path
         self._backup_dir = backup_dir
@@ -402,6 +884,20 @@ class BackupScheduler:
             env_keep = os.environ.get("KILN_BACKUP_KEEP")
             self._keep = int(env_keep) if env_keep else _DEFAULT_KEEP
 
+        # Resolve mode: explicit arg > env var > default
+        if mode is not None:
+            if mode not in _BACKUP_MODES:
+                raise ValueError(f"Unknown backup mode {mode!r}; expected one of {_BACKUP_MODES}")
+            self._mode = mode
+        else:
+            env_mode = os.environ.get("KILN_BACKUP_MODE", "").strip().lower()
+            if env_mode and env_mode not in _BACKUP_MODES:
+                logger.warning("Ignoring unknown KILN_BACKUP_MODE=%r; using snapshot", env_mode)
+            self._mode = env_mode if env_mode in _BACKUP_MODES else "snapshot"
+
+        self._last_result: ScheduledBackupResult | None = None
+        self._last_captured_at: float | None = None
+
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
 
@@ -421,7 +917,8 @@ class BackupScheduler:
         )
         self._thread.start()
         logger.info(
-            "Backup scheduler started (interval=%ds, keep=%d)",
+            "Backup scheduler started (mode=%s, interval=%ds, keep=%d)",
+            self._mode,
             self._interval,
             self._keep,
         )
@@ -439,19 +936,39 @@ class BackupScheduler:
         """Whether the scheduler thread is currently active."""
         return self._thread is not None and self._thread.is_alive()
 
+    @property
+    def last_result(self) -> ScheduledBackupResult | None:
+        """Outcome of the most recent backup cycle, if any."""
+        return self._last_result
+
+    @property
+    def lag_seconds(self) -> float | None:
+        """Seconds of changes not yet covered by a successful backup."""
+        if self._last_captured_at is None:
+            return None
+        return max(0.0, time.time() - self._last_captured_at)
+
     # -- Internals -----------------------------------------------------------
 
     def _run(self) -> None:
         """Main scheduler loop — snapshot, then sleep until next cycle."""
         while not self._stop_event.is_set():
             try:
-                result = snapshot_database(
+                backup_fn = incremental_backup if self._mode == "incremental" else snapshot_database
+                result = backup_fn(
                     self._db_path,
                     self._backup_dir,
                     keep=self._keep,
                 )
+                self._last_result = result
                 if result.success:
-                    logger.debug("Scheduled backup completed: %s", result.path)
+                    self._last_captured_at = time.time() - result.lag_seconds
+                    logger.debug(
+                        "Scheduled backup completed: %s (%.2fs, %d bytes copied)",
+                        result.path,
+                        result.duration_seconds,
+                        result.bytes_copied,
+                    )
                 else:
                     logger.warning("Scheduled backup failed: %s", result.error)
             except Exception:
@@ -16,6 +16,7 @@ import logging
 import os
 import shutil
 import signal
+import stat as stat_module
 import subprocess
 import sys
 import tempfile
@@ -89,6 +90,10 @@ _MATERIAL_TEMPS: dict[str, tuple[int, int, int, int]] = {
 _SUPPORT_MODE_CHOICES: tuple[str, ...] = ("off", "auto", "minimal", "aggressive")
 _INGEST_EXTENSIONS: tuple[str, ...] = (".gcode", ".gco", ".g", ".3mf")
 
+# Ingest state journal size that triggers a snapshot rewrite (the journal
+# is also compacted once it outgrows the snapshot).
+_INGEST_JOURNAL_COMPACT_BYTES = 256 * 1024
+
 
 def _normalise_material_type(raw: str | None) -> str | None:
     """Normalize material names to canonical keys used by temp defaults."""
@@ -587,22 +592,65 @@ def _route_printer_for_job(
 
 
 def _scan_ingest_directory(watch_dir: Path, seen: dict[str, float]) -> list[Path]:
-    """Return newly created/updated printable files since the last scan."""
+    """Return newly created/updated printable files since the last scan.
+
+    *watch_dir* must already be resolved; entries are keyed by
+    ``watch_dir / name`` so no per-file ``resolve()`` is needed.
+    """
     discovered: list[Path] = []
-    for entry in sorted(watch_dir.iterdir(), key=lambda p: p.name.lower()):
-        if not entry.is_file():
-            continue
-        if entry.suffix.lower() not in _INGEST_EXTENSIONS:
-            continue
+    with os.scandir(watch_dir) as entries:
+        candidates = [
+            entry for entry in entries if os.path.splitext(entry.name)[1].lower() in _INGEST_EXTENSIONS
+        ]
+    for entry in sorted(candidates, key=lambda e: e.name.lower()):
         try:
+            if not entry.is_file():
+                continue
             mtime = entry.stat().st_mtime
         except OSError:
             continue
-        key = str(entry.resolve())
+        path = watch_dir / entry.name
+        key = str(path)
         if seen.get(key) == mtime:
             continue
         seen[key] = mtime
-        discovered.append(entry)
+        discovered.append(path)
+    return discovered
+
+
+def _ingest_event_paths(
+    watch_dir: Path,
+    events: list[Any],
+    seen: dict[str, float],
+    changes: dict[str, float | None],
+) -> list[Path]:
+    """Apply inotify events to *seen*; return files that finished writing.
+
+    Removed files are dropped from *seen*.  Every touched key is recorded
+    in *changes* for incremental state persistence.
+    """
+    from kiln.ingest_watch import REMOVED
+
+    discovered: list[Path] = []
+    for event in events:
+        if os.path.splitext(event.name)[1].lower() not in _INGEST_EXTENSIONS:
+            continue
+        path = watch_dir / event.name
+        key = str(path)
+        if event.kind == REMOVED:
+            if seen.pop(key, None) is not None:
+                changes[key] = None
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if not stat_module.S_ISREG(st.st_mode) or seen.get(key) == st.st_mtime:
+            continue
+        seen[key] = st.st_mtime
+        changes[key] = st.st_mtime
+        if path not in discovered:
+            discovered.append(path)
     return discovered
 
 
@@ -621,20 +669,70 @@ def _normalise_ingest_seen(raw_seen: Any) -> dict[str, float]:
     return seen
 
 
+def _ingest_journal_path(state_path: Path) -> Path:
+    return state_path.with_name(state_path.name + ".journal")
+
+
 def _load_ingest_seen_state(state_path: Path) -> dict[str, float]:
-    """Load persisted ingest seen-state from disk."""
+    """Load persisted ingest seen-state from disk (snapshot plus journal)."""
     payload = _read_json_file(state_path, default={})
-    return _normalise_ingest_seen(payload.get("seen"))
+    seen = _normalise_ingest_seen(payload.get("seen"))
+    try:
+        with open(_ingest_journal_path(state_path), encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn final line after a crash
+                if not isinstance(record, dict):
+                    continue
+                for key, value in record.items():
+                    if value is None:
+                        seen.pop(key, None)
+                    else:
+                        seen.update(_normalise_ingest_seen({key: value}))
+    except FileNotFoundError:
+        pass
+    return seen
 
 
 def _save_ingest_seen_state(state_path: Path, watch_dir: Path, seen: dict[str, float]) -> None:
-    """Persist ingest seen-state to disk."""
+    """Persist a full ingest seen-state snapshot and drop the journal."""
     payload = {
         "watch_dir": str(watch_dir),
         "updated_at": time.time(),
         "seen": seen,
     }
     _write_json_file(state_path, payload)
+    with contextlib.suppress(FileNotFoundError):
+        _ingest_journal_path(state_path).unlink()
+
+
+def _persist_ingest_seen_changes(
+    state_path: Path,
+    watch_dir: Path,
+    seen: dict[str, float],
+    changes: dict[str, float | None],
+) -> None:
+    """Record *changes* (``None`` = forgotten) without rewriting the snapshot.
+
+    Changes are appended to ``<state>.journal``; the snapshot is rewritten
+    only when it does not exist yet or the journal has grown past it.
+    """
+    if not changes:
+        return
+    journal_path = _ingest_journal_path(state_path)
+    try:
+        snapshot_size = state_path.stat().st_size
+        journal_size = journal_path.stat().st_size if journal_path.exists() else 0
+    except FileNotFoundError:
+        _save_ingest_seen_state(state_path, watch_dir, seen)
+        return
+    if journal_size > max(_INGEST_JOURNAL_COMPACT_BYTES, snapshot_size):
+        _save_ingest_seen_state(state_path, watch_dir, seen)
+        return
+    with open(journal_path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(changes, separators=(",", ":")) + "\n")
 
 
 def _filter_stable_ingest_files(
@@ -659,8 +757,7 @@ def _filter_stable_ingest_files(
             stable.append(path)
             continue
         # Re-arm the file so the next scan can pick it up once stable.
-        with contextlib.suppress(OSError):
-            seen.pop(str(path.resolve()), None)
+        seen.pop(str(path), None)
     return stable
 
 
@@ -1101,7 +1198,7 @@ def cli(ctx: click.Context, printer: str | None) -> None:
     "--subnet",
     "-s",
     default=None,
-    help="Subnet to scan (e.g. '192.168.1'). Auto-detected if omitted.",
+    help="Subnet(s) to scan, comma-separated (e.g. '192.168.1' or '10.0.0.0/22,10.0.8.0/24'). Auto-detected if omitted.",
 )
 @click.option(
     "--method",
@@ -1125,7 +1222,7 @@ def discover(timeout: float, subnet: str | None, methods: tuple, json_mode: bool
     try:
         found = discover_printers(
             timeout=timeout,
-            subnet=subnet,
+            subnet=[part.strip() for part in subnet.split(",") if part.strip()] if subnet else None,
             methods=method_list,
         )
     except OSError as exc:
@@ -4065,6 +4162,12 @@ def ingest() -> None:
     type=float,
     help="Require files to be stable for this many seconds before ingest.",
 )
+@click.option(
+    "--poll",
+    "force_poll",
+    is_flag=True,
+    help="Rescan the folder every interval instead of using inotify change events.",
+)
 @click.option("--json", "json_mode", is_flag=True, help="Output JSON (requires --once).")
 def ingest_watch_cmd(
     watch_dir: str,
@@ -4075,9 +4178,16 @@ def ingest_watch_cmd(
     material: str,
     state_file: str | None,
     min_stable_seconds: float,
+    force_poll: bool,
     json_mode: bool,
 ) -> None:
-    """Watch a folder and detect new printable files for Kiln workflows."""
+    """Watch a folder and detect new printable files for Kiln workflows.
+
+    On Linux the folder is watched with inotify: a file is picked up as
+    soon as its writer closes it (or it is renamed into the folder), and
+    the stability window only applies to files found by full scans.
+    Elsewhere, or with ``--poll``, the folder is rescanned every interval.
+    """
     if json_mode and not once:
         click.echo(
             format_error(
@@ -4221,25 +4331,81 @@ def ingest_watch_cmd(
             if not json_mode:
                 click.echo(f"Queued: {path.name} -> {chosen}")
 
+    stable_seconds = max(0.0, float(min_stable_seconds))
+    # Files a full scan found still being written, re-checked every tick.
+    deferred: dict[str, Path] = {}
+
+    def _process(detected: list[Path], changes: dict[str, float | None]) -> list[Path]:
+        _enqueue_detected(detected)
+        _dispatch_pending()
+        if state_path:
+            try:
+                _persist_ingest_seen_changes(state_path, watch_path, seen, changes)
+            except Exception as exc:
+                errors.append(f"state: {exc}")
+        return detected
+
     def _scan_cycle() -> list[Path]:
         try:
-            detected = _scan_ingest_directory(watch_path, seen)
+            found = _scan_ingest_directory(watch_path, seen)
             detected = _filter_stable_ingest_files(
-                detected,
+                found,
                 seen=seen,
-                min_stable_seconds=max(0.0, float(min_stable_seconds)),
+                min_stable_seconds=stable_seconds,
             )
         except Exception as exc:
             errors.append(f"scan: {exc}")
             return []
-        _enqueue_detected(detected)
-        _dispatch_pending()
-        if state_path:
+        ready = set(detected)
+        for path in found:
+            if path in ready:
+                deferred.pop(str(path), None)
+            else:
+                deferred[str(path)] = path
+        return _process(detected, {str(path): seen.get(str(path)) for path in found})
+
+    watcher: Any = None
+    # Set when the kernel dropped the watch; re-armed once the folder exists.
+    rearm_watch = False
+
+    def _event_cycle() -> list[Path]:
+        nonlocal watcher, rearm_watch
+        from kiln.ingest_watch import LOST, RESCAN
+
+        try:
+            events = watcher.read(timeout=max(0.2, float(interval)))
+        except OSError as exc:
+            errors.append(f"watch: {exc}")
+            return []
+        kinds = {event.kind for event in events}
+        if LOST in kinds:
+            # The folder was removed or replaced; this watch is dead.
+            watcher.close()
+            watcher = None
+            rearm_watch = True
+            if not json_mode:
+                click.echo(f"Watch on {watch_path} lost; polling until it can be re-armed")
+            return _scan_cycle() if watch_path.is_dir() else []
+        if RESCAN in kinds:
+            return _scan_cycle()
+        changes: dict[str, float | None] = {}
+        detected = _ingest_event_paths(watch_path, events, seen, changes)
+        for path in detected:
+            deferred.pop(str(path), None)
+        # A writer that finished before the watch was armed sends no event.
+        now = time.time()
+        for key, path in list(deferred.items()):
             try:
-                _save_ingest_seen_state(state_path, watch_path, seen)
-            except Exception as exc:
-                errors.append(f"state: {exc}")
-        return detected
+                mtime = path.stat().st_mtime
+            except OSError:
+                del deferred[key]
+                continue
+            if now - mtime >= stable_seconds:
+                del deferred[key]
+                seen[key] = mtime
+                changes[key] = mtime
+                detected.append(path)
+        return _process(detected, changes)
 
     if not json_mode:
         mode = "auto-queue" if auto_queue else "detect-only"
@@ -4253,20 +4419,45 @@ def ingest_watch_cmd(
 
     detected_all: list[str] = []
 
+    if not once and not force_poll:
+        from kiln.ingest_watch import open_directory_watcher
+
+        # Armed before the initial scan so nothing written in between is missed.
+        watcher = open_directory_watcher(watch_path)
+        if not json_mode:
+            click.echo("Change detection: " + ("inotify" if watcher is not None else f"polling every {interval}s"))
+
     try:
         if once:
             detected = _scan_cycle()
             detected_all.extend(str(p) for p in detected)
         else:
+            detected = _scan_cycle()
+            detected_all.extend(str(p) for p in detected)
             while True:
-                detected = _scan_cycle()
+                if watcher is not None:
+                    detected = _event_cycle()
+                else:
+                    time.sleep(max(0.2, float(interval)))
+                    if rearm_watch and watch_path.is_dir():
+                        from kiln.ingest_watch import open_directory_watcher
+
+                        # One attempt; if inotify fails now, keep polling.
+                        rearm_watch = False
+                        watcher = open_directory_watcher(watch_path)
+                        if watcher is not None and not json_mode:
+                            click.echo(f"Watch on {watch_path} re-armed")
+                    # Nothing to scan until the dropped folder is recreated.
+                    detected = [] if rearm_watch else _scan_cycle()
                 detected_all.extend(str(p) for p in detected)
-                time.sleep(max(0.2, float(interval)))
     except KeyboardInterrupt:
         if json_mode:
             pass
         else:
             click.echo("\nStopped ingest watcher.")
+    finally:
+        if watcher is not None:
+            watcher.close()
 
     if json_mode:
         payload = {
@@ -8773,16 +8964,36 @@ def untrust(host: str, json_mode: bool) -> None:
 
 
 @cli.command()
-@click.option("--output", "-o", default=None, help="Output file path for backup.")
+@click.option("--output", "-o", default=None, help="Output file path for backup (directory with --incremental).")
 @click.option("--no-redact", is_flag=True, help="Skip credential redaction.")
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Online incremental backup: store only changed chunks (not redacted).",
+)
+@click.option("--keep", type=int, default=5, show_default=True, help="Restore points to keep with --incremental.")
 @click.option("--json", "json_mode", is_flag=True, help="Output JSON.")
-def backup(output: str | None, no_redact: bool, json_mode: bool) -> None:
+def backup(output: str | None, no_redact: bool, incremental: bool, keep: int, json_mode: bool) -> None:
     """Back up the Kiln database with credential redaction."""
-    from kiln.backup import BackupError, backup_database
+    from kiln.backup import BackupError, backup_database, incremental_backup
     from kiln.persistence import get_db
 
     try:
         db = get_db()
+        if incremental:
+            backup_dir = output or os.path.join(str(Path.home()), ".kiln", "backups", "incremental")
+            result = incremental_backup(db.path, backup_dir, keep=keep)
+            if not result.success:
+                raise BackupError(result.error or "Incremental backup failed")
+            if json_mode:
+                click.echo(format_response("success", data=result.to_dict(), json_mode=True))
+            else:
+                click.echo(
+                    f"Incremental backup saved to {result.path} "
+                    f"({result.bytes_copied} of {result.size_bytes} bytes written, "
+                    f"{result.duration_seconds:.1f}s)"
+                )
+            return
         result_path = backup_database(
             db.path,
             output,
@@ -8808,15 +9019,33 @@ def backup(output: str | None, no_redact: bool, json_mode: bool) -> None:
 @cli.command()
 @click.argument("backup_path", type=click.Path(exists=True))
 @click.option("--force", is_flag=True, help="Overwrite existing database.")
+@click.option(
+    "--at",
+    "at",
+    default=None,
+    help="With a directory of incremental backups: restore the newest one taken "
+    "at or before this time (ISO 8601 or Unix seconds).",
+)
 @click.option("--json", "json_mode", is_flag=True, help="Output JSON.")
-def restore(backup_path: str, force: bool, json_mode: bool) -> None:
+def restore(backup_path: str, force: bool, at: str | None, json_mode: bool) -> None:
     """Restore the Kiln database from a backup file."""
     from kiln.backup import BackupError, restore_database
     from kiln.persistence import get_db
 
     try:
+        at_epoch: float | None = None
+        if at is not None:
+            try:
+                at_epoch = float(at)
+            except ValueError:
+                from datetime import datetime
+
+                try:
+                    at_epoch = datetime.fromisoformat(at).timestamp()
+                except ValueError as exc:
+                    raise BackupError(f"Invalid --at time {at!r}: use ISO 8601 or Unix seconds") from exc
         db = get_db()
-        result_path = restore_database(backup_path, db.path, force=force)
+        result_path = restore_database(backup_path, db.path, force=force, at=at_epoch)
         data = {"restored_path": result_path}
         if json_mode:
             click.echo(format_response("success", data=data, json_mode=True))
@@ -3,10 +3,35 @@
 Synchronises printer configurations, job history, and events to a
 remote REST API.  Runs as a background daemon thread that periodically
 pushes local SQLite changes and optionally pulls remote config.
+
+Jobs and events are read with keyset-paginated queries and pushed in
+batches of at most ``batch_size`` rows.  Bodies above ~1 KiB are
+compressed (``gzip``, or ``zstd`` when the optional ``zstandard``
+package is installed) and the HMAC signature covers the bytes actually
+sent.  After each acknowledged batch the stream's cursor is recorded in
+``sync_log``, so an interrupted sync -- network error, restart, 429 --
+resumes at the first unsent row.  Printer configuration is pushed only
+when its content hash changes.
+
+A ``429 Too Many Requests`` ends the cycle: the batch size is halved
+and nothing is sent until ``Retry-After`` has passed.  Each successful
+batch doubles it back toward the configured size.
+
+Usage::
+
+    from kiln.cloud_sync import CloudSyncManager, SyncConfig
+
+    mgr = CloudSyncManager(db=db, event_bus=bus, config=SyncConfig(
+        cloud_url="https://cloud.example.com", api_key="...", batch_size=500,
+    ))
+    mgr.sync_now()
+    print(mgr.status().rows_per_second)
 """
 
 from __future__ import annotations
 
+import email.utils
+import gzip
 import hashlib
 import hmac
 import json
@@ -18,8 +43,28 @@ from typing import Any
 
 import requests
 
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Bodies smaller than this are sent uncompressed.
+_MIN_COMPRESS_BYTES = 1024
+
+# Wait used when a 429 carries no usable Retry-After, and the cap on it.
+_DEFAULT_RETRY_AFTER = 30.0
+_MAX_RETRY_AFTER = 3600.0
+
+# Printer fields that change without the configuration changing
+# (save_printer() rewrites registered_at on every re-registration).
+_VOLATILE_PRINTER_FIELDS = frozenset({"last_seen", "registered_at"})
+
 
 # ---------------------------------------------------------------------------
 # Dataclasses
@@ -28,7 +73,12 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class SyncConfig:
-    """Configuration for cloud sync."""
+    """Configuration for cloud sync.
+
+    :param batch_size: Maximum rows per push request.
+    :param compression: ``"gzip"``, ``"zstd"`` (gzip when ``zstandard``
+        is not installed) or ``"none"``.
+    """
 
     cloud_url: str = ""
     api_key: str = ""
@@ -37,6 +87,8 @@ class SyncConfig:
     sync_events: bool = True
     sync_printers: bool = True
     sync_settings: bool = False
+    batch_size: int = 500
+    compression: str = "gzip"
 
     def to_dict(self) -> dict[str, Any]:
         d = asdict(self)
@@ -52,7 +104,16 @@ class SyncConfig:
 
 @dataclass
 class SyncStatus:
-    """Current state of the sync system."""
+    """Current state of the sync system.
+
+    :param rows_per_second: Rows pushed per second during the last cycle
+        that sent data.
+    :param bytes_per_second: Body bytes (after compression) sent per
+        second during that cycle.
+    :param bytes_synced: Total body bytes sent since start.
+    :param batch_size: Current batch size, reduced after a 429.
+    :param rate_limited_until: Epoch before which no push is attempted.
+    """
 
     enabled: bool
     connected: bool = False
@@ -61,13 +122,18 @@ class SyncStatus:
     jobs_synced: int = 0
     events_synced: int = 0
     errors: list[str] = field(default_factory=list)
+    bytes_synced: int = 0
+    rows_per_second: float = 0.0
+    bytes_per_second: float = 0.0
+    batch_size: int = 0
+    rate_limited_until: float | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
 
 
 # ---------------------------------------------------------------------------
-# HMAC helper
+# Wire helpers
 # ---------------------------------------------------------------------------
 
 
@@ -80,6 +146,46 @@ def _compute_signature(secret: str, payload: bytes) -> str:
     ).hexdigest()
 
 
+def _encode_body(payload: bytes, compression: str) -> tuple[bytes, str | None]:
+    """Return ``(body, content_encoding)`` for *payload*."""
+    if compression == "none" or len(payload) < _MIN_COMPRESS_BYTES:
+        return payload, None
+    if compression == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(payload), "zstd"
+    return gzip.compress(payload, compresslevel=6), "gzip"
+
+
+def _parse_retry_after(value: str | None) -> float:
+    """Seconds to wait for a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return _DEFAULT_RETRY_AFTER
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return _DEFAULT_RETRY_AFTER
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER)
+
+
+def _printers_hash(printers: list[dict[str, Any]]) -> str:
+    """Content hash of the printer list, ignoring volatile fields."""
+    stable = sorted(
+        ({k: v for k, v in p.items() if k not in _VOLATILE_PRINTER_FIELDS} for p in printers),
+        key=lambda p: str(p.get("name", "")),
+    )
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _RateLimited(Exception):
+    """The cloud endpoint answered 429."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"rate limited, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
 # ---------------------------------------------------------------------------
 # Cloud sync manager
 # ---------------------------------------------------------------------------
@@ -104,6 +210,8 @@ class CloudSyncManager:
         self._bus = event_bus
         self._config = config or SyncConfig()
         self._lock = threading.Lock()
+        # Serialises cycles so the loop and sync_now() never race on cursors.
+        self._cycle_lock = threading.Lock()
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
         self._session = requests.Session()
@@ -111,10 +219,17 @@ class CloudSyncManager:
         # Counters
         self._jobs_synced = 0
         self._events_synced = 0
+        self._bytes_synced = 0
+        self._rows_per_second = 0.0
+        self._bytes_per_second = 0.0
         self._last_sync_at: float | None = None
         self._last_status = "never"
         self._errors: list[str] = []
 
+        # Adaptive batching / 429 backoff
+        self._batch_size = max(1, self._config.batch_size)
+        self._rate_limited_until: float | None = None
+
     @property
     def enabled(self) -> bool:
         return bool(self._config.cloud_url and self._config.api_key)
@@ -123,6 +238,7 @@ class CloudSyncManager:
         """Update the sync configuration."""
         with self._lock:
             self._config = config
+            self._batch_size = max(1, config.batch_size)
         # Persist to DB settings
         if self._db is not None:
             self._db.set_setting("cloud_sync_config", json.dumps(asdict(config)))
@@ -161,6 +277,11 @@ class CloudSyncManager:
                 jobs_synced=self._jobs_synced,
                 events_synced=self._events_synced,
                 errors=list(self._errors[-10:]),
+                bytes_synced=self._bytes_synced,
+                rows_per_second=self._rows_per_second,
+                bytes_per_second=self._bytes_per_second,
+                batch_size=self._batch_size,
+                rate_limited_until=self._rate_limited_until,
             )
 
     def sync_now(self) -> dict[str, Any]:
@@ -176,55 +297,58 @@ class CloudSyncManager:
                 self._sync_cycle()
             except Exception:
                 logger.exception("Sync cycle error")
-            self._stop_event.wait(timeout=self._config.sync_interval_seconds)
+            self._stop_event.wait(timeout=self._next_wait())
+
+    def _next_wait(self) -> float:
+        """Seconds until the next cycle: the interval, or longer while rate limited."""
+        wait = self._config.sync_interval_seconds
+        with self._lock:
+            until = self._rate_limited_until
+        if until is not None:
+            wait = max(wait, until - time.time())
+        return wait
+
+    def _stopping(self) -> bool:
+        return self._thread is not None and self._stop_event.is_set()
 
     def _sync_cycle(self) -> dict[str, Any]:
         """Execute one push/pull sync cycle."""
         if not self.enabled or self._db is None:
             return {"error": "Sync not configured"}
 
-        result: dict[str, Any] = {"jobs_pushed": 0, "events_pushed": 0}
+        with self._lock:
+            until = self._rate_limited_until
+        if until is not None and until > time.time():
+            return {
+                "error": "Rate limited by cloud endpoint",
+                "retry_after": round(until - time.time(), 1),
+            }
+
+        with self._cycle_lock:
+            return self._run_cycle()
 
-        # Get sync cursor (last sync timestamp)
-        cursor_str = self._db.get_setting("sync_cursor", "0")
-        cursor = float(cursor_str) if cursor_str else 0.0
+    def _run_cycle(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "jobs_pushed": 0,
+            "events_pushed": 0,
+            "printers_pushed": False,
+            "batches": 0,
+            "bytes_sent": 0,
+        }
+        started = time.monotonic()
 
         try:
-            # Push jobs
             if self._config.sync_jobs:
-                jobs = self._db.get_unsynced_jobs(cursor)
-                if jobs:
-                    self._push("jobs", jobs)
-                    self._db.mark_synced("job", [j["id"] for j in jobs])
-                    result["jobs_pushed"] = len(jobs)
-                    with self._lock:
-                        self._jobs_synced += len(jobs)
-
-            # Push events
+                self._push_jobs(result)
             if self._config.sync_events:
-                events = self._db.get_unsynced_events(cursor)
-                if events:
-                    self._push("events", events)
-                    self._db.mark_synced(
-                        "event",
-                        [str(e["id"]) for e in events],
-                    )
-                    result["events_pushed"] = len(events)
-                    with self._lock:
-                        self._events_synced += len(events)
-
-            # Push printers
+                self._push_events(result)
             if self._config.sync_printers:
-                printers = self._db.list_printers()
-                if printers:
-                    self._push("printers", printers)
-
-            # Update cursor
-            self._db.set_setting("sync_cursor", str(time.time()))
+                self._push_printers(result)
 
             with self._lock:
                 self._last_sync_at = time.time()
                 self._last_status = "success"
+                self._rate_limited_until = None
 
             if self._bus is not None:
                 from kiln.events import EventType
@@ -235,6 +359,22 @@ class CloudSyncManager:
                     source="cloud_sync",
                 )
 
+        except _RateLimited as exc:
+            # Progress up to the last acknowledged batch is already saved;
+            # back off and resume from the cursors next cycle.
+            with self._lock:
+                self._rate_limited_until = time.time() + exc.retry_after
+                self._batch_size = max(1, self._batch_size // 2)
+                self._last_status = "rate_limited"
+                batch_size = self._batch_size
+            result["rate_limited"] = True
+            result["retry_after"] = exc.retry_after
+            logger.warning(
+                "Cloud sync rate limited; retrying in %.0fs with batch size %d",
+                exc.retry_after,
+                batch_size,
+            )
+
         except Exception as exc:
             error_type = type(exc).__name__
             # Truncate and sanitize - don't expose full exception details
@@ -259,10 +399,99 @@ class CloudSyncManager:
                     source="cloud_sync",
                 )
 
+        finally:
+            self._record_throughput(result, time.monotonic() - started)
+
         return result
 
-    def _push(self, entity_type: str, records: list[dict[str, Any]]) -> None:
-        """Push records to the cloud endpoint."""
+    # -- streams --------------------------------------------------------
+
+    def _legacy_cursor(self) -> float:
+        """Timestamp cursor written by versions that synced row by row."""
+        try:
+            return float(self._db.get_setting("sync_cursor", "0") or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _push_jobs(self, result: dict[str, Any]) -> None:
+        raw = self._db.get_sync_cursor("jobs")
+        if raw:
+            submitted_at, job_id = json.loads(raw)
+            cursor: tuple[float, str] | None = (float(submitted_at), str(job_id))
+        else:
+            legacy = self._legacy_cursor()
+            cursor = (legacy, "") if legacy > 0 else None
+
+        while not self._stopping():
+            limit = self._current_batch_size()
+            jobs = self._db.get_jobs_page(cursor, limit)
+            if not jobs:
+                return
+            result["bytes_sent"] += self._push("jobs", jobs)
+            cursor = (jobs[-1]["submitted_at"], jobs[-1]["id"])
+            self._db.save_sync_cursor("jobs", json.dumps(list(cursor)))
+            self._batch_done(result, "jobs_pushed", len(jobs))
+            if len(jobs) < limit:
+                return
+
+    def _push_events(self, result: dict[str, Any]) -> None:
+        raw = self._db.get_sync_cursor("events")
+        if raw:
+            cursor = int(raw)
+        else:
+            legacy = self._legacy_cursor()
+            cursor = self._db.last_event_id_before(legacy) if legacy > 0 else 0
+
+        while not self._stopping():
+            limit = self._current_batch_size()
+            events = self._db.get_events_page(cursor, limit)
+            if not events:
+                return
+            result["bytes_sent"] += self._push("events", events)
+            cursor = events[-1]["id"]
+            self._db.save_sync_cursor("events", str(cursor))
+            self._batch_done(result, "events_pushed", len(events))
+            if len(events) < limit:
+                return
+
+    def _push_printers(self, result: dict[str, Any]) -> None:
+        printers = self._db.list_printers()
+        if not printers:
+            return
+        digest = _printers_hash(printers)
+        if digest == self._db.get_sync_cursor("printers"):
+            return
+        result["bytes_sent"] += self._push("printers", printers)
+        self._db.save_sync_cursor("printers", digest)
+        result["printers_pushed"] = True
+        result["batches"] += 1
+
+    def _current_batch_size(self) -> int:
+        with self._lock:
+            return self._batch_size
+
+    def _batch_done(self, result: dict[str, Any], key: str, rows: int) -> None:
+        result[key] += rows
+        result["batches"] += 1
+        with self._lock:
+            if key == "jobs_pushed":
+                self._jobs_synced += rows
+            else:
+                self._events_synced += rows
+            self._batch_size = min(max(1, self._config.batch_size), self._batch_size * 2)
+
+    def _record_throughput(self, result: dict[str, Any], elapsed: float) -> None:
+        if not result["batches"]:
+            return
+        elapsed = max(elapsed, 1e-6)
+        rows = result["jobs_pushed"] + result["events_pushed"]
+        with self._lock:
+            self._bytes_synced += result["bytes_sent"]
+            self._rows_per_second = round(rows / elapsed, 1)
+            self._bytes_per_second = round(result["bytes_sent"] / elapsed, 1)
+
+    def _push(self, entity_type: str, records: list[dict[str, Any]]) -> int:
+        """Push one batch of records; return the body size in bytes."""
         url = f"{self._config.cloud_url.rstrip('/')}/api/sync"
         payload = json.dumps(
             {
@@ -271,20 +500,26 @@ class CloudSyncManager:
                 "timestamp": time.time(),
             }
         ).encode()
+        body, encoding = _encode_body(payload, self._config.compression)
 
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self._config.api_key}",
         }
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
 
-        # Add HMAC signature
-        sig = _compute_signature(self._config.api_key, payload)
+        # Add HMAC signature over the bytes on the wire
+        sig = _compute_signature(self._config.api_key, body)
         headers["X-Kiln-Signature"] = f"sha256={sig}"
 
         response = self._session.post(
             url,
-            data=payload,
+            data=body,
             headers=headers,
             timeout=30,
         )
+        if response.status_code == 429:
+            raise _RateLimited(_parse_retry_after(response.headers.get("Retry-After")))
         response.raise_for_status()
+        return len(body)
@@ -3,16 +3,20 @@
 Parses G-code to extract filament extrusion totals, then calculates
 material weight, filament cost, electricity cost, and total cost based
 on configurable material profiles and electricity rates.
+
+Files are analysed with the streaming pass in :mod:`kiln.gcode_stats`,
+so estimating a very large file never loads it into memory.
 """
 
 from __future__ import annotations
 
 import math
 import os
-import re
 from dataclasses import asdict, dataclass, field
 from typing import Any
 
+from kiln.gcode_stats import GcodeStats, _time_from_comment, analyze_gcode_lines, get_gcode_stats
+
 # ---------------------------------------------------------------------------
 # Material profiles
 # ---------------------------------------------------------------------------
@@ -116,55 +120,15 @@ class CostEstimate:
 # G-code parsing helpers
 # ---------------------------------------------------------------------------
 
-_E_PATTERN = re.compile(r"E([-+]?\d+\.?\d*)", re.IGNORECASE)
-_TIME_PATTERNS = [
-    # PrusaSlicer: ; estimated printing time (normal mode) = 1h 23m 45s
-    re.compile(
-        r";\s*estimated printing time.*?=\s*"
-        r"(?:(\d+)h\s*)?(?:(\d+)m\s*)?(?:(\d+)s)?",
-        re.IGNORECASE,
-    ),
-    # Cura: ;TIME:5025
-    re.compile(r";\s*TIME:\s*(\d+)", re.IGNORECASE),
-    # OrcaSlicer: ; total estimated time: 1h 23m 45s
-    re.compile(
-        r";\s*total estimated time.*?:\s*"
-        r"(?:(\d+)h\s*)?(?:(\d+)m\s*)?(?:(\d+)s)?",
-        re.IGNORECASE,
-    ),
-]
-
-
-def _extract_e_value(line: str) -> float | None:
-    """Extract the E parameter value from a G-code line."""
-    m = _E_PATTERN.search(line)
-    if m:
-        return float(m.group(1))
-    return None
-
 
 def _parse_time_from_comments(lines: list[str]) -> int | None:
     """Try to extract estimated print time from slicer comments."""
     for line in lines:
         if not line.startswith(";"):
             continue
-
-        # Try Cura-style TIME:seconds first (simplest)
-        for pattern in _TIME_PATTERNS:
-            m = pattern.search(line)
-            if m:
-                groups = m.groups()
-                # Cura pattern has 1 group (seconds total)
-                if len(groups) == 1 and groups[0] is not None:
-                    return int(groups[0])
-                # H/M/S patterns have 3 groups
-                if len(groups) == 3:
-                    h = int(groups[0]) if groups[0] else 0
-                    mins = int(groups[1]) if groups[1] else 0
-                    s = int(groups[2]) if groups[2] else 0
-                    total = h * 3600 + mins * 60 + s
-                    if total > 0:
-                        return total
+        seconds = _time_from_comment(line)
+        if seconds is not None:
+            return seconds
     return None
 
 
@@ -200,15 +164,12 @@ class CostEstimator:
         electricity_rate: float = 0.12,
         printer_wattage: float = 200.0,
     ) -> CostEstimate:
-        """Estimate cost from a G-code file on disk."""
+        """Estimate cost from a G-code file on disk (streamed, not loaded)."""
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"G-code file not found: {file_path}")
 
-        with open(file_path, errors="replace") as f:
-            lines = f.readlines()
-
-        return self.estimate_from_gcode(
-            lines=lines,
+        return self.estimate_from_stats(
+            get_gcode_stats(file_path),
             file_name=os.path.basename(file_path),
             material=material,
             electricity_rate=electricity_rate,
@@ -224,6 +185,27 @@ class CostEstimator:
         printer_wattage: float = 200.0,
     ) -> CostEstimate:
         """Estimate cost from a list of G-code lines."""
+        return self.estimate_from_stats(
+            analyze_gcode_lines(lines),
+            file_name=file_name,
+            material=material,
+            electricity_rate=electricity_rate,
+            printer_wattage=printer_wattage,
+        )
+
+    def estimate_from_stats(
+        self,
+        stats: GcodeStats,
+        file_name: str = "<unknown>",
+        material: str = "PLA",
+        electricity_rate: float = 0.12,
+        printer_wattage: float = 200.0,
+    ) -> CostEstimate:
+        """Estimate cost from precomputed :class:`~kiln.gcode_stats.GcodeStats`.
+
+        Electricity is only charged when the slicer embedded a time
+        estimate; the motion-model estimate is too optimistic for billing.
+        """
         warnings: list[str] = []
 
         profile = self.get_material(material)
@@ -231,9 +213,8 @@ class CostEstimator:
             warnings.append(f"Unknown material '{material}', using PLA defaults")
             profile = BUILTIN_MATERIALS["PLA"]
 
-        # Parse extrusion and time
-        total_e_mm = self._parse_extrusion(lines)
-        est_time = _parse_time_from_comments(lines)
+        total_e_mm = stats.extrusion_mm
+        est_time = stats.slicer_time_seconds
 
         if total_e_mm <= 0:
             warnings.append("No extrusion commands found in G-code")
@@ -283,64 +264,7 @@ class CostEstimator:
     def _parse_extrusion(self, lines: list[str]) -> float:
         """Parse total filament extrusion in mm from G-code lines.
 
-        Handles both absolute (default) and relative (M83) E-axis modes.
-        Filters out retractions (negative E in absolute mode detected by
-        comparing to previous E value).
+        Handles both absolute (default) and relative (M83) E-axis modes;
+        retractions are not counted.  See :mod:`kiln.gcode_stats`.
         """
-        total_e_mm = 0.0
-        last_e = 0.0
-        relative_mode = False
-
-        for raw_line in lines:
-            line = raw_line.strip()
-
-            # Skip empty lines and comments
-            if not line or line.startswith(";"):
-                continue
-
-            # Strip inline comments
-            if ";" in line:
-                line = line[: line.index(";")].strip()
-
-            upper = line.upper()
-
-            # Track E-axis mode
-            if upper.startswith("M82"):
-                relative_mode = False
-                last_e = 0.0
-                continue
-            if upper.startswith("M83"):
-                relative_mode = True
-                continue
-            # G92 E0 resets the E position
-            if upper.startswith("G92"):
-                e_val = _extract_e_value(line)
-                if e_val is not None:
-                    last_e = e_val
-                continue
-
-            # Only process G0/G1 moves
-            if not (
-                upper.startswith("G0 ")
-                or upper.startswith("G1 ")
-                or upper.startswith("G0\t")
-                or upper.startswith("G1\t")
-            ):
-                continue
-
-            e_val = _extract_e_value(line)
-            if e_val is None:
-                continue
-
-            if relative_mode:
-                # In relative mode, positive E = extrusion, negative = retraction
-                if e_val > 0:
-                    total_e_mm += e_val
-            else:
-                # Absolute mode: extrusion = current - last (when positive)
-                delta = e_val - last_e
-                if delta > 0:
-                    total_e_mm += delta
-                last_e = e_val
-
-        return total_e_mm
+        return analyze_gcode_lines(lines).extrusion_mm
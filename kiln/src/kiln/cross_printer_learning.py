@@ -6,6 +6,13 @@ network, detects statistical outliers, enforces rate limits, and computes
 :class:`MaterialInsight` and :class:`PrinterModelInsight` summaries that
 agents use to recommend optimal settings.
 
+Statistics are maintained incrementally: every stored outcome updates
+running (Welford) means/variances, success counters and temperature
+histograms for its material, printer model and printer/material pair, and
+eviction subtracts it again.  Outlier checks and insight queries therefore
+cost the same with ten outcomes or a million, which lets the engine be
+warmed from the database at startup with :meth:`~CrossPrinterLearningEngine.load_from_db`.
+
 Usage::
 
     from kiln.cross_printer_learning import get_learning_engine
@@ -18,12 +25,14 @@ Usage::
 from __future__ import annotations
 
 import collections
+import json
 import logging
 import math
 import os
 import re
 import threading
 import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -58,6 +67,11 @@ _OUTLIER_STD_DEVS = 3.0
 # Default max stored outcomes
 _DEFAULT_MAX_OUTCOMES = 10000
 
+# Relative tolerance below which a running variance is rounding noise.
+# Removing values from a Welford accumulator leaves residue of a few ulps
+# of mean**2 even when every remaining value is identical.
+_VARIANCE_REL_EPSILON = 1e-12
+
 
 # ---------------------------------------------------------------------------
 # Exceptions
@@ -285,6 +299,110 @@ def _std_dev(values: list[float]) -> float:
     return math.sqrt(variance)
 
 
+class _RunningStat:
+    """Welford running mean/variance that also supports removal."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        if self.count <= 1:
+            self.count = 0
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 = self._m2 - delta * (value - self.mean)
+        if self._m2 <= _VARIANCE_REL_EPSILON * self.count * self.mean * self.mean:
+            self._m2 = 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Population standard deviation (0.0 for fewer than two values)."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / self.count)
+
+
+def _counter_discard(counter: collections.Counter[Any], key: Any) -> None:
+    """Decrement *key* in *counter*, dropping it when it reaches zero."""
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class _OutcomeGroup:
+    """Running statistics over the non-outlier outcomes sharing a key.
+
+    Updated on every insert/evict so queries never rescan outcomes.
+    """
+
+    __slots__ = (
+        "count",
+        "successes",
+        "hotend",
+        "bed",
+        "success_hotend",
+        "success_bed",
+        "failures",
+        "materials",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.successes = 0
+        self.hotend = _RunningStat()
+        self.bed = _RunningStat()
+        # Histograms of temperatures used by successful prints.
+        self.success_hotend: collections.Counter[float] = collections.Counter()
+        self.success_bed: collections.Counter[float] = collections.Counter()
+        self.failures: collections.Counter[str] = collections.Counter()
+        # material -> [successes, total]
+        self.materials: dict[str, list[int]] = {}
+
+    def add(self, outcome: PrintOutcome) -> None:
+        self.count += 1
+        self.hotend.add(outcome.hotend_temp)
+        self.bed.add(outcome.bed_temp)
+        mat = self.materials.setdefault(outcome.material, [0, 0])
+        mat[1] += 1
+        if outcome.success:
+            self.successes += 1
+            mat[0] += 1
+            self.success_hotend[outcome.hotend_temp] += 1
+            self.success_bed[outcome.bed_temp] += 1
+        elif outcome.failure_mode:
+            self.failures[outcome.failure_mode] += 1
+
+    def remove(self, outcome: PrintOutcome) -> None:
+        self.count -= 1
+        self.hotend.remove(outcome.hotend_temp)
+        self.bed.remove(outcome.bed_temp)
+        mat = self.materials[outcome.material]
+        mat[1] -= 1
+        if outcome.success:
+            self.successes -= 1
+            mat[0] -= 1
+            _counter_discard(self.success_hotend, outcome.hotend_temp)
+            _counter_discard(self.success_bed, outcome.bed_temp)
+        elif outcome.failure_mode:
+            _counter_discard(self.failures, outcome.failure_mode)
+        if mat[1] <= 0:
+            del self.materials[outcome.material]
+
+
 # ---------------------------------------------------------------------------
 # Core engine
 # ---------------------------------------------------------------------------
@@ -317,9 +435,20 @@ class CrossPrinterLearningEngine:
         else:
             self._max_outcomes = _DEFAULT_MAX_OUTCOMES
 
-        self._outcomes: list[PrintOutcome] = []
+        self._outcomes: collections.deque[PrintOutcome] = collections.deque()
         self._lock = threading.Lock()
 
+        # Running statistics over non-outlier outcomes, keyed by material,
+        # printer model and (printer model, material).
+        self._by_material: dict[str, _OutcomeGroup] = {}
+        self._by_printer: dict[str, _OutcomeGroup] = {}
+        self._by_pair: dict[tuple[str, str], _OutcomeGroup] = {}
+
+        # Network-wide counters over every stored outcome (outliers included).
+        self._total_successes = 0
+        self._printer_counts: collections.Counter[str] = collections.Counter()
+        self._material_counts: collections.Counter[str] = collections.Counter()
+
         # Rate limiting: printer_model -> list of timestamps
         self._rate_buckets: dict[str, list[float]] = {}
 
@@ -337,16 +466,107 @@ class CrossPrinterLearningEngine:
 
         with self._lock:
             self._check_rate_limit(outcome.printer_model)
-            self._mark_outlier_if_needed(outcome)
+            self._store(outcome)
+            self._record_rate_event(outcome.printer_model)
 
-            self._outcomes.append(outcome)
+    def load_outcomes(self, outcomes: Iterable[PrintOutcome]) -> int:
+        """Bulk-load historical outcomes, oldest first.
 
-            # Evict oldest if over capacity
-            if len(self._outcomes) > self._max_outcomes:
-                overage = len(self._outcomes) - self._max_outcomes
-                self._outcomes = self._outcomes[overage:]
+        Outcomes are validated and checked for outliers exactly as in
+        :meth:`record_outcome`, but bypass the rate limit.  Invalid
+        outcomes are skipped.
 
-            self._record_rate_event(outcome.printer_model)
+        :returns: Number of outcomes stored.
+        """
+        loaded = 0
+        with self._lock:
+            for outcome in outcomes:
+                try:
+                    _validate_outcome(outcome)
+                except LearningValidationError as exc:
+                    logger.debug("Skipping invalid outcome during load: %s", exc)
+                    continue
+                self._store(outcome)
+                loaded += 1
+        return loaded
+
+    def load_from_db(self, db: Any, *, limit: int | None = None, batch_size: int = 5000) -> int:
+        """Warm the engine from the ``print_dna`` table of a :class:`~kiln.persistence.KilnDB`.
+
+        Reads the newest *limit* records (default: the engine's capacity)
+        in batches, oldest first.  Records without a hotend and bed
+        temperature in their settings, or that fail validation, are skipped.
+
+        :returns: Number of outcomes stored.
+        """
+        limit = self._max_outcomes if limit is None else limit
+        cursor = db._conn.execute(
+            """
+            SELECT * FROM (
+                SELECT id, printer_model, material, settings, outcome,
+                       failure_mode, print_time_seconds, file_hash, timestamp
+                FROM print_dna
+                WHERE printer_model IS NOT NULL AND material IS NOT NULL
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            ) ORDER BY timestamp, id
+            """,
+            (limit,),
+        )
+
+        def _rows() -> Iterator[PrintOutcome]:
+            while batch := cursor.fetchmany(batch_size):
+                for row in batch:
+                    outcome = _outcome_from_dna_row(row)
+                    if outcome is not None:
+                        yield outcome
+
+        return self.load_outcomes(_rows())
+
+    def _store(self, outcome: PrintOutcome) -> None:
+        """Flag, index and append *outcome*, evicting the oldest if full.
+
+        Must be called with *_lock* held.
+        """
+        self._mark_outlier_if_needed(outcome)
+        self._outcomes.append(outcome)
+        self._index(outcome, add=True)
+
+        # Evict oldest if over capacity
+        while len(self._outcomes) > self._max_outcomes:
+            self._index(self._outcomes.popleft(), add=False)
+
+    def _index(self, outcome: PrintOutcome, *, add: bool) -> None:
+        """Add *outcome* to (or remove it from) the running statistics.
+
+        Must be called with *_lock* held.
+        """
+        if add:
+            self._total_successes += outcome.success
+            self._printer_counts[outcome.printer_model] += 1
+            self._material_counts[outcome.material] += 1
+        else:
+            self._total_successes -= outcome.success
+            _counter_discard(self._printer_counts, outcome.printer_model)
+            _counter_discard(self._material_counts, outcome.material)
+
+        if outcome.is_outlier:
+            return
+        for groups, key in (
+            (self._by_material, outcome.material),
+            (self._by_printer, outcome.printer_model),
+            (self._by_pair, (outcome.printer_model, outcome.material)),
+        ):
+            if add:
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _OutcomeGroup()
+                group.add(outcome)
+            else:
+                group = groups[key]
+                group.remove(outcome)
+                if group.count <= 0:
+                    del groups[key]
 
     def _check_rate_limit(self, printer_model: str) -> None:
         """Enforce rate limiting.  Must be called with *_lock* held."""
@@ -376,19 +596,16 @@ class CrossPrinterLearningEngine:
 
         Must be called with *_lock* held.
         """
-        material_outcomes = [o for o in self._outcomes if o.material == outcome.material and not o.is_outlier]
+        group = self._by_material.get(outcome.material)
 
-        if len(material_outcomes) < 5:
+        if group is None or group.count < 5:
             # Not enough data to compute meaningful statistics
             return
 
-        hotend_temps = [o.hotend_temp for o in material_outcomes]
-        bed_temps = [o.bed_temp for o in material_outcomes]
-
-        hotend_mean = _mean(hotend_temps)
-        hotend_sd = _std_dev(hotend_temps)
-        bed_mean = _mean(bed_temps)
-        bed_sd = _std_dev(bed_temps)
+        hotend_mean = group.hotend.mean
+        hotend_sd = group.hotend.std_dev
+        bed_mean = group.bed.mean
+        bed_sd = group.bed.std_dev
 
         is_outlier = False
         # When stddev is 0, all existing values are identical.  Use a
@@ -422,13 +639,6 @@ class CrossPrinterLearningEngine:
 
     # -- Querying ----------------------------------------------------------
 
-    def _non_outlier_outcomes(self) -> list[PrintOutcome]:
-        """Return all stored outcomes that are not outliers.
-
-        Must be called with *_lock* held.
-        """
-        return [o for o in self._outcomes if not o.is_outlier]
-
     def get_material_insights(self, material: str) -> MaterialInsight:
         """Aggregate insights for *material* across all printers.
 
@@ -440,49 +650,39 @@ class CrossPrinterLearningEngine:
             raise LearningValidationError("material must be a non-empty string")
 
         with self._lock:
-            relevant = [o for o in self._non_outlier_outcomes() if o.material == material]
-
-        if not relevant:
-            return MaterialInsight(
-                material=material,
-                recommended_hotend_temp_range=(0.0, 0.0),
-                recommended_bed_temp_range=(0.0, 0.0),
-                success_rate=0.0,
-                sample_count=0,
-                common_failures=[],
-            )
-
-        hotend_temps = [o.hotend_temp for o in relevant if o.success]
-        bed_temps = [o.bed_temp for o in relevant if o.success]
-
-        if hotend_temps:
-            hotend_range = (min(hotend_temps), max(hotend_temps))
-        else:
-            hotend_range = (0.0, 0.0)
-
-        if bed_temps:
-            bed_range = (min(bed_temps), max(bed_temps))
-        else:
-            bed_range = (0.0, 0.0)
+            group = self._by_material.get(material)
+            if group is None:
+                return MaterialInsight(
+                    material=material,
+                    recommended_hotend_temp_range=(0.0, 0.0),
+                    recommended_bed_temp_range=(0.0, 0.0),
+                    success_rate=0.0,
+                    sample_count=0,
+                    common_failures=[],
+                )
 
-        successes = sum(1 for o in relevant if o.success)
-        success_rate = successes / len(relevant)
+            if group.success_hotend:
+                hotend_range = (min(group.success_hotend), max(group.success_hotend))
+            else:
+                hotend_range = (0.0, 0.0)
 
-        failure_counter: collections.Counter[str] = collections.Counter()
-        for o in relevant:
-            if not o.success and o.failure_mode:
-                failure_counter[o.failure_mode] += 1
+            if group.success_bed:
+                bed_range = (min(group.success_bed), max(group.success_bed))
+            else:
+                bed_range = (0.0, 0.0)
 
-        common_failures = [{"failure_mode": mode, "count": count} for mode, count in failure_counter.most_common()]
+            common_failures = [
+                {"failure_mode": mode, "count": count} for mode, count in group.failures.most_common()
+            ]
 
-        return MaterialInsight(
-            material=material,
-            recommended_hotend_temp_range=hotend_range,
-            recommended_bed_temp_range=bed_range,
-            success_rate=round(success_rate, 4),
-            sample_count=len(relevant),
-            common_failures=common_failures,
-        )
+            return MaterialInsight(
+                material=material,
+                recommended_hotend_temp_range=hotend_range,
+                recommended_bed_temp_range=bed_range,
+                success_rate=round(group.successes / group.count, 4),
+                sample_count=group.count,
+                common_failures=common_failures,
+            )
 
     def get_printer_insights(self, printer_model: str) -> PrinterModelInsight:
         """Aggregate insights for *printer_model*.
@@ -495,55 +695,37 @@ class CrossPrinterLearningEngine:
             raise LearningValidationError("printer_model must be a non-empty string")
 
         with self._lock:
-            relevant = [o for o in self._non_outlier_outcomes() if o.printer_model == printer_model]
-
-        if not relevant:
-            return PrinterModelInsight(
-                printer_model=printer_model,
-                best_materials=[],
-                worst_materials=[],
-                common_failures=[],
-                avg_success_rate=0.0,
-                sample_count=0,
-            )
+            group = self._by_printer.get(printer_model)
+            if group is None:
+                return PrinterModelInsight(
+                    printer_model=printer_model,
+                    best_materials=[],
+                    worst_materials=[],
+                    common_failures=[],
+                    avg_success_rate=0.0,
+                    sample_count=0,
+                )
 
-        # Per-material success rates
-        material_stats: dict[str, dict[str, int]] = {}
-        for o in relevant:
-            if o.material not in material_stats:
-                material_stats[o.material] = {"success": 0, "total": 0}
-            material_stats[o.material]["total"] += 1
-            if o.success:
-                material_stats[o.material]["success"] += 1
-
-        material_rates = {
-            mat: stats["success"] / stats["total"] for mat, stats in material_stats.items() if stats["total"] > 0
-        }
+            # Per-material success rates
+            material_rates = {mat: success / total for mat, (success, total) in group.materials.items() if total > 0}
+            common_failures = [
+                {"failure_mode": mode, "count": count} for mode, count in group.failures.most_common()
+            ]
+            successes = group.successes
+            sample_count = group.count
 
         sorted_materials = sorted(material_rates.items(), key=lambda x: x[1], reverse=True)
 
         best_materials = [mat for mat, _ in sorted_materials[:3]]
         worst_materials = [mat for mat, _ in sorted_materials[-3:] if material_rates[mat] < 1.0]
 
-        # Overall success rate
-        successes = sum(1 for o in relevant if o.success)
-        avg_success_rate = successes / len(relevant)
-
-        # Common failures
-        failure_counter: collections.Counter[str] = collections.Counter()
-        for o in relevant:
-            if not o.success and o.failure_mode:
-                failure_counter[o.failure_mode] += 1
-
-        common_failures = [{"failure_mode": mode, "count": count} for mode, count in failure_counter.most_common()]
-
         return PrinterModelInsight(
             printer_model=printer_model,
             best_materials=best_materials,
             worst_materials=worst_materials,
             common_failures=common_failures,
-            avg_success_rate=round(avg_success_rate, 4),
-            sample_count=len(relevant),
+            avg_success_rate=round(successes / sample_count, 4),
+            sample_count=sample_count,
         )
 
     def get_recommendation(
@@ -569,56 +751,43 @@ class CrossPrinterLearningEngine:
 
         with self._lock:
             # Prefer outcomes for this specific printer+material combo
-            specific = [
-                o
-                for o in self._non_outlier_outcomes()
-                if o.printer_model == printer_model and o.material == material and o.success
-            ]
-
+            specific = self._by_pair.get((printer_model, material))
             # Fall back to all printers for this material
-            all_material = [o for o in self._non_outlier_outcomes() if o.material == material and o.success]
+            all_material = self._by_material.get(material)
+
+            # Use specific data if we have enough, otherwise fall back
+            if specific is not None and specific.successes >= 3:
+                source = specific
+                confidence = "high" if specific.successes >= 10 else "medium"
+            elif all_material is not None and all_material.successes:
+                source = all_material
+                confidence = "low"
+            else:
+                return {
+                    "recommended_hotend_temp": None,
+                    "recommended_bed_temp": None,
+                    "confidence": "none",
+                    "sample_count": 0,
+                    "success_rate": 0.0,
+                }
+
+            # Use median for robustness
+            recommended_hotend = _histogram_median(source.success_hotend)
+            recommended_bed = _histogram_median(source.success_bed)
 
             # For success rate, include failures too (non-outlier)
-            all_for_rate = [
-                o for o in self._non_outlier_outcomes() if o.printer_model == printer_model and o.material == material
-            ]
+            success_rate = 0.0
+            if specific is not None:
+                success_rate = round(specific.successes / specific.count, 4)
 
-        # Use specific data if we have enough, otherwise fall back
-        if len(specific) >= 3:
-            source = specific
-            confidence = "high" if len(specific) >= 10 else "medium"
-        elif all_material:
-            source = all_material
-            confidence = "low"
-        else:
             return {
-                "recommended_hotend_temp": None,
-                "recommended_bed_temp": None,
-                "confidence": "none",
-                "sample_count": 0,
-                "success_rate": 0.0,
+                "recommended_hotend_temp": round(recommended_hotend, 1),
+                "recommended_bed_temp": round(recommended_bed, 1),
+                "confidence": confidence,
+                "sample_count": source.successes,
+                "success_rate": success_rate,
             }
 
-        hotend_temps = [o.hotend_temp for o in source]
-        bed_temps = [o.bed_temp for o in source]
-
-        # Use median for robustness
-        recommended_hotend = _median(hotend_temps)
-        recommended_bed = _median(bed_temps)
-
-        success_rate = 0.0
-        if all_for_rate:
-            successes = sum(1 for o in all_for_rate if o.success)
-            success_rate = round(successes / len(all_for_rate), 4)
-
-        return {
-            "recommended_hotend_temp": round(recommended_hotend, 1),
-            "recommended_bed_temp": round(recommended_bed, 1),
-            "confidence": confidence,
-            "sample_count": len(source),
-            "success_rate": success_rate,
-        }
-
     def get_network_stats(self) -> dict[str, Any]:
         """Return aggregate statistics for the entire printer network.
 
@@ -635,15 +804,11 @@ class CrossPrinterLearningEngine:
                     "overall_success_rate": 0.0,
                 }
 
-            printers = {o.printer_model for o in self._outcomes}
-            materials = {o.material for o in self._outcomes}
-            successes = sum(1 for o in self._outcomes if o.success)
-
             return {
                 "total_outcomes": total,
-                "unique_printers": len(printers),
-                "unique_materials": len(materials),
-                "overall_success_rate": round(successes / total, 4),
+                "unique_printers": len(self._printer_counts),
+                "unique_materials": len(self._material_counts),
+                "overall_success_rate": round(self._total_successes / total, 4),
             }
 
 
@@ -664,6 +829,59 @@ def _median(values: list[float]) -> float:
     return sorted_vals[mid]
 
 
+def _histogram_median(histogram: collections.Counter[float]) -> float:
+    """Return the median of the values counted in *histogram*.
+
+    Equivalent to ``_median`` over the expanded values but linear in the
+    number of distinct values rather than the number of samples.
+    """
+    n = sum(histogram.values())
+    if n == 0:
+        return 0.0
+    lo_rank, hi_rank = (n - 1) // 2, n // 2
+    lo = hi = None
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if lo is None and seen > lo_rank:
+            lo = value
+        if seen > hi_rank:
+            hi = value
+            break
+    return (lo + hi) / 2.0  # type: ignore[operator]
+
+
+_DNA_HOTEND_KEYS = ("hotend_temp", "nozzle_temp", "tool_temp", "temperature")
+_DNA_BED_KEYS = ("bed_temp", "bed_temperature")
+
+
+def _outcome_from_dna_row(row: Any) -> PrintOutcome | None:
+    """Build a :class:`PrintOutcome` from a ``print_dna`` row, or ``None``."""
+    try:
+        settings = json.loads(row["settings"] or "{}")
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(settings, dict):
+        return None
+    hotend = next((settings[k] for k in _DNA_HOTEND_KEYS if isinstance(settings.get(k), (int, float))), None)
+    bed = next((settings[k] for k in _DNA_BED_KEYS if isinstance(settings.get(k), (int, float))), None)
+    if hotend is None or bed is None:
+        return None
+    success = row["outcome"] == "success"
+    return PrintOutcome(
+        printer_model=row["printer_model"],
+        material=row["material"],
+        hotend_temp=float(hotend),
+        bed_temp=float(bed),
+        success=success,
+        failure_mode=None if success else row["failure_mode"],
+        print_time_s=float(row["print_time_seconds"] or 0),
+        layer_count=int(settings.get("layer_count") or 0),
+        file_hash=row["file_hash"] or "",
+        recorded_at=row["timestamp"],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Module-level singleton (lazy, thread-safe)
 # ---------------------------------------------------------------------------
@@ -18,19 +18,28 @@ Public API:
     list_printer_profiles     — all known printer capability profiles
     get_design_pattern        — constraints for a design pattern
     list_design_patterns      — all patterns in a domain
+    find_patterns_for_material — patterns rated compatible with a material
     get_design_constraints    — decompose functional requirements into rules
     match_requirements        — find which requirement profiles match text
 """
 
 from __future__ import annotations
 
-import json
 import logging
 import re
+import threading
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
+from kiln.design_knowledge_snapshot import (
+    KnowledgeSnapshot,
+    build_material_pattern_index,
+    build_requirement_material_index,
+    load_section,
+    open_snapshot,
+)
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -276,162 +285,127 @@ class PrintDiagnostic:
 
 
 class _DesignKnowledgeBase:
-    """Loads and indexes the design knowledge JSON files."""
+    """Loads and indexes the design knowledge base.
+
+    Sections are loaded lazily and independently.  When a compiled
+    snapshot (see :mod:`kiln.design_knowledge_snapshot`) matches the
+    JSON sources it is used instead: point lookups then decode a single
+    row and cross-indexes come precomputed.  Otherwise each section is
+    parsed from its JSON file on first access.
+    """
 
-    def __init__(self, domain: str = "fdm") -> None:
+    def __init__(
+        self,
+        domain: str = "fdm",
+        *,
+        data_dir: Path | None = None,
+        snapshot_path: Path | None = None,
+        use_snapshot: bool = True,
+    ) -> None:
         self.domain = domain
-        self._materials: dict[str, dict[str, Any]] = {}
-        self._patterns: dict[str, dict[str, Any]] = {}
-        self._requirements: dict[str, dict[str, Any]] = {}
-        self._load_tables: dict[str, dict[str, Any]] = {}
-        self._environment: dict[str, dict[str, Any]] = {}
-        self._printers: dict[str, dict[str, Any]] = {}
-        self._troubleshooting: dict[str, dict[str, Any]] = {}
-        self._printer_compatibility: dict[str, dict[str, Any]] = {}
-        self._post_processing: dict[str, dict[str, Any]] = {}
-        self._multi_material: dict[str, Any] = {}
-        self._loaded = False
-
-    def _load(self) -> None:
-        if self._loaded:
-            return
-
-        materials_path = _DATA_DIR / "materials.json"
-        patterns_path = _DATA_DIR / "design_patterns.json"
-        requirements_path = _DATA_DIR / "functional_requirements.json"
-        load_tables_path = _DATA_DIR / "load_tables.json"
-        environment_path = _DATA_DIR / "environment_compatibility.json"
-        printers_path = _DATA_DIR / "printer_profiles.json"
-
-        if materials_path.exists():
-            raw = json.loads(materials_path.read_text(encoding="utf-8"))
-            self._materials = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        if patterns_path.exists():
-            raw = json.loads(patterns_path.read_text(encoding="utf-8"))
-            self._patterns = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        if requirements_path.exists():
-            raw = json.loads(requirements_path.read_text(encoding="utf-8"))
-            self._requirements = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        if load_tables_path.exists():
-            raw = json.loads(load_tables_path.read_text(encoding="utf-8"))
-            self._load_tables = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        if environment_path.exists():
-            raw = json.loads(environment_path.read_text(encoding="utf-8"))
-            self._environment = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        if printers_path.exists():
-            raw = json.loads(printers_path.read_text(encoding="utf-8"))
-            self._printers = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        troubleshooting_path = _DATA_DIR / "material_troubleshooting.json"
-        if troubleshooting_path.exists():
-            raw = json.loads(troubleshooting_path.read_text(encoding="utf-8"))
-            self._troubleshooting = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        compatibility_path = _DATA_DIR / "printer_material_compatibility.json"
-        if compatibility_path.exists():
-            raw = json.loads(compatibility_path.read_text(encoding="utf-8"))
-            self._printer_compatibility = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        post_processing_path = _DATA_DIR / "post_processing.json"
-        if post_processing_path.exists():
-            raw = json.loads(post_processing_path.read_text(encoding="utf-8"))
-            self._post_processing = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        multi_material_path = _DATA_DIR / "multi_material_pairing.json"
-        if multi_material_path.exists():
-            raw = json.loads(multi_material_path.read_text(encoding="utf-8"))
-            self._multi_material = {
-                k: v for k, v in raw.items() if not k.startswith("_")
-            }
-
-        self._loaded = True
-        logger.info(
-            "Design knowledge loaded: %d materials, %d patterns, %d requirements, "
-            "%d load tables, %d environments, %d printers, %d troubleshooting, "
-            "%d printer-compat, %d post-processing",
-            len(self._materials),
-            len(self._patterns),
-            len(self._requirements),
-            len(self._load_tables),
-            len(self._environment),
-            len(self._printers),
-            len(self._troubleshooting),
-            len(self._printer_compatibility),
-            len(self._post_processing),
-        )
+        self._data_dir = data_dir if data_dir is not None else _DATA_DIR
+        self._snapshot_path = snapshot_path
+        self._use_snapshot = use_snapshot
+        self._snapshot: KnowledgeSnapshot | None = None
+        self._snapshot_checked = False
+        self._sections: dict[str, dict[str, Any]] = {}
+        self._material_patterns: dict[str, list[tuple[str, str]]] | None = None
+        self._requirement_materials: dict[str, dict[str, list[str]]] | None = None
+        self._lock = threading.Lock()
+
+    def _get_snapshot(self) -> KnowledgeSnapshot | None:
+        if not self._snapshot_checked:
+            with self._lock:
+                if not self._snapshot_checked:
+                    if self._use_snapshot:
+                        self._snapshot = open_snapshot(self._snapshot_path, data_dir=self._data_dir)
+                        if self._snapshot is not None:
+                            logger.info("Design knowledge served from snapshot %s", self._snapshot.path)
+                    self._snapshot_checked = True
+        return self._snapshot
+
+    @property
+    def source(self) -> str:
+        """``"snapshot"`` or ``"json"`` — where sections are read from."""
+        return "snapshot" if self._get_snapshot() is not None else "json"
+
+    def _section(self, name: str) -> dict[str, Any]:
+        data = self._sections.get(name)
+        if data is not None:
+            return data
+        snapshot = self._get_snapshot()
+        data = snapshot.section(name) if snapshot is not None else load_section(self._data_dir, name)
+        logger.debug("Design knowledge section %r loaded: %d entries", name, len(data))
+        self._sections[name] = data
+        return data
+
+    def lookup(self, section: str, key: str) -> Any | None:
+        """Return one entry without decoding the whole section if possible."""
+        data = self._sections.get(section)
+        if data is not None:
+            return data.get(key)
+        snapshot = self._get_snapshot()
+        if snapshot is not None:
+            return snapshot.get(section, key)
+        return self._section(section).get(key)
+
+    def patterns_for_material(self, material_id: str) -> list[tuple[str, str]]:
+        """Return ``[(pattern_id, rating), ...]`` for a material, best first."""
+        snapshot = self._get_snapshot()
+        if snapshot is not None:
+            return snapshot.patterns_for_material(material_id)
+        if self._material_patterns is None:
+            self._material_patterns = build_material_pattern_index(self.patterns)
+        return list(self._material_patterns.get(material_id.lower(), []))
+
+    def materials_for_requirement(self, requirement_id: str) -> dict[str, list[str]]:
+        """Return ``{"require"|"prefer"|"exclude": [material, ...]}`` for a requirement."""
+        snapshot = self._get_snapshot()
+        if snapshot is not None:
+            return snapshot.materials_for_requirement(requirement_id)
+        if self._requirement_materials is None:
+            self._requirement_materials = build_requirement_material_index(self.requirements)
+        return {k: list(v) for k, v in self._requirement_materials.get(requirement_id, {}).items()}
 
     @property
     def materials(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._materials
+        return self._section("materials")
 
     @property
     def patterns(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._patterns
+        return self._section("patterns")
 
     @property
     def requirements(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._requirements
+        return self._section("requirements")
 
     @property
     def load_tables(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._load_tables
+        return self._section("load_tables")
 
     @property
     def environment(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._environment
+        return self._section("environment")
 
     @property
     def printers(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._printers
+        return self._section("printers")
 
     @property
     def troubleshooting(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._troubleshooting
+        return self._section("troubleshooting")
 
     @property
     def printer_compatibility(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._printer_compatibility
+        return self._section("printer_compatibility")
 
     @property
     def post_processing(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._post_processing
+        return self._section("post_processing")
 
     @property
     def multi_material(self) -> dict[str, Any]:
-        self._load()
-        return self._multi_material
+        return self._section("multi_material")
 
 
 # Module-level lazy singleton
@@ -456,7 +430,7 @@ def get_material_profile(material_id: str) -> MaterialProfile | None:
     :param material_id: Material key (e.g. ``"petg"``, ``"nylon"``).
     """
     kb = _get_kb()
-    data = kb.materials.get(material_id.lower())
+    data = kb.lookup("materials", material_id.lower())
     if data is None:
         return None
 
@@ -529,13 +503,10 @@ def recommend_material_for_design(
     excluded: set[str] = set()
 
     for cs in matched:
-        rules = cs.constraint_rules
-        if "material_prefer" in rules:
-            preferred.update(rules["material_prefer"])
-        if "material_require" in rules:
-            required.update(rules["material_require"])
-        if "material_exclude" in rules:
-            excluded.update(rules["material_exclude"])
+        relations = kb.materials_for_requirement(cs.requirement_id)
+        preferred.update(relations.get("prefer", []))
+        required.update(relations.get("require", []))
+        excluded.update(relations.get("exclude", []))
 
     # Score each material
     scores: list[tuple[float, str, list[str], list[str]]] = []
@@ -663,7 +634,7 @@ def estimate_load_capacity(
     """Estimate max safe load for a given cantilever geometry."""
     kb = _get_kb()
     material_key = material_id.lower()
-    material_data = kb.load_tables.get(material_key)
+    material_data = kb.lookup("load_tables", material_key)
     if material_data is None:
         return None
 
@@ -753,7 +724,7 @@ def check_environment_compatibility(
     """Check if a material survives in a described environment."""
     kb = _get_kb()
     material_key = material_id.lower()
-    material_data = kb.environment.get(material_key)
+    material_data = kb.lookup("environment", material_key)
     if material_data is None:
         return None
 
@@ -935,7 +906,7 @@ def get_printer_design_profile(printer_id: str) -> PrinterDesignProfile | None:
     """Get design capabilities for a specific printer."""
     kb = _get_kb()
     printer_key = printer_id.lower()
-    data = kb.printers.get(printer_key)
+    data = kb.lookup("printers", printer_key)
     if data is None:
         return None
 
@@ -992,7 +963,7 @@ def get_design_pattern(pattern_id: str) -> DesignPattern | None:
     :param pattern_id: Pattern key (e.g. ``"snap_fit_cantilever"``).
     """
     kb = _get_kb()
-    data = kb.patterns.get(pattern_id)
+    data = kb.lookup("patterns", pattern_id)
     if data is None:
         return None
 
@@ -1049,6 +1020,31 @@ def find_patterns_for_use_case(use_case: str) -> list[DesignPattern]:
     return results
 
 
+def find_patterns_for_material(
+    material_id: str,
+    *,
+    include_poor: bool = False,
+) -> list[DesignPattern]:
+    """Find design patterns rated compatible with a material.
+
+    Patterns rated ``"excellent"`` come first, then ``"good"``.  Patterns
+    rated ``"poor"`` are only included when *include_poor* is set;
+    ``"avoid"`` ratings are never returned.
+
+    :param material_id: Material key (e.g. ``"petg"``).
+    :param include_poor: Also return patterns rated ``"poor"``.
+    """
+    kb = _get_kb()
+    allowed = {"excellent", "good", "poor"} if include_poor else {"excellent", "good"}
+    results = []
+    for pid, rating in kb.patterns_for_material(material_id):
+        if rating in allowed:
+            pattern = get_design_pattern(pid)
+            if pattern:
+                results.append(pattern)
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Public API — Functional Requirements
 # ---------------------------------------------------------------------------
@@ -1247,7 +1243,7 @@ def troubleshoot_print_issue(
     """
     kb = _get_kb()
     material_key = material_id.lower()
-    data = kb.troubleshooting.get(material_key)
+    data = kb.lookup("troubleshooting", material_key)
     if data is None:
         return None
 
@@ -1307,7 +1303,7 @@ def check_printer_material_compatibility(
     printer_key = printer_id.lower()
 
     # Try exact match, then prefix match, then 'default' fallback
-    compat_data = kb.printer_compatibility.get(printer_key)
+    compat_data = kb.lookup("printer_compatibility", printer_key)
     if compat_data is None:
         for key in kb.printer_compatibility:
             if key.startswith(printer_key) or printer_key.startswith(key):
@@ -1315,7 +1311,7 @@ def check_printer_material_compatibility(
                 printer_key = key
                 break
     if compat_data is None:
-        compat_data = kb.printer_compatibility.get("default")
+        compat_data = kb.lookup("printer_compatibility", "default")
         if compat_data is None:
             return None
         printer_key = "default"
@@ -1357,7 +1353,7 @@ def get_post_processing(material_id: str) -> PostProcessingGuide | None:
     """
     kb = _get_kb()
     material_key = material_id.lower()
-    data = kb.post_processing.get(material_key)
+    data = kb.lookup("post_processing", material_key)
     if data is None:
         return None
 
@@ -1772,54 +1768,28 @@ class ConstructionDesignBrief:
 
 
 class _ConstructionKnowledgeBase:
-    """Loads construction-domain design knowledge."""
-
-    def __init__(self) -> None:
-        self._materials: dict[str, dict[str, Any]] = {}
-        self._patterns: dict[str, dict[str, Any]] = {}
-        self._requirements: dict[str, dict[str, Any]] = {}
-        self._loaded = False
-
-    def _load(self) -> None:
-        if self._loaded:
-            return
-
-        for name, target in (
-            ("construction_materials.json", "_materials"),
-            ("construction_patterns.json", "_patterns"),
-            ("construction_requirements.json", "_requirements"),
-        ):
-            path = _DATA_DIR / name
-            if path.exists():
-                raw = json.loads(path.read_text(encoding="utf-8"))
-                setattr(
-                    self,
-                    target,
-                    {k: v for k, v in raw.items() if not k.startswith("_")},
-                )
+    """Loads construction-domain design knowledge.
 
-        self._loaded = True
-        logger.info(
-            "Construction knowledge loaded: %d materials, %d patterns, %d requirements",
-            len(self._materials),
-            len(self._patterns),
-            len(self._requirements),
-        )
+    Shares the FDM knowledge base's snapshot/JSON section loader.
+    """
+
+    def __init__(self, base: _DesignKnowledgeBase | None = None) -> None:
+        self._base = base if base is not None else _get_kb()
+
+    def lookup(self, section: str, key: str) -> Any | None:
+        return self._base.lookup(f"construction_{section}", key)
 
     @property
     def materials(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._materials
+        return self._base._section("construction_materials")
 
     @property
     def patterns(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._patterns
+        return self._base._section("construction_patterns")
 
     @property
     def requirements(self) -> dict[str, dict[str, Any]]:
-        self._load()
-        return self._requirements
+        return self._base._section("construction_requirements")
 
 
 _construction_kb: _ConstructionKnowledgeBase | None = None
@@ -1844,7 +1814,7 @@ def get_construction_material(material_id: str) -> ConstructionMaterialProfile |
         ``"icon_carbonx"``).
     """
     kb = _get_construction_kb()
-    data = kb.materials.get(material_id.lower())
+    data = kb.lookup("materials", material_id.lower())
     if data is None:
         return None
 
@@ -1892,7 +1862,7 @@ def get_construction_pattern(pattern_id: str) -> ConstructionPattern | None:
     :param pattern_id: Pattern key (e.g. ``"load_bearing_wall"``).
     """
     kb = _get_construction_kb()
-    data = kb.patterns.get(pattern_id)
+    data = kb.lookup("patterns", pattern_id)
     if data is None:
         return None
 
@@ -1935,7 +1905,7 @@ def get_construction_requirement(
         ``"single_family_residential"``, ``"military_defense"``).
     """
     kb = _get_construction_kb()
-    data = kb.requirements.get(requirement_id)
+    data = kb.lookup("requirements", requirement_id)
     if data is None:
         return None
 
@@ -2106,5 +2076,7 @@ def _find_construction_patterns_from_text(
 def _reset_knowledge_base() -> None:
     """Reset the singleton — for testing only."""
     global _kb, _construction_kb
+    if _kb is not None and _kb._snapshot is not None:
+        _kb._snapshot.close()
     _kb = None
     _construction_kb = None
@@ -0,0 +1,450 @@
+"""Compiled, pre-indexed snapshot of the design knowledge base.
+
+:mod:`kiln.design_intelligence` reads a dozen JSON files from
+``data/design_knowledge/``.  Parsing all of them on every process start
+(and after every singleton reset) is wasted work for point lookups like
+``get_material_profile("petg")``.  This module compiles the JSON files
+into a single read-only SQLite file that:
+
+- stores every entry as its own row, keyed by ``(section, key)``, so a
+  lookup touches one B-tree page instead of parsing a whole file;
+- carries precomputed cross-indexes (material → design patterns by
+  rating, requirement → preferred/required/excluded materials);
+- is opened read-only with ``mmap`` enabled, so every Kiln process on a
+  host shares the same OS page-cache pages;
+- records a format version and a digest of the source JSON so stale
+  snapshots are ignored and the JSON files are used instead.
+
+Build step::
+
+    python -m kiln.design_knowledge_snapshot            # default location
+    python -m kiln.design_knowledge_snapshot -o kb.sqlite
+
+The snapshot path defaults to ``~/.kiln/cache/design_knowledge.sqlite``
+and can be overridden with ``KILN_DESIGN_KB_SNAPSHOT``.  Set that
+variable to ``off`` to always read the JSON files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_DEFAULT_DATA_DIR = Path(__file__).parent / "data" / "design_knowledge"
+_DEFAULT_SNAPSHOT_PATH = Path.home() / ".kiln" / "cache" / "design_knowledge.sqlite"
+_ENV_VAR = "KILN_DESIGN_KB_SNAPSHOT"
+_MMAP_SIZE = 16 * 1024 * 1024
+
+# Knowledge-base section name -> source file in the data directory.
+SECTION_FILES: dict[str, str] = {
+    "materials": "materials.json",
+    "patterns": "design_patterns.json",
+    "requirements": "functional_requirements.json",
+    "load_tables": "load_tables.json",
+    "environment": "environment_compatibility.json",
+    "printers": "printer_profiles.json",
+    "troubleshooting": "material_troubleshooting.json",
+    "printer_compatibility": "printer_material_compatibility.json",
+    "post_processing": "post_processing.json",
+    "multi_material": "multi_material_pairing.json",
+    "construction_materials": "construction_materials.json",
+    "construction_patterns": "construction_patterns.json",
+    "construction_requirements": "construction_requirements.json",
+}
+
+# Ordering used for the material → pattern cross-index.
+_PATTERN_RATING_ORDER = ("excellent", "good", "poor", "avoid")
+
+# constraint_rules key -> relation name in the requirement → material index.
+_REQUIREMENT_RELATIONS = {
+    "material_require": "require",
+    "material_prefer": "prefer",
+    "material_exclude": "exclude",
+}
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL
+);
+CREATE TABLE entries (
+    section     TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    ord         INTEGER NOT NULL,
+    value_json  TEXT NOT NULL,
+    PRIMARY KEY (section, key)
+) WITHOUT ROWID;
+CREATE INDEX idx_entries_order ON entries(section, ord);
+CREATE TABLE material_patterns (
+    material    TEXT NOT NULL,
+    pattern_id  TEXT NOT NULL,
+    rating      TEXT NOT NULL,
+    ord         INTEGER NOT NULL
+);
+CREATE INDEX idx_material_patterns ON material_patterns(material, ord);
+CREATE TABLE requirement_materials (
+    requirement_id  TEXT NOT NULL,
+    material        TEXT NOT NULL,
+    relation        TEXT NOT NULL,
+    ord             INTEGER NOT NULL
+);
+CREATE INDEX idx_requirement_materials ON requirement_materials(requirement_id, ord);
+CREATE INDEX idx_material_requirements ON requirement_materials(material);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Source loading and cross-indexes
+# ---------------------------------------------------------------------------
+
+
+def load_section(data_dir: Path, section: str) -> dict[str, Any]:
+    """Parse one knowledge-base section from its JSON source file.
+
+    Keys starting with ``_`` (metadata blocks) are dropped.  A missing
+    file yields an empty dict.
+    """
+    path = data_dir / SECTION_FILES[section]
+    if not path.exists():
+        return {}
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return {k: v for k, v in raw.items() if not k.startswith("_")}
+
+
+def build_material_pattern_index(
+    patterns: dict[str, dict[str, Any]],
+) -> dict[str, list[tuple[str, str]]]:
+    """Map material ID → ``[(pattern_id, rating), ...]``, best rating first."""
+    index: dict[str, list[tuple[str, str]]] = {}
+    for rating in _PATTERN_RATING_ORDER:
+        for pid, data in patterns.items():
+            for material in data.get("material_compatibility", {}).get(rating, []):
+                index.setdefault(material.lower(), []).append((pid, rating))
+    return index
+
+
+def build_requirement_material_index(
+    requirements: dict[str, dict[str, Any]],
+) -> dict[str, dict[str, list[str]]]:
+    """Map requirement ID → ``{"require"|"prefer"|"exclude": [material, ...]}``."""
+    index: dict[str, dict[str, list[str]]] = {}
+    for req_id, data in requirements.items():
+        rules = data.get("constraint_rules", {})
+        relations = {
+            relation: list(rules[rule_key])
+            for rule_key, relation in _REQUIREMENT_RELATIONS.items()
+            if rule_key in rules
+        }
+        index[req_id] = relations
+    return index
+
+
+def _source_files(data_dir: Path) -> list[Path]:
+    return [data_dir / name for name in sorted(set(SECTION_FILES.values()))]
+
+
+def _source_stat(data_dir: Path) -> str:
+    """Cheap stat-based signature (name, size, mtime) of the source files."""
+    parts = []
+    for path in _source_files(data_dir):
+        try:
+            st = path.stat()
+            parts.append([path.name, st.st_size, st.st_mtime_ns])
+        except OSError:
+            parts.append([path.name, None, None])
+    return json.dumps(parts)
+
+
+def source_digest(data_dir: Path) -> str:
+    """SHA-256 over the names and contents of all source JSON files."""
+    h = hashlib.sha256()
+    for path in _source_files(data_dir):
+        h.update(path.name.encode("utf-8"))
+        h.update(b"\0")
+        if path.exists():
+            h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SnapshotInfo:
+    """Summary of a compiled snapshot.
+
+    :param path: Snapshot file path.
+    :param format_version: Snapshot schema version.
+    :param source_digest: SHA-256 of the source JSON files.
+    :param entry_counts: Number of entries per section.
+    :param size_bytes: Size of the snapshot file.
+    """
+
+    path: str
+    format_version: int
+    source_digest: str
+    entry_counts: dict[str, int]
+    size_bytes: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialise to a plain dict suitable for JSON output."""
+        return asdict(self)
+
+
+def default_snapshot_path() -> Path | None:
+    """Resolve the snapshot path, or ``None`` if snapshots are disabled."""
+    env = os.environ.get(_ENV_VAR, "").strip()
+    if env.lower() in ("off", "0", "false", "none"):
+        return None
+    return Path(env).expanduser() if env else _DEFAULT_SNAPSHOT_PATH
+
+
+def compile_snapshot(
+    output_path: str | Path | None = None,
+    *,
+    data_dir: str | Path | None = None,
+) -> SnapshotInfo:
+    """Compile the knowledge-base JSON files into a snapshot.
+
+    The file is written to a temporary sibling and atomically renamed, so
+    processes reading the old snapshot are never exposed to a partial one.
+
+    :param output_path: Destination file.  Defaults to
+        :func:`default_snapshot_path`.
+    :param data_dir: Source directory.  Defaults to the bundled
+        ``data/design_knowledge``.
+    :raises ValueError: If no output path is given and snapshots are
+        disabled via ``KILN_DESIGN_KB_SNAPSHOT=off``.
+    """
+    src = Path(data_dir) if data_dir is not None else _DEFAULT_DATA_DIR
+    if output_path is None:
+        output_path = default_snapshot_path()
+        if output_path is None:
+            raise ValueError(f"Design knowledge snapshots are disabled via {_ENV_VAR}")
+    out = Path(output_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    digest = source_digest(src)
+    sections = {name: load_section(src, name) for name in SECTION_FILES}
+
+    fd, tmp_name = tempfile.mkstemp(prefix=".kb-", suffix=".sqlite", dir=str(out.parent))
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_name)
+        try:
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("format_version", str(SNAPSHOT_FORMAT_VERSION)),
+                    ("source_digest", digest),
+                    ("source_stat", _source_stat(src)),
+                    ("source_dir", str(src.resolve())),
+                ],
+            )
+            for name, entries in sections.items():
+                conn.executemany(
+                    "INSERT INTO entries (section, key, ord, value_json) VALUES (?, ?, ?, ?)",
+                    [
+                        (name, key, ord_, json.dumps(value, separators=(",", ":")))
+                        for ord_, (key, value) in enumerate(entries.items())
+                    ],
+                )
+            conn.executemany(
+                "INSERT INTO material_patterns (material, pattern_id, rating, ord) VALUES (?, ?, ?, ?)",
+                [
+                    (material, pid, rating, ord_)
+                    for material, pairs in build_material_pattern_index(sections["patterns"]).items()
+                    for ord_, (pid, rating) in enumerate(pairs)
+                ],
+            )
+            rows = []
+            for req_id, relations in build_requirement_material_index(sections["requirements"]).items():
+                ord_ = 0
+                for relation, materials in relations.items():
+                    for material in materials:
+                        rows.append((req_id, material, relation, ord_))
+                        ord_ += 1
+            conn.executemany(
+                "INSERT INTO requirement_materials (requirement_id, material, relation, ord) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.replace(tmp_name, out)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+    info = SnapshotInfo(
+        path=str(out),
+        format_version=SNAPSHOT_FORMAT_VERSION,
+        source_digest=digest,
+        entry_counts={name: len(entries) for name, entries in sections.items()},
+        size_bytes=out.stat().st_size,
+    )
+    logger.info("Compiled design knowledge snapshot %s (%d bytes)", out, info.size_bytes)
+    return info
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+class KnowledgeSnapshot:
+    """Read-only view over a compiled snapshot file.
+
+    Thread-safe: a single connection is shared behind a lock.  Sections
+    are decoded on demand; point lookups decode a single row.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            f"file:{self._path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        self._conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+        self._conn.execute("PRAGMA query_only=ON")
+        self._meta: dict[str, str] = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def format_version(self) -> int:
+        return int(self._meta.get("format_version", "0"))
+
+    @property
+    def source_digest(self) -> str:
+        return self._meta.get("source_digest", "")
+
+    def matches_source(self, data_dir: Path) -> bool:
+        """Return ``True`` if the snapshot was compiled from *data_dir* as it is now."""
+        if self.format_version != SNAPSHOT_FORMAT_VERSION:
+            return False
+        if self._meta.get("source_stat") == _source_stat(data_dir):
+            return True
+        # Same content under new mtimes (e.g. a reinstall) is still valid.
+        return self.source_digest == source_digest(data_dir)
+
+    def section(self, name: str) -> dict[str, Any]:
+        """Decode every entry of a section, in source-file order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value_json FROM entries WHERE section = ? ORDER BY ord",
+                (name,),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, section: str, key: str) -> Any | None:
+        """Decode a single entry, or return ``None`` if absent."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value_json FROM entries WHERE section = ? AND key = ?",
+                (section, key),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def patterns_for_material(self, material_id: str) -> list[tuple[str, str]]:
+        """Return ``[(pattern_id, rating), ...]`` for a material, best first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pattern_id, rating FROM material_patterns WHERE material = ? ORDER BY ord",
+                (material_id.lower(),),
+            ).fetchall()
+        return [(pid, rating) for pid, rating in rows]
+
+    def materials_for_requirement(self, requirement_id: str) -> dict[str, list[str]]:
+        """Return ``{"require"|"prefer"|"exclude": [material, ...]}`` for a requirement."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT relation, material FROM requirement_materials WHERE requirement_id = ? ORDER BY ord",
+                (requirement_id,),
+            ).fetchall()
+        result: dict[str, list[str]] = {}
+        for relation, material in rows:
+            result.setdefault(relation, []).append(material)
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_snapshot(
+    path: str | Path | None = None,
+    *,
+    data_dir: str | Path | None = None,
+) -> KnowledgeSnapshot | None:
+    """Open a snapshot if it exists and matches the current source files.
+
+    Returns ``None`` (never raises) when snapshots are disabled, the file
+    is missing or unreadable, or it is stale — callers then fall back to
+    parsing the JSON files.
+    """
+    resolved = Path(path) if path is not None else default_snapshot_path()
+    if resolved is None or not resolved.is_file():
+        return None
+    src = Path(data_dir) if data_dir is not None else _DEFAULT_DATA_DIR
+    try:
+        snapshot = KnowledgeSnapshot(resolved)
+    except sqlite3.Error as exc:
+        logger.warning("Ignoring unreadable design knowledge snapshot %s: %s", resolved, exc)
+        return None
+    if not snapshot.matches_source(src):
+        logger.info("Design knowledge snapshot %s is stale; using JSON sources", resolved)
+        snapshot.close()
+        return None
+    return snapshot
+
+
+# ---------------------------------------------------------------------------
+# Build-step entry point
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m kiln.design_knowledge_snapshot",
+        description="Compile the design knowledge base into a pre-indexed snapshot.",
+    )
+    parser.add_argument("-o", "--output", default=None, help="Snapshot path (default: %(default)s).")
+    parser.add_argument("--data-dir", default=None, help="Source JSON directory.")
+    args = parser.parse_args(argv)
+
+    try:
+        info = compile_snapshot(args.output, data_dir=args.data_dir)
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        print(f"Error: {exc}")
+        return 1
+    print(json.dumps(info.to_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
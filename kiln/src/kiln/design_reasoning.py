@@ -2088,24 +2088,18 @@ def optimize_template_params(
     :returns: :class:`OptimizationResult` with best params and STL path.
     """
     import itertools
-    import json
     import tempfile
     from string import Template
 
-    # Load templates
-    if templates_path is None:
-        tpl_path = Path(__file__).parent / "data" / "design_templates.json"
-    else:
-        tpl_path = Path(templates_path)
+    from kiln.template_store import get_template_store
 
-    if not tpl_path.is_file():
-        raise ValueError(f"Templates file not found: {tpl_path}")
-
-    with open(tpl_path) as fh:
-        data = json.load(fh)
+    # Load templates
+    store = get_template_store(templates_path)
+    if not store.exists():
+        raise ValueError(f"Templates file not found: {store.path}")
 
-    tpl = data.get(template_id)
-    if not tpl or template_id.startswith("_"):
+    tpl = store.get(template_id)
+    if not tpl:
         raise ValueError(f"Template {template_id!r} not found")
 
     params_spec = tpl.get("parameters", {})
@@ -2649,71 +2643,40 @@ def search_templates(
 ) -> TemplateSearchResult:
     """Search templates by natural-language description.
 
-    Uses token-overlap scoring: each query token is checked against the
-    template's ID, description, category, and tags.  Templates are ranked
-    by match ratio and returned in descending score order.
+    Ranks templates with BM25 over an in-memory inverted index of each
+    template's ID, name, tags, category, description, and parameter
+    names (see :mod:`kiln.template_store`).  Query tokens also match by
+    prefix and by a single typo.  Scores are normalised to ``(0, 1]``
+    and matches are returned in descending score order.
 
     :param query: Natural-language search string.
     :param max_results: Cap on returned matches (default 10).
     :param category_filter: If set, only return templates in this category.
     :returns: ``TemplateSearchResult`` with scored matches.
     """
-    import json as _json
+    from kiln.template_store import get_template_store
 
     if not query or not query.strip():
         return TemplateSearchResult(query=query, total_templates=0)
 
-    templates_path = Path(__file__).parent / "data" / "design_templates.json"
-    if not templates_path.exists():
+    store = get_template_store()
+    if not store.exists():
         return TemplateSearchResult(query=query, total_templates=0)
 
-    with open(templates_path) as fh:
-        data: dict[str, Any] = _json.load(fh)
-
-    # Normalised query tokens
-    q_tokens = query.lower().split()
-    if not q_tokens:
-        return TemplateSearchResult(query=query, total_templates=0)
-
-    scored: list[tuple[float, str, dict[str, Any]]] = []
-    template_keys = [k for k in data if not k.startswith("_")]
-
-    for tid in template_keys:
-        tmpl = data[tid]
-        cat = tmpl.get("category", "")
-        if category_filter and cat != category_filter:
-            continue
-
-        # Build searchable text from template metadata
-        desc = tmpl.get("description", "")
-        tags = tmpl.get("tags", [])
-        search_text = " ".join([
-            tid.replace("_", " "),
-            desc,
-            cat.replace("_", " "),
-            " ".join(tags) if isinstance(tags, list) else "",
-        ]).lower()
-
-        # Score = fraction of query tokens found in search text
-        hits = sum(1 for t in q_tokens if t in search_text)
-        score = hits / len(q_tokens)
-
-        if score > 0:
-            scored.append((score, tid, {
-                "template_id": tid,
-                "score": round(score, 3),
-                "description": desc,
-                "category": cat,
-            }))
-
-    # Sort by score descending, then alphabetically for ties
-    scored.sort(key=lambda x: (-x[0], x[1]))
-    top = scored[:max_results]
+    matches = store.search(query, limit=max_results, category=category_filter)
 
     return TemplateSearchResult(
         query=query,
-        matches=[entry[2] for entry in top],
-        total_templates=len(template_keys),
+        matches=[
+            {
+                "template_id": m.template_id,
+                "score": m.score,
+                "description": m.description,
+                "category": m.category,
+            }
+            for m in matches
+        ],
+        total_templates=len(store),
         search_method="keyword",
     )
 
@@ -2926,9 +2889,10 @@ def design_to_gcode(
     :param infill_percent: Infill percentage for weight estimation.
     :returns: ``DesignToGCodeResult`` with paths and metadata.
     """
-    import json as _json
     import tempfile
 
+    from kiln.template_store import get_template_store
+
     result = DesignToGCodeResult(description=description)
 
     if not description or not description.strip():
@@ -2950,11 +2914,7 @@ def design_to_gcode(
     result.steps_completed.append("template_search")
 
     # Step 2: Load template and generate SCAD → STL
-    templates_path = Path(__file__).parent / "data" / "design_templates.json"
-    with open(templates_path) as fh:
-        templates = _json.load(fh)
-
-    tmpl = templates.get(template_id)
+    tmpl = get_template_store().get(template_id)
     if not tmpl or "scad_template" not in tmpl:
         result.errors.append(f"Template '{template_id}' has no scad_template.")
         return result
@@ -3393,23 +3353,19 @@ def solve_constraints(
         (``ratio`` specifies a ratio to another param, e.g. ``{"ratio": ["width", 0.5]}``).
     :returns: ``ConstraintSolution`` with solved parameters.
     """
-    import json as _json
+    from kiln.template_store import get_template_store
 
     result = ConstraintSolution(template_id=template_id)
 
-    templates_path = Path(__file__).parent / "data" / "design_templates.json"
-    if not templates_path.exists():
+    store = get_template_store()
+    if not store.exists():
         result.notes.append("Templates file not found.")
         return result
 
-    with open(templates_path) as fh:
-        data = _json.load(fh)
-
-    if template_id not in data or template_id.startswith("_"):
+    tmpl = store.get(template_id)
+    if tmpl is None:
         result.notes.append(f"Unknown template: {template_id}")
         return result
-
-    tmpl = data[template_id]
     raw_params = tmpl.get("parameters", {})
 
     if not raw_params:
@@ -9,7 +9,7 @@ The pipeline:
     1. Get a DesignBrief from design intelligence (material, patterns, rules)
     2. Run printability analysis on the mesh (existing engine)
     3. Compare geometry against DesignBrief constraints (wall thickness,
-       overhang angles, stability, bridges, adhesion)
+       overhang angles, stability, bridges, adhesion, support volume)
     4. Return a structured report with pass/fail per check, severity,
        and actionable fix descriptions
 
@@ -302,6 +302,37 @@ def _check_bed_adhesion(
     )
 
 
+def _check_support_volume(
+    support_percentage: float,
+    *,
+    footprint_mm2: float = 0.0,
+    max_height_mm: float = 0.0,
+    max_support_pct: float = 20.0,
+) -> DesignValidationCheck:
+    """Check support material, as a % of model volume, from the support map."""
+    passed = support_percentage <= max_support_pct
+
+    if passed:
+        severity = "info"
+        fix = ""
+    else:
+        severity = "warning"
+        fix = (
+            f"Supports would add {support_percentage:.0f}% of the model's volume, "
+            f"covering {footprint_mm2:.0f} mm2 of the bed up to {max_height_mm:.1f} mm tall. "
+            f"Re-orient the model or chamfer overhangs to 45 degrees or less."
+        )
+
+    return DesignValidationCheck(
+        check_name="support_volume",
+        passed=passed,
+        severity=severity,
+        actual_value=round(support_percentage, 1),
+        required_value=max_support_pct,
+        fix_suggestion=fix,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -348,6 +379,7 @@ def validate_design(
     thin_walls = report_dict.get("thin_walls", {})
     bridging_data = report_dict.get("bridging", {})
     adhesion_data = report_dict.get("bed_adhesion", {})
+    supports_data = report_dict.get("supports", {})
 
     # 3. Extract model dimensions.
     _, vertices = _parse_mesh(file_path)
@@ -415,6 +447,15 @@ def validate_design(
     contact_pct = adhesion_data.get("contact_percentage", 100.0)
     checks.append(_check_bed_adhesion(contact_pct))
 
+    # Support material, from the rasterized support footprint.
+    checks.append(
+        _check_support_volume(
+            supports_data.get("mapped_percentage", 0.0),
+            footprint_mm2=supports_data.get("footprint_area_mm2", 0.0),
+            max_height_mm=supports_data.get("max_support_height_mm", 0.0),
+        )
+    )
+
     # 5. Aggregate results.
     failed_checks = [c for c in checks if not c.passed]
     critical_count = sum(1 for c in failed_checks if c.severity == "critical")
@@ -492,6 +533,14 @@ def validation_to_feedback(
                 f"minimize bridges, no spans greater than {check.required_value} mm"
             )
 
+        elif name == "support_volume":
+            printability_issues.append(
+                f"Heavy supports ({check.actual_value}% of model volume, max {check.required_value}%)"
+            )
+            printability_constraints.append(
+                "self-supporting overhangs of 45 degrees or less"
+            )
+
         elif name == "stability":
             structural_issues.append(
                 f"Unstable aspect ratio ({check.actual_value}:1, max {check.required_value}:1)"
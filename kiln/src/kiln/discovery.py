@@ -6,16 +6,43 @@ Uses multiple discovery strategies:
 3. Manual IP scan of subnet
 
 Follows the SonosCLI pattern: try multiple strategies, merge results,
-return a unified list of discovered printers.
+return a unified list of discovered printers.  Strategies run
+concurrently and each printer is reported to ``on_found`` as soon as any
+strategy sees it.
+
+The subnet scan is two-staged so dead addresses cost almost nothing:
+
+1. An asyncio TCP-connect sweep of every host x printer HTTP port, with
+   thousands of non-blocking connects in flight and a tight per-connect
+   timeout.
+2. HTTP identification requests, over a pooled ``requests`` session, sent
+   only to the ports that accepted a connection.
+
+Subnets may be given as legacy three-octet prefixes (``"192.168.1"``) or
+CIDR ranges (``"10.0.0.0/22"``), and several can be scanned at once.
+
+Usage::
+
+    from kiln.discovery import discover_printers, scan_subnets
+
+    printers = discover_printers(timeout=5.0, subnet=["192.168.0.0/22", "10.0.5"])
+    printers, timings = scan_subnets(["192.168.0.0/22"], timeout=3.0)
+    print(timings.sweep_seconds, timings.identify_seconds)
 """
 
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import contextlib
+import ipaddress
 import logging
 import platform
 import socket
+import struct
+import threading
 import time
+from collections.abc import Callable, Iterable
 from dataclasses import asdict, dataclass, field
 from typing import Any
 
@@ -66,6 +93,25 @@ _PROBE_TARGETS = [
     (3030, None, None, "elegoo"),  # Elegoo SDCP WebSocket port (no HTTP probe)
 ]
 
+# Targets that can be identified over HTTP, and the ports they listen on.
+_HTTP_PROBE_TARGETS = [target for target in _PROBE_TARGETS if target[1] is not None]
+_HTTP_PROBE_PORTS = list(dict.fromkeys(port for port, _, _, _ in _HTTP_PROBE_TARGETS))
+
+# Upper bound on addresses in one scan (a /20), so a typo such as "/8"
+# cannot start a multi-million connect sweep.
+_MAX_SCAN_HOSTS = 4096
+
+# Concurrent connects in flight during the sweep (further capped by the
+# process file-descriptor limit).
+_MAX_SWEEP_CONCURRENCY = 4096
+
+# Per-connect timeout for the sweep.  LAN hosts answer (SYN-ACK or RST)
+# within a few milliseconds; silence means nobody is there.
+_DEFAULT_CONNECT_TIMEOUT = 0.5
+
+# Worker threads for the HTTP identification stage.
+_IDENTIFY_WORKERS = 32
+
 # mDNS service types to browse
 _MDNS_SERVICES = [
     ("_octoprint._tcp.local.", "octoprint"),
@@ -76,17 +122,22 @@ _MDNS_SERVICES = [
 
 def discover_printers(
     timeout: float = 5.0,
-    subnet: str | None = None,
+    subnet: str | list[str] | None = None,
     methods: list[str] | None = None,
+    *,
+    on_found: Callable[[DiscoveredPrinter], None] | None = None,
 ) -> list[DiscoveredPrinter]:
     """Run discovery using all available methods.
 
     Args:
         timeout: Maximum time in seconds for the entire discovery.
-        subnet: Optional subnet to scan (e.g. "192.168.1"). If None,
-            auto-detects from the default network interface.
+        subnet: Optional subnet(s) to scan, as ``"192.168.1"`` prefixes or
+            CIDR ranges.  If None, auto-detects from the default network
+            interface.
         methods: List of methods to use. Default: ["mdns", "http_probe"].
             Options: "mdns", "http_probe".
+        on_found: Called once per (host, port) as soon as any method finds
+            it, from a discovery worker thread.
 
     Returns:
         List of discovered printers, deduplicated by host+port.
@@ -108,34 +159,100 @@ def discover_printers(
                 "Consider using explicit printer IPs or providing a subnet."
             )
 
-    all_printers: list[DiscoveredPrinter] = []
-    deadline = time.monotonic() + timeout
+    seen: set[tuple[str, int]] = set()
+    seen_lock = threading.Lock()
 
+    def _emit(printer: DiscoveredPrinter) -> None:
+        if on_found is None:
+            return
+        with seen_lock:
+            key = (printer.host, printer.port)
+            if key in seen:
+                return
+            seen.add(key)
+        on_found(printer)
+
+    # Methods run side by side, so the total is bounded by the slowest
+    # one rather than their sum.
+    runners: list[tuple[str, Callable[[], list[DiscoveredPrinter]]]] = []
     for method in methods:
-        remaining = deadline - time.monotonic()
-        if remaining <= 0:
-            logger.debug("Discovery timeout reached, skipping remaining methods")
-            break
+        if method == "mdns":
+            runners.append((method, lambda: _try_mdns(timeout=timeout, on_found=_emit)))
+        elif method == "http_probe":
+            scan_subnet = subnet or _detect_subnet()
+            if scan_subnet is None:
+                logger.warning("Could not detect subnet for HTTP probe; skipping")
+                continue
+            runners.append(
+                (method, lambda s=scan_subnet: _try_http_probe(s, timeout=timeout, on_found=_emit))
+            )
+        else:
+            logger.warning("Unknown discovery method: %s", method)
 
-        try:
-            if method == "mdns":
-                all_printers.extend(_try_mdns(timeout=remaining))
-            elif method == "http_probe":
-                scan_subnet = subnet or _detect_subnet()
-                if scan_subnet is None:
-                    logger.warning("Could not detect subnet for HTTP probe; skipping")
-                    continue
-                all_printers.extend(_try_http_probe(scan_subnet, timeout=remaining))
-            else:
-                logger.warning("Unknown discovery method: %s", method)
-        except Exception:
-            logger.exception("Discovery method '%s' failed", method)
+    all_printers: list[DiscoveredPrinter] = []
+    started = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, len(runners)), thread_name_prefix="kiln-discovery"
+    ) as executor:
+        futures = [(method, executor.submit(runner)) for method, runner in runners]
+        for method, future in futures:
+            try:
+                all_printers.extend(future.result())
+            except Exception:
+                logger.exception("Discovery method '%s' failed", method)
+    logger.debug("Discovery finished in %.2fs", time.monotonic() - started)
 
     deduped = _deduplicate(all_printers)
     _annotate_trust(deduped)
     return deduped
 
 
+def _identify(
+    resp: requests.Response,
+    *,
+    host: str,
+    port: int,
+    expected_key: str,
+    printer_type: str,
+    discovery_method: str,
+) -> DiscoveredPrinter | None:
+    """Turn one probe response into a printer, or ``None`` if it is not one."""
+    if resp.status_code == 200:
+        data = resp.json()
+        if not isinstance(data, dict) or expected_key not in data:
+            return None
+        name = data.get("text", data.get("hostname", ""))
+        version = ""
+        if printer_type == "octoprint":
+            version = data.get("server", "")
+        elif printer_type == "moonraker":
+            version = data.get("klippy_state", "")
+        elif printer_type == "prusaconnect":
+            printer_data = data.get("printer", {})
+            name = printer_data.get("state", "PrusaLink")
+            version = ""
+        return DiscoveredPrinter(
+            host=host,
+            port=port,
+            printer_type=printer_type,
+            name=str(name),
+            version=str(version),
+            api_available=True,
+            discovery_method=discovery_method,
+        )
+    if resp.status_code == 401 and printer_type == "prusaconnect":
+        # Prusa Link requires auth — 401 still means it's there
+        return DiscoveredPrinter(
+            host=host,
+            port=port,
+            printer_type=printer_type,
+            name="PrusaLink",
+            api_available=True,
+            discovery_method=discovery_method,
+        )
+    return None
+
+
 def probe_host(host: str, timeout: float = 3.0) -> list[DiscoveredPrinter]:
     """Probe a specific host for known printer services.
 
@@ -169,51 +286,30 @@ def probe_host(host: str, timeout: float = 3.0) -> list[DiscoveredPrinter]:
         url = f"http://{host}:{port}{path}"
         try:
             resp = requests.get(url, timeout=timeout)
-            if resp.status_code == 200:
-                data = resp.json()
-                if expected_key in data:
-                    name = data.get("text", data.get("hostname", ""))
-                    version = ""
-                    if printer_type == "octoprint":
-                        version = data.get("server", "")
-                    elif printer_type == "moonraker":
-                        version = data.get("klippy_state", "")
-                    elif printer_type == "prusaconnect":
-                        printer_data = data.get("printer", {})
-                        name = printer_data.get("state", "PrusaLink")
-                        version = ""
-
-                    results.append(
-                        DiscoveredPrinter(
-                            host=host,
-                            port=port,
-                            printer_type=printer_type,
-                            name=str(name),
-                            version=str(version),
-                            api_available=True,
-                            discovery_method="manual",
-                        )
-                    )
-            elif resp.status_code == 401 and printer_type == "prusaconnect":
-                # Prusa Link requires auth — 401 still means it's there
-                results.append(
-                    DiscoveredPrinter(
-                        host=host,
-                        port=port,
-                        printer_type=printer_type,
-                        name="PrusaLink",
-                        api_available=True,
-                        discovery_method="manual",
-                    )
-                )
+            found = _identify(
+                resp,
+                host=host,
+                port=port,
+                expected_key=expected_key,
+                printer_type=printer_type,
+                discovery_method="manual",
+            )
+            if found is not None:
+                results.append(found)
         except (requests.ConnectionError, requests.Timeout, requests.JSONDecodeError, OSError):
             pass
 
     return results
 
 
-def _try_mdns(timeout: float) -> list[DiscoveredPrinter]:
-    """Discover printers via mDNS/Bonjour (requires zeroconf)."""
+def _try_mdns(
+    timeout: float,
+    on_found: Callable[[DiscoveredPrinter], None] | None = None,
+) -> list[DiscoveredPrinter]:
+    """Discover printers via mDNS/Bonjour (requires zeroconf).
+
+    Each service is passed to *on_found* as it is resolved.
+    """
     try:
         from zeroconf import ServiceBrowser, Zeroconf  # type: ignore[import-untyped]
     except ImportError:
@@ -238,16 +334,17 @@ def _try_mdns(timeout: float) -> list[DiscoveredPrinter]:
             host = addresses[0]
             port = info.port or 80
             server_name = info.server or name
-            results.append(
-                DiscoveredPrinter(
-                    host=host,
-                    port=port,
-                    printer_type=self.printer_type,
-                    name=server_name,
-                    api_available=True,
-                    discovery_method="mdns",
-                )
+            printer = DiscoveredPrinter(
+                host=host,
+                port=port,
+                printer_type=self.printer_type,
+                name=server_name,
+                api_available=True,
+                discovery_method="mdns",
             )
+            results.append(printer)
+            if on_found is not None:
+                on_found(printer)
 
         def remove_service(self, zc: Zeroconf, type_: str, name: str) -> None:
             pass
@@ -271,83 +368,249 @@ def _try_mdns(timeout: float) -> list[DiscoveredPrinter]:
     return results
 
 
-def _try_http_probe(subnet: str, timeout: float) -> list[DiscoveredPrinter]:
-    """Probe common printer ports on the local subnet.
+@dataclass
+class ScanTimings:
+    """Per-stage counts and durations of one :func:`scan_subnets` run."""
 
-    Scans hosts 1-254 in the given subnet using a thread pool for
-    concurrent probing.
-    """
-    results: list[DiscoveredPrinter] = []
-    per_host_timeout = min(timeout / 10, 2.0)  # keep individual probes short
+    hosts: int = 0
+    connect_attempts: int = 0
+    open_ports: int = 0
+    identified: int = 0
+    sweep_seconds: float = 0.0
+    identify_seconds: float = 0.0
+    total_seconds: float = 0.0
 
-    def _probe_single(host_num: int) -> list[DiscoveredPrinter]:
-        host = f"{subnet}.{host_num}"
-        found: list[DiscoveredPrinter] = []
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
 
-        for port, path, expected_key, printer_type in _PROBE_TARGETS:
-            if path is None:
-                continue  # skip non-HTTP probes in subnet scan
 
-            url = f"http://{host}:{port}{path}"
-            try:
-                resp = requests.get(url, timeout=per_host_timeout)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    if expected_key in data:
-                        name = data.get("text", data.get("hostname", ""))
-                        version = ""
-                        if printer_type == "octoprint":
-                            version = data.get("server", "")
-                        elif printer_type == "moonraker":
-                            version = data.get("klippy_state", "")
-                        elif printer_type == "prusaconnect":
-                            printer_data = data.get("printer", {})
-                            name = printer_data.get("state", "PrusaLink")
-                            version = ""
-
-                        found.append(
-                            DiscoveredPrinter(
-                                host=host,
-                                port=port,
-                                printer_type=printer_type,
-                                name=str(name),
-                                version=str(version),
-                                api_available=True,
-                                discovery_method="http_probe",
-                            )
-                        )
-                elif resp.status_code == 401 and printer_type == "prusaconnect":
-                    # Prusa Link requires auth — 401 still means it's there
-                    found.append(
-                        DiscoveredPrinter(
-                            host=host,
-                            port=port,
-                            printer_type=printer_type,
-                            name="PrusaLink",
-                            api_available=True,
-                            discovery_method="http_probe",
-                        )
-                    )
-            except (
-                requests.ConnectionError,
-                requests.Timeout,
-                requests.JSONDecodeError,
-                OSError,
-            ):
-                pass
+def _parse_subnet(spec: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    """Parse ``"192.168.1"``, ``"192.168.1.7"`` or a CIDR range."""
+    spec = spec.strip()
+    if "/" not in spec:
+        octets = spec.split(".")
+        if len(octets) == 3:
+            spec = f"{spec}.0/24"
+        elif len(octets) == 4:
+            spec = f"{spec}/32"
+    return ipaddress.ip_network(spec, strict=False)
 
-        return found
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-        futures = {executor.submit(_probe_single, i): i for i in range(1, 255)}
-        done, _ = concurrent.futures.wait(futures, timeout=timeout, return_when=concurrent.futures.ALL_COMPLETED)
-        for future in done:
+def _expand_hosts(subnets: Iterable[str]) -> list[str]:
+    """List every host address in *subnets*, in order and without repeats.
+
+    :raises ValueError: If a subnet is malformed or the total exceeds
+        :data:`_MAX_SCAN_HOSTS`.
+    """
+    hosts: dict[str, None] = {}
+    for spec in subnets:
+        network = _parse_subnet(spec)
+        if len(hosts) + network.num_addresses > _MAX_SCAN_HOSTS + 2:
+            raise ValueError(f"Refusing to scan more than {_MAX_SCAN_HOSTS} addresses (got {spec!r})")
+        for address in network.hosts():
+            hosts[str(address)] = None
+    return list(hosts)
+
+
+def _sweep_concurrency() -> int:
+    with contextlib.suppress(ImportError, ValueError, OSError):
+        import resource  # POSIX only
+
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft > 0:
+            # Leave room for the rest of the process.
+            return max(16, min(_MAX_SWEEP_CONCURRENCY, soft - 256))
+    return 256
+
+
+async def _tcp_sweep(
+    targets: list[tuple[str, int]],
+    *,
+    connect_timeout: float,
+    concurrency: int,
+    budget: float,
+) -> list[tuple[str, int]]:
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    open_ports: list[tuple[str, int]] = []
+    # Close with RST instead of FIN so probed printers are not left with
+    # sockets in TIME_WAIT.
+    linger = struct.pack("ii", 1, 0)
+
+    async def _attempt(host: str, port: int) -> None:
+        async with semaphore:
+            family = socket.AF_INET6 if ":" in host else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
             try:
-                found = future.result(timeout=0)
-                results.extend(found)
-            except Exception as exc:
-                logger.debug("Failed to get result from discovery probe future: %s", exc)
+                await asyncio.wait_for(loop.sock_connect(sock, (host, port)), connect_timeout)
+            except (OSError, asyncio.TimeoutError):
+                return
+            finally:
+                with contextlib.suppress(OSError):
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, linger)
+                sock.close()
+        open_ports.append((host, port))
+
+    tasks = [asyncio.ensure_future(_attempt(host, port)) for host, port in targets]
+    _, pending = await asyncio.wait(tasks, timeout=budget)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    return open_ports
+
+
+def _sweep_open_ports(
+    targets: list[tuple[str, int]],
+    *,
+    connect_timeout: float,
+    budget: float,
+) -> list[tuple[str, int]]:
+    """Return the (host, port) pairs in *targets* that accept a TCP connect."""
+    if not targets:
+        return []
+    coro = _tcp_sweep(
+        targets,
+        connect_timeout=connect_timeout,
+        concurrency=_sweep_concurrency(),
+        budget=budget,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Called from inside an event loop (e.g. a sync MCP tool): sweep on a
+    # private loop in a helper thread.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(asyncio.run, coro).result()
+
+
+def _identify_port(
+    session: requests.Session,
+    host: str,
+    port: int,
+    *,
+    request_timeout: float,
+) -> DiscoveredPrinter | None:
+    """Send the HTTP probes registered for *port* until one identifies a printer."""
+    for target_port, path, expected_key, printer_type in _HTTP_PROBE_TARGETS:
+        if target_port != port:
+            continue
+        try:
+            resp = session.get(f"http://{host}:{port}{path}", timeout=request_timeout)
+            found = _identify(
+                resp,
+                host=host,
+                port=port,
+                expected_key=expected_key,
+                printer_type=printer_type,
+                discovery_method="http_probe",
+            )
+        except requests.Timeout:
+            # The port accepted a connect but does not answer HTTP in time;
+            # the remaining paths would time out too.
+            return None
+        except (requests.ConnectionError, requests.JSONDecodeError, OSError):
+            continue
+        if found is not None:
+            return found
+    return None
+
+
+def scan_subnets(
+    subnets: str | Iterable[str],
+    *,
+    timeout: float = 5.0,
+    connect_timeout: float | None = None,
+    on_found: Callable[[DiscoveredPrinter], None] | None = None,
+) -> tuple[list[DiscoveredPrinter], ScanTimings]:
+    """Find HTTP-reachable printers in one or more subnets.
+
+    Args:
+        subnets: ``"192.168.1"`` prefixes, single addresses or CIDR ranges.
+        timeout: Overall budget for both stages.
+        connect_timeout: Per-connect timeout of the sweep.  Defaults to
+            0.5s, or a quarter of *timeout* if that is shorter.
+        on_found: Called with each printer as soon as it is identified.
+
+    Returns:
+        The printers found and per-stage :class:`ScanTimings`.
+
+    Raises:
+        ValueError: If a subnet is malformed or too large.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    hosts = _expand_hosts([subnets] if isinstance(subnets, str) else subnets)
+    targets = [(host, port) for host in hosts for port in _HTTP_PROBE_PORTS]
+    timings = ScanTimings(hosts=len(hosts), connect_attempts=len(targets))
+    if connect_timeout is None:
+        connect_timeout = min(_DEFAULT_CONNECT_TIMEOUT, timeout / 4)
+    request_timeout = min(timeout / 10, 2.0)  # keep individual probes short
+
+    # Leave at least half the budget for identification.
+    sweep_budget = max(connect_timeout, timeout / 2)
+    open_ports = _sweep_open_ports(targets, connect_timeout=connect_timeout, budget=sweep_budget)
+    timings.open_ports = len(open_ports)
+    timings.sweep_seconds = time.monotonic() - started
 
+    results: list[DiscoveredPrinter] = []
+    results_lock = threading.Lock()
+
+    def _record(future: concurrent.futures.Future[DiscoveredPrinter | None]) -> None:
+        with contextlib.suppress(Exception):
+            printer = future.result()
+            if printer is not None:
+                with results_lock:
+                    results.append(printer)
+                if on_found is not None:
+                    on_found(printer)
+
+    if open_ports:
+        workers = min(_IDENTIFY_WORKERS, len(open_ports))
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers))
+        with (
+            session,
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kiln-identify") as executor,
+        ):
+            futures = []
+            for host, port in open_ports:
+                future = executor.submit(_identify_port, session, host, port, request_timeout=request_timeout)
+                future.add_done_callback(_record)
+                futures.append(future)
+            _, not_done = concurrent.futures.wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+            for future in not_done:
+                future.cancel()
+    timings.identify_seconds = time.monotonic() - started - timings.sweep_seconds
+
+    with results_lock:
+        found = list(results)
+    timings.identified = len(found)
+    timings.total_seconds = time.monotonic() - started
+    return found, timings
+
+
+def _try_http_probe(
+    subnet: str | list[str],
+    timeout: float,
+    on_found: Callable[[DiscoveredPrinter], None] | None = None,
+) -> list[DiscoveredPrinter]:
+    """Probe common printer ports on the local subnet(s).
+
+    See :func:`scan_subnets`; this logs the per-stage timings.
+    """
+    results, timings = scan_subnets(subnet, timeout=timeout, on_found=on_found)
+    logger.info(
+        "Subnet scan: %d hosts, %d open ports, %d printers in %.2fs (sweep %.2fs, identify %.2fs)",
+        timings.hosts,
+        timings.open_ports,
+        timings.identified,
+        timings.total_seconds,
+        timings.sweep_seconds,
+        timings.identify_seconds,
+    )
     return results
 
 
@@ -45,6 +45,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from kiln import parse_int_env
+from kiln.metrics import EVENT_DISPATCH_LATENCY
 
 logger = logging.getLogger(__name__)
 
@@ -246,6 +247,7 @@ class EventBus:
         handlers: list[tuple[EventHandler, EventFilter | None]],
     ) -> None:
         """Call each handler whose filter (if any) passes for *event*."""
+        started = time.perf_counter()
         for handler, filt in handlers:
             try:
                 if filt is not None and not filt(event):
@@ -257,6 +259,7 @@ class EventBus:
                     handler,
                     event.type.value,
                 )
+        EVENT_DISPATCH_LATENCY.observe(time.perf_counter() - started, labels={"event": event.type.value})
 
     # ------------------------------------------------------------------
     # Publish
@@ -20,6 +20,7 @@ Usage::
 from __future__ import annotations
 
 import logging
+import math
 import threading
 import time
 from dataclasses import dataclass, field
@@ -39,6 +40,16 @@ _PERIOD_SECONDS: dict[str, int] = {
 
 _VALID_PERIODS = frozenset(_PERIOD_SECONDS.keys())
 
+# Minute-resolution rollups cover the 24h window with a margin; longer
+# windows resolve their leading edge to the hour.
+_MINUTE_RETENTION_SECONDS = 25 * 3600
+
+# Hour and day rollups cover the longest period (30d) with a margin.
+_ROLLUP_RETENTION_SECONDS = 31 * 86400
+
+# Raw event records are kept this long after they have been rolled up.
+_RAW_RETENTION_SECONDS = 3600
+
 
 # ---------------------------------------------------------------------------
 # Data model
@@ -199,6 +210,136 @@ class _ErrorRecord:
     timestamp: float = field(default_factory=time.time)
 
 
+# ---------------------------------------------------------------------------
+# Rolling aggregates
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """Additive aggregates for one minute, hour or day.
+
+    Fleet-wide buckets also carry material / failure-mode counters and the
+    sets of printers observed and printing; per-printer buckets leave
+    those ``None``.
+    """
+
+    jobs: int = 0
+    successes: int = 0
+    timed_jobs: int = 0
+    duration_s: float = 0.0
+    filament_mm: float = 0.0
+    revenue: float = 0.0
+    errors: int = 0
+    state_obs: int = 0
+    up_obs: int = 0
+    materials: dict[str, int] | None = None
+    failure_modes: dict[str, int] | None = None
+    observed: set[str] | None = None
+    printing: set[str] | None = None
+
+    def add(self, other: _Bucket) -> None:
+        self.jobs += other.jobs
+        self.successes += other.successes
+        self.timed_jobs += other.timed_jobs
+        self.duration_s += other.duration_s
+        self.filament_mm += other.filament_mm
+        self.revenue += other.revenue
+        self.errors += other.errors
+        self.state_obs += other.state_obs
+        self.up_obs += other.up_obs
+        # Only ever called on fresh accumulator buckets, so the containers
+        # below are owned by ``self`` and safe to mutate.
+        if other.materials:
+            self.materials = _merge_counts(self.materials, other.materials)
+        if other.failure_modes:
+            self.failure_modes = _merge_counts(self.failure_modes, other.failure_modes)
+        if other.observed:
+            self.observed = self.observed | other.observed if self.observed else set(other.observed)
+        if other.printing:
+            self.printing = self.printing | other.printing if self.printing else set(other.printing)
+
+
+def _merge_counts(into: dict[str, int] | None, other: dict[str, int]) -> dict[str, int]:
+    if into is None:
+        return dict(other)
+    for key, count in other.items():
+        into[key] = into.get(key, 0) + count
+    return into
+
+
+class _Rollup:
+    """Minute, hour and day buckets for one aggregate stream.
+
+    Every event updates one bucket at each resolution.  Range queries walk
+    the coarsest buckets that fit, so a 30-day window touches at most ~30
+    day, ~46 hour and ~118 minute buckets regardless of event volume.
+    Minute detail is kept for :data:`_MINUTE_RETENTION_SECONDS`; older
+    range edges resolve to the hour.
+    """
+
+    __slots__ = ("days", "hours", "minutes")
+
+    def __init__(self) -> None:
+        self.minutes: dict[int, _Bucket] = {}
+        self.hours: dict[int, _Bucket] = {}
+        self.days: dict[int, _Bucket] = {}
+
+    def buckets(self, ts: float) -> tuple[_Bucket, _Bucket, _Bucket]:
+        """Return the (minute, hour, day) buckets containing *ts*."""
+        minute = int(ts // 60)
+        return (
+            self.minutes.setdefault(minute, _Bucket()),
+            self.hours.setdefault(minute // 60, _Bucket()),
+            self.days.setdefault(minute // 1440, _Bucket()),
+        )
+
+    def prune(self, now: float) -> None:
+        first_minute = math.ceil((now - _MINUTE_RETENTION_SECONDS) / 60)
+        for minute in [m for m in self.minutes if m < first_minute]:
+            del self.minutes[minute]
+        first_hour = math.ceil((now - _ROLLUP_RETENTION_SECONDS) / 3600)
+        for hour in [h for h in self.hours if h < first_hour]:
+            del self.hours[hour]
+        first_day = math.ceil((now - _ROLLUP_RETENTION_SECONDS) / 86400)
+        for day in [d for d in self.days if d < first_day]:
+            del self.days[day]
+
+    def total(self, first_minute: int, end_minute: int, now: float) -> _Bucket:
+        """Sum events in minutes ``[first_minute, end_minute)``."""
+        totals = _Bucket()
+        oldest_minute = math.ceil((now - _MINUTE_RETENTION_SECONDS) / 60)
+        m = first_minute
+        while m < end_minute:
+            if m % 1440 == 0 and m + 1440 <= end_minute:
+                bucket = self.days.get(m // 1440)
+                step = 1440
+            elif m % 60 == 0 and m + 60 <= end_minute:
+                bucket = self.hours.get(m // 60)
+                step = 60
+            elif m >= oldest_minute:
+                bucket = self.minutes.get(m)
+                step = 1
+            else:
+                # Minute detail already pruned: resume at the next hour.
+                bucket = None
+                step = 60 - m % 60
+            if bucket is not None:
+                totals.add(bucket)
+            m += step
+        return totals
+
+
+def _minute_span(start: float, end: float, now: float) -> tuple[int, int]:
+    """Map ``[start, end)`` to a half-open range of minute indices.
+
+    Events count from the first whole minute at or after *start*.  A range
+    ending at *now* includes the current (partial) minute.
+    """
+    last = int(now // 60) + 1 if end >= now else math.ceil(end / 60)
+    return math.ceil(start / 60), last
+
+
 # ---------------------------------------------------------------------------
 # Core engine
 # ---------------------------------------------------------------------------
@@ -209,6 +350,11 @@ class FleetAnalytics:
 
     Thread-safe.  All public methods acquire the internal lock.
 
+    Events are folded into minute/hour/day rollups as they are recorded,
+    so snapshots, reports and trends cost O(buckets) rather than
+    O(records).  Raw records are kept only briefly (for inspection) and
+    evicted once they are older than :data:`_RAW_RETENTION_SECONDS`.
+
     :param period: Default reporting period (``"24h"``, ``"7d"``, ``"30d"``).
     """
 
@@ -227,11 +373,62 @@ class FleetAnalytics:
         self._state_history: list[_PrinterStateRecord] = []
         self._revenue_records: list[dict[str, Any]] = []
 
-        # Max records to keep in memory
+        # Rolling aggregates, fleet-wide and per printer
+        self._fleet_rollup = _Rollup()
+        self._printer_rollups: dict[str, _Rollup] = {}
+        self._last_prune_minute = 0
+
+        # Max raw records to keep in memory
         self._max_job_records = 50000
         self._max_error_records = 10000
         self._max_state_history = 100000
 
+    # ------------------------------------------------------------------
+    # Aggregate maintenance
+    # ------------------------------------------------------------------
+
+    def _rollups_for(self, printer_id: str | None, ts: float) -> list[tuple[_Bucket, bool]]:
+        """Buckets to update for an event: ``(bucket, is_fleet)`` pairs.
+
+        Events older than the rollup retention are not aggregated.  Must be
+        called with ``self._lock`` held.
+        """
+        if ts < time.time() - _ROLLUP_RETENTION_SECONDS:
+            return []
+        pairs = [(bucket, True) for bucket in self._fleet_rollup.buckets(ts)]
+        if printer_id is not None:
+            rollup = self._printer_rollups.get(printer_id)
+            if rollup is None:
+                rollup = self._printer_rollups[printer_id] = _Rollup()
+            pairs.extend((bucket, False) for bucket in rollup.buckets(ts))
+        return pairs
+
+    def _maybe_prune(self, now: float) -> None:
+        """Drop expired buckets and raw records, at most once a minute.
+
+        Must be called with ``self._lock`` held.
+        """
+        minute = int(now // 60)
+        if minute == self._last_prune_minute:
+            return
+        self._last_prune_minute = minute
+        self._fleet_rollup.prune(now)
+        for rollup in self._printer_rollups.values():
+            rollup.prune(now)
+
+        raw_cutoff = now - _RAW_RETENTION_SECONDS
+        self._job_records = [j for j in self._job_records if j.recorded_at >= raw_cutoff]
+        self._error_records = [e for e in self._error_records if e.timestamp >= raw_cutoff]
+        self._state_history = [s for s in self._state_history if s.timestamp >= raw_cutoff]
+        self._revenue_records = [r for r in self._revenue_records if r["timestamp"] >= raw_cutoff]
+
+    def _window(self, rollup: _Rollup | None, start: float, end: float, now: float) -> _Bucket:
+        """Sum *rollup* over ``[start, end)``.  Must hold ``self._lock``."""
+        if rollup is None:
+            return _Bucket()
+        first, last = _minute_span(start, end, now)
+        return rollup.total(first, last, now)
+
     # ------------------------------------------------------------------
     # Event ingestion
     # ------------------------------------------------------------------
@@ -273,9 +470,22 @@ class FleetAnalytics:
             recorded_at=recorded_at if recorded_at is not None else time.time(),
         )
         with self._lock:
+            for bucket, is_fleet in self._rollups_for(printer_id, record.recorded_at):
+                bucket.jobs += 1
+                if success:
+                    bucket.successes += 1
+                if duration_s > 0:
+                    bucket.timed_jobs += 1
+                    bucket.duration_s += duration_s
+                bucket.filament_mm += filament_used_mm
+                if is_fleet:
+                    bucket.materials = _merge_counts(bucket.materials, {material: 1})
+                    if failure_mode:
+                        bucket.failure_modes = _merge_counts(bucket.failure_modes, {failure_mode: 1})
             self._job_records.append(record)
             if len(self._job_records) > self._max_job_records:
                 self._job_records = self._job_records[-self._max_job_records :]
+            self._maybe_prune(time.time())
 
     def record_printer_state(
         self,
@@ -300,14 +510,29 @@ class FleetAnalytics:
             state=state,
             timestamp=ts,
         )
+        is_up = state not in ("offline", "error")
         with self._lock:
             self._printer_states[printer_id] = record
             if model is not None:
                 self._printer_models[printer_id] = model
             self._printer_jobs[printer_id] = current_job
+            for bucket, is_fleet in self._rollups_for(printer_id, ts):
+                if is_fleet:
+                    if bucket.observed is None:
+                        bucket.observed = set()
+                    bucket.observed.add(printer_id)
+                    if state == "printing":
+                        if bucket.printing is None:
+                            bucket.printing = set()
+                        bucket.printing.add(printer_id)
+                else:
+                    bucket.state_obs += 1
+                    if is_up:
+                        bucket.up_obs += 1
             self._state_history.append(record)
             if len(self._state_history) > self._max_state_history:
                 self._state_history = self._state_history[-self._max_state_history :]
+            self._maybe_prune(time.time())
 
     def record_error(
         self,
@@ -328,9 +553,13 @@ class FleetAnalytics:
             timestamp=timestamp if timestamp is not None else time.time(),
         )
         with self._lock:
+            for bucket, is_fleet in self._rollups_for(printer_id, record.timestamp):
+                if not is_fleet:
+                    bucket.errors += 1
             self._error_records.append(record)
             if len(self._error_records) > self._max_error_records:
                 self._error_records = self._error_records[-self._max_error_records :]
+            self._maybe_prune(time.time())
 
     def record_revenue(
         self,
@@ -343,13 +572,12 @@ class FleetAnalytics:
         :param amount: Revenue amount.
         :param timestamp: Override timestamp (defaults to now).
         """
+        ts = timestamp if timestamp is not None else time.time()
         with self._lock:
-            self._revenue_records.append(
-                {
-                    "amount": amount,
-                    "timestamp": timestamp if timestamp is not None else time.time(),
-                }
-            )
+            for bucket, _ in self._rollups_for(None, ts):
+                bucket.revenue += amount
+            self._revenue_records.append({"amount": amount, "timestamp": ts})
+            self._maybe_prune(time.time())
 
     # ------------------------------------------------------------------
     # Snapshots
@@ -386,34 +614,13 @@ class FleetAnalytics:
                 error += 1
 
         # Job stats for the period
-        period_jobs = [j for j in self._job_records if j.recorded_at >= cutoff]
-        total_jobs = len(period_jobs)
-        successful = sum(1 for j in period_jobs if j.success)
-        failed = sum(1 for j in period_jobs if not j.success)
-
-        # Average print time
-        durations = [j.duration_s for j in period_jobs if j.duration_s > 0]
-        avg_print_time = sum(durations) / len(durations) if durations else 0.0
-
-        # Filament usage
-        total_filament = sum(j.filament_used_mm for j in period_jobs)
-
-        # Revenue
-        period_revenue = [r for r in self._revenue_records if r["timestamp"] >= cutoff]
-        revenue = sum(r["amount"] for r in period_revenue)
-
-        # Top material
-        material_counts: dict[str, int] = {}
-        for j in period_jobs:
-            material_counts[j.material] = material_counts.get(j.material, 0) + 1
-        top_material = max(material_counts, key=material_counts.get) if material_counts else "none"
-
-        # Top failure mode
-        failure_counts: dict[str, int] = {}
-        for j in period_jobs:
-            if j.failure_mode:
-                failure_counts[j.failure_mode] = failure_counts.get(j.failure_mode, 0) + 1
-        top_failure = max(failure_counts, key=failure_counts.get) if failure_counts else None
+        period = self._window(self._fleet_rollup, cutoff, now, now)
+        avg_print_time = period.duration_s / period.timed_jobs if period.timed_jobs else 0.0
+
+        material_counts = period.materials or {}
+        top_material = max(material_counts, key=material_counts.__getitem__) if material_counts else "none"
+        failure_counts = period.failure_modes or {}
+        top_failure = max(failure_counts, key=failure_counts.__getitem__) if failure_counts else None
 
         # Utilization = printing / total (avoid division by zero)
         utilization = (printing / total * 100.0) if total > 0 else 0.0
@@ -425,13 +632,13 @@ class FleetAnalytics:
             printing_printers=printing,
             idle_printers=idle,
             error_printers=error,
-            total_jobs_today=total_jobs,
-            successful_jobs_today=successful,
-            failed_jobs_today=failed,
+            total_jobs_today=period.jobs,
+            successful_jobs_today=period.successes,
+            failed_jobs_today=period.jobs - period.successes,
             fleet_utilization_pct=utilization,
             avg_print_time_today_s=avg_print_time,
-            total_filament_used_today_mm=total_filament,
-            revenue_today=revenue,
+            total_filament_used_today_mm=period.filament_mm,
+            revenue_today=period.revenue,
             top_material=top_material,
             top_failure_mode=top_failure,
         )
@@ -450,7 +657,7 @@ class FleetAnalytics:
         cutoff = now - _PERIOD_SECONDS["24h"]
 
         with self._lock:
-            return self._build_printer_analytics(printer_id, cutoff)
+            return self._build_printer_analytics(printer_id, cutoff, now)
 
     def get_all_printer_analytics(self) -> list[PrinterAnalytics]:
         """Return analytics for all tracked printers."""
@@ -459,9 +666,9 @@ class FleetAnalytics:
 
         with self._lock:
             printer_ids = sorted(self._printer_states.keys())
-            return [self._build_printer_analytics(pid, cutoff) for pid in printer_ids]
+            return [self._build_printer_analytics(pid, cutoff, now) for pid in printer_ids]
 
-    def _build_printer_analytics(self, printer_id: str, cutoff: float) -> PrinterAnalytics:
+    def _build_printer_analytics(self, printer_id: str, cutoff: float, now: float) -> PrinterAnalytics:
         """Build analytics for one printer.
 
         Must be called with ``self._lock`` held.
@@ -475,28 +682,13 @@ class FleetAnalytics:
         model = self._printer_models.get(printer_id, "unknown")
         current_job = self._printer_jobs.get(printer_id)
 
-        # Jobs in window
-        jobs = [j for j in self._job_records if j.printer_id == printer_id and j.recorded_at >= cutoff]
-        job_count = len(jobs)
-        successful = sum(1 for j in jobs if j.success)
-        success_rate = (successful / job_count * 100.0) if job_count > 0 else 0.0
-
-        # Average duration
-        durations = [j.duration_s for j in jobs if j.duration_s > 0]
-        avg_duration = sum(durations) / len(durations) if durations else 0.0
-
-        # Filament
-        filament = sum(j.filament_used_mm for j in jobs)
-
-        # Errors in window
-        errors = [e for e in self._error_records if e.printer_id == printer_id and e.timestamp >= cutoff]
-        error_count = len(errors)
+        window = self._window(self._printer_rollups.get(printer_id), cutoff, now, now)
+        success_rate = (window.successes / window.jobs * 100.0) if window.jobs > 0 else 0.0
+        avg_duration = window.duration_s / window.timed_jobs if window.timed_jobs else 0.0
 
         # Uptime: fraction of state observations that are not offline/error
-        state_obs = [s for s in self._state_history if s.printer_id == printer_id and s.timestamp >= cutoff]
-        if state_obs:
-            up_obs = sum(1 for s in state_obs if s.state not in ("offline", "error"))
-            uptime_pct = up_obs / len(state_obs) * 100.0
+        if window.state_obs:
+            uptime_pct = window.up_obs / window.state_obs * 100.0
         else:
             # No observations — use current state as a single sample
             uptime_pct = 0.0 if current.state in ("offline", "error") else 100.0
@@ -505,13 +697,13 @@ class FleetAnalytics:
             printer_id=printer_id,
             printer_model=model,
             uptime_pct=uptime_pct,
-            job_count_24h=job_count,
+            job_count_24h=window.jobs,
             success_rate_24h=success_rate,
             avg_job_duration_s=avg_duration,
             current_state=current.state,
             current_job=current_job,
-            filament_used_24h_mm=filament,
-            error_count_24h=error_count,
+            filament_used_24h_mm=window.filament_mm,
+            error_count_24h=window.errors,
         )
 
     # ------------------------------------------------------------------
@@ -533,7 +725,7 @@ class FleetAnalytics:
         with self._lock:
             snapshot = self._build_fleet_snapshot(now, cutoff)
             printer_ids = sorted(self._printer_states.keys())
-            printer_analytics = [self._build_printer_analytics(pid, cutoff) for pid in printer_ids]
+            printer_analytics = [self._build_printer_analytics(pid, cutoff, now) for pid in printer_ids]
 
             # Time series (hourly buckets for 24h, daily for 7d/30d)
             if period == "24h":
@@ -547,8 +739,8 @@ class FleetAnalytics:
             revenue_ts = self._build_revenue_trend(cutoff, now, interval_minutes)
 
             # Breakdowns
-            material_breakdown = self._build_material_breakdown(cutoff)
-            failure_breakdown = self._build_failure_breakdown(cutoff)
+            material_breakdown = self._build_material_breakdown(cutoff, now)
+            failure_breakdown = self._build_failure_breakdown(cutoff, now)
 
         return AnalyticsReport(
             period=period,
@@ -582,33 +774,35 @@ class FleetAnalytics:
         with self._lock:
             return self._build_utilization_trend(cutoff, now, interval_minutes)
 
+    def _trend_windows(self, cutoff: float, now: float, interval_minutes: int) -> list[tuple[float, _Bucket]]:
+        """Fleet totals for consecutive ``interval_minutes`` windows.
+
+        Must be called with ``self._lock`` held.
+        """
+        interval_s = interval_minutes * 60
+        windows: list[tuple[float, _Bucket]] = []
+        bucket_start = cutoff
+        while bucket_start < now:
+            bucket_end = min(bucket_start + interval_s, now)
+            windows.append((bucket_start, self._window(self._fleet_rollup, bucket_start, bucket_end, now)))
+            bucket_start = bucket_end
+        return windows
+
     def _build_utilization_trend(
         self,
         cutoff: float,
         now: float,
         interval_minutes: int,
     ) -> list[TimeSeriesPoint]:
-        """Build utilization time series from state history.
+        """Build utilization time series from state observations.
 
         Must be called with ``self._lock`` held.
         """
-        interval_s = interval_minutes * 60
         points: list[TimeSeriesPoint] = []
-
-        bucket_start = cutoff
-        while bucket_start < now:
-            bucket_end = min(bucket_start + interval_s, now)
-
-            # State observations in this bucket
-            obs = [s for s in self._state_history if bucket_start <= s.timestamp < bucket_end]
-            if obs:
-                # Unique printers observed
-                printer_ids = {s.printer_id for s in obs}
-                printing_ids = {s.printer_id for s in obs if s.state == "printing"}
-                utilization = len(printing_ids) / len(printer_ids) * 100.0 if printer_ids else 0.0
-            else:
-                utilization = 0.0
-
+        for bucket_start, totals in self._trend_windows(cutoff, now, interval_minutes):
+            # Unique printers observed vs. seen printing in this window
+            observed = totals.observed or set()
+            utilization = len(totals.printing or ()) / len(observed) * 100.0 if observed else 0.0
             points.append(
                 TimeSeriesPoint(
                     timestamp=bucket_start,
@@ -616,8 +810,6 @@ class FleetAnalytics:
                     label="utilization_pct",
                 )
             )
-            bucket_start = bucket_end
-
         return points
 
     def _build_success_rate_trend(
@@ -626,24 +818,13 @@ class FleetAnalytics:
         now: float,
         interval_minutes: int,
     ) -> list[TimeSeriesPoint]:
-        """Build success rate time series from job records.
+        """Build success rate time series from job aggregates.
 
         Must be called with ``self._lock`` held.
         """
-        interval_s = interval_minutes * 60
         points: list[TimeSeriesPoint] = []
-
-        bucket_start = cutoff
-        while bucket_start < now:
-            bucket_end = min(bucket_start + interval_s, now)
-
-            jobs = [j for j in self._job_records if bucket_start <= j.recorded_at < bucket_end]
-            if jobs:
-                success_count = sum(1 for j in jobs if j.success)
-                rate = success_count / len(jobs) * 100.0
-            else:
-                rate = 0.0
-
+        for bucket_start, totals in self._trend_windows(cutoff, now, interval_minutes):
+            rate = totals.successes / totals.jobs * 100.0 if totals.jobs else 0.0
             points.append(
                 TimeSeriesPoint(
                     timestamp=bucket_start,
@@ -651,8 +832,6 @@ class FleetAnalytics:
                     label="success_rate_pct",
                 )
             )
-            bucket_start = bucket_end
-
         return points
 
     def _build_revenue_trend(
@@ -661,56 +840,36 @@ class FleetAnalytics:
         now: float,
         interval_minutes: int,
     ) -> list[TimeSeriesPoint]:
-        """Build revenue time series from revenue records.
+        """Build revenue time series from revenue aggregates.
 
         Must be called with ``self._lock`` held.
         """
-        interval_s = interval_minutes * 60
-        points: list[TimeSeriesPoint] = []
-
-        bucket_start = cutoff
-        while bucket_start < now:
-            bucket_end = min(bucket_start + interval_s, now)
-
-            records = [r for r in self._revenue_records if bucket_start <= r["timestamp"] < bucket_end]
-            total = sum(r["amount"] for r in records)
-
-            points.append(
-                TimeSeriesPoint(
-                    timestamp=bucket_start,
-                    value=round(total, 2),
-                    label="revenue",
-                )
+        return [
+            TimeSeriesPoint(
+                timestamp=bucket_start,
+                value=round(totals.revenue, 2),
+                label="revenue",
             )
-            bucket_start = bucket_end
-
-        return points
+            for bucket_start, totals in self._trend_windows(cutoff, now, interval_minutes)
+        ]
 
     # ------------------------------------------------------------------
     # Breakdowns
     # ------------------------------------------------------------------
 
-    def _build_material_breakdown(self, cutoff: float) -> dict[str, int]:
+    def _build_material_breakdown(self, cutoff: float, now: float) -> dict[str, int]:
         """Material → job count for the period.
 
         Must be called with ``self._lock`` held.
         """
-        counts: dict[str, int] = {}
-        for j in self._job_records:
-            if j.recorded_at >= cutoff:
-                counts[j.material] = counts.get(j.material, 0) + 1
-        return counts
+        return dict(self._window(self._fleet_rollup, cutoff, now, now).materials or {})
 
-    def _build_failure_breakdown(self, cutoff: float) -> dict[str, int]:
+    def _build_failure_breakdown(self, cutoff: float, now: float) -> dict[str, int]:
         """Failure mode → count for the period.
 
         Must be called with ``self._lock`` held.
         """
-        counts: dict[str, int] = {}
-        for j in self._job_records:
-            if j.recorded_at >= cutoff and j.failure_mode:
-                counts[j.failure_mode] = counts.get(j.failure_mode, 0) + 1
-        return counts
+        return dict(self._window(self._fleet_rollup, cutoff, now, now).failure_modes or {})
 
     # ------------------------------------------------------------------
     # Ranking queries
@@ -726,7 +885,7 @@ class FleetAnalytics:
 
         with self._lock:
             printer_ids = list(self._printer_states.keys())
-            analytics = [self._build_printer_analytics(pid, cutoff) for pid in printer_ids]
+            analytics = [self._build_printer_analytics(pid, cutoff, now) for pid in printer_ids]
 
         # Sort by success rate descending, then by job count descending
         analytics.sort(key=lambda a: (a.success_rate_24h, a.job_count_24h), reverse=True)
@@ -742,7 +901,7 @@ class FleetAnalytics:
 
         with self._lock:
             printer_ids = list(self._printer_states.keys())
-            analytics = [self._build_printer_analytics(pid, cutoff) for pid in printer_ids]
+            analytics = [self._build_printer_analytics(pid, cutoff, now) for pid in printer_ids]
 
         return [a for a in analytics if a.error_count_24h > error_threshold]
 
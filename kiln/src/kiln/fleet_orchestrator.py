@@ -13,6 +13,10 @@ decisions.
 The orchestrator does NOT communicate with printers directly — it delegates
 to the registry and queue, keeping a clean separation of concerns.
 
+:meth:`FleetOrchestrator.assign_jobs` polls the fleet once per round into a
+:class:`FleetSnapshot` and matches every queued job against it in a single
+assignment, scored by pluggable :class:`PrinterSelector` strategies.
+
 Example::
 
     orch = get_fleet_orchestrator()
@@ -20,6 +24,12 @@ Example::
     status = orch.get_job_status(job_id)
     orch.cancel_job(job_id, reason="wrong filament loaded")
     utilization = orch.get_fleet_utilization()
+
+    orch = FleetOrchestrator(
+        selector=CompositeSelector(MaterialSelector(), BuildVolumeSelector(), LoadBalancingSelector()),
+    )
+    results = orch.assign_jobs()
+    orch.get_assignment_metrics().to_dict()
 """
 
 from __future__ import annotations
@@ -32,8 +42,15 @@ import uuid
 from dataclasses import asdict, dataclass, field
 from typing import Any
 
+from kiln.assignment import solve_assignment
+
 logger = logging.getLogger(__name__)
 
+# Score bonus for a job's ``preferred_printer``.  Larger than the sum of
+# all strategy scores, so an idle preferred printer always wins among that
+# job's candidates.  Scores never decide which jobs are admitted.
+_PREFERRED_PRINTER_BONUS: float = 10.0
+
 
 # ---------------------------------------------------------------------------
 # Exceptions
@@ -233,11 +250,97 @@ class FleetUtilization:
         return asdict(self)
 
 
+@dataclass
+class FleetSnapshot:
+    """Point-in-time view of the fleet used for one assignment round.
+
+    Printer capabilities come from registry tags: ``materials`` is a
+    comma-separated list (e.g. ``"PLA,PETG"``) and ``build_volume`` is
+    ``"XxYxZ"`` in mm.  Printers without a tag are treated as unknown
+    rather than incompatible.
+
+    :param idle_printers: Sorted names of printers that can accept a job.
+    :param materials: Printer name → upper-cased supported materials.
+    :param build_volumes: Printer name → ``(x, y, z)`` build volume in mm.
+    :param assignment_counts: Printer name → jobs assigned by this
+        orchestrator so far (for load balancing).
+    :param taken_at: Unix timestamp when the snapshot was taken.
+    """
+
+    idle_printers: list[str]
+    materials: dict[str, list[str]] = field(default_factory=dict)
+    build_volumes: dict[str, tuple[float, float, float]] = field(default_factory=dict)
+    assignment_counts: dict[str, int] = field(default_factory=dict)
+    taken_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable dictionary."""
+        return {
+            "idle_printers": list(self.idle_printers),
+            "materials": {k: list(v) for k, v in self.materials.items()},
+            "build_volumes": {k: list(v) for k, v in self.build_volumes.items()},
+            "assignment_counts": dict(self.assignment_counts),
+            "taken_at": self.taken_at,
+        }
+
+
+@dataclass
+class AssignmentMetrics:
+    """Cumulative metrics for batched assignment rounds.
+
+    :param rounds: Number of :meth:`FleetOrchestrator.assign_jobs` rounds run.
+    :param jobs_considered: Queued jobs seen across all rounds.
+    :param jobs_assigned: Jobs assigned across all rounds.
+    :param fleet_queries: Fleet-wide idle-printer polls performed.
+    :param fleet_queries_avoided: Polls a per-job assignment loop would
+        have made on top of the one snapshot per round.
+    :param last_latency_ms: Wall time of the most recent round.
+    :param total_latency_ms: Wall time of all rounds.
+    """
+
+    rounds: int = 0
+    jobs_considered: int = 0
+    jobs_assigned: int = 0
+    fleet_queries: int = 0
+    fleet_queries_avoided: int = 0
+    last_latency_ms: float = 0.0
+    total_latency_ms: float = 0.0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        """Mean wall time per round."""
+        return self.total_latency_ms / self.rounds if self.rounds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable dictionary."""
+        data = asdict(self)
+        data["last_latency_ms"] = round(self.last_latency_ms, 3)
+        data["total_latency_ms"] = round(self.total_latency_ms, 3)
+        data["avg_latency_ms"] = round(self.avg_latency_ms, 3)
+        return data
+
+
 # ---------------------------------------------------------------------------
 # Printer selection strategy
 # ---------------------------------------------------------------------------
 
 
+def _parse_materials(raw: str) -> list[str]:
+    return [m.strip().upper() for m in raw.split(",") if m.strip()]
+
+
+def _parse_build_volume(raw: Any) -> tuple[float, float, float] | None:
+    """Parse ``"XxYxZ"`` or a 3-sequence into a build volume, else ``None``."""
+    try:
+        parts = raw.lower().split("x") if isinstance(raw, str) else list(raw)
+        if len(parts) != 3:
+            return None
+        x, y, z = (float(p) for p in parts)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return (x, y, z)
+
+
 class PrinterSelector:
     """Selects the best available printer for a job.
 
@@ -246,30 +349,187 @@ class PrinterSelector:
     already failed this job.  Subclass or replace with a custom callable
     for more sophisticated strategies (e.g. load balancing, material
     matching, build-volume filtering).
+
+    Single-job and batched assignment both go through :meth:`score`.
+    Strategies override :meth:`rank`; the base :meth:`score` applies the
+    failed-printer filter and preferred-printer bonus around it, and
+    :meth:`select` picks the best-scoring printer.
     """
 
     def select(
         self,
         job: OrchestratedJob,
         idle_printers: list[str],
+        snapshot: FleetSnapshot | None = None,
     ) -> str | None:
         """Choose a printer for *job* from the list of idle printers.
 
+        Picks the highest :meth:`score`; ties go to the earliest printer
+        (stable ordering from the registry).
+
         :param job: The job that needs a printer.
         :param idle_printers: Names of printers currently idle.
+        :param snapshot: Fleet snapshot passed to :meth:`rank`.  Defaults
+            to one listing only *idle_printers*.
         :returns: Printer name, or ``None`` if no suitable printer is available.
         """
-        # Filter out printers that already failed this job.
-        candidates = [p for p in idle_printers if p not in job.failed_printers]
-        if not candidates:
+        return _best_printer(self, job, idle_printers, snapshot)
+
+    def score(
+        self,
+        job: OrchestratedJob,
+        printer_name: str,
+        snapshot: FleetSnapshot,
+    ) -> float | None:
+        """Score how well *printer_name* suits *job*; higher is better.
+
+        :param job: The job that needs a printer.
+        :param printer_name: An idle printer from *snapshot*.
+        :param snapshot: The fleet snapshot for this assignment round.
+        :returns: Score, or ``None`` if the printer must not take the job.
+        """
+        if printer_name in job.failed_printers:
+            return None
+        extra = self.rank(job, printer_name, snapshot)
+        if extra is None:
+            return None
+        if job.preferred_printer == printer_name:
+            extra += _PREFERRED_PRINTER_BONUS
+        return extra
+
+    def rank(
+        self,
+        job: OrchestratedJob,
+        printer_name: str,
+        snapshot: FleetSnapshot,
+    ) -> float | None:
+        """Strategy-specific score in ``[0, 1]``, or ``None`` to exclude.
+
+        The base strategy has no preference between printers.
+        """
+        return 0.0
+
+
+class MaterialSelector(PrinterSelector):
+    """Match the job's ``metadata["material"]`` against printer materials.
+
+    Printers that list the material score 1.0; printers without a
+    ``materials`` tag score 0.0; printers listing other materials only
+    are excluded.
+    """
+
+    def rank(
+        self,
+        job: OrchestratedJob,
+        printer_name: str,
+        snapshot: FleetSnapshot,
+    ) -> float | None:
+        material = job.metadata.get("material")
+        if not material:
+            return 0.0
+        supported = snapshot.materials.get(printer_name)
+        if not supported:
+            return 0.0
+        return 1.0 if str(material).strip().upper() in supported else None
+
+
+class BuildVolumeSelector(PrinterSelector):
+    """Exclude printers smaller than the job's ``metadata["min_build_volume"]``.
+
+    Among printers that fit, tighter fits score higher so large printers
+    stay free for large jobs.  Printers without a ``build_volume`` tag
+    score 0.0.
+    """
+
+    def rank(
+        self,
+        job: OrchestratedJob,
+        printer_name: str,
+        snapshot: FleetSnapshot,
+    ) -> float | None:
+        required = _parse_build_volume(job.metadata.get("min_build_volume"))
+        if required is None:
+            return 0.0
+        volume = snapshot.build_volumes.get(printer_name)
+        if volume is None:
+            return 0.0
+        if any(have < need for have, need in zip(volume, required, strict=True)):
             return None
+        needed = required[0] * required[1] * required[2]
+        available = volume[0] * volume[1] * volume[2]
+        return needed / available if available > 0 else 0.0
+
 
-        # Prefer the explicitly requested printer if available.
-        if job.preferred_printer and job.preferred_printer in candidates:
-            return job.preferred_printer
+class LoadBalancingSelector(PrinterSelector):
+    """Prefer printers that this orchestrator has assigned fewer jobs to."""
 
-        # Default: first available (stable ordering from registry).
-        return candidates[0]
+    def rank(
+        self,
+        job: OrchestratedJob,
+        printer_name: str,
+        snapshot: FleetSnapshot,
+    ) -> float | None:
+        return 1.0 / (1 + snapshot.assignment_counts.get(printer_name, 0))
+
+
+class CompositeSelector(PrinterSelector):
+    """Sum the :meth:`~PrinterSelector.rank` of several strategies.
+
+    A printer excluded by any strategy is excluded overall.  Single-job
+    :meth:`~PrinterSelector.select` keeps the base behaviour.
+
+    :param selectors: Strategies to combine.
+    """
+
+    def __init__(self, *selectors: PrinterSelector) -> None:
+        self.selectors = list(selectors)
+
+    def rank(
+        self,
+        job: OrchestratedJob,
+        printer_name: str,
+        snapshot: FleetSnapshot,
+    ) -> float | None:
+        total = 0.0
+        for selector in self.selectors:
+            value = selector.rank(job, printer_name, snapshot)
+            if value is None:
+                return None
+            total += value
+        return total
+
+
+def _best_printer(
+    selector: PrinterSelector,
+    job: OrchestratedJob,
+    printers: list[str],
+    snapshot: FleetSnapshot | None,
+) -> str | None:
+    """Return the printer in *printers* with the highest score for *job*."""
+    if snapshot is None:
+        snapshot = FleetSnapshot(idle_printers=list(printers))
+    best: str | None = None
+    best_score = 0.0
+    for name in printers:
+        value = selector.score(job, name, snapshot)
+        if value is not None and (best is None or value > best_score):
+            best, best_score = name, value
+    return best
+
+
+def _augment(row: int, allowed: list[list[int]], owner: dict[int, int], seen: set[int]) -> bool:
+    """Find a printer for *row*, moving earlier rows if needed (Kuhn's algorithm).
+
+    *owner* maps printer column to row and is only updated on success.
+    """
+    for col in allowed[row]:
+        if col in seen:
+            continue
+        seen.add(col)
+        if col not in owner or _augment(owner[col], allowed, owner, seen):
+            owner[col] = row
+            return True
+    return False
 
 
 # ---------------------------------------------------------------------------
@@ -311,6 +571,8 @@ class FleetOrchestrator:
         self._jobs: dict[str, OrchestratedJob] = {}
         self._lock = threading.Lock()
         self._printer_jobs: dict[str, str] = {}  # printer_name -> job_id
+        self._assignment_counts: dict[str, int] = {}  # printer_name -> jobs assigned
+        self._metrics = AssignmentMetrics()
 
     # ------------------------------------------------------------------
     # Lazy accessors for kiln subsystems
@@ -466,9 +728,11 @@ class FleetOrchestrator:
     def assign_job(self, job_id: str) -> AssignmentResult:
         """Attempt to assign a specific queued job to an available printer.
 
-        The printer selector chooses the best candidate from the idle
-        printers in the registry.  If assignment succeeds, the job
-        transitions to ``ASSIGNED`` state.
+        The printer selector scores the idle printers in the registry the
+        same way :meth:`assign_jobs` does and the best one is chosen.
+        Printers already holding an active job from this orchestrator are
+        skipped.  If assignment succeeds, the job transitions to
+        ``ASSIGNED`` state.
 
         :param job_id: ID of the job to assign.
         :returns: :class:`AssignmentResult` indicating success or failure.
@@ -483,9 +747,9 @@ class FleetOrchestrator:
                     message=(f"Job {job_id} is {job.status.value}, only QUEUED jobs can be assigned"),
                 )
 
-            registry = self._get_registry()
+            self._metrics.fleet_queries += 1
             try:
-                idle_names = registry.get_idle_printers()
+                idle_names, materials, build_volumes = self._poll_fleet()
             except Exception as exc:
                 logger.warning("Failed to query idle printers: %s", exc)
                 return AssignmentResult(
@@ -493,7 +757,10 @@ class FleetOrchestrator:
                     message=f"Failed to query printer fleet: {exc}",
                 )
 
-            printer_name = self._selector.select(job, idle_names)
+            snapshot = self._build_snapshot(idle_names, materials, build_volumes)
+            available = set(snapshot.idle_printers)
+            candidates = [name for name in idle_names if name in available]
+            printer_name = _best_printer(self._selector, job, candidates, snapshot)
             if printer_name is None:
                 return AssignmentResult(
                     success=False,
@@ -505,6 +772,7 @@ class FleetOrchestrator:
             job.status = OrchestratedJobStatus.ASSIGNED
             job.attempt += 1
             self._printer_jobs[printer_name] = job_id
+            self._assignment_counts[printer_name] = self._assignment_counts.get(printer_name, 0) + 1
 
         logger.info(
             "Assigned job %s to printer %r (attempt %d/%d)",
@@ -527,38 +795,186 @@ class FleetOrchestrator:
             message=f"Assigned to {printer_name}",
         )
 
-    def assign_jobs(self) -> list[AssignmentResult]:
-        """Attempt to assign all queued jobs to available printers.
+    def take_fleet_snapshot(self) -> FleetSnapshot:
+        """Poll the fleet once and capture everything assignment needs.
+
+        Printers already holding an ``ASSIGNED`` or ``PRINTING`` job from
+        this orchestrator are left out even if they still report idle.
+
+        :raises Exception: Whatever the registry raises when polling fails.
+        """
+        with self._lock:
+            self._metrics.fleet_queries += 1
+        fleet = self._poll_fleet()
+        with self._lock:
+            return self._build_snapshot(*fleet)
 
-        Jobs are processed in priority order (highest first), then by
-        submission time (oldest first).
+    def _poll_fleet(
+        self,
+    ) -> tuple[list[str], dict[str, list[str]], dict[str, tuple[float, float, float]]]:
+        """Return idle printers in registry order with their materials and build volumes."""
+        registry = self._get_registry()
+        idle_names = list(registry.get_idle_printers())
 
-        :returns: List of :class:`AssignmentResult` for each queued job.
+        materials: dict[str, list[str]] = {}
+        build_volumes: dict[str, tuple[float, float, float]] = {}
+        for name in idle_names:
+            try:
+                tags = registry.get_metadata(name).tags
+            except Exception:
+                continue
+            if not isinstance(tags, dict):
+                continue
+            if tags.get("materials"):
+                materials[name] = _parse_materials(str(tags["materials"]))
+            volume = _parse_build_volume(tags.get("build_volume"))
+            if volume is not None:
+                build_volumes[name] = volume
+        return idle_names, materials, build_volumes
+
+    def _build_snapshot(
+        self,
+        idle_names: list[str],
+        materials: dict[str, list[str]],
+        build_volumes: dict[str, tuple[float, float, float]],
+    ) -> FleetSnapshot:
+        """Drop printers holding an active job and capture the snapshot.
+
+        Caller must hold ``_lock``.
         """
+        busy = {
+            name
+            for name, job_id in self._printer_jobs.items()
+            if (held := self._jobs.get(job_id)) is not None and not held.is_terminal
+        }
+        return FleetSnapshot(
+            idle_printers=sorted(n for n in idle_names if n not in busy),
+            materials=materials,
+            build_volumes=build_volumes,
+            assignment_counts=dict(self._assignment_counts),
+        )
+
+    def assign_jobs(self, snapshot: FleetSnapshot | None = None) -> list[AssignmentResult]:
+        """Attempt to assign all queued jobs to available printers.
+
+        The fleet is polled once (or *snapshot* is used as given) and all
+        queued jobs are matched against it.  Jobs are admitted in priority
+        order (highest first), then by submission time (oldest first),
+        whenever every admitted job can still get a printer, so a
+        lower-priority job never displaces a higher-priority one however
+        it scores.  Admitted jobs are then matched to printers to maximise
+        the total :meth:`PrinterSelector.score`.  All assignments are
+        committed under a single lock acquisition.
+
+        :param snapshot: Optional pre-taken :class:`FleetSnapshot`.
+        :returns: List of :class:`AssignmentResult` for each queued job,
+            in priority order.
+        """
+        started = time.monotonic()
         with self._lock:
             queued = [j for j in self._jobs.values() if j.status == OrchestratedJobStatus.QUEUED]
 
         # Sort: highest priority first, then oldest first.
         queued.sort(key=lambda j: (-j.priority, j.submitted_at))
+        if not queued:
+            return []
 
-        results: list[AssignmentResult] = []
+        if snapshot is None:
+            try:
+                snapshot = self.take_fleet_snapshot()
+            except Exception as exc:
+                logger.warning("Failed to query idle printers: %s", exc)
+                return [
+                    AssignmentResult(success=False, message=f"Failed to query printer fleet: {exc}")
+                    for _ in queued
+                ]
+        printers = snapshot.idle_printers
+
+        # Admit jobs in priority order, skipping those that cannot get a
+        # printer without bumping an already admitted job, until every
+        # printer has a candidate.
+        rows: list[OrchestratedJob] = []
+        matrix: list[list[float | None]] = []
+        allowed: list[list[int]] = []
+        owner: dict[int, int] = {}  # printer column -> admitted row
         for job in queued:
-            result = self.assign_job(job.job_id)
-            results.append(result)
-            # Stop if we ran out of printers.
-            if not result.success and "No suitable" in result.message:
-                # Remaining jobs would also fail; skip them.
-                for _remaining in queued[len(results) :]:
-                    results.append(
-                        AssignmentResult(
-                            success=False,
-                            message="No idle printers remaining",
-                        )
-                    )
+            if len(rows) >= len(printers):
                 break
+            scores = [self._selector.score(job, p, snapshot) for p in printers]
+            allowed.append([c for c, sc in enumerate(scores) if sc is not None])
+            if not _augment(len(rows), allowed, owner, set()):
+                allowed.pop()
+                continue
+            rows.append(job)
+            matrix.append(scores)
+
+        pairs = solve_assignment(matrix)
+        if len(pairs) < len(rows):
+            # The greedy fallback for huge fleets can strand an admitted job.
+            pairs = [(r, c) for c, r in owner.items()]
+        planned = {rows[r].job_id: printers[c] for r, c in pairs}
+
+        committed: dict[str, str] = {}
+        with self._lock:
+            for job_id, printer_name in planned.items():
+                job = self._jobs.get(job_id)
+                current = self._printer_jobs.get(printer_name)
+                if job is None or job.status != OrchestratedJobStatus.QUEUED:
+                    continue
+                if current is not None and current in self._jobs and not self._jobs[current].is_terminal:
+                    continue
+                job.printer_name = printer_name
+                job.status = OrchestratedJobStatus.ASSIGNED
+                job.attempt += 1
+                self._printer_jobs[printer_name] = job_id
+                self._assignment_counts[printer_name] = self._assignment_counts.get(printer_name, 0) + 1
+                committed[job_id] = printer_name
+
+            elapsed_ms = (time.monotonic() - started) * 1000.0
+            self._metrics.rounds += 1
+            self._metrics.jobs_considered += len(queued)
+            self._metrics.jobs_assigned += len(committed)
+            self._metrics.fleet_queries_avoided += len(queued) - 1
+            self._metrics.last_latency_ms = elapsed_ms
+            self._metrics.total_latency_ms += elapsed_ms
 
+        results: list[AssignmentResult] = []
+        exhausted = len(committed) >= len(printers)
+        for job in queued:
+            printer_name = committed.get(job.job_id)
+            if printer_name is None:
+                message = "No idle printers remaining" if exhausted else "No suitable idle printer available"
+                results.append(AssignmentResult(success=False, message=message))
+                continue
+            logger.info(
+                "Assigned job %s to printer %r (attempt %d/%d)",
+                job.job_id,
+                printer_name,
+                job.attempt,
+                job.max_attempts,
+            )
+            self._publish_event(
+                "JOB_STARTED",
+                {
+                    "job_id": job.job_id,
+                    "printer_name": printer_name,
+                    "file_path": job.file_path,
+                },
+            )
+            results.append(
+                AssignmentResult(
+                    success=True,
+                    printer_name=printer_name,
+                    message=f"Assigned to {printer_name}",
+                )
+            )
         return results
 
+    def get_assignment_metrics(self) -> AssignmentMetrics:
+        """Return a copy of the cumulative assignment metrics."""
+        with self._lock:
+            return AssignmentMetrics(**asdict(self._metrics))
+
     # ------------------------------------------------------------------
     # Job lifecycle transitions
     # ------------------------------------------------------------------
@@ -34,9 +34,12 @@ from kiln.fulfillment.intelligence import (
     OrderHistory,
     OrderRecord,
     ProviderHealth,
+    ProviderLatencyStats,
     ProviderQuote,
     ProviderStatus,
     QuoteComparison,
+    QuoteEngine,
+    QuoteEngineConfig,
     QuoteValidation,
     RetryResult,
     batch_quote,
@@ -45,6 +48,7 @@ from kiln.fulfillment.intelligence import (
     get_health_monitor,
     get_insurance_options,
     get_order_history,
+    get_quote_engine,
     place_order_with_retry,
     validate_quote_for_order,
 )
@@ -75,10 +79,13 @@ __all__ = [
     "OrderResult",
     "OrderStatus",
     "ProviderHealth",
+    "ProviderLatencyStats",
     "ProviderQuote",
     "ProviderStatus",
     "Quote",
     "QuoteComparison",
+    "QuoteEngine",
+    "QuoteEngineConfig",
     "QuoteRequest",
     "QuoteValidation",
     "ProxyProvider",
@@ -91,6 +98,7 @@ __all__ = [
     "get_health_monitor",
     "get_insurance_options",
     "get_order_history",
+    "get_quote_engine",
     "get_provider",
     "get_provider_class",
     "list_providers",
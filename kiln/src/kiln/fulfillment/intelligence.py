@@ -3,25 +3,37 @@ logic, material filtering, batch quoting, order history, and shipping insurance.
 
 Sits between the MCP tool layer and individual fulfillment providers to add
 cross-cutting intelligence that individual providers don't handle alone.
+
+Quote requests in :func:`compare_providers` and :func:`batch_quote` run
+concurrently through a :class:`QuoteEngine`: per-provider concurrency
+caps, an overall deadline with partial results, one hedged retry for slow
+requests, read-through of the :class:`~kiln.quote_cache.QuoteCache`, and
+per-provider latency stats.
 """
 
 from __future__ import annotations
 
 import enum
+import hashlib
 import logging
+import os
 import secrets
 import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import asdict, dataclass, field
 from typing import Any
 
 from kiln.fulfillment.base import (
     FulfillmentError,
+    FulfillmentProvider,
     Material,
     OrderRequest,
     OrderResult,
     Quote,
     QuoteRequest,
+    ShippingOption,
 )
 from kiln.fulfillment.registry import get_provider, list_providers
 
@@ -139,6 +151,398 @@ def get_health_monitor() -> HealthMonitor:
     return _health_monitor
 
 
+# ---------------------------------------------------------------------------
+# Concurrent quoting engine
+# ---------------------------------------------------------------------------
+
+# Errors a provider may raise for a single quote; anything else propagates.
+_QUOTE_ERRORS: tuple[type[Exception], ...] = (FulfillmentError, RuntimeError, FileNotFoundError)
+
+# How often to look for queued quote tasks that have started and need a
+# hedge clock.
+_QUEUED_POLL_SECONDS = 0.05
+
+
+@dataclass
+class QuoteEngineConfig:
+    """Tuning for :class:`QuoteEngine`.
+
+    :param max_workers: Size of the shared request thread pool.
+    :param max_concurrency_per_provider: In-flight requests allowed per
+        provider (hedged requests included).
+    :param deadline_seconds: Overall time budget for one run.  Requests
+        still outstanding at the deadline are reported as timed out.
+    :param hedge_after_seconds: Send one duplicate request when the first
+        has not answered after this long; ``None`` disables hedging.
+    :param use_cache: Read through and write back the quote cache.
+    """
+
+    max_workers: int = 16
+    max_concurrency_per_provider: int = 4
+    deadline_seconds: float = 90.0
+    hedge_after_seconds: float | None = 15.0
+    use_cache: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ProviderLatencyStats:
+    """Per-provider request statistics for one quoting run."""
+
+    provider_name: str
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    cache_hits: int = 0
+    hedged: int = 0
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    max_ms: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _QuoteOutcome:
+    """Result of one quote task (one provider × one request)."""
+
+    quote: Quote | None = None
+    display_name: str = ""
+    error: str | None = None
+    elapsed_ms: float = 0.0
+    cached: bool = False
+    hedged: bool = False
+    skipped: bool = False
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 1)
+
+
+def _quote_to_cache_metadata(quote: Quote, display_name: str) -> dict[str, Any]:
+    data = quote.to_dict()
+    data["raw"] = quote.raw
+    return {"quote": data, "display_name": display_name}
+
+
+def _quote_from_cache_metadata(metadata: dict[str, Any]) -> Quote | None:
+    data = metadata.get("quote")
+    if not isinstance(data, dict):
+        return None
+    try:
+        fields = dict(data)
+        fields["shipping_options"] = [ShippingOption(**opt) for opt in fields.get("shipping_options", [])]
+        return Quote(**fields)
+    except TypeError:
+        return None
+
+
+class QuoteEngine:
+    """Runs many quote requests concurrently across providers.
+
+    Thread-safe; one engine (see :func:`get_quote_engine`) is shared by
+    :func:`compare_providers` and :func:`batch_quote`.
+
+    :param config: Engine tuning.  Uses defaults if ``None``.
+    :param cache: Quote cache to read through.  Defaults to
+        :func:`kiln.quote_cache.get_quote_cache`.
+    """
+
+    def __init__(
+        self,
+        config: QuoteEngineConfig | None = None,
+        *,
+        cache: Any | None = None,
+    ) -> None:
+        self._config = config or QuoteEngineConfig()
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    @property
+    def config(self) -> QuoteEngineConfig:
+        return self._config
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._config.max_workers,
+                    thread_name_prefix="kiln-quote",
+                )
+            return self._pool
+
+    def _semaphore(self, provider_name: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(provider_name)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self._config.max_concurrency_per_provider)
+                self._semaphores[provider_name] = sem
+            return sem
+
+    def _get_cache(self) -> Any:
+        if self._cache is None:
+            from kiln.quote_cache import get_quote_cache
+
+            self._cache = get_quote_cache()
+        return self._cache
+
+    def _file_digest(self, file_path: str) -> str | None:
+        """Content hash of *file_path*, memoised on (path, size, mtime)."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = (file_path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is not None:
+            return digest
+        h = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(chunk)
+        except OSError:
+            return None
+        digest = h.hexdigest()
+        with self._lock:
+            self._digests[key] = digest
+        return digest
+
+    def _cache_key(self, provider_name: str, request: QuoteRequest) -> tuple[str, str, str, int] | None:
+        if not self._config.use_cache:
+            return None
+        digest = self._file_digest(request.file_path)
+        if digest is None:
+            return None
+        # The cache keys on (provider, service, material, quantity); the
+        # model content and destination go in the service slot.
+        return (provider_name, f"quote:{digest}:{request.shipping_country}", request.material_id, request.quantity)
+
+    def _cache_get(self, key: tuple[str, str, str, int] | None) -> _QuoteOutcome | None:
+        if key is None:
+            return None
+        try:
+            cached = self._get_cache().get(*key)
+        except Exception:
+            logger.debug("Quote cache read failed", exc_info=True)
+            return None
+        if cached is None:
+            return None
+        quote = _quote_from_cache_metadata(cached.metadata)
+        if quote is None or (quote.expires_at is not None and quote.expires_at <= time.time()):
+            return None
+        return _QuoteOutcome(
+            quote=quote,
+            display_name=cached.metadata.get("display_name", key[0]),
+            cached=True,
+        )
+
+    def _cache_put(self, key: tuple[str, str, str, int] | None, outcome: _QuoteOutcome) -> None:
+        if key is None or outcome.quote is None:
+            return
+        quote = outcome.quote
+        try:
+            self._get_cache().put(
+                *key,
+                quote.total_price,
+                quote.currency,
+                quote.lead_time_days or 0,
+                metadata=_quote_to_cache_metadata(quote, outcome.display_name),
+            )
+        except Exception:
+            logger.debug("Quote cache write failed", exc_info=True)
+
+    def _attempt(
+        self,
+        provider_name: str,
+        request: QuoteRequest,
+        provider: FulfillmentProvider | None,
+        on_start: Callable[[], None] | None = None,
+    ) -> _QuoteOutcome:
+        """Run one quote request, holding the provider's concurrency slot.
+
+        *on_start* is called once the slot is acquired.
+        """
+        with self._semaphore(provider_name):
+            start = time.monotonic()
+            if on_start is not None:
+                on_start()
+            try:
+                prov = provider if provider is not None else get_provider(provider_name)
+                quote = prov.get_quote(request)
+            except _QUOTE_ERRORS as exc:
+                return _QuoteOutcome(error=str(exc), elapsed_ms=(time.monotonic() - start) * 1000)
+            return _QuoteOutcome(
+                quote=quote,
+                display_name=prov.display_name,
+                elapsed_ms=(time.monotonic() - start) * 1000,
+            )
+
+    def run(
+        self,
+        tasks: list[tuple[str, QuoteRequest]],
+        *,
+        providers: dict[str, FulfillmentProvider] | None = None,
+    ) -> tuple[list[_QuoteOutcome], dict[str, ProviderLatencyStats]]:
+        """Quote every ``(provider_name, request)`` task concurrently.
+
+        Unhealthy providers (per :func:`get_health_monitor`, checked once
+        at the start) are skipped.  Each task's first answer wins; a task
+        still running ``hedge_after_seconds`` after it got its provider
+        slot gets one hedged duplicate.  Tasks still queued behind the
+        per-provider cap are never hedged.
+
+        :param tasks: Provider name and request for each quote.
+        :param providers: Optional already-resolved provider instances.
+        :returns: One outcome per task, in task order, and latency stats
+            keyed by provider name.
+        """
+        cfg = self._config
+        monitor = get_health_monitor()
+        providers = providers or {}
+        outcomes: list[_QuoteOutcome | None] = [None] * len(tasks)
+        stats: dict[str, ProviderLatencyStats] = {}
+        latencies: dict[str, list[float]] = {}
+        healthy: dict[str, bool] = {}
+        keys: list[tuple[str, str, str, int] | None] = [None] * len(tasks)
+
+        pool: ThreadPoolExecutor | None = None
+        pending: dict[Future[_QuoteOutcome], int] = {}
+        # Set by the worker once the task holds its provider slot; the
+        # hedge clock starts there, not at submission.
+        started_at: dict[int, float] = {}
+        hedged: set[int] = set()
+
+        def submit(index: int) -> None:
+            nonlocal pool
+            if pool is None:
+                pool = self._get_pool()
+            name, request = tasks[index]
+            stats[name].requests += 1
+
+            def on_start() -> None:
+                started_at.setdefault(index, time.monotonic())
+
+            pending[pool.submit(self._attempt, name, request, providers.get(name), on_start)] = index
+
+        for index, (name, request) in enumerate(tasks):
+            stat = stats.setdefault(name, ProviderLatencyStats(provider_name=name))
+            if name not in healthy:
+                healthy[name] = monitor.is_healthy(name)
+            if not healthy[name]:
+                outcomes[index] = _QuoteOutcome(
+                    display_name=name,
+                    error=f"Provider {name} is currently unhealthy, skipped.",
+                    skipped=True,
+                )
+                continue
+            keys[index] = self._cache_key(name, request)
+            hit = self._cache_get(keys[index])
+            if hit is not None:
+                stat.cache_hits += 1
+                outcomes[index] = hit
+                continue
+            submit(index)
+
+        run_start = time.monotonic()
+        deadline = run_start + cfg.deadline_seconds
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake = deadline
+            if cfg.hedge_after_seconds is not None:
+                for index in set(pending.values()) - hedged:
+                    started = started_at.get(index)
+                    if started is None:
+                        # Queued on the provider cap; look again shortly.
+                        wake = min(wake, now + min(cfg.hedge_after_seconds, _QUEUED_POLL_SECONDS))
+                    else:
+                        wake = min(wake, started + cfg.hedge_after_seconds)
+            done, _ = wait(pending, timeout=max(wake - now, 0.0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = pending.pop(future)
+                if outcomes[index] is not None:
+                    continue  # the other hedged copy already answered
+                name = tasks[index][0]
+                outcome = future.result()
+                outcome.hedged = index in hedged
+                outcomes[index] = outcome
+                latencies.setdefault(name, []).append(outcome.elapsed_ms)
+                if outcome.quote is not None:
+                    stats[name].successes += 1
+                    monitor.record_success(name, response_time_ms=outcome.elapsed_ms)
+                    self._cache_put(keys[index], outcome)
+                else:
+                    stats[name].failures += 1
+                    monitor.record_failure(name, error=outcome.error or "")
+                for other, other_index in list(pending.items()):
+                    if other_index == index:
+                        other.cancel()
+                        del pending[other]
+
+            if cfg.hedge_after_seconds is not None:
+                now = time.monotonic()
+                for index in sorted(set(pending.values()) - hedged):
+                    started = started_at.get(index)
+                    if started is not None and now - started >= cfg.hedge_after_seconds:
+                        hedged.add(index)
+                        stats[tasks[index][0]].hedged += 1
+                        submit(index)
+
+        for future, index in pending.items():
+            future.cancel()
+            if outcomes[index] is not None:
+                continue
+            name = tasks[index][0]
+            stats[name].timeouts += 1
+            outcomes[index] = _QuoteOutcome(
+                display_name=name,
+                error=f"Quote from {name} did not arrive within {cfg.deadline_seconds:.0f}s deadline.",
+                elapsed_ms=(time.monotonic() - started_at.get(index, run_start)) * 1000,
+                hedged=index in hedged,
+            )
+
+        for name, values in latencies.items():
+            values.sort()
+            stats[name].p50_ms = _percentile(values, 0.5)
+            stats[name].p95_ms = _percentile(values, 0.95)
+            stats[name].max_ms = round(values[-1], 1)
+
+        return [o if o is not None else _QuoteOutcome(error="not run") for o in outcomes], stats
+
+    def shutdown(self) -> None:
+        """Release the request pool.  It is recreated on next use."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_quote_engine: QuoteEngine | None = None
+_quote_engine_lock = threading.Lock()
+
+
+def get_quote_engine() -> QuoteEngine:
+    """Return the module-level :class:`QuoteEngine` singleton."""
+    global _quote_engine  # noqa: PLW0603
+    if _quote_engine is None:
+        with _quote_engine_lock:
+            if _quote_engine is None:
+                _quote_engine = QuoteEngine()
+    return _quote_engine
+
+
 # ---------------------------------------------------------------------------
 # Multi-provider quote comparison
 # ---------------------------------------------------------------------------
@@ -154,6 +558,7 @@ class ProviderQuote:
     error: str | None = None
     response_time_ms: float = 0.0
     health: str = "unknown"
+    cached: bool = False
 
     def to_dict(self) -> dict[str, Any]:
         data: dict[str, Any] = {
@@ -166,6 +571,8 @@ class ProviderQuote:
             data["quote"] = self.quote.to_dict()
         if self.error:
             data["error"] = self.error
+        if self.cached:
+            data["cached"] = True
         return data
 
 
@@ -178,10 +585,12 @@ class QuoteComparison:
     fastest: str | None = None  # Provider name
     recommended: str | None = None  # Provider name (best balance)
     summary: str = ""
+    provider_stats: list[ProviderLatencyStats] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
         data["quotes"] = [q.to_dict() for q in self.quotes]
+        data["provider_stats"] = [s.to_dict() for s in self.provider_stats]
         return data
 
 
@@ -192,8 +601,9 @@ def compare_providers(
     quantity: int = 1,
     shipping_country: str = "US",
     providers: list[str] | None = None,
+    engine: QuoteEngine | None = None,
 ) -> QuoteComparison:
-    """Get quotes from multiple providers and compare them.
+    """Get quotes from multiple providers concurrently and compare them.
 
     Args:
         file_path: Path to the model file (STL/3MF/OBJ).
@@ -201,9 +611,12 @@ def compare_providers(
         quantity: Number of copies.
         shipping_country: ISO country code for shipping.
         providers: Specific providers to query. If None, queries all registered.
+        engine: Quoting engine to use.  Defaults to :func:`get_quote_engine`.
 
     Returns:
-        QuoteComparison with ranked results and recommendations.
+        QuoteComparison with ranked results, recommendations, and
+        per-provider latency stats.  Providers that miss the engine
+        deadline are reported with an error; the rest are still compared.
     """
     monitor = get_health_monitor()
     provider_names = providers or list_providers()
@@ -216,42 +629,26 @@ def compare_providers(
         shipping_country=shipping_country,
     )
 
-    for name in provider_names:
-        if not monitor.is_healthy(name):
-            results.append(
-                ProviderQuote(
-                    provider_name=name,
-                    provider_display_name=name,
-                    error=f"Provider {name} is currently unhealthy, skipped.",
-                    health=monitor.get_status(name).health.value,
-                )
-            )
-            continue
-
-        start = time.monotonic()
-        try:
-            provider = get_provider(name)
-            quote = provider.get_quote(request)
-            elapsed = (time.monotonic() - start) * 1000
-            monitor.record_success(name, response_time_ms=elapsed)
+    outcomes, stats = (engine or get_quote_engine()).run([(name, request) for name in provider_names])
+    for name, outcome in zip(provider_names, outcomes, strict=True):
+        if outcome.quote is not None:
             results.append(
                 ProviderQuote(
                     provider_name=name,
-                    provider_display_name=provider.display_name,
-                    quote=quote,
-                    response_time_ms=round(elapsed, 1),
-                    health="healthy",
+                    provider_display_name=outcome.display_name,
+                    quote=outcome.quote,
+                    response_time_ms=round(outcome.elapsed_ms, 1),
+                    health=monitor.get_status(name).health.value if outcome.cached else "healthy",
+                    cached=outcome.cached,
                 )
             )
-        except (FulfillmentError, RuntimeError, FileNotFoundError) as exc:
-            elapsed = (time.monotonic() - start) * 1000
-            monitor.record_failure(name, error=str(exc))
+        else:
             results.append(
                 ProviderQuote(
                     provider_name=name,
                     provider_display_name=name,
-                    error=str(exc),
-                    response_time_ms=round(elapsed, 1),
+                    error=outcome.error,
+                    response_time_ms=round(outcome.elapsed_ms, 1),
                     health=monitor.get_status(name).health.value,
                 )
             )
@@ -299,6 +696,7 @@ def compare_providers(
         fastest=fastest,
         recommended=recommended,
         summary=" ".join(summary_parts),
+        provider_stats=[stats[name] for name in dict.fromkeys(provider_names)],
     )
 
 
@@ -421,52 +819,59 @@ def batch_quote(
     *,
     provider_name: str | None = None,
     shipping_country: str = "US",
+    engine: QuoteEngine | None = None,
 ) -> BatchQuote:
     """Get quotes for multiple parts in a single operation.
 
+    Items are quoted concurrently, up to the engine's per-provider cap.
+
     Args:
         items: List of parts to quote.
         provider_name: Specific provider, or None for default.
         shipping_country: ISO country code for shipping.
+        engine: Quoting engine to use.  Defaults to :func:`get_quote_engine`.
 
     Returns:
         BatchQuote with per-item results and aggregated total.
     """
     provider = get_provider(provider_name)
-    monitor = get_health_monitor()
     results: list[BatchQuoteResult] = []
     total = 0.0
     success = 0
     fail = 0
 
-    for item in items:
+    tasks = [
+        (
+            provider.name,
+            QuoteRequest(
+                file_path=item.file_path,
+                material_id=item.material_id,
+                quantity=item.quantity,
+                shipping_country=shipping_country,
+            ),
+        )
+        for item in items
+    ]
+    outcomes, _ = (engine or get_quote_engine()).run(tasks, providers={provider.name: provider})
+
+    for item, outcome in zip(items, outcomes, strict=True):
         label = item.label or item.file_path.rsplit("/", 1)[-1]
-        try:
-            quote = provider.get_quote(
-                QuoteRequest(
-                    file_path=item.file_path,
-                    material_id=item.material_id,
-                    quantity=item.quantity,
-                    shipping_country=shipping_country,
-                )
-            )
-            monitor.record_success(provider.name)
+        if outcome.quote is not None:
             results.append(
                 BatchQuoteResult(
                     label=label,
                     file_path=item.file_path,
-                    quote=quote,
+                    quote=outcome.quote,
                 )
             )
-            total += quote.total_price
+            total += outcome.quote.total_price
             success += 1
-        except (FulfillmentError, FileNotFoundError) as exc:
-            monitor.record_failure(provider.name, error=str(exc))
+        else:
             results.append(
                 BatchQuoteResult(
                     label=label,
                     file_path=item.file_path,
-                    error=str(exc),
+                    error=outcome.error,
                 )
             )
             fail += 1
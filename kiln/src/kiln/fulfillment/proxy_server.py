@@ -7,6 +7,7 @@ Handles proxy fulfillment requests from the REST API:
 - Order forwarding to fulfillment providers
 - Auto-refund on order failure
 - Server-side quote caching (prevents client-side price manipulation)
+- Short-lived cache of license validation decisions, invalidated on revocation
 
 Used by :class:`kiln.rest_api.FulfillmentProxyAPI` to process agent requests
 through the Kiln backend.
@@ -25,6 +26,7 @@ import os
 import threading
 import time
 import uuid
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 
 from kiln.billing import BillingLedger
@@ -44,6 +46,119 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Decision sources that reflect a degraded entitlement store; never cached.
+_UNCACHEABLE_SOURCES = frozenset({"error", "stale-cache"})
+
+
+class LicenseDecisionCache:
+    """Bounded TTL + LRU cache of license validation results.
+
+    Entries are keyed by the SHA-256 of the license key plus the device
+    fingerprint and activation flags, and indexed by token id (``jti``)
+    so a revocation drops every decision for that token at once.  An
+    entry never outlives the license's own expiry.
+
+    Args:
+        ttl_seconds: How long a decision is reused.
+        max_entries: Capacity; least recently used entries are evicted.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 60.0, max_entries: int = 10_000) -> None:
+        self._ttl_seconds = max(0.0, float(ttl_seconds))
+        self._max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple[str, ...], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._by_jti: dict[str, set[tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0
+
+    @staticmethod
+    def make_key(
+        license_key: str,
+        device_fingerprint: str,
+        *,
+        enforce_activation_cap: bool,
+        auto_activate_if_needed: bool,
+    ) -> tuple[str, ...]:
+        return (
+            hash_license_key(license_key.strip()),
+            device_fingerprint,
+            "cap" if enforce_activation_cap else "",
+            "auto" if auto_activate_if_needed else "",
+        )
+
+    def get(self, key: tuple[str, ...]) -> dict[str, Any] | None:
+        """Return a copy of the cached decision for *key*, or ``None``."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[1]
+        return _copy_decision(result)
+
+    def put(self, key: tuple[str, ...], result: dict[str, Any]) -> None:
+        """Cache *result* unless it came from a degraded entitlement store."""
+        if not self.enabled or "source" not in result or result["source"] in _UNCACHEABLE_SOURCES:
+            return
+        expires_at = time.time() + self._ttl_seconds
+        license_expiry = (result.get("info") or {}).get("expires_at")
+        if isinstance(license_expiry, (int, float)):
+            expires_at = min(expires_at, float(license_expiry))
+        jti = str(result.get("jti") or "")
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (expires_at, _copy_decision(result))
+            if jti:
+                self._by_jti.setdefault(jti, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_jti(self, jti: str) -> int:
+        """Drop every decision for token *jti*.  Returns the number removed."""
+        with self._lock:
+            keys = self._by_jti.pop(jti, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_jti.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _drop(self, key: tuple[str, ...]) -> None:
+        # Caller holds the lock.
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        jti = str(entry[1].get("jti") or "")
+        keys = self._by_jti.get(jti)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_jti[jti]
+
+
+def _copy_decision(result: dict[str, Any]) -> dict[str, Any]:
+    copied = dict(result)
+    if isinstance(copied.get("info"), dict):
+        copied["info"] = dict(copied["info"])
+    return copied
+
 
 class ProxyOrchestrator:
     """Orchestrates proxy fulfillment requests with billing and license checks.
@@ -81,6 +196,11 @@ class ProxyOrchestrator:
         # race conditions where concurrent requests bypass the limit.
         self._user_order_locks: dict[str, threading.Lock] = {}
         self._user_locks_lock = threading.Lock()
+        # Validation decisions reused across requests from the same device.
+        self._license_decisions = LicenseDecisionCache(
+            ttl_seconds=float(os.environ.get("KILN_LICENSE_DECISION_CACHE_TTL_SECONDS", "60")),
+            max_entries=int(os.environ.get("KILN_LICENSE_DECISION_CACHE_SIZE", "10000")),
+        )
 
     @staticmethod
     def _provider_routing_metadata(
@@ -128,6 +248,12 @@ class ProxyOrchestrator:
         Returns:
             Dict with ``tier``, ``email``, ``valid``, and ``info`` fields.
             If key is invalid, returns ``tier=FREE`` and ``valid=False``.
+
+        Decisions are cached per (key, device fingerprint) for
+        ``KILN_LICENSE_DECISION_CACHE_TTL_SECONDS`` (default 60, ``0``
+        disables) unless *record_event* is set, since that call must reach
+        the entitlement store.  Revocations seen through :meth:`is_revoked`
+        or :meth:`list_revocations` invalidate cached decisions immediately.
         """
         if not key or not key.strip():
             return {
@@ -136,6 +262,46 @@ class ProxyOrchestrator:
                 "error": "No license key provided",
             }
 
+        cache_key: tuple[str, ...] | None = None
+        if not record_event and self._license_decisions.enabled:
+            cache_key = LicenseDecisionCache.make_key(
+                key,
+                device_fingerprint,
+                enforce_activation_cap=enforce_activation_cap,
+                auto_activate_if_needed=auto_activate_if_needed,
+            )
+            cached = self._license_decisions.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._validate_license_uncached(
+            key,
+            event_type=event_type,
+            device_fingerprint=device_fingerprint,
+            ip_address_raw=ip_address_raw,
+            client_version=client_version,
+            metadata=metadata,
+            enforce_activation_cap=enforce_activation_cap,
+            auto_activate_if_needed=auto_activate_if_needed,
+            record_event=record_event,
+        )
+        if cache_key is not None:
+            self._license_decisions.put(cache_key, result)
+        return result
+
+    def _validate_license_uncached(
+        self,
+        key: str,
+        *,
+        event_type: str,
+        device_fingerprint: str,
+        ip_address_raw: str,
+        client_version: str,
+        metadata: dict[str, Any] | None,
+        enforce_activation_cap: bool,
+        auto_activate_if_needed: bool,
+        record_event: bool,
+    ) -> dict[str, Any]:
         try:
             mgr = LicenseManager(license_key=key)
             tier = mgr.get_tier()
@@ -550,11 +716,28 @@ class ProxyOrchestrator:
 
     def is_revoked(self, jti: str) -> bool:
         """Return whether a token has been revoked."""
-        return self._entitlement.is_revoked(jti.strip())
+        jti = jti.strip()
+        revoked = self._entitlement.is_revoked(jti)
+        if revoked:
+            self._license_decisions.invalidate_jti(jti)
+        return revoked
 
     def list_revocations(self, *, limit: int = 500, since_iso: str | None = None) -> list[dict[str, Any]]:
         """List revoked JTIs for revocation cache sync."""
-        return self._entitlement.list_revocations(limit=limit, since_iso=since_iso)
+        rows = self._entitlement.list_revocations(limit=limit, since_iso=since_iso)
+        for row in rows:
+            jti = str(row.get("jti") or "").strip()
+            if jti:
+                self._license_decisions.invalidate_jti(jti)
+        return rows
+
+    def invalidate_license_decisions(self, jti: str | None = None) -> int:
+        """Drop cached validation decisions for *jti*, or all when ``None``."""
+        if jti is None:
+            count = len(self._license_decisions)
+            self._license_decisions.clear()
+            return count
+        return self._license_decisions.invalidate_jti(jti.strip())
 
     # ------------------------------------------------------------------
     # Internal helpers
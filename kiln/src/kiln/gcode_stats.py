@@ -0,0 +1,464 @@
+"""Single-pass, bounded-memory G-code statistics.
+
+Streams a G-code file in fixed-size buffers and collects everything the
+cost estimator, slicer estimate parser and job splitter need in one pass:
+extrusion totals (overall and per tool), retraction, a simple motion-model
+time estimate with per-layer breakdown, the slicer's own embedded time
+estimate, and the first/last few lines for header and footer metadata.
+
+Memory use is independent of file size: only the current buffer, a
+bounded head/tail of raw lines and one entry per layer are kept.
+
+Extrusion semantics match the historical cost estimator:
+
+* ``M83`` switches E to relative mode; positive E moves count as
+  extrusion, negative ones as retraction.
+* ``M82`` switches E to absolute mode and resets the reference position
+  to 0 (slicers always follow it with ``G92 E0``).
+* ``G90`` / ``G91`` only change the X/Y/Z mode; the E mode is left as
+  ``M82`` / ``M83`` set it, so ``M83`` followed by ``G90`` stays relative.
+* ``G92 E<n>`` sets the absolute reference position.
+* In absolute mode, positive deltas count as extrusion (including
+  un-retracts) and negative deltas as retraction.
+
+Usage::
+
+    from kiln.gcode_stats import get_gcode_stats
+
+    stats = get_gcode_stats("/path/to/part.gcode")
+    print(stats.extrusion_mm, stats.estimated_time_seconds, stats.layer_count)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+# Read buffer size for file scans.
+_DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Raw lines kept from each end of the file for header/footer metadata.
+_BOUNDARY_LINES = 200
+
+# Feed rate assumed for moves before the file sets one (mm/min).
+_DEFAULT_FEEDRATE_MM_MIN = 3000.0
+
+# Minimum Z change (mm) between extruding moves that starts a new layer.
+# Z-hops are ignored because they never extrude; spiral-vase prints get
+# one "layer" per this much climb, which keeps the layer list bounded.
+_MIN_LAYER_STEP_MM = 0.05
+
+# Cached results for recently analysed files.
+_CACHE_MAX_ENTRIES = 32
+
+_WORD = re.compile(r"([A-Za-z])\s*([-+]?(?:\d+\.?\d*|\.\d+))")
+
+_TIME_PATTERNS = [
+    # PrusaSlicer: ; estimated printing time (normal mode) = 1h 23m 45s
+    re.compile(
+        r";\s*estimated printing time.*?=\s*"
+        r"(?:(\d+)h\s*)?(?:(\d+)m\s*)?(?:(\d+)s)?",
+        re.IGNORECASE,
+    ),
+    # Cura: ;TIME:5025
+    re.compile(r";\s*TIME:\s*(\d+)", re.IGNORECASE),
+    # OrcaSlicer: ; total estimated time: 1h 23m 45s
+    re.compile(
+        r";\s*total estimated time.*?:\s*"
+        r"(?:(\d+)h\s*)?(?:(\d+)m\s*)?(?:(\d+)s)?",
+        re.IGNORECASE,
+    ),
+]
+
+
+def _time_from_comment(line: str) -> int | None:
+    """Parse a slicer time-estimate comment, or return ``None``."""
+    for pattern in _TIME_PATTERNS:
+        m = pattern.search(line)
+        if m:
+            groups = m.groups()
+            # Cura pattern has 1 group (seconds total)
+            if len(groups) == 1 and groups[0] is not None:
+                return int(groups[0])
+            # H/M/S patterns have 3 groups
+            if len(groups) == 3:
+                h = int(groups[0]) if groups[0] else 0
+                mins = int(groups[1]) if groups[1] else 0
+                s = int(groups[2]) if groups[2] else 0
+                total = h * 3600 + mins * 60 + s
+                if total > 0:
+                    return total
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Result
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class GcodeStats:
+    """Aggregate statistics for one G-code program.
+
+    :param extrusion_mm: Filament pushed by positive E moves (mm).
+    :param retraction_mm: Filament pulled back by negative E moves (mm).
+    :param extrusion_by_tool: ``extrusion_mm`` split by active tool number.
+    :param slicer_time_seconds: Time estimate embedded by the slicer, if any.
+    :param motion_time_seconds: Feed-rate based estimate (distance / F plus
+        dwells, no acceleration model) — a lower bound on real time.
+    :param layer_z: Z height of each layer, in print order.
+    :param layer_time_seconds: Time per layer, parallel to ``layer_z``;
+        rescaled to sum to ``slicer_time_seconds`` when that is known.
+    :param line_count: Lines read.
+    :param move_count: ``G0``–``G3`` moves seen.
+    :param bytes_read: Size of the input in bytes (files only).
+    :param header_lines: First lines of the program (raw).
+    :param tail_lines: Last lines of the program not already in
+        ``header_lines``.
+    """
+
+    extrusion_mm: float = 0.0
+    retraction_mm: float = 0.0
+    extrusion_by_tool: dict[int, float] = field(default_factory=dict)
+    slicer_time_seconds: int | None = None
+    motion_time_seconds: float = 0.0
+    layer_z: list[float] = field(default_factory=list)
+    layer_time_seconds: list[float] = field(default_factory=list)
+    line_count: int = 0
+    move_count: int = 0
+    bytes_read: int = 0
+    header_lines: list[str] = field(default_factory=list)
+    tail_lines: list[str] = field(default_factory=list)
+
+    @property
+    def layer_count(self) -> int:
+        return len(self.layer_z)
+
+    @property
+    def max_z(self) -> float:
+        return max(self.layer_z) if self.layer_z else 0.0
+
+    @property
+    def estimated_time_seconds(self) -> int | None:
+        """Slicer estimate when embedded, else the motion-model estimate."""
+        if self.slicer_time_seconds is not None:
+            return self.slicer_time_seconds
+        if self.motion_time_seconds > 0:
+            return max(1, round(self.motion_time_seconds))
+        return None
+
+    def boundary_lines(self) -> list[str]:
+        """Header and footer lines, where slicers put their metadata."""
+        return self.header_lines + self.tail_lines
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        del data["header_lines"]
+        del data["tail_lines"]
+        data["layer_count"] = self.layer_count
+        data["max_z"] = self.max_z
+        data["estimated_time_seconds"] = self.estimated_time_seconds
+        return data
+
+
+# ---------------------------------------------------------------------------
+# Accumulator
+# ---------------------------------------------------------------------------
+
+
+class GcodeStatsAccumulator:
+    """Incrementally builds :class:`GcodeStats` from lines.
+
+    Feed lines with :meth:`feed` (or whole iterables with
+    :meth:`feed_lines`) and call :meth:`result` once at the end.
+    """
+
+    def __init__(self) -> None:
+        self._stats = GcodeStats()
+        self._tail: deque[str] = deque(maxlen=_BOUNDARY_LINES)
+        # Machine state
+        self._x = self._y = self._z = 0.0
+        self._xyz_relative = False
+        self._e_relative = False
+        self._last_e = 0.0
+        self._feedrate = _DEFAULT_FEEDRATE_MM_MIN
+        self._tool = 0
+        # Layer tracking
+        self._layer_z: float | None = None
+        self._layer_time = 0.0
+
+    def feed(self, raw_line: str) -> None:
+        """Consume one line of G-code."""
+        self.feed_lines((raw_line,))
+
+    def feed_lines(self, lines: Iterable[str]) -> None:
+        """Consume an iterable of G-code lines.
+
+        This is the hot loop for multi-hundred-megabyte files, so machine
+        state lives in locals for the duration of the call and is written
+        back to the instance at the end.
+        """
+        stats = self._stats
+        header = stats.header_lines
+        tail_append = self._tail.append
+        layer_zs = stats.layer_z
+        layer_times = stats.layer_time_seconds
+        tools = stats.extrusion_by_tool
+        findall = _WORD.findall
+        hypot = math.hypot
+
+        line_count = stats.line_count
+        moves = stats.move_count
+        extrusion = stats.extrusion_mm
+        retraction = stats.retraction_mm
+        motion = stats.motion_time_seconds
+        x, y, z = self._x, self._y, self._z
+        xyz_relative = self._xyz_relative
+        e_relative = self._e_relative
+        last_e = self._last_e
+        feedrate = self._feedrate
+        tool = self._tool
+        layer_z = self._layer_z
+        layer_time = self._layer_time
+
+        try:
+            for raw_line in lines:
+                line_count += 1
+                if line_count <= _BOUNDARY_LINES:
+                    header.append(raw_line)
+                else:
+                    tail_append(raw_line)
+
+                line = raw_line.strip()
+                if not line:
+                    continue
+                if line[0] == ";":
+                    if stats.slicer_time_seconds is None and "ime" in line.lower():
+                        stats.slicer_time_seconds = _time_from_comment(line)
+                    continue
+
+                semi = line.find(";")
+                if semi >= 0:
+                    line = line[:semi]
+                words = findall(line.upper())
+                if not words:
+                    continue
+                letter, number = words[0]
+
+                if letter == "G":
+                    code = int(number) if number.isdigit() else int(float(number))
+                else:
+                    code = -1
+
+                if 0 <= code <= 3:
+                    moves += 1
+                    nx, ny, nz = x, y, z
+                    e_value: float | None = None
+                    for axis, value in words:
+                        if axis == "X":
+                            nx = nx + float(value) if xyz_relative else float(value)
+                        elif axis == "Y":
+                            ny = ny + float(value) if xyz_relative else float(value)
+                        elif axis == "E":
+                            e_value = float(value)
+                        elif axis == "Z":
+                            nz = nz + float(value) if xyz_relative else float(value)
+                        elif axis == "F":
+                            feed = float(value)
+                            if feed > 0:
+                                feedrate = feed
+
+                    delta = 0.0
+                    if e_value is not None:
+                        if e_relative:
+                            delta = e_value
+                        else:
+                            delta = e_value - last_e
+                            last_e = e_value
+                        if delta > 0:
+                            extrusion += delta
+                            tools[tool] = tools.get(tool, 0.0) + delta
+                            if layer_z is None or abs(nz - layer_z) >= _MIN_LAYER_STEP_MM:
+                                if layer_z is not None:
+                                    layer_zs.append(round(layer_z, 4))
+                                    layer_times.append(layer_time)
+                                layer_z = nz
+                                layer_time = 0.0
+                        elif delta < 0:
+                            retraction -= delta
+
+                    # Chord length for arcs too: close enough for a time
+                    # estimate.  Extrude-only moves take |E| / F.
+                    distance = hypot(nx - x, ny - y, nz - z) or abs(delta)
+                    seconds = distance * 60.0 / feedrate
+                    x, y, z = nx, ny, nz
+                    motion += seconds
+                    if layer_z is not None:
+                        layer_time += seconds
+                elif code == 4:
+                    seconds = 0.0
+                    for axis, value in words[1:]:
+                        if axis == "P":
+                            seconds = float(value) / 1000.0
+                        elif axis == "S":
+                            seconds = float(value)
+                    seconds = max(seconds, 0.0)
+                    motion += seconds
+                    if layer_z is not None:
+                        layer_time += seconds
+                elif code == 90:
+                    xyz_relative = False
+                elif code == 91:
+                    xyz_relative = True
+                elif code == 92:
+                    for axis, value in words[1:]:
+                        if axis == "E":
+                            last_e = float(value)
+                        elif axis == "X":
+                            x = float(value)
+                        elif axis == "Y":
+                            y = float(value)
+                        elif axis == "Z":
+                            z = float(value)
+                elif code == 28:
+                    x = y = z = 0.0
+                elif letter == "M":
+                    m_code = int(float(number))
+                    if m_code == 82:
+                        e_relative = False
+                        last_e = 0.0
+                    elif m_code == 83:
+                        e_relative = True
+                elif letter == "T":
+                    tool = int(float(number))
+        finally:
+            stats.line_count = line_count
+            stats.move_count = moves
+            stats.extrusion_mm = extrusion
+            stats.retraction_mm = retraction
+            stats.motion_time_seconds = motion
+            self._x, self._y, self._z = x, y, z
+            self._xyz_relative = xyz_relative
+            self._e_relative = e_relative
+            self._last_e = last_e
+            self._feedrate = feedrate
+            self._tool = tool
+            self._layer_z = layer_z
+            self._layer_time = layer_time
+
+    def _close_layer(self) -> None:
+        if self._layer_z is None:
+            return
+        self._stats.layer_z.append(round(self._layer_z, 4))
+        self._stats.layer_time_seconds.append(self._layer_time)
+        self._layer_time = 0.0
+
+    def result(self) -> GcodeStats:
+        """Finish the pass and return the collected statistics."""
+        self._close_layer()
+        self._layer_z = None
+        stats = self._stats
+        stats.tail_lines = list(self._tail)
+        self._tail.clear()
+
+        layer_total = sum(stats.layer_time_seconds)
+        if stats.slicer_time_seconds and layer_total > 0:
+            scale = stats.slicer_time_seconds / layer_total
+            stats.layer_time_seconds = [round(t * scale, 3) for t in stats.layer_time_seconds]
+        else:
+            stats.layer_time_seconds = [round(t, 3) for t in stats.layer_time_seconds]
+        stats.motion_time_seconds = round(stats.motion_time_seconds, 3)
+        stats.extrusion_by_tool = {t: round(mm, 5) for t, mm in sorted(stats.extrusion_by_tool.items())}
+        return stats
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def analyze_gcode_lines(lines: Iterable[str]) -> GcodeStats:
+    """Compute :class:`GcodeStats` for in-memory G-code lines."""
+    acc = GcodeStatsAccumulator()
+    acc.feed_lines(lines)
+    return acc.result()
+
+
+def analyze_gcode_file(file_path: str, *, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> GcodeStats:
+    """Stream a G-code file through the accumulator.
+
+    Reads *chunk_size* characters at a time and carries any partial final
+    line over to the next buffer, so memory stays bounded for arbitrarily
+    large files.
+
+    :raises FileNotFoundError: If the file does not exist.
+    :raises OSError: If the file cannot be read.
+    """
+    acc = GcodeStatsAccumulator()
+    carry = ""
+    with open(file_path, errors="replace", newline=None) as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            chunk = carry + chunk
+            lines = chunk.split("\n")
+            carry = lines.pop()
+            acc.feed_lines(lines)
+    if carry:
+        acc.feed(carry)
+    stats = acc.result()
+    stats.bytes_read = os.path.getsize(file_path)
+    return stats
+
+
+_cache: OrderedDict[tuple[str, int, int], GcodeStats] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_gcode_stats(file_path: str) -> GcodeStats:
+    """Return (cached) statistics for a G-code file.
+
+    Results are keyed on the resolved path, size and modification time, so
+    the cost estimator, slicer and job splitter share one pass over the
+    same unchanged file.  Treat the returned object as read-only.
+
+    :raises FileNotFoundError: If the file does not exist.
+    :raises OSError: If the file cannot be read.
+    """
+    path = os.path.realpath(file_path)
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+    stats = analyze_gcode_file(path)
+    with _cache_lock:
+        _cache[key] = stats
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return stats
+
+
+def _reset_gcode_stats_cache() -> None:
+    """Clear cached results (for tests)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+__all__ = [
+    "GcodeStats",
+    "GcodeStatsAccumulator",
+    "analyze_gcode_file",
+    "analyze_gcode_lines",
+    "get_gcode_stats",
+]
@@ -0,0 +1,220 @@
+"""Event-driven hot-folder watching for ``kiln ingest watch``.
+
+Polling a slicer drop folder means listing and stat-ing every file in it
+on every interval, and a new file waits up to a full interval before it
+is noticed.  On Linux this module asks the kernel instead: an inotify
+watch (through ``ctypes``, no extra dependency) on the folder reports
+
+* ``IN_CLOSE_WRITE`` -- a writer closed the file, so it is complete (no
+  mtime stability heuristic needed);
+* ``IN_MOVED_TO`` -- a finished file was renamed into the folder, the
+  usual atomic-publish pattern of slicers and sync tools;
+* ``IN_DELETE`` / ``IN_MOVED_FROM`` -- the file left the folder.
+
+If the kernel's event queue overflows, the watcher reports
+:data:`RESCAN` and the caller falls back to one full directory scan.  If
+the folder itself is removed or replaced, the kernel drops the watch and
+the watcher reports :data:`LOST`: it will never report anything again,
+so the caller rescans, closes it and opens a new watcher once the folder
+exists again.  On other platforms, or if inotify is unavailable (e.g.
+the per-user watch limit is exhausted), :func:`open_directory_watcher`
+returns ``None`` and callers keep polling.
+
+Usage::
+
+    from kiln.ingest_watch import RESCAN, WRITTEN, open_directory_watcher
+
+    watcher = open_directory_watcher("/srv/slicer-out")
+    if watcher is not None:
+        with watcher:
+            for event in watcher.read(timeout=2.0):
+                if event.kind == WRITTEN:
+                    print("ready:", event.name)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Event kinds reported by DirectoryWatcher.read().
+WRITTEN = "written"
+REMOVED = "removed"
+RESCAN = "rescan"
+LOST = "lost"
+
+# inotify(7) flags.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT_HEADER = struct.Struct("iIII")
+
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """One change in a watched directory.
+
+    :param kind: :data:`WRITTEN`, :data:`REMOVED`, :data:`RESCAN` or
+        :data:`LOST`.
+    :param name: File name within the directory (empty for ``RESCAN`` and
+        ``LOST``).
+    """
+
+    kind: str
+    name: str = ""
+
+
+# ---------------------------------------------------------------------------
+# inotify binding
+# ---------------------------------------------------------------------------
+
+_libc: ctypes.CDLL | None = None
+
+
+def _load_libc() -> ctypes.CDLL:
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        _libc = libc
+    return _libc
+
+
+class DirectoryWatcher:
+    """Non-recursive inotify watch on a single directory (Linux only).
+
+    :param path: Directory to watch.
+    :raises OSError: If inotify is unavailable or the watch cannot be added.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        libc = _load_libc()
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        wd = libc.inotify_add_watch(fd, os.fsencode(os.fspath(path)), _WATCH_MASK | _IN_ONLYDIR)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed: {os.strerror(err)}", os.fspath(path))
+        self._fd = fd
+        self._poller = select.poll()
+        self._poller.register(fd, select.POLLIN)
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self, timeout: float | None = None) -> list[WatchEvent]:
+        """Wait up to *timeout* seconds for changes and return them.
+
+        Returns an empty list on timeout.  Events for subdirectories are
+        skipped.
+        """
+        if self._fd < 0:
+            raise ValueError("watcher is closed")
+        timeout_ms = None if timeout is None else max(0, int(timeout * 1000))
+        if not self._poller.poll(timeout_ms):
+            return []
+        events: list[WatchEvent] = []
+        while True:
+            try:
+                buf = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except InterruptedError:
+                continue
+            if not buf:
+                break
+            events.extend(_parse_events(buf))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            with contextlib.suppress(OSError):
+                os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> DirectoryWatcher:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _parse_events(buf: bytes) -> list[WatchEvent]:
+    events: list[WatchEvent] = []
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(buf):
+        _, mask, _, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+        offset += _EVENT_HEADER.size
+        raw_name = buf[offset : offset + name_len].rstrip(b"\0")
+        offset += name_len
+        if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED):
+            events.append(WatchEvent(LOST))
+            continue
+        if mask & _IN_Q_OVERFLOW:
+            events.append(WatchEvent(RESCAN))
+            continue
+        if mask & _IN_ISDIR or not raw_name:
+            continue
+        name = os.fsdecode(raw_name)
+        if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+            events.append(WatchEvent(WRITTEN, name))
+        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+            events.append(WatchEvent(REMOVED, name))
+    return events
+
+
+def open_directory_watcher(path: str | os.PathLike[str]) -> DirectoryWatcher | None:
+    """Return an inotify watcher for *path*, or ``None`` to fall back to polling."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return DirectoryWatcher(path)
+    except (OSError, AttributeError) as exc:
+        # AttributeError: libc without inotify symbols (e.g. some musl builds).
+        level = logging.WARNING if isinstance(exc, OSError) and exc.errno == errno.ENOSPC else logging.DEBUG
+        logger.log(level, "inotify unavailable for %s (%s); polling instead", path, exc)
+        return None
+
+
+__all__ = [
+    "LOST",
+    "REMOVED",
+    "RESCAN",
+    "WRITTEN",
+    "DirectoryWatcher",
+    "WatchEvent",
+    "open_directory_watcher",
+]
@@ -13,8 +13,11 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import tempfile
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass
 from typing import Any
 
@@ -81,6 +84,39 @@ class SplitProgress:
         return asdict(self)
 
 
+@dataclass
+class SplitExecution:
+    """Outcome of preparing a split plan with :func:`execute_split_plan`.
+
+    :param slices: One entry per distinct (model, profile) combination.
+    :param validations: One entry per distinct (G-code, printer profile).
+    :param uploads: One entry per distinct (printer, G-code).
+    :param critical_path_seconds: Print time of the busiest printer, from
+        the sliced G-code where available.
+    :param critical_printer: Printer on the critical path.
+    :param elapsed_seconds: Wall-clock time spent slicing, validating and
+        uploading.
+    :param errors: Human-readable failures; empty on full success.
+    """
+
+    slices: list[dict[str, Any]]
+    validations: list[dict[str, Any]]
+    uploads: list[dict[str, Any]]
+    critical_path_seconds: int
+    critical_printer: str | None
+    elapsed_seconds: float
+    errors: list[str]
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["success"] = self.success
+        return data
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -92,11 +128,10 @@ def _get_available_printers(available_printers: list[dict[str, Any]] | None = No
         return available_printers
 
     try:
-        from kiln.registry import get_registry
+        from kiln.server import _registry as registry
 
-        registry = get_registry()
         printers = []
-        for name in registry.list():
+        for name in registry.list_names():
             try:
                 adapter = registry.get(name)
                 state = adapter.get_state()
@@ -116,13 +151,31 @@ def _get_available_printers(available_printers: list[dict[str, Any]] | None = No
         return []
 
 
+_GCODE_EXTENSIONS = (".gcode", ".gco", ".g")
+
+# Cap on concurrent uploads when executing a split plan.
+_MAX_UPLOAD_WORKERS = 8
+
+
 def _estimate_print_time(file_path: str) -> int:
     """Rough time estimate for a single print in seconds.
 
-    Uses file size as a proxy — 1MB of G-code ~ 30 minutes.
+    G-code files use the slicer's embedded estimate (or the motion-model
+    estimate) from :func:`kiln.gcode_stats.get_gcode_stats`.  Other files
+    fall back to file size as a proxy — 1MB of G-code ~ 30 minutes.
     """
     import os
 
+    if file_path.lower().endswith(_GCODE_EXTENSIONS):
+        from kiln.gcode_stats import get_gcode_stats
+
+        try:
+            estimate = get_gcode_stats(file_path).estimated_time_seconds
+        except OSError:
+            estimate = None
+        if estimate:
+            return max(estimate, 60)
+
     try:
         size_bytes = os.path.getsize(file_path)
         size_mb = size_bytes / (1024 * 1024)
@@ -258,8 +311,7 @@ def plan_assembly_split(
     savings = ((total_sequential - parallel_time) / total_sequential * 100) if total_sequential > 0 else 0.0
 
     assembly_instructions = [
-        f"Step {i + 1}: Collect part '{p.part_id}' from printer '{p.printer_name}'"
-        for i, p in enumerate(parts)
+        f"Step {i + 1}: Collect part '{p.part_id}' from printer '{p.printer_name}'" for i, p in enumerate(parts)
     ]
     assembly_instructions.append(f"Step {len(parts) + 1}: Assemble all {len(parts)} parts per the model design")
 
@@ -441,3 +493,206 @@ def cancel_split_plan(plan_id: str) -> dict[str, Any]:
         "cancelled_count": cancelled,
         "errors": errors,
     }
+
+
+# ---------------------------------------------------------------------------
+# Batch preparation
+# ---------------------------------------------------------------------------
+
+
+def _printer_id_for(part: SplitJob) -> str | None:
+    printer_id = part.settings.get("printer_id")
+    if printer_id:
+        return printer_id
+    return part.printer_model if part.printer_model and part.printer_model != "unknown" else None
+
+
+def execute_split_plan(
+    plan: SplitPlan,
+    *,
+    profiles: dict[str, str] | None = None,
+    output_dir: str | None = None,
+    upload: bool = True,
+    registry: Any = None,
+    pool: Any = None,
+    upload_workers: int | None = None,
+    timeout: float | None = None,
+) -> SplitExecution:
+    """Slice, validate and upload every part of *plan* as one batch.
+
+    Work is deduplicated at each stage, so a 10-copy job across 5
+    identical printers slices once, validates once and uploads once per
+    printer:
+
+    1. Each distinct (model, profile) pair is sliced once on the shared
+       :class:`~kiln.slice_pool.SlicePool` (through the slice cache).
+       Parts that are already G-code skip this step.
+    2. Each distinct (G-code, printer profile) pair is safety-scanned once
+       with :func:`kiln.gcode.scan_gcode_file`.
+    3. Each distinct (printer, G-code) pair is uploaded once, with uploads
+       to different printers running in parallel.
+
+    Parts are updated in place: ``settings["gcode_path"]`` and
+    ``settings["remote_name"]`` are filled in, ``estimated_time_seconds``
+    is refreshed from the sliced G-code, and parts that fail any stage are
+    marked ``"failed"``.  The plan's time estimates are recomputed.  Queue
+    submission is still done by :func:`submit_split_plan`.
+
+    :param plan: Plan from :func:`plan_multi_copy_split` or
+        :func:`plan_assembly_split`.
+    :param profiles: Slicer profile path by printer name or printer model.
+        A part's own ``settings["profile"]`` takes precedence.
+    :param output_dir: Directory for sliced G-code.  Defaults to a fresh
+        temporary directory.
+    :param upload: Set ``False`` to stop after validation.
+    :param registry: Object with ``get(printer_name)`` returning an
+        adapter.  Defaults to the server's printer registry.
+    :param pool: Slicing pool.  Defaults to the shared pool.
+    :param upload_workers: Concurrent uploads (default: one per printer,
+        capped at 8).
+    :param timeout: Seconds to wait for slicing before giving up on the
+        remaining jobs.
+    """
+    started = time.monotonic()
+    profiles = profiles or {}
+    errors: list[str] = []
+
+    # 1. Slice distinct (model, profile) combinations.
+    slice_groups: dict[tuple[str, str | None], list[SplitJob]] = {}
+    for part in plan.parts:
+        if part.file_path.lower().endswith(_GCODE_EXTENSIONS):
+            part.settings["gcode_path"] = part.file_path
+            continue
+        profile = part.settings.get("profile") or profiles.get(part.printer_name) or profiles.get(part.printer_model)
+        slice_groups.setdefault((os.path.realpath(part.file_path), profile), []).append(part)
+
+    slices: list[dict[str, Any]] = []
+    if slice_groups:
+        if pool is None:
+            from kiln.slice_pool import get_slice_pool
+
+            pool = get_slice_pool()
+        out_root = output_dir or tempfile.mkdtemp(prefix="kiln_split_")
+        submitted = [
+            (
+                pool.submit(model, profile=profile, output_dir=os.path.join(out_root, f"slice_{i}")),
+                model,
+                profile,
+                parts,
+            )
+            for i, ((model, profile), parts) in enumerate(slice_groups.items())
+        ]
+        pool.wait([job for job, _, _, _ in submitted], timeout=timeout)
+
+        for job, model, profile, parts in submitted:
+            gcode = job.result.output_path if job.status == "completed" and job.result else None
+            if gcode is None:
+                if not job.done:
+                    pool.cancel(job.id)
+                reason = job.error or ("timed out" if not job.done else job.status)
+                errors.append(f"Slicing {os.path.basename(model)} failed: {reason}")
+            for part in parts:
+                part.settings["gcode_path"] = gcode
+                if gcode is None:
+                    part.status = "failed"
+            slices.append(
+                {
+                    "file_path": model,
+                    "profile": profile,
+                    "part_ids": [p.part_id for p in parts],
+                    "status": job.status,
+                    "gcode_path": gcode,
+                    "cached": bool(job.result and job.result.cached),
+                    "run_seconds": job.run_seconds,
+                    "error": job.error,
+                }
+            )
+
+    # 2. Validate distinct (G-code, printer profile) pairs.
+    from kiln.gcode import scan_gcode_file
+
+    validations: list[dict[str, Any]] = []
+    verdicts: dict[tuple[str, str | None], bool] = {}
+    for part in plan.parts:
+        gcode = part.settings.get("gcode_path")
+        if not gcode:
+            continue
+        key = (gcode, _printer_id_for(part))
+        if key not in verdicts:
+            entry: dict[str, Any] = {"gcode_path": gcode, "printer_id": key[1]}
+            try:
+                result = scan_gcode_file(gcode, printer_id=key[1])
+                entry.update(valid=result.valid, warnings=len(result.warnings), errors=result.errors[:5])
+            except OSError as exc:
+                entry.update(valid=False, warnings=0, errors=[str(exc)])
+            verdicts[key] = entry["valid"]
+            validations.append(entry)
+            if not entry["valid"]:
+                errors.append(f"G-code {os.path.basename(gcode)} failed safety validation: {entry['errors'][:1]}")
+        if not verdicts[key]:
+            part.status = "failed"
+
+    # 3. Upload distinct (printer, G-code) pairs in parallel.
+    uploads: list[dict[str, Any]] = []
+    targets: dict[tuple[str, str], list[SplitJob]] = {}
+    if upload:
+        for part in plan.parts:
+            gcode = part.settings.get("gcode_path")
+            if gcode and part.status != "failed":
+                targets.setdefault((part.printer_name, gcode), []).append(part)
+    if targets:
+        if registry is None:
+            from kiln.server import _registry as registry
+
+        def _upload(printer_name: str, gcode: str) -> Any:
+            return registry.get(printer_name).upload_file(gcode)
+
+        workers = upload_workers or min(len({name for name, _ in targets}), _MAX_UPLOAD_WORKERS)
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="kiln-split-upload") as executor:
+            futures = {executor.submit(_upload, name, gcode): (name, gcode) for name, gcode in targets}
+            for future in as_completed(futures):
+                name, gcode = futures[future]
+                entry = {"printer_name": name, "gcode_path": gcode, "success": False, "file_name": None}
+                try:
+                    result = future.result()
+                    entry["success"] = bool(getattr(result, "success", True))
+                    entry["file_name"] = getattr(result, "file_name", None) or os.path.basename(gcode)
+                    if not entry["success"]:
+                        entry["error"] = getattr(result, "message", "upload rejected")
+                except Exception as exc:
+                    entry["error"] = str(exc)
+                if not entry["success"]:
+                    errors.append(f"Upload of {os.path.basename(gcode)} to {name} failed: {entry['error']}")
+                for part in targets[(name, gcode)]:
+                    if entry["success"]:
+                        part.settings["remote_name"] = entry["file_name"]
+                    else:
+                        part.status = "failed"
+                uploads.append(entry)
+
+    # 4. Critical-path ETA from the sliced G-code.
+    printer_times: dict[str, int] = {}
+    sequential = 0
+    for part in plan.parts:
+        gcode = part.settings.get("gcode_path")
+        if gcode:
+            part.estimated_time_seconds = _estimate_print_time(gcode)
+        sequential += part.estimated_time_seconds
+        if part.status != "failed":
+            printer_times[part.printer_name] = printer_times.get(part.printer_name, 0) + part.estimated_time_seconds
+    critical_printer = max(printer_times, key=printer_times.__getitem__) if printer_times else None
+    critical_path = printer_times.get(critical_printer, 0) if critical_printer else 0
+
+    plan.estimated_total_time_seconds = critical_path
+    plan.estimated_sequential_time_seconds = sequential
+    plan.time_savings_percentage = round((sequential - critical_path) / sequential * 100, 1) if sequential > 0 else 0.0
+
+    return SplitExecution(
+        slices=slices,
+        validations=validations,
+        uploads=uploads,
+        critical_path_seconds=critical_path,
+        critical_printer=critical_printer,
+        elapsed_seconds=round(time.monotonic() - started, 3),
+        errors=errors,
+    )
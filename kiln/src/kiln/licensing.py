@@ -42,6 +42,7 @@ import logging
 import os
 import secrets
 import sys
+import threading
 import time
 import warnings
 from collections.abc import Callable
@@ -102,10 +103,39 @@ def _encode_b64_no_pad(raw: bytes) -> str:
     return base64.b64encode(raw).decode("ascii").rstrip("=")
 
 
+# Parsed verify keys, memoised per value of the verify-keys env var so
+# every license check does not re-decode the Ed25519 public keys.
+_verify_keys_cache: tuple[str, dict[str, Ed25519PublicKey]] | None = None
+_verify_keys_lock = threading.Lock()
+
+
 def _load_v2_verify_keys() -> dict[str, Ed25519PublicKey]:
-    """Load v2 Ed25519 verify keys keyed by key id (kid)."""
-    raw_map = dict(_V2_DEFAULT_VERIFY_KEYS)
+    """Return v2 Ed25519 verify keys keyed by key id (kid).
+
+    Keys are parsed once per process and re-parsed only if
+    ``KILN_LICENSE_VERIFY_KEYS_JSON`` changes.
+    """
+    global _verify_keys_cache
     env_json = os.environ.get(_V2_VERIFY_KEYS_ENV, "").strip()
+    cached = _verify_keys_cache
+    if cached is not None and cached[0] == env_json:
+        return cached[1]
+    with _verify_keys_lock:
+        keys = _parse_v2_verify_keys(env_json)
+        _verify_keys_cache = (env_json, keys)
+    return keys
+
+
+def _reset_verify_keys_cache() -> None:
+    """Forget the parsed verify keys (tests)."""
+    global _verify_keys_cache
+    with _verify_keys_lock:
+        _verify_keys_cache = None
+
+
+def _parse_v2_verify_keys(env_json: str) -> dict[str, Ed25519PublicKey]:
+    """Decode the built-in verify keys plus any from *env_json*."""
+    raw_map = dict(_V2_DEFAULT_VERIFY_KEYS)
     if env_json:
         try:
             parsed = json.loads(env_json)
@@ -1,9 +1,40 @@
+"""In-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms live in a global :class:`MetricsRegistry`.
+Hot paths record into the pre-defined metrics at the bottom of this module
+(tool calls, adapter HTTP requests, scheduler ticks, queue depth, database
+commits, event dispatch, webhook delivery and backups).  The REST API
+serves them at ``GET /metrics``; in MCP stdio mode set
+``KILN_METRICS_PORT`` to start a standalone exporter via
+:func:`start_metrics_server`.
+
+Usage::
+
+    from kiln.metrics import ADAPTER_LATENCY, endpoint_label, get_metrics
+
+    with ADAPTER_LATENCY.timer({"backend": "octoprint", "endpoint": endpoint_label("GET", "/api/job")}):
+        ...
+
+    text = get_metrics().export_prometheus()
+"""
+
 from __future__ import annotations
 
+import contextlib
+import json
+import logging
 import threading
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+# Content type of the Prometheus text exposition format.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 @dataclass
 class Counter:
@@ -148,6 +179,15 @@ class Histogram:
                 if value <= bucket:
                     data.buckets[bucket] += 1
 
+    @contextlib.contextmanager
+    def timer(self, labels: dict[str, str] | None = None) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, labels)
+
     def get(self, labels: dict[str, str] | None = None) -> dict[str, Any]:
         """Get histogram data."""
         label_tuple = self._validate_labels(labels)
@@ -217,38 +257,57 @@ class MetricsRegistry:
         lines = []
 
         with self._lock:
-            for name, metric in self._metrics.items():
-                exported = metric.export()
-
-                # HELP and TYPE lines
-                lines.append(f"# HELP {name} {exported['help']}")
-                lines.append(f"# TYPE {name} {exported['type']}")
-
-                # Metric values
-                if exported["type"] == "histogram":
-                    for label_str, data in exported["values"].items():
-                        label_suffix = f"{{{label_str}}}" if label_str else ""
-
-                        # Bucket lines
-                        for bucket, count in sorted(data["buckets"].items()):
-                            bucket_labels = f'{label_str},le="{bucket}"' if label_str else f'le="{bucket}"'
-                            lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
-
-                        # +Inf bucket
-                        inf_labels = f'{label_str},le="+Inf"' if label_str else 'le="+Inf"'
-                        lines.append(f"{name}_bucket{{{inf_labels}}} {data['count']}")
-
-                        # Sum and count
-                        lines.append(f"{name}_sum{label_suffix} {data['sum']}")
-                        lines.append(f"{name}_count{label_suffix} {data['count']}")
+            metrics = list(self._metrics.items())
+
+        for name, metric in metrics:
+            exported = metric.export()
+
+            # HELP and TYPE lines
+            lines.append(f"# HELP {name} {_escape_help(exported['help'])}")
+            lines.append(f"# TYPE {name} {exported['type']}")
+
+            with metric._lock:
+                if isinstance(metric, Histogram):
+                    samples: list[tuple[tuple[str, ...], Any]] = list(metric._data.items())
+                else:
+                    samples = list(metric._values.items())
+
+            # Metric values
+            for label_tuple, value in samples:
+                pairs = list(zip(metric.labels, label_tuple, strict=False))
+                if isinstance(metric, Histogram):
+                    # Bucket lines
+                    for bucket, count in sorted(value.buckets.items()):
+                        lines.append(f"{name}_bucket{_format_prometheus_labels([*pairs, ('le', str(bucket))])} {count}")
+
+                    # +Inf bucket
+                    lines.append(f"{name}_bucket{_format_prometheus_labels([*pairs, ('le', '+Inf')])} {value.count}")
+
+                    # Sum and count
+                    suffix = _format_prometheus_labels(pairs)
+                    lines.append(f"{name}_sum{suffix} {value.sum}")
+                    lines.append(f"{name}_count{suffix} {value.count}")
                 else:
-                    for label_str, value in exported["values"].items():
-                        label_suffix = f"{{{label_str}}}" if label_str else ""
-                        lines.append(f"{name}{label_suffix} {value}")
+                    lines.append(f"{name}{_format_prometheus_labels(pairs)} {value}")
 
         return "\n".join(lines) + "\n"
 
 
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_prometheus_labels(pairs: list[tuple[str, str]]) -> str:
+    """Render ``{k="v",...}`` with Prometheus escaping (empty string if no labels)."""
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(str(value))}"' for key, value in pairs) + "}"
+
+
 # Global registry
 _registry = MetricsRegistry()
 
@@ -291,3 +350,165 @@ API_LATENCY = Histogram(
     "kiln_api_latency_seconds", "API call latency", buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
 )
 _registry.register(API_LATENCY)
+
+# Hot-path instrumentation
+TOOL_CALLS = Counter("kiln_tool_calls_total", "MCP/REST tool invocations", labels=["tool", "status"])
+_registry.register(TOOL_CALLS)
+
+TOOL_LATENCY = Histogram(
+    "kiln_tool_latency_seconds",
+    "MCP/REST tool call latency",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    labels=["tool"],
+)
+_registry.register(TOOL_LATENCY)
+
+ADAPTER_LATENCY = Histogram(
+    "kiln_adapter_request_seconds",
+    "Printer adapter HTTP request latency",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    labels=["backend", "endpoint"],
+)
+_registry.register(ADAPTER_LATENCY)
+
+SCHEDULER_TICK = Histogram(
+    "kiln_scheduler_tick_seconds",
+    "Scheduler tick duration",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+_registry.register(SCHEDULER_TICK)
+
+DB_COMMIT_LATENCY = Histogram(
+    "kiln_db_commit_seconds",
+    "Database commit latency",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+    labels=["backend"],
+)
+_registry.register(DB_COMMIT_LATENCY)
+
+EVENT_DISPATCH_LATENCY = Histogram(
+    "kiln_event_dispatch_seconds",
+    "Event bus dispatch latency across all handlers",
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+    labels=["event"],
+)
+_registry.register(EVENT_DISPATCH_LATENCY)
+
+WEBHOOK_DELIVERY_LAG = Histogram(
+    "kiln_webhook_delivery_lag_seconds",
+    "Time from event publication to webhook delivery completing",
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0],
+    labels=["status"],
+)
+_registry.register(WEBHOOK_DELIVERY_LAG)
+
+BACKUP_DURATION = Histogram(
+    "kiln_backup_duration_seconds",
+    "Database backup duration",
+    buckets=[0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0],
+    labels=["mode", "status"],
+)
+_registry.register(BACKUP_DURATION)
+
+BACKUP_BYTES = Counter("kiln_backup_bytes_total", "Bytes written to backup storage", labels=["mode"])
+_registry.register(BACKUP_BYTES)
+
+BACKUP_LAST_SUCCESS = Gauge(
+    "kiln_backup_last_success_timestamp_seconds",
+    "Point in time captured by the newest successful backup",
+    labels=["mode"],
+)
+_registry.register(BACKUP_LAST_SUCCESS)
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation helpers
+# ---------------------------------------------------------------------------
+
+
+def endpoint_label(method: str, path: str, *, depth: int = 3) -> str:
+    """Collapse a request path into a low-cardinality endpoint label.
+
+    Only the first *depth* path segments are kept, so file names and job
+    ids do not create a series per request: ``GET /api/files/local/x.gcode``
+    becomes ``GET /api/files/local``.
+    """
+    segments = [seg for seg in path.split("?", 1)[0].split("/") if seg][:depth]
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+
+def _reports_failure(result: Any) -> bool:
+    """Whether a tool result carries ``"success": false``.
+
+    Understands the raw dict, a ``CallToolResult``, FastMCP's
+    ``(content, structured)`` pair and a list of content blocks holding
+    the JSON text.
+    """
+    if isinstance(result, dict):
+        if "success" not in result and isinstance(result.get("result"), dict):
+            result = result["result"]  # FastMCP-wrapped structured output
+        return result.get("success") is False
+    if getattr(result, "isError", False):
+        return True
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], dict):
+        return _reports_failure(result[1])
+    if isinstance(result, (list, tuple)) and len(result) == 1:
+        text = getattr(result[0], "text", None)
+        # Cheap substring check first so successful results are not parsed.
+        if isinstance(text, str) and '"success": false' in text:
+            try:
+                payload = json.loads(text)
+            except ValueError:
+                return False
+            return isinstance(payload, dict) and payload.get("success") is False
+    return False
+
+
+def record_tool_call(tool: str, seconds: float, *, result: Any = None, error: bool = False) -> None:
+    """Record one tool invocation.
+
+    Tools usually report failure as ``{"success": False, ...}`` rather
+    than raising, so such results count as errors too.  *result* may be
+    the tool's own return value or FastMCP's converted form.
+    """
+    failed = error or _reports_failure(result)
+    TOOL_CALLS.inc(labels={"tool": tool, "status": "error" if failed else "ok"})
+    TOOL_LATENCY.observe(seconds, labels={"tool": tool})
+
+
+# ---------------------------------------------------------------------------
+# Standalone exporter
+# ---------------------------------------------------------------------------
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_metrics().export_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("metrics exporter: " + format, *args)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` from a daemon thread.
+
+    Intended for MCP stdio mode, where there is no HTTP app to mount the
+    endpoint on.  Binds to localhost by default.
+
+    :returns: The running server; call ``shutdown()`` to stop it.
+    :raises OSError: If the address cannot be bound.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="kiln-metrics", daemon=True)
+    thread.start()
+    logger.info("Prometheus metrics exporter listening on %s:%d", host, server.server_address[1])
+    return server
@@ -0,0 +1,430 @@
+"""Monthly time partitions for KilnDB's append-only tables.
+
+``events``, ``safety_audit_log`` and ``snapshots`` only grow at the head
+and are only trimmed at the tail, so each is split into one partition per
+calendar month (UTC).  Retention then drops whole partitions instead of
+running a large ``DELETE ... WHERE timestamp < ?`` that holds the write
+lock and leaves the file full of free pages.
+
+* **SQLite** -- every month is an ordinary table ``<table>_pYYYYMM`` with
+  its own copy of the indexes.  ``<table>`` itself becomes a
+  ``UNION ALL`` view over the partitions, so existing queries keep
+  working, and ``INSTEAD OF`` triggers route ad-hoc INSERT, UPDATE and
+  DELETE statements against the view to the partitions.  Rows are always
+  appended to the newest partition, so each partition holds a contiguous
+  range of ids in write order.
+* **PostgreSQL** -- the tables stay plain until native partitioning can
+  be tested against a real server.  :class:`PartitionManager` then
+  writes to and deletes from the table itself and has no partitions to
+  drop.
+
+The ``table_partitions`` catalog lists each partition's period.  Its
+``head`` column, set on the oldest surviving partition when older ones
+are dropped, carries forward the last value of a hash chain (the audit
+log's ``prev_hash``) so the chain can still be verified partition by
+partition after retention.
+
+Usage::
+
+    from kiln.partitions import PartitionManager
+
+    partitions = PartitionManager(backend)
+    table = partitions.write_target("events")  # e.g. "events_p202610"
+    removed = partitions.drop_expired("events", cutoff)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import re
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+# ---------------------------------------------------------------------------
+# Periods
+# ---------------------------------------------------------------------------
+
+_PARTITION_SUFFIX_RE = re.compile(r"_p\d{6}$")
+_CREATE_TABLE_RE = re.compile(r'^CREATE TABLE\s+(?:"[^"]+"|\w+)', re.IGNORECASE)
+_CREATE_INDEX_RE = re.compile(
+    r'^CREATE (UNIQUE )?INDEX\s+"?(\w+)"?\s+ON\s+(?:"[^"]+"|\w+)',
+    re.IGNORECASE,
+)
+
+
+def period_of(timestamp: float) -> str:
+    """Return the ``YYYYMM`` partition period (UTC) containing *timestamp*."""
+    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return f"{dt.year:04d}{dt.month:02d}"
+
+
+def period_bounds(period: str) -> tuple[float, float]:
+    """Return the ``[start, end)`` Unix timestamps of a ``YYYYMM`` period."""
+    year, month = int(period[:4]), int(period[4:])
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start.timestamp(), end.timestamp()
+
+
+def _next_period(period: str) -> str:
+    return period_of(period_bounds(period)[1])
+
+
+def partition_name(table: str, period: str) -> str:
+    """Return the name of *table*'s partition for *period*."""
+    return f"{table}_p{period}"
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One monthly partition of a partitioned table.
+
+    :param name: Partition table name, e.g. ``"events_p202610"``.
+    :param parent: Name of the partitioned table (the view on SQLite).
+    :param period: ``YYYYMM`` month the partition was opened for.
+    :param time_column: Column retention compares against.
+    :param head: Carried-forward chain value of the rows dropped before
+        this partition (empty unless older partitions were dropped).
+    """
+
+    name: str
+    parent: str
+    period: str
+    time_column: str
+    head: str = ""
+
+    @property
+    def start(self) -> float:
+        return period_bounds(self.period)[0]
+
+    @property
+    def end(self) -> float:
+        return period_bounds(self.period)[1]
+
+
+# ---------------------------------------------------------------------------
+# Catalog
+# ---------------------------------------------------------------------------
+
+
+def _ensure_catalog(conn: Any) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS table_partitions (
+            name        TEXT PRIMARY KEY,
+            parent      TEXT NOT NULL,
+            period      TEXT NOT NULL,
+            time_column TEXT NOT NULL,
+            head        TEXT NOT NULL DEFAULT '',
+            created_at  REAL NOT NULL
+        )
+        """
+    )
+
+
+def _record(conn: Any, parent: str, period: str, time_column: str) -> None:
+    conn.execute(
+        "INSERT INTO table_partitions (name, parent, period, time_column, created_at) VALUES (?, ?, ?, ?, ?)",
+        (partition_name(parent, period), parent, period, time_column, time.time()),
+    )
+
+
+@contextlib.contextmanager
+def _savepoint(conn: Any) -> Iterator[None]:
+    """Run DDL atomically whether or not a transaction is already open."""
+    conn.execute("SAVEPOINT kiln_partitions")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK TO SAVEPOINT kiln_partitions")
+        conn.execute("RELEASE SAVEPOINT kiln_partitions")
+        raise
+    conn.execute("RELEASE SAVEPOINT kiln_partitions")
+
+
+# ---------------------------------------------------------------------------
+# SQLite: partition tables behind a UNION ALL view
+# ---------------------------------------------------------------------------
+
+
+def _sqlite_type(conn: Any, name: str) -> str | None:
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def _sqlite_clone(conn: Any, source: str, name: str, period: str) -> list[str]:
+    """Create table *name* shaped like *source*; return its index DDL.
+
+    Indexes are returned rather than created so that bulk copies can fill
+    the table first.
+    """
+    table_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (source,),
+    ).fetchone()[0]
+    conn.execute(_CREATE_TABLE_RE.sub(f"CREATE TABLE {name}", table_sql, count=1))
+    indexes = []
+    for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (source,),
+    ).fetchall():
+        match = _CREATE_INDEX_RE.match(sql)
+        if match is None:
+            continue
+        base = _PARTITION_SUFFIX_RE.sub("", match.group(2))
+        unique = match.group(1) or ""
+        indexes.append(f"CREATE {unique}INDEX {base}_p{period} ON {name}{sql[match.end() :]}")
+    return indexes
+
+
+def _sqlite_seed_sequence(conn: Any, name: str, seq: int) -> None:
+    """Continue AUTOINCREMENT ids in *name* after *seq*."""
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (name,))
+    conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, seq))
+
+
+def _sqlite_sequence(conn: Any, name: str) -> int:
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def _sqlite_rebuild_view(conn: Any, table: str, partitions: list[str]) -> None:
+    """Recreate the *table* view and its write triggers over *partitions*."""
+    newest = partitions[-1]
+    columns = conn.execute(f"PRAGMA table_info({newest})").fetchall()
+    names = [col[1] for col in columns]
+    # Views have no defaults, so fall back to the partition's own.
+    values = [f"NEW.{col[1]}" if col[4] is None else f"COALESCE(NEW.{col[1]}, ({col[4]}))" for col in columns]
+    assignments = ", ".join(f"{name} = NEW.{name}" for name in names)
+
+    conn.execute(f"DROP VIEW IF EXISTS {table}")
+    conn.execute(f"CREATE VIEW {table} AS " + " UNION ALL ".join(f"SELECT * FROM {p}" for p in partitions))
+    conn.execute(
+        f"CREATE TRIGGER {table}_insert INSTEAD OF INSERT ON {table} BEGIN "
+        f"INSERT INTO {newest} ({', '.join(names)}) VALUES ({', '.join(values)}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {table}_update INSTEAD OF UPDATE ON {table} BEGIN "
+        + " ".join(f"UPDATE {p} SET {assignments} WHERE id = OLD.id;" for p in partitions)
+        + " END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {table}_delete INSTEAD OF DELETE ON {table} BEGIN "
+        + " ".join(f"DELETE FROM {p} WHERE id = OLD.id;" for p in partitions)
+        + " END"
+    )
+
+
+def _sqlite_partition_table(conn: Any, table: str, time_column: str) -> None:
+    if _sqlite_type(conn, table) != "table":
+        return
+    current = period_of(time.time())
+    oldest, max_id = conn.execute(f"SELECT MIN({time_column}), MAX(id) FROM {table}").fetchone()
+    period = min(period_of(oldest), current) if oldest is not None else current
+
+    # Split by the first id written in each month so that every partition
+    # holds a contiguous id range, as if it had been partitioned all along.
+    ranges: list[tuple[str, int]] = []
+    lower = 0
+    while period != current:
+        nxt = _next_period(period)
+        row = conn.execute(
+            f"SELECT MIN(id) FROM {table} WHERE {time_column} >= ?",
+            (period_bounds(nxt)[0],),
+        ).fetchone()
+        upper = max(lower, row[0] if row[0] is not None else (max_id or 0) + 1)
+        if upper > lower:
+            ranges.append((period, lower))
+        lower = upper
+        period = nxt
+    ranges.append((current, lower))
+
+    seq = _sqlite_sequence(conn, table)
+    names = []
+    for index, (period, lower) in enumerate(ranges):
+        upper = ranges[index + 1][1] if index + 1 < len(ranges) else None
+        name = partition_name(table, period)
+        indexes = _sqlite_clone(conn, table, name, period)
+        if upper is None:
+            conn.execute(f"INSERT INTO {name} SELECT * FROM {table} WHERE id >= ?", (lower,))
+        else:
+            conn.execute(f"INSERT INTO {name} SELECT * FROM {table} WHERE id >= ? AND id < ?", (lower, upper))
+        for sql in indexes:
+            conn.execute(sql)
+        _record(conn, table, period, time_column)
+        names.append(name)
+    _sqlite_seed_sequence(conn, names[-1], seq)
+    conn.execute(f"DROP TABLE {table}")
+    _sqlite_rebuild_view(conn, table, names)
+
+
+def partition_table(conn: Any, table: str, time_column: str) -> None:
+    """Convert plain SQLite *table* into monthly partitions on *time_column*.
+
+    Existing rows are copied into the partition for the month they were
+    written in.  Does nothing if *table* is already partitioned.
+    """
+    _ensure_catalog(conn)
+    with _savepoint(conn):
+        _sqlite_partition_table(conn, table, time_column)
+
+
+# ---------------------------------------------------------------------------
+# Manager
+# ---------------------------------------------------------------------------
+
+
+class PartitionManager:
+    """Routes writes to, and expires, the partitions of partitioned tables.
+
+    Callers hold their own write lock and commit afterwards; DDL issued
+    here runs inside a savepoint so a failure leaves the schema intact.
+
+    :param conn: A :class:`~kiln.persistence.StorageBackend`.
+    :param postgres: Whether *conn* is the PostgreSQL backend.
+    """
+
+    def __init__(self, conn: Any, *, postgres: bool = False) -> None:
+        self._conn = conn
+        self._postgres = postgres
+        self._targets: dict[str, tuple[str, str]] = {}
+
+    def partitions(self, table: str) -> list[Partition]:
+        """Return *table*'s partitions, oldest first."""
+        rows = self._conn.execute(
+            "SELECT name, parent, period, time_column, head FROM table_partitions WHERE parent = ? ORDER BY period",
+            (table,),
+        ).fetchall()
+        return [Partition(*row) for row in rows]
+
+    def write_target(self, table: str, *, now: float | None = None) -> str:
+        """Return the table new rows of *table* should be inserted into.
+
+        On SQLite this is the newest partition, opening a partition for the
+        current month first if the month has rolled over.  On PostgreSQL
+        the table is plain and is returned as is.
+        """
+        period = period_of(time.time() if now is None else now)
+        cached = self._targets.get(table)
+        if cached is not None and cached[0] == period:
+            return cached[1]
+        parts = self.partitions(table)
+        if not parts:
+            if not self._postgres:
+                raise ValueError(f"{table} is not partitioned")
+            target = table  # Plain PostgreSQL table.
+        elif parts[-1].period >= period:
+            target = parts[-1].name
+        else:
+            target = self._open_sqlite_partition(parts, period)
+        self._targets[table] = (period, target)
+        return target
+
+    def _open_sqlite_partition(self, parts: list[Partition], period: str) -> str:
+        newest = parts[-1]
+        name = partition_name(newest.parent, period)
+        with _savepoint(self._conn):
+            if _sqlite_type(self._conn, name) == "table":
+                return name  # Opened by another connection.
+            for sql in _sqlite_clone(self._conn, newest.name, name, period):
+                self._conn.execute(sql)
+            _sqlite_seed_sequence(self._conn, name, _sqlite_sequence(self._conn, newest.name))
+            _record(self._conn, newest.parent, period, newest.time_column)
+            _sqlite_rebuild_view(self._conn, newest.parent, [p.name for p in parts] + [name])
+        return name
+
+    def last_value(self, table: str, column: str, *, before: str | None = None) -> str:
+        """Return *column* of the newest row of *table*, searching partitions
+        newest first.
+
+        :param before: Only search partitions older than this one.  When
+            no partition has rows, the oldest partition's carried-forward
+            head is returned.
+        """
+        parts = self.partitions(table)
+        if before is not None:
+            parts = parts[: [p.name for p in parts].index(before)]
+        names = [p.name for p in parts]
+        if not names and before is None and self._postgres:
+            names = [table]  # Plain PostgreSQL table.
+        for name in reversed(names):
+            row = self._conn.execute(f"SELECT {column} FROM {name} ORDER BY id DESC LIMIT 1").fetchone()
+            if row is not None:
+                return row[0] or ""
+        head = self.partitions(table)[:1]
+        return head[0].head if head else ""
+
+    def drop_expired(
+        self,
+        table: str,
+        before: float,
+        *,
+        chain_column: str | None = None,
+        dry_run: bool = False,
+    ) -> int:
+        """Drop the oldest partitions whose rows are all older than *before*.
+
+        Only a prefix of the partitions is dropped, so a hash chain stays
+        verifiable from the oldest surviving partition; pass *chain_column*
+        to carry its last dropped value forward as that partition's head.
+        The newest partition is always kept, since it receives writes.
+
+        :returns: The number of rows removed (or that would be, with
+            *dry_run*).
+        """
+        parts = self.partitions(table)
+        expired: list[Partition] = []
+        for part in parts[:-1]:
+            newest = self._conn.execute(f"SELECT MAX({part.time_column}) FROM {part.name}").fetchone()[0]
+            if newest is not None and newest >= before:
+                break
+            expired.append(part)
+        removed = sum(self._conn.execute(f"SELECT COUNT(*) FROM {p.name}").fetchone()[0] for p in expired)
+        if dry_run or not expired:
+            return removed
+
+        survivors = parts[len(expired) :]
+        with _savepoint(self._conn):
+            if chain_column is not None and survivors:
+                head = self.last_value(table, chain_column, before=survivors[0].name)
+                self._conn.execute("UPDATE table_partitions SET head = ? WHERE name = ?", (head, survivors[0].name))
+            for part in expired:
+                self._conn.execute(f"DROP TABLE {part.name}")
+                self._conn.execute("DELETE FROM table_partitions WHERE name = ?", (part.name,))
+            _sqlite_rebuild_view(self._conn, table, [p.name for p in survivors])
+        return removed
+
+    def delete_where(self, table: str, where: str, params: tuple[Any, ...] | list[Any]) -> int:
+        """Run ``DELETE ... WHERE <where>`` against every partition of *table*.
+
+        Deleting from the partitions directly skips the SQLite view's
+        row-by-row ``INSTEAD OF`` trigger.
+        """
+        if self._postgres:
+            return self._conn.execute(f"DELETE FROM {table} WHERE {where}", params).rowcount
+        return sum(
+            self._conn.execute(f"DELETE FROM {part.name} WHERE {where}", params).rowcount
+            for part in self.partitions(table)
+        )
+
+    def purge_before(self, table: str, before: float, *, time_column: str) -> int:
+        """Remove every row of *table* whose *time_column* is older than *before*.
+
+        Whole partitions are dropped; only the partitions straddling
+        *before* fall back to deleting rows.
+        """
+        removed = self.drop_expired(table, before)
+        return removed + self.delete_where(table, f"{time_column} < ?", (before,))
+
+
+__all__ = [
+    "Partition",
+    "PartitionManager",
+    "partition_name",
+    "partition_table",
+    "period_bounds",
+    "period_of",
+]
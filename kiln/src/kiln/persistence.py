@@ -23,7 +23,6 @@ Example::
 
 from __future__ import annotations
 
-import contextlib
 import hashlib
 import hmac
 import json
@@ -38,6 +37,10 @@ from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, Protocol
 
+from kiln.metrics import DB_COMMIT_LATENCY
+from kiln.partitions import PartitionManager
+from kiln.schema_migrations import AddColumn, apply_migrations
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -50,6 +53,14 @@ _DEFAULT_DB_PATH = os.path.join(_DEFAULT_DB_DIR, "kiln.db")
 # SQL parameter type accepted by both sqlite3 and typical DB-API adapters.
 _SqlParams = Sequence[Any] | dict[str, Any]
 
+# Tables split into monthly partitions (schema migration 8), mapped to the
+# hash-chain column whose head is carried forward when partitions expire.
+_PARTITIONED_TABLES: dict[str, str | None] = {
+    "events": None,
+    "safety_audit_log": "prev_hash",
+    "snapshots": None,
+}
+
 
 # ---------------------------------------------------------------------------
 # Storage backend abstraction
@@ -141,7 +152,8 @@ class SQLiteBackend:
         return self._conn.executescript(sql_script)
 
     def commit(self) -> None:
-        self._conn.commit()
+        with DB_COMMIT_LATENCY.timer({"backend": "sqlite"}):
+            self._conn.commit()
 
     def close(self) -> None:
         self._conn.close()
@@ -398,7 +410,8 @@ class PostgresBackend:
         return _PgDictCursor(cur)
 
     def commit(self) -> None:
-        self._conn.commit()
+        with DB_COMMIT_LATENCY.timer({"backend": "postgres"}):
+            self._conn.commit()
 
     def close(self) -> None:
         self._conn.close()
@@ -452,9 +465,9 @@ class KilnDB:
 
         self._write_lock = threading.Lock()
         self._audit_hmac_key_cache: bytes | None = None
+        self._partitions = PartitionManager(self._conn, postgres=self._is_postgres)
 
         self._ensure_schema()
-        self._migrate_agent_memory()
         self._enforce_permissions()
 
     # ------------------------------------------------------------------
@@ -462,20 +475,16 @@ class KilnDB:
     # ------------------------------------------------------------------
 
     def _migrate_agent_memory(self) -> None:
-        """Add version and expires_at columns to existing agent_memory tables."""
-        if self._is_postgres:
-            # Postgres: query information_schema for existing columns.
-            rows = self._conn.execute(
-                "SELECT column_name FROM information_schema.columns WHERE table_name = 'agent_memory'",
-            ).fetchall()
-            columns = {row[0] for row in rows}
-        else:
-            # SQLite: use PRAGMA table_info.
-            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(agent_memory)").fetchall()}
-        if "version" not in columns:
-            self._conn.execute("ALTER TABLE agent_memory ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
-        if "expires_at" not in columns:
-            self._conn.execute("ALTER TABLE agent_memory ADD COLUMN expires_at REAL DEFAULT NULL")
+        """Add version and expires_at columns to existing agent_memory tables.
+
+        Normally applied by schema migration 6; kept callable for
+        databases opened outside :meth:`_ensure_schema`.
+        """
+        for operation in (
+            AddColumn("agent_memory", "version", "INTEGER NOT NULL DEFAULT 1"),
+            AddColumn("agent_memory", "expires_at", "REAL DEFAULT NULL"),
+        ):
+            operation.apply(self._conn, postgres=self._is_postgres)
         self._conn.commit()
 
     def _enforce_permissions(self) -> None:
@@ -678,8 +687,8 @@ class KilnDB:
                 );
                 CREATE INDEX IF NOT EXISTS idx_print_history_printer
                     ON print_history(printer_name);
-                CREATE INDEX IF NOT EXISTS idx_print_history_status
-                    ON print_history(status);
+                CREATE INDEX IF NOT EXISTS idx_print_history_printer_completed
+                    ON print_history(printer_name, completed_at);
 
                 CREATE TABLE IF NOT EXISTS agent_memory (
                     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -720,8 +729,25 @@ class KilnDB:
                     ON print_outcomes(outcome);
                 CREATE UNIQUE INDEX IF NOT EXISTS idx_print_outcomes_job_id
                     ON print_outcomes(job_id);
-                CREATE INDEX IF NOT EXISTS idx_print_outcomes_material
-                    ON print_outcomes(material_type);
+                CREATE INDEX IF NOT EXISTS idx_print_outcomes_printer_created
+                    ON print_outcomes(printer_name, created_at);
+
+                -- Per-printer daily rollups of print_history ("history")
+                -- and print_outcomes ("outcome"), maintained on insert.
+                CREATE TABLE IF NOT EXISTS printer_daily_rollups (
+                    printer_name    TEXT NOT NULL,
+                    day             INTEGER NOT NULL,
+                    source          TEXT NOT NULL,
+                    material_type   TEXT NOT NULL DEFAULT '',
+                    failure_mode    TEXT NOT NULL DEFAULT '',
+                    prints          INTEGER NOT NULL DEFAULT 0,
+                    successes       INTEGER NOT NULL DEFAULT 0,
+                    duration_sum    REAL NOT NULL DEFAULT 0,
+                    duration_count  INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (printer_name, day, source, material_type, failure_mode)
+                );
+                CREATE INDEX IF NOT EXISTS idx_printer_daily_rollups_day
+                    ON printer_daily_rollups(day);
 
                 CREATE TABLE IF NOT EXISTS safety_audit_log (
                     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -734,12 +760,6 @@ class KilnDB:
                     details         TEXT,
                     created_at      REAL DEFAULT (strftime('%s', 'now'))
                 );
-                CREATE INDEX IF NOT EXISTS idx_audit_tool
-                    ON safety_audit_log(tool_name);
-                CREATE INDEX IF NOT EXISTS idx_audit_action
-                    ON safety_audit_log(action);
-                CREATE INDEX IF NOT EXISTS idx_audit_time
-                    ON safety_audit_log(timestamp);
 
                 CREATE TABLE IF NOT EXISTS model_cache (
                     cache_id        TEXT PRIMARY KEY,
@@ -759,8 +779,6 @@ class KilnDB:
                 );
                 CREATE INDEX IF NOT EXISTS idx_model_cache_hash
                     ON model_cache(file_hash);
-                CREATE INDEX IF NOT EXISTS idx_model_cache_source
-                    ON model_cache(source);
 
                 CREATE TABLE IF NOT EXISTS fulfillment_orders (
                     id              TEXT PRIMARY KEY,
@@ -800,12 +818,6 @@ class KilnDB:
                     completion_pct   REAL,
                     created_at       REAL NOT NULL
                 );
-                CREATE INDEX IF NOT EXISTS idx_snapshots_job
-                    ON snapshots(job_id);
-                CREATE INDEX IF NOT EXISTS idx_snapshots_printer
-                    ON snapshots(printer_name);
-                CREATE INDEX IF NOT EXISTS idx_snapshots_phase
-                    ON snapshots(phase);
 
                 CREATE TABLE IF NOT EXISTS published_models (
                     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -880,12 +892,9 @@ class KilnDB:
                     quality_grade   TEXT DEFAULT 'B',
                     failure_mode    TEXT,
                     print_time_seconds INTEGER DEFAULT 0,
-                    timestamp       REAL NOT NULL
+                    timestamp       REAL NOT NULL,
+                    shape_descriptor BLOB
                 );
-                CREATE INDEX IF NOT EXISTS idx_print_dna_file_hash
-                    ON print_dna(file_hash);
-                CREATE INDEX IF NOT EXISTS idx_print_dna_geometric_sig
-                    ON print_dna(geometric_signature);
                 CREATE INDEX IF NOT EXISTS idx_print_dna_outcome
                     ON print_dna(outcome);
                 CREATE INDEX IF NOT EXISTS idx_print_dna_printer
@@ -952,37 +961,35 @@ class KilnDB:
                     created_at      REAL NOT NULL,
                     updated_at      REAL NOT NULL
                 );
+
+                CREATE TABLE IF NOT EXISTS webhook_dead_letters (
+                    event_id    TEXT PRIMARY KEY,
+                    webhook_id  TEXT NOT NULL,
+                    url         TEXT NOT NULL,
+                    event_type  TEXT NOT NULL,
+                    payload     TEXT NOT NULL,
+                    error       TEXT,
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    timestamp   REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_webhook_dead_letters_webhook
+                    ON webhook_dead_letters(webhook_id, timestamp);
                 """
             )
 
-            # Add hmac_signature column to safety_audit_log if missing.
-            # sqlite3.OperationalError on SQLite, various DB errors on
-            # Postgres -- column already exists in both cases.
-            with contextlib.suppress(sqlite3.OperationalError, Exception):
-                self._conn.execute("ALTER TABLE safety_audit_log ADD COLUMN hmac_signature TEXT")
+            # Columns and indexes added since the base schema shipped.
+            # Migration 8 turns events, safety_audit_log and snapshots into
+            # monthly partitions behind views of the same names.
+            apply_migrations(self._conn, postgres=self._is_postgres)
 
-            # Add session_id column to safety_audit_log if missing.
-            with contextlib.suppress(sqlite3.OperationalError, Exception):
-                self._conn.execute("ALTER TABLE safety_audit_log ADD COLUMN session_id TEXT")
-            with contextlib.suppress(sqlite3.OperationalError, Exception):
-                self._conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_audit_session ON safety_audit_log(session_id)"
-                )
-
-            # Add prev_hash column for tamper-evident hash chain.
-            with contextlib.suppress(sqlite3.OperationalError, Exception):
-                self._conn.execute(
-                    "ALTER TABLE safety_audit_log ADD COLUMN prev_hash TEXT DEFAULT ''"
-                )
-
-            # Add user_email column to billing_charges if missing (added for
-            # per-user free-tier tracking in the fulfillment proxy).
-            with contextlib.suppress(sqlite3.OperationalError, Exception):
-                self._conn.execute("ALTER TABLE billing_charges ADD COLUMN user_email TEXT")
-            with contextlib.suppress(sqlite3.OperationalError, Exception):
-                self._conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_billing_charges_user ON billing_charges(user_email)"
-                )
+            # Backfill daily rollups for databases created before the
+            # rollup table existed.
+            rollups_empty = self._conn.execute("SELECT 1 FROM printer_daily_rollups LIMIT 1").fetchone() is None
+            if rollups_empty and (
+                self._conn.execute("SELECT 1 FROM print_history LIMIT 1").fetchone() is not None
+                or self._conn.execute("SELECT 1 FROM print_outcomes LIMIT 1").fetchone() is not None
+            ):
+                self._rebuild_daily_rollups()
 
             self._conn.commit()
 
@@ -1067,9 +1074,10 @@ class KilnDB:
         """Insert an event and return the row id."""
         ts = timestamp if timestamp is not None else time.time()
         with self._write_lock:
+            table = self._partitions.write_target("events")
             cur = self._conn.execute(
-                """
-                INSERT INTO events (event_type, source, data, timestamp)
+                f"""
+                INSERT INTO {table} (event_type, source, data, timestamp)
                 VALUES (?, ?, ?, ?)
                 """,
                 (event_type, source, json.dumps(data), ts),
@@ -1376,7 +1384,7 @@ class KilnDB:
                   SELECT entity_id FROM sync_log
                   WHERE entity_type = 'event' AND status = 'success'
               )
-            ORDER BY e.id ASC
+            ORDER BY e.timestamp ASC, e.id ASC
             """,
             (since,),
         ).fetchall()
@@ -1402,6 +1410,89 @@ class KilnDB:
                 )
             self._conn.commit()
 
+    def get_sync_cursor(self, stream: str) -> str | None:
+        """Return the last cursor saved for sync *stream*, or ``None``.
+
+        Cursors live in ``sync_log`` as ``entity_type = 'cursor:<stream>'``
+        rows with ``status = 'cursor'``; ``entity_id`` holds the value.
+        """
+        row = self._conn.execute(
+            """
+            SELECT entity_id FROM sync_log
+            WHERE entity_type = ? AND status = 'cursor'
+            ORDER BY id DESC LIMIT 1
+            """,
+            (f"cursor:{stream}",),
+        ).fetchone()
+        return row["entity_id"] if row else None
+
+    def save_sync_cursor(self, stream: str, cursor: str) -> None:
+        """Record *cursor* for sync *stream*, replacing the previous one."""
+        entity_type = f"cursor:{stream}"
+        with self._write_lock:
+            self._conn.execute(
+                "DELETE FROM sync_log WHERE entity_type = ? AND status = 'cursor'",
+                (entity_type,),
+            )
+            self._conn.execute(
+                """
+                INSERT INTO sync_log (entity_type, entity_id, synced_at,
+                                      sync_direction, status)
+                VALUES (?, ?, ?, 'push', 'cursor')
+                """,
+                (entity_type, cursor, time.time()),
+            )
+            self._conn.commit()
+
+    def get_jobs_page(
+        self,
+        after: tuple[float, str] | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Return up to *limit* jobs ordered by ``(submitted_at, id)``.
+
+        :param after: Keyset cursor ``(submitted_at, id)`` of the last job
+            already returned; ``None`` starts from the beginning.
+        """
+        if after is None:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs ORDER BY submitted_at ASC, id ASC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        else:
+            submitted_at, job_id = after
+            rows = self._conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE (submitted_at, id) > (?, ?)
+                ORDER BY submitted_at ASC, id ASC
+                LIMIT ?
+                """,
+                (submitted_at, job_id, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_events_page(self, after_id: int, limit: int) -> list[dict[str, Any]]:
+        """Return up to *limit* events with ``id > after_id``, oldest first."""
+        rows = self._conn.execute(
+            "SELECT * FROM events WHERE id > ? ORDER BY id ASC LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
+        results: list[dict[str, Any]] = []
+        for row in rows:
+            d = dict(row)
+            d["data"] = json.loads(d["data"])
+            results.append(d)
+        return results
+
+    def last_event_id_before(self, timestamp: float) -> int:
+        """Return the highest event id logged at or before *timestamp* (0 if none)."""
+        row = self._conn.execute(
+            "SELECT MAX(id) AS max_id FROM events WHERE timestamp <= ?",
+            (timestamp,),
+        ).fetchone()
+        return row["max_id"] or 0
+
     # ------------------------------------------------------------------
     # Billing charges
     # ------------------------------------------------------------------
@@ -1852,6 +1943,13 @@ class KilnDB:
                     record.get("created_at", time.time()),
                 ),
             )
+            self._bump_daily_rollup(
+                "history",
+                record["printer_name"],
+                record.get("completed_at") or record.get("created_at", time.time()),
+                success=record["status"] == "completed",
+                duration=record.get("duration_seconds"),
+            )
             self._conn.commit()
             return cur.lastrowid  # type: ignore[return-value]
 
@@ -2087,6 +2185,243 @@ class KilnDB:
             self._conn.commit()
             return cur.rowcount
 
+    # ------------------------------------------------------------------
+    # Print trend aggregates
+    # ------------------------------------------------------------------
+
+    def _bump_daily_rollup(
+        self,
+        source: str,
+        printer_name: str,
+        timestamp: float,
+        *,
+        success: bool,
+        duration: float | None = None,
+        material_type: str | None = None,
+        failure_mode: str | None = None,
+    ) -> None:
+        """Add one print to ``printer_daily_rollups``.
+
+        Must be called with ``_write_lock`` held; the caller commits.
+        """
+        timed = duration is not None and duration > 0
+        self._conn.execute(
+            """
+            INSERT INTO printer_daily_rollups
+                (printer_name, day, source, material_type, failure_mode,
+                 prints, successes, duration_sum, duration_count)
+            VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
+            ON CONFLICT (printer_name, day, source, material_type, failure_mode) DO UPDATE SET
+                prints = prints + 1,
+                successes = successes + excluded.successes,
+                duration_sum = duration_sum + excluded.duration_sum,
+                duration_count = duration_count + excluded.duration_count
+            """,
+            (
+                printer_name,
+                int(timestamp // 86400),
+                source,
+                material_type or "",
+                failure_mode or "",
+                1 if success else 0,
+                duration if timed else 0.0,
+                1 if timed else 0,
+            ),
+        )
+
+    def _rebuild_daily_rollups(self) -> None:
+        """Recompute ``printer_daily_rollups`` from the source tables.
+
+        Must be called with ``_write_lock`` held; the caller commits.
+        """
+        self._conn.execute("DELETE FROM printer_daily_rollups")
+        self._conn.execute(
+            """
+            INSERT INTO printer_daily_rollups
+                (printer_name, day, source, material_type, failure_mode,
+                 prints, successes, duration_sum, duration_count)
+            SELECT printer_name,
+                   CAST(COALESCE(completed_at, created_at) / 86400 AS INTEGER),
+                   'history', '', '',
+                   COUNT(*),
+                   SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+                   COALESCE(SUM(CASE WHEN duration_seconds > 0 THEN duration_seconds END), 0),
+                   SUM(CASE WHEN duration_seconds > 0 THEN 1 ELSE 0 END)
+            FROM print_history
+            GROUP BY 1, 2
+            """
+        )
+        self._conn.execute(
+            """
+            INSERT INTO printer_daily_rollups
+                (printer_name, day, source, material_type, failure_mode,
+                 prints, successes, duration_sum, duration_count)
+            SELECT printer_name,
+                   CAST(created_at / 86400 AS INTEGER),
+                   'outcome',
+                   COALESCE(material_type, ''),
+                   CASE WHEN outcome = 'failed' THEN COALESCE(failure_mode, '') ELSE '' END,
+                   COUNT(*),
+                   SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END),
+                   0, 0
+            FROM print_outcomes
+            GROUP BY 1, 2, 4, 5
+            """
+        )
+
+    def rebuild_daily_rollups(self) -> None:
+        """Recompute the per-printer daily rollups from scratch."""
+        with self._write_lock:
+            self._rebuild_daily_rollups()
+            self._conn.commit()
+
+    def list_daily_rollups(
+        self,
+        *,
+        since: float,
+        printer_names: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return daily rollup rows from the day containing *since* onward.
+
+        Each row has ``printer_name``, ``day`` (days since the epoch),
+        ``source`` (``"history"`` or ``"outcome"``), ``material_type``,
+        ``failure_mode`` (empty strings when not applicable), ``prints``,
+        ``successes``, ``duration_sum`` and ``duration_count``.
+        """
+        params: list[Any] = [int(since // 86400)]
+        where = "day >= ?"
+        if printer_names is not None:
+            if not printer_names:
+                return []
+            where += f" AND printer_name IN ({', '.join('?' for _ in printer_names)})"
+            params.extend(printer_names)
+        rows = self._conn.execute(
+            f"SELECT * FROM printer_daily_rollups WHERE {where} ORDER BY printer_name, day",
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_print_trend_stats(
+        self,
+        printer_name: str,
+        *,
+        since: float,
+        limit: int = 500,
+    ) -> dict[str, Any]:
+        """Aggregate the newest *limit* prints since *since* for trend analysis.
+
+        Both print history and print outcomes are summarised in SQL using
+        the ``(printer_name, completed_at)`` / ``(printer_name, created_at)``
+        indexes.  Each summary splits the rows chronologically into an
+        older and a newer half (both halves are the full set when fewer
+        than two rows exist).
+
+        Returns a dict with ``history`` and ``outcomes`` summaries (keys
+        ``total``, ``successes``, ``duration_sum``, ``duration_count`` and
+        ``older_``/``newer_`` prefixed variants), plus ``failure_modes``
+        (``[{"mode", "count"}]``, most frequent first) and ``materials``
+        (``{material: {"total", "successes"}}``) from the outcomes.
+        """
+        history_sql = """
+            WITH recent AS (
+                SELECT id, completed_at,
+                       CASE WHEN status = 'completed' THEN 1 ELSE 0 END AS ok,
+                       CASE WHEN duration_seconds > 0 THEN duration_seconds END AS dur
+                FROM print_history
+                WHERE printer_name = ?
+                  AND (completed_at >= ? OR (completed_at IS NULL AND created_at >= ?))
+                ORDER BY completed_at DESC
+                LIMIT ?
+            ),
+            ranked AS (
+                SELECT ok, dur,
+                       ROW_NUMBER() OVER (ORDER BY completed_at, id) AS rn,
+                       COUNT(*) OVER () AS n
+                FROM recent
+            )
+        """
+        outcomes_sql = """
+            WITH recent AS (
+                SELECT id, created_at, outcome, material_type, failure_mode,
+                       CASE WHEN outcome = 'success' THEN 1 ELSE 0 END AS ok,
+                       NULL AS dur
+                FROM print_outcomes
+                WHERE printer_name = ? AND created_at >= ?
+                ORDER BY created_at DESC
+                LIMIT ?
+            ),
+            ranked AS (
+                SELECT ok, dur, outcome, material_type, failure_mode,
+                       ROW_NUMBER() OVER (ORDER BY created_at, id) AS rn,
+                       COUNT(*) OVER () AS n
+                FROM recent
+            )
+        """
+        summary_select = """
+            SELECT COALESCE(MAX(n), 0) AS total,
+                   COALESCE(SUM(ok), 0) AS successes,
+                   COALESCE(SUM(dur), 0) AS duration_sum,
+                   COUNT(dur) AS duration_count,
+                   COALESCE(SUM(CASE WHEN rn <= n / 2 THEN 1 ELSE 0 END), 0) AS older_total,
+                   COALESCE(SUM(CASE WHEN rn <= n / 2 THEN ok ELSE 0 END), 0) AS older_successes,
+                   COALESCE(SUM(CASE WHEN rn <= n / 2 THEN dur END), 0) AS older_duration_sum,
+                   COUNT(CASE WHEN rn <= n / 2 THEN dur END) AS older_duration_count
+            FROM ranked
+        """
+
+        def _summary(row: Any) -> dict[str, Any]:
+            data = dict(row)
+            total = data["total"]
+            if total < 2:
+                halves = {
+                    f"{half}_{key}": data[key]
+                    for half in ("older", "newer")
+                    for key in ("total", "successes", "duration_sum", "duration_count")
+                }
+            else:
+                halves = {}
+                for key in ("total", "successes", "duration_sum", "duration_count"):
+                    halves[f"newer_{key}"] = data[key] - data[f"older_{key}"]
+            data.update(halves)
+            return data
+
+        history = _summary(
+            self._conn.execute(history_sql + summary_select, (printer_name, since, since, limit)).fetchone()
+        )
+        outcomes = _summary(self._conn.execute(outcomes_sql + summary_select, (printer_name, since, limit)).fetchone())
+
+        failure_rows = self._conn.execute(
+            outcomes_sql
+            + """
+            SELECT failure_mode, COUNT(*) AS count
+            FROM ranked
+            WHERE outcome = 'failed' AND failure_mode IS NOT NULL AND failure_mode != ''
+            GROUP BY failure_mode
+            ORDER BY COUNT(*) DESC, MIN(rn)
+            """,
+            (printer_name, since, limit),
+        ).fetchall()
+        material_rows = self._conn.execute(
+            outcomes_sql
+            + """
+            SELECT material_type, COUNT(*) AS total, SUM(ok) AS successes
+            FROM ranked
+            WHERE material_type IS NOT NULL AND material_type != ''
+            GROUP BY material_type
+            ORDER BY MIN(rn)
+            """,
+            (printer_name, since, limit),
+        ).fetchall()
+
+        return {
+            "history": history,
+            "outcomes": outcomes,
+            "failure_modes": [{"mode": row["failure_mode"], "count": row["count"]} for row in failure_rows],
+            "materials": {
+                row["material_type"]: {"total": row["total"], "successes": row["successes"]} for row in material_rows
+            },
+        }
+
     # ------------------------------------------------------------------
     # Print outcomes (cross-printer learning)
     # ------------------------------------------------------------------
@@ -2139,6 +2474,14 @@ class KilnDB:
                         outcome.get("created_at", time.time()),
                     ),
                 )
+                self._bump_daily_rollup(
+                    "outcome",
+                    outcome["printer_name"],
+                    outcome.get("created_at", time.time()),
+                    success=outcome["outcome"] == "success",
+                    material_type=outcome.get("material_type"),
+                    failure_mode=outcome.get("failure_mode") if outcome["outcome"] == "failed" else None,
+                )
                 self._conn.commit()
                 return cur.lastrowid  # type: ignore[return-value]
             except (sqlite3.IntegrityError, Exception) as exc:
@@ -2298,6 +2641,31 @@ class KilnDB:
             )
         return results
 
+    def print_outcome_counts(self) -> list[dict[str, Any]]:
+        """Return outcome totals grouped by printer, material, and file hash.
+
+        One row per distinct ``(printer_name, material_type, file_hash)``
+        with ``total`` and ``successes`` counts.  Used to seed in-memory
+        success-rate matrices without per-job queries.
+        """
+        rows = self._conn.execute(
+            "SELECT printer_name, material_type, file_hash, "
+            "  COUNT(*) as total, "
+            "  SUM(CASE WHEN outcome = 'success' THEN 1 ELSE 0 END) as wins "
+            "FROM print_outcomes "
+            "GROUP BY printer_name, material_type, file_hash"
+        ).fetchall()
+        return [
+            {
+                "printer_name": row[0],
+                "material_type": row[1],
+                "file_hash": row[2],
+                "total": row[3],
+                "successes": row[4],
+            }
+            for row in rows
+        ]
+
     def get_successful_settings(
         self,
         printer_name: str | None = None,
@@ -2514,17 +2882,59 @@ class KilnDB:
             )
             jobs_deleted = cursor.rowcount
 
-            cursor = self._conn.execute(
-                "DELETE FROM events WHERE timestamp < ?",
-                (cutoff,),
-            )
-            events_deleted = cursor.rowcount
+            # Drops whole monthly partitions; only the partition straddling
+            # the cutoff has rows deleted.
+            events_deleted = self._partitions.purge_before("events", cutoff, time_column="timestamp")
 
             self._conn.commit()
             self._conn.execute("VACUUM")
 
         return {"jobs_deleted": jobs_deleted, "events_deleted": events_deleted}
 
+    def list_partitions(self, table: str) -> list[dict[str, Any]]:
+        """Return the monthly partitions of *table*, oldest first.
+
+        Each dict has ``name``, ``period`` (``YYYYMM``), ``start`` and
+        ``end`` (Unix timestamps bounding the month) and ``head`` (the
+        hash-chain value carried over from dropped partitions).
+
+        :param table: ``"events"``, ``"safety_audit_log"`` or ``"snapshots"``.
+        :raises ValueError: If *table* is not partitioned.
+        """
+        if table not in _PARTITIONED_TABLES:
+            raise ValueError(f"{table!r} is not a partitioned table")
+        return [
+            {"name": p.name, "period": p.period, "start": p.start, "end": p.end, "head": p.head}
+            for p in self._partitions.partitions(table)
+        ]
+
+    def drop_expired_partitions(self, table: str, before: float, *, dry_run: bool = False) -> int:
+        """Drop the partitions of *table* holding only rows older than *before*.
+
+        Whole partitions are dropped, oldest first, so the partition
+        straddling *before* is kept until all of its rows have expired.
+        For the audit log the chain head is carried forward, so
+        :meth:`verify_audit_log` still passes afterwards.
+
+        :param table: ``"events"``, ``"safety_audit_log"`` or ``"snapshots"``.
+        :param before: Unix timestamp retention cutoff.
+        :param dry_run: Count the rows that would be removed without
+            dropping anything.
+        :returns: Number of rows removed (or that would be).
+        :raises ValueError: If *table* is not partitioned.
+        """
+        if table not in _PARTITIONED_TABLES:
+            raise ValueError(f"{table!r} is not a partitioned table")
+        with self._write_lock:
+            removed = self._partitions.drop_expired(
+                table,
+                before,
+                chain_column=_PARTITIONED_TABLES[table],
+                dry_run=dry_run,
+            )
+            self._conn.commit()
+            return removed
+
     def db_size_bytes(self) -> int:
         """Return the current size of the database file in bytes."""
         try:
@@ -2652,10 +3062,8 @@ class KilnDB:
             )
 
             # Fetch the hash of the most recent entry to form the chain.
-            prev_row = self._conn.execute(
-                "SELECT prev_hash FROM safety_audit_log ORDER BY id DESC LIMIT 1"
-            ).fetchone()
-            last_hash = dict(prev_row).get("prev_hash", "") if prev_row else ""
+            table = self._partitions.write_target("safety_audit_log")
+            last_hash = self._partitions.last_value("safety_audit_log", "prev_hash")
 
             # Compute chain hash: sha256(prev_hash | tool | action | session_id | timestamp)
             chain_input = "|".join([
@@ -2668,8 +3076,8 @@ class KilnDB:
             chain_hash = hashlib.sha256(chain_input.encode("utf-8")).hexdigest()
 
             cur = self._conn.execute(
-                """
-                INSERT INTO safety_audit_log
+                f"""
+                INSERT INTO {table}
                     (timestamp, tool_name, safety_level, action,
                      agent_id, printer_name, details, hmac_signature,
                      session_id, prev_hash)
@@ -2691,71 +3099,107 @@ class KilnDB:
             self._conn.commit()
             return cur.lastrowid  # type: ignore[return-value]
 
-    def verify_audit_log(self) -> dict[str, Any]:
+    def verify_audit_log(self, partition: str | None = None) -> dict[str, Any]:
         """Verify HMAC signatures **and** the SHA-256 hash chain.
 
         HMAC verification detects *modification* of individual entries.
         Hash-chain verification detects *deletion* — removing any row
         breaks the chain for all subsequent entries.
 
+        The log is verified one monthly partition at a time, carrying the
+        chain head forward from the previous partition (or, for the oldest
+        partition, from the partitions dropped by retention).
+
+        :param partition: Verify only this partition (see
+            :meth:`list_partitions`), starting from the head carried over
+            from the partitions before it.
         :returns: Dict with ``total``, ``valid``, ``invalid`` counts,
             ``integrity`` (``"ok"`` or ``"compromised"``), plus
             ``verified`` (bool), ``total_entries`` (int),
-            ``broken_at`` (int or None), and ``hash_chain_intact`` (bool).
+            ``broken_at`` (int or None), ``hash_chain_intact`` (bool) and
+            ``partitions`` (per-partition ``total``, ``invalid`` and
+            ``hash_chain_intact``).
+        :raises ValueError: If *partition* is not a partition of the log.
         """
-        rows = self._conn.execute("SELECT * FROM safety_audit_log ORDER BY id").fetchall()
-        total = len(rows)
+        parts = self._partitions.partitions("safety_audit_log")
+        if partition is not None:
+            parts = [p for p in parts if p.name == partition]
+            if not parts:
+                raise ValueError(f"Unknown audit log partition {partition!r}")
+        total = 0
         valid = 0
         invalid = 0
 
         # Hash chain state
         hash_chain_intact = True
         broken_at: int | None = None
-        last_hash = ""
-
-        for idx, row in enumerate(rows):
-            d = dict(row)
-
-            # --- HMAC verification (existing) ---
-            stored_sig = d.get("hmac_signature")
-            if stored_sig is None:
-                invalid += 1
-            else:
-                expected = self._compute_audit_hmac(
-                    {
-                        "timestamp": d["timestamp"],
-                        "tool_name": d["tool_name"],
-                        "safety_level": d["safety_level"],
-                        "action": d["action"],
-                        "agent_id": d.get("agent_id"),
-                        "printer_name": d.get("printer_name"),
-                        "details": d.get("details"),
-                    }
-                )
-                if hmac.compare_digest(stored_sig, expected):
-                    valid += 1
+        last_hash = self._partitions.last_value("safety_audit_log", "prev_hash", before=parts[0].name) if parts else ""
+        summaries: list[dict[str, Any]] = []
+        # PostgreSQL keeps the log in one plain table.
+        sources = [(p.name, p.period) for p in parts]
+        if not sources and partition is None and self._is_postgres:
+            sources = [("safety_audit_log", None)]
+
+        for part_name, part_period in sources:
+            rows = self._conn.execute(f"SELECT * FROM {part_name} ORDER BY id").fetchall()
+            part_invalid = 0
+            part_intact = True
+
+            for row in rows:
+                d = dict(row)
+
+                # --- HMAC verification (existing) ---
+                stored_sig = d.get("hmac_signature")
+                if stored_sig is None:
+                    part_invalid += 1
                 else:
-                    invalid += 1
-
-            # --- Hash chain verification ---
-            stored_hash = d.get("prev_hash", "")
-            if stored_hash:
-                # Recompute expected chain hash from previous hash + row fields.
-                chain_input = "|".join([
-                    last_hash,
-                    d["tool_name"],
-                    d["action"],
-                    d.get("session_id") or "",
-                    str(d["timestamp"]),
-                ])
-                expected_hash = hashlib.sha256(chain_input.encode("utf-8")).hexdigest()
-                if stored_hash != expected_hash and hash_chain_intact:
-                    hash_chain_intact = False
-                    broken_at = idx
-                last_hash = stored_hash
-            else:
-                # Legacy row without prev_hash — reset chain baseline.
-                last_hash = ""
+                    expected = self._compute_audit_hmac(
+                        {
+                            "timestamp": d["timestamp"],
+                            "tool_name": d["tool_name"],
+                            "safety_level": d["safety_level"],
+                            "action": d["action"],
+                            "agent_id": d.get("agent_id"),
+                            "printer_name": d.get("printer_name"),
+                            "details": d.get("details"),
+                        }
+                    )
+                    if hmac.compare_digest(stored_sig, expected):
+                        valid += 1
+                    else:
+                        part_invalid += 1
+
+                # --- Hash chain verification ---
+                stored_hash = d.get("prev_hash", "")
+                if stored_hash:
+                    # Recompute expected chain hash from previous hash + row fields.
+                    chain_input = "|".join([
+                        last_hash,
+                        d["tool_name"],
+                        d["action"],
+                        d.get("session_id") or "",
+                        str(d["timestamp"]),
+                    ])
+                    expected_hash = hashlib.sha256(chain_input.encode("utf-8")).hexdigest()
+                    if stored_hash != expected_hash and part_intact:
+                        part_intact = False
+                        if hash_chain_intact:
+                            hash_chain_intact = False
+                            broken_at = total
+                    last_hash = stored_hash
+                else:
+                    # Legacy row without prev_hash — reset chain baseline.
+                    last_hash = ""
+                total += 1
+
+            invalid += part_invalid
+            summaries.append({
+                "partition": part_name,
+                "period": part_period,
+                "total": len(rows),
+                "invalid": part_invalid,
+                "hash_chain_intact": part_intact,
+            })
 
         return {
             "total": total,
@@ -2766,6 +3210,7 @@ class KilnDB:
             "total_entries": total,
             "broken_at": broken_at,
             "hash_chain_intact": hash_chain_intact,
+            "partitions": summaries,
         }
 
     def query_audit(
@@ -2829,7 +3274,7 @@ class KilnDB:
         recent_blocked = self._conn.execute(
             "SELECT tool_name, details, timestamp FROM safety_audit_log "
             "WHERE action IN ('blocked', 'rate_limited', 'auth_denied') "
-            "AND timestamp > ? ORDER BY id DESC LIMIT 10",
+            "AND timestamp > ? ORDER BY timestamp DESC, id DESC LIMIT 10",
             (cutoff,),
         ).fetchall()
         blocked_list = []
@@ -2976,9 +3421,10 @@ class KilnDB:
         :returns: The auto-incremented snapshot row ID.
         """
         with self._write_lock:
+            table = self._partitions.write_target("snapshots")
             cur = self._conn.execute(
-                """
-                INSERT INTO snapshots
+                f"""
+                INSERT INTO {table}
                     (job_id, printer_name, phase, image_path, image_size_bytes,
                      analysis, agent_notes, confidence, completion_pct, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -3056,9 +3502,91 @@ class KilnDB:
             params.append(older_than)
         if not clauses:
             return 0
-        where = " WHERE " + " AND ".join(clauses)
         with self._write_lock:
-            cur = self._conn.execute(f"DELETE FROM snapshots{where}", params)
+            if job_id is None and older_than is not None:
+                deleted = self._partitions.purge_before("snapshots", older_than, time_column="created_at")
+            else:
+                deleted = self._partitions.delete_where("snapshots", " AND ".join(clauses), params)
+            self._conn.commit()
+            return deleted
+
+    # ------------------------------------------------------------------
+    # Webhook dead letters
+    # ------------------------------------------------------------------
+
+    def save_webhook_dead_letter(self, entry: dict[str, Any], *, keep: int | None = None) -> None:
+        """Insert or replace a webhook delivery that exhausted its retries.
+
+        :param entry: Dict with ``event_id``, ``webhook_id``, ``url``,
+            ``event_type``, ``payload`` and optionally ``error``,
+            ``attempts`` and ``timestamp``.
+        :param keep: If set, prune all but the newest *keep* entries.
+        """
+        with self._write_lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO webhook_dead_letters
+                    (event_id, webhook_id, url, event_type, payload, error, attempts, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    entry["event_id"],
+                    entry["webhook_id"],
+                    entry["url"],
+                    entry["event_type"],
+                    entry["payload"],
+                    entry.get("error"),
+                    entry.get("attempts", 0),
+                    entry.get("timestamp", time.time()),
+                ),
+            )
+            if keep is not None:
+                # Range delete below the keep-th newest timestamp, so the
+                # prune walks idx_webhook_dead_letters_time instead of the table.
+                self._conn.execute(
+                    "DELETE FROM webhook_dead_letters WHERE timestamp < "
+                    "(SELECT timestamp FROM webhook_dead_letters ORDER BY timestamp DESC LIMIT 1 OFFSET ?)",
+                    (max(keep, 1) - 1,),
+                )
+            self._conn.commit()
+
+    def list_webhook_dead_letters(
+        self,
+        *,
+        webhook_id: str | None = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Return dead-lettered webhook deliveries, oldest first.
+
+        :param webhook_id: Only entries for this endpoint.
+        :param limit: Maximum number of entries to return.
+        """
+        if webhook_id is None:
+            rows = self._conn.execute(
+                "SELECT * FROM webhook_dead_letters ORDER BY timestamp ASC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                "SELECT * FROM webhook_dead_letters WHERE webhook_id = ? ORDER BY timestamp ASC LIMIT ?",
+                (webhook_id, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def count_webhook_dead_letters(self) -> int:
+        """Return the number of dead-lettered webhook deliveries."""
+        return self._conn.execute("SELECT COUNT(*) FROM webhook_dead_letters").fetchone()[0]
+
+    def delete_webhook_dead_letters(self, event_ids: list[str]) -> int:
+        """Delete dead letters by event ID. Returns count deleted."""
+        if not event_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in event_ids)
+        with self._write_lock:
+            cur = self._conn.execute(
+                f"DELETE FROM webhook_dead_letters WHERE event_id IN ({placeholders})",
+                list(event_ids),
+            )
             self._conn.commit()
             return cur.rowcount
 
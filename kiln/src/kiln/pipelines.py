@@ -437,6 +437,7 @@ def quick_print(
                 model_path,
                 profile=ctx["effective_profile"],
                 slicer_path=slicer_path,
+                use_cache=True,
             )
             ctx["gcode_path"] = result.output_path
             return PipelineStep(
@@ -692,6 +693,7 @@ def reslice_and_print(
                 profile=ctx["effective_profile"],
                 slicer_path=slicer_path,
                 extra_args=extra_args,
+                use_cache=True,
             )
             ctx["gcode_path"] = result.output_path
             return PipelineStep(
@@ -1111,7 +1113,7 @@ def benchmark(
     try:
         from kiln.slicer import slice_file
 
-        result = slice_file(model_path, profile=effective_profile)
+        result = slice_file(model_path, profile=effective_profile, use_cache=True)
         gcode_path = result.output_path
         steps.append(
             PipelineStep(
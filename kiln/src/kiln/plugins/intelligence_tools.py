@@ -88,6 +88,7 @@ class _IntelligenceToolsPlugin:
             quality_grade: str = "B",
             failure_mode: str | None = None,
             print_time_seconds: int = 0,
+            shape_descriptor: list[float] | None = None,
         ) -> dict:
             """Record a print outcome with full model DNA.
 
@@ -110,6 +111,8 @@ class _IntelligenceToolsPlugin:
                 quality_grade: Grade from ``"A"`` to ``"F"`` (default ``"B"``).
                 failure_mode: Optional failure description.
                 print_time_seconds: Print duration in seconds.
+                shape_descriptor: Shape descriptor from fingerprinting, used
+                    for nearest-neighbour similarity (optional).
             """
             import kiln.server as _srv
 
@@ -127,6 +130,7 @@ class _IntelligenceToolsPlugin:
                     overhang_ratio=overhang_ratio,
                     complexity_score=complexity_score,
                     geometric_signature=geometric_signature,
+                    shape_descriptor=list(shape_descriptor or []),
                 )
 
                 _record(
@@ -162,6 +166,7 @@ class _IntelligenceToolsPlugin:
             complexity_score: float,
             printer_model: str,
             material: str,
+            shape_descriptor: list[float] | None = None,
         ) -> dict:
             """Predict optimal print settings from historical DNA data.
 
@@ -176,6 +181,8 @@ class _IntelligenceToolsPlugin:
                 complexity_score: Model complexity (0.0-1.0).
                 printer_model: Target printer model.
                 material: Target material.
+                shape_descriptor: Shape descriptor from fingerprinting; enables
+                    nearest-neighbour matching of similar models (optional).
             """
             import kiln.server as _srv
 
@@ -195,6 +202,7 @@ class _IntelligenceToolsPlugin:
                     overhang_ratio=0.0,
                     complexity_score=complexity_score,
                     geometric_signature=geometric_signature,
+                    shape_descriptor=list(shape_descriptor or []),
                 )
 
                 prediction = predict_settings(fp, printer_model, material)
@@ -212,11 +220,13 @@ class _IntelligenceToolsPlugin:
             complexity_score: float = 0.0,
             limit: int = 10,
             threshold: float = 0.8,
+            shape_descriptor: list[float] | None = None,
         ) -> dict:
             """Find similar models in the print DNA knowledge base.
 
-            Uses geometric signature matching and surface area / volume
-            similarity to locate models with similar geometry.
+            Uses nearest-neighbour search over shape descriptors when one is
+            given, otherwise geometric signature matching and surface area /
+            volume similarity, to locate models with similar geometry.
 
             Args:
                 file_hash: SHA-256 hash of the model file.
@@ -226,6 +236,7 @@ class _IntelligenceToolsPlugin:
                 complexity_score: Complexity (for fuzzy matching).
                 limit: Maximum results (default 10).
                 threshold: Similarity threshold 0.0-1.0 (default 0.8).
+                shape_descriptor: Shape descriptor from fingerprinting (optional).
             """
             import kiln.server as _srv
 
@@ -245,6 +256,7 @@ class _IntelligenceToolsPlugin:
                     overhang_ratio=0.0,
                     complexity_score=complexity_score,
                     geometric_signature=geometric_signature,
+                    shape_descriptor=list(shape_descriptor or []),
                 )
 
                 records = find_similar_models(fp, limit=limit, threshold=threshold)
@@ -8,18 +8,36 @@ prediction for similar models.
 The fingerprint includes: file hash (SHA-256), geometric signature
 (triangle count, bounding box, surface area), complexity metrics
 (overhang ratio, thin wall ratio), and material compatibility scores.
+
+Each fingerprint also carries a fixed-length *shape descriptor* — a
+scale-, rotation- and tessellation-invariant vector built from the D2
+shape distribution, principal-axis (second moment) ratios, and a few
+solidity measures.  Descriptors are stored as packed float32 blobs and
+served from an in-process vantage-point tree, so similar-model lookups
+are true nearest-neighbour queries rather than table scans.
+
+Example::
+
+    fp = fingerprint_model("bracket.stl")
+    for record in find_similar_models(fp, limit=5):
+        print(record.fingerprint.file_hash, record.outcome)
 """
 
 from __future__ import annotations
 
+import bisect
 import hashlib
+import heapq
 import json
 import logging
 import math
+import random
 import struct
+import threading
 import time
-from dataclasses import asdict, dataclass
-from typing import Any
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any, NamedTuple
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +60,7 @@ class ModelFingerprint:
     overhang_ratio: float  # 0.0 - 1.0
     complexity_score: float  # 0.0 - 1.0 (simple cube=0.1, organic shape=0.9)
     geometric_signature: str  # compact hash of geometry for similarity matching
+    shape_descriptor: list[float] = field(default_factory=list)  # see _shape_descriptor()
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -89,6 +108,30 @@ class SettingsPrediction:
 _VALID_OUTCOMES = frozenset({"success", "failed", "partial"})
 _VALID_GRADES = frozenset({"A", "B", "C", "D", "F"})
 
+# Shape descriptor layout: 2 principal-axis ratios, fill ratio, sphericity,
+# overhang ratio, then the D2 distribution as a cumulative histogram (CDFs
+# compare robustly under Euclidean distance).  D2 distances are binned over
+# ``[0, _D2_RANGE_OF_MEAN * mean distance]``; the mean is far more stable
+# across samplings than the maximum.
+_D2_BINS = 16
+_D2_SAMPLE_PAIRS = 4096
+_D2_RANGE_OF_MEAN = 2.5
+SHAPE_DESCRIPTOR_LENGTH = 5 + _D2_BINS
+
+# Descriptor distance at which similarity drops to 0.5.  Similarity is
+# ``1 / (1 + distance / scale)``; re-tessellated or rescaled copies of the
+# same part typically land well under 0.05.
+_SIMILARITY_DISTANCE_SCALE = 0.25
+
+# Minimum similarity for a neighbour to inform ``predict_settings``.
+_PREDICTION_MIN_SIMILARITY = 0.8
+
+# Pending inserts are scanned linearly; once they exceed this fraction of
+# the tree size (or the floor below), the tree is rebuilt.
+_INDEX_REBUILD_FRACTION = 0.25
+_INDEX_REBUILD_MIN_PENDING = 64
+_VP_LEAF_SIZE = 8
+
 
 # ---------------------------------------------------------------------------
 # STL parsing helpers
@@ -191,6 +234,341 @@ def _signed_volume_of_triangle(v0: tuple, v1: tuple, v2: tuple) -> float:
     ) / 6.0
 
 
+def _symmetric_eigenvalues(
+    a11: float, a22: float, a33: float, a12: float, a13: float, a23: float
+) -> tuple[float, float, float]:
+    """Eigenvalues of a symmetric 3x3 matrix, largest first (closed form)."""
+    p1 = a12 * a12 + a13 * a13 + a23 * a23
+    if p1 == 0.0:
+        e = sorted((a11, a22, a33), reverse=True)
+        return e[0], e[1], e[2]
+    q = (a11 + a22 + a33) / 3.0
+    p2 = (a11 - q) ** 2 + (a22 - q) ** 2 + (a33 - q) ** 2 + 2.0 * p1
+    p = math.sqrt(p2 / 6.0)
+    b11, b22, b33 = (a11 - q) / p, (a22 - q) / p, (a33 - q) / p
+    b12, b13, b23 = a12 / p, a13 / p, a23 / p
+    det = b11 * (b22 * b33 - b23 * b23) - b12 * (b12 * b33 - b23 * b13) + b13 * (b12 * b23 - b22 * b13)
+    phi = math.acos(max(-1.0, min(1.0, det / 2.0))) / 3.0
+    e1 = q + 2.0 * p * math.cos(phi)
+    e3 = q + 2.0 * p * math.cos(phi + 2.0 * math.pi / 3.0)
+    return e1, 3.0 * q - e1 - e3, e3
+
+
+def _shape_descriptor(
+    triangles: list[tuple],
+    vertices: list[tuple],
+    areas: list[float],
+    *,
+    volume: float,
+    overhang_ratio: float,
+    seed: int,
+) -> list[float]:
+    """Compute the fixed-length shape descriptor for a parsed mesh.
+
+    Surface points are sampled uniformly by area with a seeded RNG, so the
+    same file always yields the same vector.  Every component lies in
+    ``[0, 1]`` and is invariant to uniform scaling, translation and
+    rotation — except the overhang ratio, which deliberately reflects the
+    print orientation.
+    """
+    total_area = sum(areas)
+    cumulative: list[float] = []
+    running = 0.0
+    for a in areas:
+        running += a
+        cumulative.append(running)
+
+    rng = random.Random(seed)
+    n_points = 2 * _D2_SAMPLE_PAIRS
+    points: list[tuple[float, float, float]] = []
+    last = len(triangles) - 1
+    for _ in range(n_points):
+        if total_area > 0:
+            idx = min(bisect.bisect_left(cumulative, rng.random() * total_area), last)
+        else:
+            idx = rng.randint(0, last)
+        tri = triangles[idx]
+        v0, v1, v2 = vertices[tri[0]], vertices[tri[1]], vertices[tri[2]]
+        r1 = math.sqrt(rng.random())
+        r2 = rng.random()
+        w0, w1, w2 = 1.0 - r1, r1 * (1.0 - r2), r1 * r2
+        points.append(
+            (
+                w0 * v0[0] + w1 * v1[0] + w2 * v2[0],
+                w0 * v0[1] + w1 * v1[1] + w2 * v2[1],
+                w0 * v0[2] + w1 * v1[2] + w2 * v2[2],
+            )
+        )
+
+    # Principal-axis ratios from the second central moments of the sample.
+    mx = sum(p[0] for p in points) / n_points
+    my = sum(p[1] for p in points) / n_points
+    mz = sum(p[2] for p in points) / n_points
+    cxx = cyy = czz = cxy = cxz = cyz = 0.0
+    for x, y, z in points:
+        dx, dy, dz = x - mx, y - my, z - mz
+        cxx += dx * dx
+        cyy += dy * dy
+        czz += dz * dz
+        cxy += dx * dy
+        cxz += dx * dz
+        cyz += dy * dz
+    l1, l2, l3 = _symmetric_eigenvalues(cxx, cyy, czz, cxy, cxz, cyz)
+    axis_ratios = (math.sqrt(max(l2, 0.0) / l1), math.sqrt(max(l3, 0.0) / l1)) if l1 > 0 else (0.0, 0.0)
+
+    # D2 shape distribution, normalised by the mean sampled distance.
+    distances = [math.dist(points[i], points[i + _D2_SAMPLE_PAIRS]) for i in range(_D2_SAMPLE_PAIRS)]
+    mean_distance = sum(distances) / _D2_SAMPLE_PAIRS
+    counts = [0] * _D2_BINS
+    if mean_distance > 0:
+        scale = _D2_BINS / (_D2_RANGE_OF_MEAN * mean_distance)
+        for d in distances:
+            counts[min(int(d * scale), _D2_BINS - 1)] += 1
+    else:
+        counts[0] = _D2_SAMPLE_PAIRS
+    cdf: list[float] = []
+    seen = 0
+    for c in counts:
+        seen += c
+        cdf.append(seen / _D2_SAMPLE_PAIRS)
+
+    # Solidity: volume relative to the cube of the mean distance (squashed
+    # into [0, 1)), and the equal-volume sphere's area over the actual area
+    # (1.0 for a sphere, approaching 0 for thin or highly detailed parts).
+    reference_volume = mean_distance**3
+    fill_ratio = volume / (volume + reference_volume) if reference_volume > 0 else 0.0
+    sphericity = min(1.0, math.pi ** (1 / 3) * (6.0 * volume) ** (2 / 3) / total_area) if total_area > 0 else 0.0
+
+    descriptor = [*axis_ratios, fill_ratio, sphericity, overhang_ratio, *cdf]
+    return [round(v, 4) for v in descriptor]
+
+
+def _pack_descriptor(descriptor: Sequence[float]) -> bytes | None:
+    """Pack a descriptor as little-endian float32 (``None`` when empty)."""
+    if not descriptor:
+        return None
+    return struct.pack(f"<{len(descriptor)}f", *descriptor)
+
+
+def _unpack_descriptor(blob: bytes | None) -> list[float]:
+    """Inverse of :func:`_pack_descriptor`; stale layouts decode to ``[]``."""
+    if not blob or len(blob) != 4 * SHAPE_DESCRIPTOR_LENGTH:
+        return []
+    return [round(v, 4) for v in struct.unpack(f"<{SHAPE_DESCRIPTOR_LENGTH}f", blob)]
+
+
+def descriptor_similarity(distance: float) -> float:
+    """Map a descriptor distance to a similarity score in ``(0, 1]``."""
+    return 1.0 / (1.0 + distance / _SIMILARITY_DISTANCE_SCALE)
+
+
+def _max_distance_for(threshold: float) -> float:
+    """Largest descriptor distance whose similarity is at least *threshold*."""
+    if threshold <= 0:
+        return math.inf
+    return _SIMILARITY_DISTANCE_SCALE * (1.0 / min(threshold, 1.0) - 1.0)
+
+
+# ---------------------------------------------------------------------------
+# Nearest-neighbour index
+# ---------------------------------------------------------------------------
+
+
+class ShapeEntry(NamedTuple):
+    """One indexed print_dna row."""
+
+    vector: tuple[float, ...]
+    row_id: int
+    file_hash: str
+    printer_model: str
+    material: str
+    outcome: str
+
+
+class _VPTree:
+    """Static vantage-point tree over :class:`ShapeEntry` vectors.
+
+    Nodes are ``(vantage, radius, inside, outside)`` tuples; leaves are
+    plain lists of entries.  Built once from a snapshot of entries and
+    replaced wholesale on rebuild; queried via :func:`_vp_search`.
+    """
+
+    def __init__(self, entries: list[ShapeEntry]) -> None:
+        self._rng = random.Random(0)
+        self.root = self._build(list(entries))
+
+    def _build(self, entries: list[ShapeEntry]) -> Any:
+        if len(entries) <= _VP_LEAF_SIZE:
+            return entries
+        vantage = entries.pop(self._rng.randrange(len(entries)))
+        scored = sorted(((math.dist(vantage.vector, e.vector), e) for e in entries), key=lambda t: t[0])
+        mid = len(scored) // 2
+        radius = scored[mid][0]
+        inside = [e for _, e in scored[:mid]]
+        outside = [e for _, e in scored[mid:]]
+        return (vantage, radius, self._build(inside), self._build(outside))
+
+
+def _vp_search(
+    node: Any,
+    query: Sequence[float],
+    heap: list[tuple[float, int, ShapeEntry]],
+    k: int,
+    max_distance: float,
+    accept: Callable[[ShapeEntry], bool],
+) -> None:
+    """Merge the *k* nearest accepted entries under *node* into the max-*heap*.
+
+    *node* is a :class:`_VPTree` node or a plain list of entries (a leaf).
+    Heap items are ``(-distance, -row_id, entry)`` so the farthest
+    candidate sits at ``heap[0]``.
+    """
+
+    def tau() -> float:
+        return -heap[0][0] if len(heap) >= k else max_distance
+
+    def offer(d: float, entry: ShapeEntry) -> None:
+        if d > tau() or not accept(entry):
+            return
+        item = (-d, -entry.row_id, entry)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    def visit(node: Any) -> None:
+        if isinstance(node, list):
+            for entry in node:
+                offer(math.dist(query, entry.vector), entry)
+            return
+        vantage, radius, inside, outside = node
+        d = math.dist(query, vantage.vector)
+        offer(d, vantage)
+        if d < radius:
+            visit(inside)
+            if d + tau() >= radius:
+                visit(outside)
+        else:
+            visit(outside)
+            if d - tau() <= radius:
+                visit(inside)
+
+    visit(node)
+
+
+class ShapeIndex:
+    """Incrementally maintained k-NN index over stored shape descriptors.
+
+    New rows are picked up by :meth:`sync` (keyed on the autoincrement id)
+    and held in a small pending list that is scanned linearly; the tree is
+    rebuilt once the pending list outgrows a fraction of the tree.
+
+    :param db: The :class:`~kiln.persistence.KilnDB` whose ``print_dna``
+        table backs the index.
+    """
+
+    def __init__(self, db: Any) -> None:
+        self.db = db
+        self._lock = threading.Lock()
+        self._tree = _VPTree([])
+        self._indexed: list[ShapeEntry] = []
+        self._pending: list[ShapeEntry] = []
+        self._last_row_id = 0
+
+    def __len__(self) -> int:
+        return len(self._indexed) + len(self._pending)
+
+    def sync(self) -> int:
+        """Load rows added since the last sync; returns how many were added."""
+        rows = self.db._conn.execute(
+            """
+            SELECT id, shape_descriptor, file_hash, printer_model, material, outcome
+            FROM print_dna
+            WHERE id > ?
+            ORDER BY id
+            """,
+            (self._last_row_id,),
+        ).fetchall()
+        added = 0
+        with self._lock:
+            for row in rows:
+                row_id = row[0]
+                self._last_row_id = max(self._last_row_id, row_id)
+                vector = _unpack_descriptor(row[1])
+                if not vector:
+                    continue
+                self._pending.append(
+                    ShapeEntry(tuple(vector), row_id, row[2] or "", row[3] or "", row[4] or "", row[5] or "")
+                )
+                added += 1
+            threshold = max(_INDEX_REBUILD_MIN_PENDING, _INDEX_REBUILD_FRACTION * len(self._indexed))
+            if len(self._pending) > threshold:
+                self._rebuild_locked()
+        return added
+
+    def rebuild(self) -> None:
+        """Fold every pending entry into a freshly built tree."""
+        with self._lock:
+            self._rebuild_locked()
+
+    def _rebuild_locked(self) -> None:
+        self._indexed.extend(self._pending)
+        self._pending = []
+        self._tree = _VPTree(self._indexed)
+
+    def nearest(
+        self,
+        vector: Sequence[float],
+        *,
+        k: int = 10,
+        max_distance: float = math.inf,
+        accept: Callable[[ShapeEntry], bool] | None = None,
+    ) -> list[tuple[float, ShapeEntry]]:
+        """Return up to *k* ``(distance, entry)`` pairs, nearest first.
+
+        :param vector: Query descriptor.
+        :param k: Maximum neighbours to return.
+        :param max_distance: Ignore entries farther than this.
+        :param accept: Optional predicate; rejected entries are skipped
+            without consuming one of the *k* slots.
+        """
+        if k <= 0 or len(vector) != SHAPE_DESCRIPTOR_LENGTH:
+            return []
+        self.sync()
+        predicate = accept or (lambda _entry: True)
+        heap: list[tuple[float, int, ShapeEntry]] = []
+        with self._lock:
+            root = self._tree.root
+            pending = list(self._pending)
+        _vp_search(root, vector, heap, k, max_distance, predicate)
+        # Pending entries are few by construction; scan them as one leaf.
+        _vp_search(pending, vector, heap, k, max_distance, predicate)
+        return sorted(((-neg_d, entry) for neg_d, _, entry in heap), key=lambda t: (t[0], t[1].row_id))
+
+
+_shape_index: ShapeIndex | None = None
+_shape_index_lock = threading.Lock()
+
+
+def get_shape_index() -> ShapeIndex:
+    """Return the shape index for the current database, creating it lazily."""
+    from kiln.persistence import get_db
+
+    global _shape_index
+    db = get_db()
+    with _shape_index_lock:
+        if _shape_index is None or _shape_index.db is not db:
+            _shape_index = ShapeIndex(db)
+        return _shape_index
+
+
+def _reset_shape_index() -> None:
+    """Drop the cached index (for tests)."""
+    global _shape_index
+    with _shape_index_lock:
+        _shape_index = None
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -200,8 +578,9 @@ def fingerprint_model(file_path: str) -> ModelFingerprint:
     """Compute a full fingerprint from an STL file.
 
     Reads the file, parses geometry, and computes hash, bounding box,
-    surface area, volume, overhang ratio, complexity score, and a
-    geometric signature for similarity matching.
+    surface area, volume, overhang ratio, complexity score, a geometric
+    signature for exact matching, and a shape descriptor for
+    nearest-neighbour similarity.
 
     :param file_path: Path to an STL file.
     :raises ValueError: If the file is empty or unparseable.
@@ -245,6 +624,7 @@ def fingerprint_model(file_path: str) -> ModelFingerprint:
     surface_area = 0.0
     volume = 0.0
     overhang_count = 0
+    areas: list[float] = []
 
     for tri in triangles:
         v0 = vertices[tri[0]]
@@ -252,7 +632,9 @@ def fingerprint_model(file_path: str) -> ModelFingerprint:
         v2 = vertices[tri[2]]
         normal = tri[3]
 
-        surface_area += _triangle_area(v0, v1, v2)
+        area = _triangle_area(v0, v1, v2)
+        areas.append(area)
+        surface_area += area
         volume += _signed_volume_of_triangle(v0, v1, v2)
 
         # Overhang detection: normal pointing significantly downward (Z < -0.5)
@@ -278,6 +660,15 @@ def fingerprint_model(file_path: str) -> ModelFingerprint:
     sig_data = f"{triangle_count}:{vertex_count}:{round(surface_area, 2)}:{round(volume, 2)}"
     geometric_signature = hashlib.sha256(sig_data.encode()).hexdigest()[:16]
 
+    shape_descriptor = _shape_descriptor(
+        triangles,
+        vertices,
+        areas,
+        volume=volume,
+        overhang_ratio=overhang_ratio,
+        seed=int(file_hash[:16], 16),
+    )
+
     return ModelFingerprint(
         file_hash=file_hash,
         triangle_count=triangle_count,
@@ -288,6 +679,7 @@ def fingerprint_model(file_path: str) -> ModelFingerprint:
         overhang_ratio=round(overhang_ratio, 4),
         complexity_score=round(complexity_score, 4),
         geometric_signature=geometric_signature,
+        shape_descriptor=shape_descriptor,
     )
 
 
@@ -333,8 +725,8 @@ def record_print_dna(
                 overhang_ratio, complexity_score,
                 printer_model, material, settings,
                 outcome, quality_grade, failure_mode,
-                print_time_seconds, timestamp
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                print_time_seconds, timestamp, shape_descriptor
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 fingerprint.file_hash,
@@ -353,6 +745,7 @@ def record_print_dna(
                 failure_mode,
                 print_time_seconds,
                 now,
+                _pack_descriptor(fingerprint.shape_descriptor),
             ),
         )
         db._conn.commit()
@@ -374,6 +767,7 @@ def _row_to_record(row: Any) -> PrintDNARecord:
         overhang_ratio=row_dict.get("overhang_ratio", 0.0),
         complexity_score=row_dict.get("complexity_score", 0.0),
         geometric_signature=row_dict.get("geometric_signature", ""),
+        shape_descriptor=_unpack_descriptor(row_dict.get("shape_descriptor")),
     )
 
     return PrintDNARecord(
@@ -398,6 +792,9 @@ def predict_settings(
 
     Searches for exact file hash matches first, then falls back to
     geometrically similar models, and finally to material defaults.
+    Similar models are the nearest successful prints in shape-descriptor
+    space on the same printer and material; fingerprints without a
+    descriptor fall back to exact geometric signature matching.
 
     :param fingerprint: The model fingerprint.
     :param printer_model: Target printer model.
@@ -422,7 +819,19 @@ def predict_settings(
     if rows:
         return _aggregate_prediction(rows, source="exact_match")
 
-    # Strategy 2: similar geometric signature
+    # Strategy 2: nearest neighbours by shape descriptor
+    if fingerprint.shape_descriptor:
+        neighbours = get_shape_index().nearest(
+            fingerprint.shape_descriptor,
+            k=20,
+            max_distance=_max_distance_for(_PREDICTION_MIN_SIMILARITY),
+            accept=lambda e: e.outcome == "success" and e.printer_model == printer_model and e.material == material,
+        )
+        rows = _fetch_rows(db, [entry.row_id for _, entry in neighbours])
+        if rows:
+            return _aggregate_prediction(rows, source="similar_geometry")
+
+    # Strategy 2b: identical geometric signature (rows without descriptors)
     rows = db._conn.execute(
         """
         SELECT * FROM print_dna
@@ -511,6 +920,19 @@ def _aggregate_prediction(rows: list, *, source: str) -> SettingsPrediction:
     )
 
 
+def _fetch_rows(db: Any, row_ids: list[int]) -> list:
+    """Fetch print_dna rows by id, preserving the order of *row_ids*."""
+    if not row_ids:
+        return []
+    placeholders = ", ".join("?" for _ in row_ids)
+    rows = db._conn.execute(
+        f"SELECT * FROM print_dna WHERE id IN ({placeholders})",
+        row_ids,
+    ).fetchall()
+    by_id = {dict(row)["id"]: row for row in rows}
+    return [by_id[row_id] for row_id in row_ids if row_id in by_id]
+
+
 def find_similar_models(
     fingerprint: ModelFingerprint,
     *,
@@ -519,14 +941,17 @@ def find_similar_models(
 ) -> list[PrintDNARecord]:
     """Find geometrically similar models in the print DNA database.
 
-    Currently uses geometric signature matching (exact signature match
-    implies high geometric similarity). Future versions may use more
-    granular similarity metrics.
+    When the fingerprint carries a shape descriptor, this is a k-nearest
+    neighbour query against the in-process :class:`ShapeIndex`, ordered
+    nearest first.  Otherwise (e.g. fingerprints built by hand from a few
+    scalar fields) it falls back to signature matching plus surface area /
+    volume / complexity ranges.
 
     :param fingerprint: The reference fingerprint.
     :param limit: Maximum results.
-    :param threshold: Similarity threshold (0.0 - 1.0). Currently only
-        exact signature matches (threshold < 1.0) are returned.
+    :param threshold: Similarity threshold (0.0 - 1.0), compared against
+        :func:`descriptor_similarity`.  ``1.0`` restricts results to exact
+        geometric signature matches.
     """
     from kiln.persistence import get_db
 
@@ -543,6 +968,14 @@ def find_similar_models(
             """,
             (fingerprint.geometric_signature, fingerprint.file_hash, limit),
         ).fetchall()
+    elif fingerprint.shape_descriptor:
+        neighbours = get_shape_index().nearest(
+            fingerprint.shape_descriptor,
+            k=limit,
+            max_distance=_max_distance_for(threshold),
+            accept=lambda e: e.file_hash != fingerprint.file_hash,
+        )
+        rows = _fetch_rows(db, [entry.row_id for _, entry in neighbours])
     else:
         # Include same geometric signature (exact similarity)
         # plus fuzzy matches based on complexity and surface area ranges
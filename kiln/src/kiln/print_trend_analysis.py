@@ -118,26 +118,6 @@ class TrendReport:
 # ---------------------------------------------------------------------------
 
 
-def _split_halves(records: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    """Split records into older half and newer half by timestamp."""
-    if len(records) < 2:
-        return records, records
-    mid = len(records) // 2
-    return records[:mid], records[mid:]
-
-
-def _success_rate(records: list[dict[str, Any]]) -> float:
-    """Compute success rate from a list of outcome/status records."""
-    if not records:
-        return 0.0
-    successes = sum(
-        1
-        for r in records
-        if r.get("outcome") == "success" or r.get("status") == "completed"
-    )
-    return successes / len(records)
-
-
 def _classify_rate_trend(older_rate: float, newer_rate: float) -> str:
     """Classify failure rate trend from two success rates.
 
@@ -151,18 +131,6 @@ def _classify_rate_trend(older_rate: float, newer_rate: float) -> str:
     return "stable"
 
 
-def _avg_duration(records: list[dict[str, Any]]) -> float | None:
-    """Compute average duration from records with duration_seconds."""
-    durations = [
-        r["duration_seconds"]
-        for r in records
-        if r.get("duration_seconds") is not None and r["duration_seconds"] > 0
-    ]
-    if not durations:
-        return None
-    return sum(durations) / len(durations)
-
-
 def _classify_duration_trend(older_avg: float | None, newer_avg: float | None) -> str:
     """Classify duration trend from two averages."""
     if older_avg is None or newer_avg is None:
@@ -177,39 +145,6 @@ def _classify_duration_trend(older_avg: float | None, newer_avg: float | None) -
     return "stable"
 
 
-def _failure_mode_counts(outcomes: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Count failure modes from outcome records."""
-    counts: dict[str, int] = {}
-    for r in outcomes:
-        mode = r.get("failure_mode")
-        if mode and r.get("outcome") == "failed":
-            counts[mode] = counts.get(mode, 0) + 1
-    return sorted(
-        [{"mode": m, "count": c} for m, c in counts.items()],
-        key=lambda x: x["count"],
-        reverse=True,
-    )
-
-
-def _material_stats(outcomes: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    """Compute per-material success rates from outcome records."""
-    by_material: dict[str, list[dict[str, Any]]] = {}
-    for r in outcomes:
-        mat = r.get("material_type")
-        if mat:
-            by_material.setdefault(mat, []).append(r)
-
-    result: dict[str, dict[str, Any]] = {}
-    for mat, recs in by_material.items():
-        total = len(recs)
-        successes = sum(1 for r in recs if r.get("outcome") == "success")
-        result[mat] = {
-            "total": total,
-            "success_rate": round(successes / total, 2) if total > 0 else 0.0,
-        }
-    return result
-
-
 def _compute_health_score(
     success_rate: float,
     failure_trend: str,
@@ -244,60 +179,41 @@ def _compute_health_score(
 # ---------------------------------------------------------------------------
 
 
-def analyze_printer_trends(
-    printer_name: str,
-    *,
-    db: Any,
-    lookback_days: int | None = None,
-) -> TrendReport:
-    """Analyze local print history trends for a printer.
+def _rate(successes: int, total: int) -> float:
+    return successes / total if total else 0.0
 
-    All data comes from the local SQLite database.  Nothing leaves
-    the machine.
-
-    :param printer_name: Printer to analyze.
-    :param db: A :class:`~kiln.persistence.KilnDB` instance.
-    :param lookback_days: Override the default lookback window.
-    :returns: :class:`TrendReport` with health score, trends, and alerts.
-    """
-    window = lookback_days if lookback_days is not None else _LOOKBACK_DAYS
-    cutoff = time.time() - (window * 86400)
 
-    # Fetch print history records (returned newest-first; reverse to chronological)
-    history = db.list_print_history(printer_name=printer_name, limit=500)
-    history = [r for r in history if (r.get("completed_at") or r.get("created_at", 0)) >= cutoff]
-    history.reverse()
+def _mean(total: float, count: int) -> float | None:
+    return total / count if count else None
 
-    # Fetch outcome records (returned newest-first; reverse to chronological)
-    outcomes = db.list_print_outcomes(printer_name=printer_name, limit=500)
-    outcomes = [r for r in outcomes if r.get("created_at", 0) >= cutoff]
-    outcomes.reverse()
 
-    # Use whichever dataset has more records for rate/trend analysis
-    records = outcomes if len(outcomes) >= len(history) else history
-    total = len(records)
+def _material_rates(materials: dict[str, dict[str, int]]) -> dict[str, dict[str, Any]]:
+    return {
+        mat: {
+            "total": counts["total"],
+            "success_rate": round(counts["successes"] / counts["total"], 2) if counts["total"] > 0 else 0.0,
+        }
+        for mat, counts in materials.items()
+    }
 
-    # Overall success rate
-    rate = _success_rate(records)
 
-    # Trend analysis: compare first half (older) vs second half (newer)
-    older, newer = _split_halves(records)
-    older_rate = _success_rate(older)
-    newer_rate = _success_rate(newer)
+def _build_report(
+    printer_name: str,
+    *,
+    window: int,
+    total: int,
+    rate: float,
+    older_rate: float,
+    newer_rate: float,
+    avg_dur: float | None,
+    old_dur: float | None,
+    new_dur: float | None,
+    top_failures: list[dict[str, Any]],
+    mat_stats: dict[str, dict[str, Any]],
+) -> TrendReport:
+    """Classify trends, score health and raise alerts from aggregate figures."""
     failure_trend = _classify_rate_trend(older_rate, newer_rate)
-
-    # Duration trend (from history — has duration_seconds)
-    h_older, h_newer = _split_halves(history)
-    old_dur = _avg_duration(h_older)
-    new_dur = _avg_duration(h_newer)
     dur_trend = _classify_duration_trend(old_dur, new_dur)
-    avg_dur = _avg_duration(history)
-
-    # Failure modes (from outcomes — has failure_mode)
-    top_failures = _failure_mode_counts(outcomes)
-
-    # Material reliability
-    mat_stats = _material_stats(outcomes)
 
     # Health score
     health = _compute_health_score(rate, failure_trend, dur_trend, total)
@@ -369,3 +285,130 @@ def analyze_printer_trends(
         alerts=alerts,
         analysis_window_days=window,
     )
+
+
+def analyze_printer_trends(
+    printer_name: str,
+    *,
+    db: Any,
+    lookback_days: int | None = None,
+) -> TrendReport:
+    """Analyze local print history trends for a printer.
+
+    All data comes from the local SQLite database.  Nothing leaves
+    the machine.  Counting, halving and grouping happen in SQL (see
+    :meth:`~kiln.persistence.KilnDB.get_print_trend_stats`), so only a
+    handful of aggregate rows are read regardless of history size.
+
+    :param printer_name: Printer to analyze.
+    :param db: A :class:`~kiln.persistence.KilnDB` instance.
+    :param lookback_days: Override the default lookback window.
+    :returns: :class:`TrendReport` with health score, trends, and alerts.
+    """
+    window = lookback_days if lookback_days is not None else _LOOKBACK_DAYS
+    cutoff = time.time() - (window * 86400)
+
+    stats = db.get_print_trend_stats(printer_name, since=cutoff, limit=500)
+    history = stats["history"]
+    outcomes = stats["outcomes"]
+
+    # Use whichever dataset has more records for rate/trend analysis
+    records = outcomes if outcomes["total"] >= history["total"] else history
+
+    return _build_report(
+        printer_name,
+        window=window,
+        total=records["total"],
+        rate=_rate(records["successes"], records["total"]),
+        # Trend analysis: compare first half (older) vs second half (newer)
+        older_rate=_rate(records["older_successes"], records["older_total"]),
+        newer_rate=_rate(records["newer_successes"], records["newer_total"]),
+        # Duration trend (from history — has duration_seconds)
+        avg_dur=_mean(history["duration_sum"], history["duration_count"]),
+        old_dur=_mean(history["older_duration_sum"], history["older_duration_count"]),
+        new_dur=_mean(history["newer_duration_sum"], history["newer_duration_count"]),
+        top_failures=stats["failure_modes"],
+        mat_stats=_material_rates(stats["materials"]),
+    )
+
+
+def analyze_fleet_trends(
+    *,
+    db: Any,
+    printer_names: list[str] | None = None,
+    lookback_days: int | None = None,
+) -> dict[str, TrendReport]:
+    """Analyze every printer's trends from the daily rollup table.
+
+    Reads one pre-aggregated row per printer, day and material/failure
+    mode instead of individual prints, so a fleet-wide report stays fast
+    however much history has accumulated.  Because rollups are per day,
+    the older/newer comparison splits the window at its midpoint day
+    rather than at the median print, and failure-mode ties are broken by
+    earliest day then name.
+
+    :param db: A :class:`~kiln.persistence.KilnDB` instance.
+    :param printer_names: Restrict the report to these printers.
+    :param lookback_days: Override the default lookback window.
+    :returns: Mapping of printer name to :class:`TrendReport`.
+    """
+    window = lookback_days if lookback_days is not None else _LOOKBACK_DAYS
+    now = time.time()
+    cutoff = now - (window * 86400)
+    mid_day = int((cutoff + now) / 2 // 86400)
+
+    # printer -> source -> [total, successes, dur_sum, dur_count] for all/older/newer
+    agg: dict[str, dict[str, dict[str, list[float]]]] = {}
+    failures: dict[str, dict[str, list[int]]] = {}
+    materials: dict[str, dict[str, dict[str, int]]] = {}
+
+    for row in db.list_daily_rollups(since=cutoff, printer_names=printer_names):
+        printer = row["printer_name"]
+        per_source = agg.setdefault(printer, {}).setdefault(
+            row["source"], {"all": [0, 0, 0.0, 0], "older": [0, 0, 0.0, 0], "newer": [0, 0, 0.0, 0]}
+        )
+        half = "older" if row["day"] < mid_day else "newer"
+        for bucket in (per_source["all"], per_source[half]):
+            bucket[0] += row["prints"]
+            bucket[1] += row["successes"]
+            bucket[2] += row["duration_sum"]
+            bucket[3] += row["duration_count"]
+        if row["source"] != "outcome":
+            continue
+        if row["failure_mode"]:
+            entry = failures.setdefault(printer, {}).setdefault(row["failure_mode"], [0, row["day"]])
+            entry[0] += row["prints"]
+        if row["material_type"]:
+            mat = materials.setdefault(printer, {}).setdefault(row["material_type"], {"total": 0, "successes": 0})
+            mat["total"] += row["prints"]
+            mat["successes"] += row["successes"]
+
+    empty = {"all": [0, 0, 0.0, 0], "older": [0, 0, 0.0, 0], "newer": [0, 0, 0.0, 0]}
+    reports: dict[str, TrendReport] = {}
+    for printer in printer_names if printer_names is not None else sorted(agg):
+        sources = agg.get(printer, {})
+        history = sources.get("history", empty)
+        outcomes = sources.get("outcome", empty)
+        records = outcomes if outcomes["all"][0] >= history["all"][0] else history
+        total = int(records["all"][0])
+        # With fewer than two prints both halves are everything.
+        older = records["older"] if total >= 2 else records["all"]
+        newer = records["newer"] if total >= 2 else records["all"]
+        modes = failures.get(printer, {})
+        reports[printer] = _build_report(
+            printer,
+            window=window,
+            total=total,
+            rate=_rate(records["all"][1], total),
+            older_rate=_rate(older[1], older[0]),
+            newer_rate=_rate(newer[1], newer[0]),
+            avg_dur=_mean(history["all"][2], history["all"][3]),
+            old_dur=_mean(history["older"][2], history["older"][3]),
+            new_dur=_mean(history["newer"][2], history["newer"][3]),
+            top_failures=[
+                {"mode": mode, "count": count}
+                for mode, (count, _day) in sorted(modes.items(), key=lambda kv: (-kv[1][0], kv[1][1], kv[0]))
+            ],
+            mat_stats=_material_rates(materials.get(printer, {})),
+        )
+    return reports
@@ -2,19 +2,31 @@
 
 Analyzes STL/OBJ meshes for FDM printing readiness: overhang detection,
 thin wall analysis, bridging assessment, bed adhesion surface estimation,
-and support volume estimation. Uses only stdlib (struct, math) -- no
+and support volume estimation. Needs only the stdlib (struct, math) -- no
 external mesh libraries.
+
+When numpy is installed, per-face geometry (normals, areas, centroids) is
+computed once for the whole mesh as arrays and the analyzers work on
+those; otherwise the same results come from plain Python loops.  Both
+paths also rasterize the downward-facing area into a support footprint
+map (see :class:`SupportMap`) and bin overhang area per print layer.
 """
 
 from __future__ import annotations
 
 import math
 from dataclasses import asdict, dataclass, field
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
 from kiln.generation.validation import _parse_obj, _parse_stl
 
+try:
+    import numpy as np  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 # ---------------------------------------------------------------------------
 # Dataclasses
 # ---------------------------------------------------------------------------
@@ -29,6 +41,9 @@ class OverhangAnalysis:
     overhang_percentage: float  # % of total triangles
     needs_supports: bool
     worst_regions: list[dict[str, float]]  # [{x, y, z, angle}]
+    overhang_area_mm2: float = 0.0  # overhang area projected onto the bed
+    peak_layer_height_mm: float = 0.0  # top of the layer with the most overhang
+    peak_layer_area_mm2: float = 0.0
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -78,6 +93,38 @@ class SupportAnalysis:
     estimated_support_volume_mm3: float
     support_percentage: float  # % of model volume
     support_regions: list[dict[str, float]]
+    # From the rasterized support map: each bed cell is filled up to the
+    # lowest overhang above it, so stacked overhangs are counted once.
+    footprint_area_mm2: float = 0.0
+    mapped_volume_mm3: float = 0.0
+    mapped_percentage: float = 0.0  # % of model volume
+    max_support_height_mm: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SupportMap:
+    """Support footprint of a mesh rasterized onto the build plate.
+
+    ``heights_mm[row][col]`` is the height above the bed of the lowest
+    overhang surface over the cell whose lower-left corner is
+    ``(origin_x_mm + col * resolution_mm, origin_y_mm + row * resolution_mm)``
+    -- the column a support has to fill -- or ``0.0`` where nothing needs
+    support.  ``layer_overhang_area_mm2[k]`` is the overhang area, projected
+    onto the bed, printed in layer *k* counted up from the bed.
+    """
+
+    resolution_mm: float
+    origin_x_mm: float
+    origin_y_mm: float
+    layer_height_mm: float
+    heights_mm: list[list[float]]
+    layer_overhang_area_mm2: list[float]
+    footprint_area_mm2: float
+    volume_mm3: float
+    max_height_mm: float
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -323,73 +370,602 @@ def _parse_mesh(
 
 
 # ---------------------------------------------------------------------------
-# Analysis functions
+# Face arrays, layers and support rasterization
 # ---------------------------------------------------------------------------
 
+# Barycentric slack when testing whether a cell centre lies in a triangle.
+_RASTER_EPS = 1e-9
 
-def _analyze_overhangs(
+# Upper bound on support map cells (rows * cols).  Finer resolutions are
+# coarsened to fit, which bounds time and memory (``heights_mm`` holds
+# one float per cell) -- 500 x 500 cells, i.e. 0.5 mm over a 250 mm bed.
+_MAX_SUPPORT_CELLS = 250_000
+
+
+@dataclass
+class _FaceArrays:
+    """Per-face geometry of a whole mesh as numpy arrays.
+
+    Built once by :func:`_mesh_faces` and shared by the analyzers.  When
+    winding normalization was requested, ``normals`` and ``signed_volumes``
+    follow the outward orientation :func:`_normalize_triangle_winding`
+    would pick; ``vertices`` keep their original order.
+    """
+
+    vertices: Any  # (n, 3, 3)
+    normals: Any  # (n, 3), unit length or zero for degenerate faces
+    areas: Any  # (n,)
+    centroids: Any  # (n, 3)
+    signed_volumes: Any  # (n,)
+    z_lo: Any  # (n,) lowest vertex Z
+    z_hi: Any  # (n,) highest vertex Z
+
+
+def _mesh_faces(
     triangles: list[tuple[tuple[float, ...], ...]],
     *,
-    max_overhang_angle: float = 45.0,
-    z_min: float | None = None,
-    layer_height: float = 0.2,
     normalize_winding: bool = True,
-) -> OverhangAnalysis:
-    """Detect overhanging triangles.
+) -> _FaceArrays | None:
+    """Compute face normals, areas and centroids for every triangle at once.
 
-    A triangle is an overhang if its normal points downward (negative Z
-    component) and the face angle from vertical exceeds
-    ``max_overhang_angle``.
+    Returns ``None`` when numpy is not installed; the analyzers then fall
+    back to per-triangle loops.
     """
-    if normalize_winding:
-        triangles = _normalize_triangle_winding(triangles)
+    if np is None:
+        return None
+
+    # fromiter over the flattened coordinates is several times faster than
+    # np.asarray on a list of nested tuples.
+    coords = chain.from_iterable(chain.from_iterable(triangles))
+    v = np.fromiter(coords, dtype=np.float64, count=9 * len(triangles)).reshape(-1, 3, 3)
+    a, b, c = v[:, 0], v[:, 1], v[:, 2]
+    e1 = b - a
+    e2 = c - a
+    # Same operation order as _triangle_normal, so both paths agree exactly.
+    cross = np.stack(
+        (
+            e1[:, 1] * e2[:, 2] - e1[:, 2] * e2[:, 1],
+            e1[:, 2] * e2[:, 0] - e1[:, 0] * e2[:, 2],
+            e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0],
+        ),
+        axis=1,
+    )
+    length = np.sqrt(cross[:, 0] ** 2 + cross[:, 1] ** 2 + cross[:, 2] ** 2)
+    centroids = (a + b + c) / 3.0
+    signed_volumes = (
+        a[:, 0] * (b[:, 1] * c[:, 2] - b[:, 2] * c[:, 1])
+        + a[:, 1] * (b[:, 2] * c[:, 0] - b[:, 0] * c[:, 2])
+        + a[:, 2] * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    ) / 6.0
 
-    total = len(triangles)
-    overhang_count = 0
-    max_angle = 0.0
-    worst_regions: list[dict[str, float]] = []
+    if normalize_winding and len(v):
+        flat = v.reshape(-1, 3)
+        center = (flat.min(axis=0) + flat.max(axis=0)) / 2.0
+        radial = centroids - center
+        flip = (cross[:, 0] * radial[:, 0] + cross[:, 1] * radial[:, 1] + cross[:, 2] * radial[:, 2]) < 0.0
+        cross[flip] = -cross[flip]
+        signed_volumes[flip] = -signed_volumes[flip]
+
+    normals = np.zeros_like(cross)
+    nonzero = length >= 1e-12
+    normals[nonzero] = cross[nonzero] / length[nonzero, None]
+
+    return _FaceArrays(
+        vertices=v,
+        normals=normals,
+        areas=0.5 * length,
+        centroids=centroids,
+        signed_volumes=signed_volumes,
+        z_lo=v[:, :, 2].min(axis=1),
+        z_hi=v[:, :, 2].max(axis=1),
+    )
 
-    for tri in triangles:
-        if z_min is not None and _is_bed_supported_triangle(tri, z_min, layer_height):
+
+def _overhang_angle(nz: float) -> float:
+    """Overhang angle in degrees (90 = horizontal ceiling) for a unit normal Z."""
+    angle_from_down = math.degrees(math.acos(max(-1.0, min(1.0, -nz))))
+    return max(0.0, 90.0 - angle_from_down)
+
+
+def _overhang_angles(normals: Any) -> Any:
+    """Vectorized :func:`_overhang_angle` over an (n, 3) normal array."""
+    angle_from_down = np.degrees(np.arccos(np.clip(-normals[:, 2], -1.0, 1.0)))
+    return np.maximum(0.0, 90.0 - angle_from_down)
+
+
+def _layer_count(z_base: float, z_top: float, layer_height: float) -> int:
+    """Number of layers needed to print from *z_base* up to *z_top*."""
+    return max(1, math.ceil((z_top - z_base) / layer_height - 1e-9))
+
+
+def _layer_index(z: float, z_base: float, layer_height: float, n_layers: int) -> int:
+    """Index of the layer holding height *z*, clamped to the layer range."""
+    return min(max(math.floor((z - z_base) / layer_height), 0), n_layers - 1)
+
+
+def _layer_areas(
+    spans: list[tuple[float, float, float]],
+    z_base: float,
+    layer_height: float,
+    n_layers: int,
+) -> list[float]:
+    """Spread each ``(z_lo, z_hi, area)`` evenly over the layers it spans.
+
+    Faces thinner than a thousandth of a layer land in the layer holding
+    their lowest point.  The top layer extends to cover the tallest face.
+    """
+    areas = [0.0] * n_layers
+    for lo, hi, area in spans:
+        if hi - lo < layer_height * 1e-3:
+            areas[_layer_index(lo, z_base, layer_height, n_layers)] += area
             continue
+        rate = area / (hi - lo)
+        first = _layer_index(lo, z_base, layer_height, n_layers)
+        last = _layer_index(hi, z_base, layer_height, n_layers)
+        for k in range(first, last + 1):
+            bottom = z_base + k * layer_height
+            top = bottom + layer_height if k < n_layers - 1 else max(bottom + layer_height, hi)
+            overlap = min(hi, top) - max(lo, bottom)
+            if overlap > 0:
+                areas[k] += rate * overlap
+    return areas
+
+
+def _layer_areas_np(
+    z_lo: Any,
+    z_hi: Any,
+    weights: Any,
+    z_base: float,
+    layer_height: float,
+    n_layers: int,
+) -> list[float]:
+    """Vectorized :func:`_layer_areas`.
+
+    A face spanning ``[lo, hi]`` contributes ``rate * (e - lo)`` of its
+    area below a layer edge ``e`` inside the span (``rate = area / (hi -
+    lo)``), so the total below every edge comes from prefix sums over the
+    faces sorted by ``lo`` minus the same over ``hi`` -- no per-layer loop.
+    """
+    areas = np.zeros(n_layers)
+    thin = (z_hi - z_lo) < layer_height * 1e-3
+    if thin.any():
+        k = np.clip(np.floor((z_lo[thin] - z_base) / layer_height), 0, n_layers - 1).astype(np.intp)
+        areas += np.bincount(k, weights=weights[thin], minlength=n_layers)
+
+    lo, hi = z_lo[~thin], z_hi[~thin]
+    if len(lo):
+        rate = weights[~thin] / (hi - lo)
+        edges = z_base + layer_height * np.arange(n_layers + 1, dtype=np.float64)
+        edges[-1] = max(edges[-1], float(hi.max()))
+
+        def below(starts: Any) -> Any:
+            order = np.argsort(starts, kind="stable")
+            s, r = starts[order], rate[order]
+            cum_rate = np.concatenate(([0.0], np.cumsum(r)))
+            cum_rate_start = np.concatenate(([0.0], np.cumsum(r * s)))
+            n = np.searchsorted(s, edges, side="left")
+            return edges * cum_rate[n] - cum_rate_start[n]
 
-        n = _triangle_normal(tri[0], tri[1], tri[2])
-        nn = _normalize(n)
-        nz = nn[2]
+        areas += np.diff(below(lo) - below(hi))
 
-        # Only consider downward-facing normals.
-        if nz >= 0:
+    return np.maximum(areas, 0.0).tolist()
+
+
+def _peak_layer(layer_areas: list[float], layer_height: float) -> tuple[float, float]:
+    """Return ``(layer top above the bed, area)`` for the layer with the most overhang.
+
+    Layers within rounding noise of the peak count as tied; the lowest wins.
+    """
+    peak = max(layer_areas, default=0.0)
+    if peak <= 0.0:
+        return 0.0, 0.0
+    k = next(i for i, area in enumerate(layer_areas) if area >= peak * (1.0 - 1e-9))
+    return round((k + 1) * layer_height, 3), round(peak, 2)
+
+
+def _support_grid(
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float,
+    resolution_mm: float,
+) -> tuple[int, int, float]:
+    """Return ``(rows, cols, resolution_mm)`` of a grid covering the XY bounding box.
+
+    The resolution is coarsened when needed so the grid has at most
+    :data:`_MAX_SUPPORT_CELLS` cells.
+    """
+    dx, dy = x_max - x_min, y_max - y_min
+    cols = max(1, math.ceil(dx / resolution_mm))
+    rows = max(1, math.ceil(dy / resolution_mm))
+    if rows * cols > _MAX_SUPPORT_CELLS:
+        resolution_mm *= math.sqrt(rows * cols / _MAX_SUPPORT_CELLS)
+        while True:
+            cols = max(1, math.ceil(dx / resolution_mm))
+            rows = max(1, math.ceil(dy / resolution_mm))
+            if rows * cols <= _MAX_SUPPORT_CELLS:
+                break
+            resolution_mm *= 1.01
+    return rows, cols, resolution_mm
+
+
+def _rasterize_support(
+    faces: list[tuple[tuple[tuple[float, ...], ...], tuple[float, float, float]]],
+    z_min: float,
+    origin: tuple[float, float],
+    resolution_mm: float,
+    rows: int,
+    cols: int,
+) -> list[float]:
+    """Rasterize ``(triangle, centroid)`` overhangs into a flat height grid.
+
+    Each cell whose centre lies inside a triangle's XY projection takes
+    the triangle's height there (interpolated across the face), keeping
+    the lowest overhang when several cover it.  Triangles too small to
+    cover a cell centre mark the cell under their centroid instead.
+    """
+    ox, oy = origin
+    res = resolution_mm
+    grid = [math.inf] * (rows * cols)
+
+    for tri, centroid in faces:
+        (xa, ya, za), (xb, yb, zb), (xc, yc, zc) = (v[:3] for v in tri)
+        d = (yb - yc) * (xa - xc) + (xc - xb) * (ya - yc)
+        covered = False
+        if abs(d) > 1e-12:
+            i0 = max(math.ceil((min(xa, xb, xc) - ox) / res - 0.5), 0)
+            i1 = min(math.floor((max(xa, xb, xc) - ox) / res - 0.5), cols - 1)
+            j0 = max(math.ceil((min(ya, yb, yc) - oy) / res - 0.5), 0)
+            j1 = min(math.floor((max(ya, yb, yc) - oy) / res - 0.5), rows - 1)
+            for j in range(j0, j1 + 1):
+                py = oy + (j + 0.5) * res
+                for i in range(i0, i1 + 1):
+                    px = ox + (i + 0.5) * res
+                    w0 = ((yb - yc) * (px - xc) + (xc - xb) * (py - yc)) / d
+                    w1 = ((yc - ya) * (px - xc) + (xa - xc) * (py - yc)) / d
+                    w2 = 1.0 - w0 - w1
+                    if w0 < -_RASTER_EPS or w1 < -_RASTER_EPS or w2 < -_RASTER_EPS:
+                        continue
+                    height = w0 * za + w1 * zb + w2 * zc - z_min
+                    cell = j * cols + i
+                    if height < grid[cell]:
+                        grid[cell] = height
+                    covered = True
+        if not covered:
+            i = min(max(math.floor((centroid[0] - ox) / res), 0), cols - 1)
+            j = min(max(math.floor((centroid[1] - oy) / res), 0), rows - 1)
+            cell = j * cols + i
+            grid[cell] = min(grid[cell], centroid[2] - z_min)
+
+    return [max(0.0, h) if h != math.inf else 0.0 for h in grid]
+
+
+def _rasterize_support_np(
+    faces: _FaceArrays,
+    idx: Any,
+    z_min: float,
+    origin: tuple[float, float],
+    resolution_mm: float,
+    rows: int,
+    cols: int,
+) -> list[float]:
+    """Vectorized :func:`_rasterize_support` for the faces at *idx*.
+
+    Every face's candidate cell centres (those inside its XY bounding box)
+    are laid out in one flat array, tested against the face with
+    barycentric weights, and reduced into the grid with ``minimum.at``.
+    """
+    ox, oy = origin
+    res = resolution_mm
+    grid = np.full(rows * cols, np.inf)
+
+    if len(idx):
+        v = faces.vertices[idx]
+        x, y, z = v[:, :, 0], v[:, :, 1], v[:, :, 2]
+        i0 = np.maximum(np.ceil((x.min(axis=1) - ox) / res - 0.5), 0).astype(np.intp)
+        i1 = np.minimum(np.floor((x.max(axis=1) - ox) / res - 0.5), cols - 1).astype(np.intp)
+        j0 = np.maximum(np.ceil((y.min(axis=1) - oy) / res - 0.5), 0).astype(np.intp)
+        j1 = np.minimum(np.floor((y.max(axis=1) - oy) / res - 0.5), rows - 1).astype(np.intp)
+        nx = np.maximum(i1 - i0 + 1, 0)
+        ny = np.maximum(j1 - j0 + 1, 0)
+        counts = nx * ny
+
+        covered = np.zeros(len(idx), dtype=bool)
+        total = int(counts.sum())
+        if total:
+            owner = np.repeat(np.arange(len(idx)), counts)
+            local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            ci = i0[owner] + local % nx[owner]
+            cj = j0[owner] + local // nx[owner]
+            px = ox + (ci + 0.5) * res
+            py = oy + (cj + 0.5) * res
+            xa, xb, xc = x[owner, 0], x[owner, 1], x[owner, 2]
+            ya, yb, yc = y[owner, 0], y[owner, 1], y[owner, 2]
+            d = (yb - yc) * (xa - xc) + (xc - xb) * (ya - yc)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                w0 = ((yb - yc) * (px - xc) + (xc - xb) * (py - yc)) / d
+                w1 = ((yc - ya) * (px - xc) + (xa - xc) * (py - yc)) / d
+            w2 = 1.0 - w0 - w1
+            inside = (np.abs(d) > 1e-12) & (w0 >= -_RASTER_EPS) & (w1 >= -_RASTER_EPS) & (w2 >= -_RASTER_EPS)
+            owner, ci, cj = owner[inside], ci[inside], cj[inside]
+            w0, w1, w2 = w0[inside], w1[inside], w2[inside]
+            height = w0 * z[owner, 0] + w1 * z[owner, 1] + w2 * z[owner, 2] - z_min
+            np.minimum.at(grid, cj * cols + ci, height)
+            covered[owner] = True
+
+        small = idx[~covered]
+        if len(small):
+            c = faces.centroids[small]
+            ci = np.clip(np.floor((c[:, 0] - ox) / res), 0, cols - 1).astype(np.intp)
+            cj = np.clip(np.floor((c[:, 1] - oy) / res), 0, rows - 1).astype(np.intp)
+            np.minimum.at(grid, cj * cols + ci, c[:, 2] - z_min)
+
+    grid[np.isinf(grid)] = 0.0
+    return np.maximum(grid, 0.0).tolist()
+
+
+def _build_support_map(
+    grid: list[float],
+    layer_areas: list[float],
+    origin: tuple[float, float],
+    rows: int,
+    cols: int,
+    *,
+    resolution_mm: float,
+    layer_height: float,
+) -> SupportMap:
+    """Package a flat height grid and per-layer areas as a :class:`SupportMap`."""
+    cell_area = resolution_mm * resolution_mm
+    return SupportMap(
+        resolution_mm=resolution_mm,
+        origin_x_mm=round(origin[0], 3),
+        origin_y_mm=round(origin[1], 3),
+        layer_height_mm=layer_height,
+        heights_mm=[[round(h, 3) for h in grid[r * cols : (r + 1) * cols]] for r in range(rows)],
+        layer_overhang_area_mm2=[round(a, 3) for a in layer_areas],
+        footprint_area_mm2=round(sum(1 for h in grid if h > 0.0) * cell_area, 2),
+        volume_mm3=round(sum(grid) * cell_area, 2),
+        max_height_mm=round(max(grid), 2),
+    )
+
+
+def _support_candidates(
+    triangles: list[tuple[tuple[float, ...], ...]],
+    z_min: float,
+    *,
+    max_overhang_angle: float,
+    layer_height: float,
+) -> list[tuple[tuple[tuple[float, ...], ...], float, tuple[float, float, float], float]]:
+    """Return ``(triangle, unit normal Z, centroid, area)`` for faces needing support.
+
+    Those are overhangs off the bed whose centroid sits above *z_min*.
+    """
+    candidates = []
+    for tri in triangles:
+        if _is_bed_supported_triangle(tri, z_min, layer_height):
             continue
 
-        angle_from_down = math.degrees(math.acos(max(-1.0, min(1.0, -nz))))
-        overhang_angle = max(0.0, 90.0 - angle_from_down)
-        if overhang_angle < max_overhang_angle:
+        nz = _normalize(_triangle_normal(tri[0], tri[1], tri[2]))[2]
+        if nz >= 0 or _overhang_angle(nz) < max_overhang_angle:
             continue
 
-        overhang_count += 1
-        if overhang_angle > max_angle:
-            max_angle = overhang_angle
         centroid = _triangle_centroid(tri[0], tri[1], tri[2])
-        if len(worst_regions) < 10:
-            worst_regions.append(
-                {
-                    "x": round(centroid[0], 2),
-                    "y": round(centroid[1], 2),
-                    "z": round(centroid[2], 2),
-                    "angle": round(overhang_angle, 1),
-                }
-            )
+        if centroid[2] - z_min <= 0:
+            continue
 
-    worst_regions.sort(key=lambda r: r["angle"], reverse=True)
+        candidates.append((tri, nz, centroid, _triangle_area(tri[0], tri[1], tri[2])))
+    return candidates
+
+
+def _support_mask(
+    faces: _FaceArrays,
+    z_min: float,
+    *,
+    max_overhang_angle: float,
+    layer_height: float,
+) -> Any:
+    """Vectorized :func:`_support_candidates`: a boolean mask over *faces*."""
+    nz = faces.normals[:, 2]
+    return (
+        (faces.z_hi > z_min + layer_height * 2.0)
+        & (nz < 0)
+        & (_overhang_angles(faces.normals) >= max_overhang_angle)
+        & (faces.centroids[:, 2] - z_min > 0)
+    )
+
+
+def _support_map(
+    triangles: list[tuple[tuple[float, ...], ...]],
+    z_min: float,
+    *,
+    max_overhang_angle: float = 45.0,
+    layer_height: float = 0.2,
+    resolution_mm: float = 1.0,
+    normalize_winding: bool = True,
+    faces: _FaceArrays | None = None,
+) -> SupportMap:
+    """Rasterize the faces needing support into a :class:`SupportMap`.
+
+    :param faces: Precomputed :func:`_mesh_faces` output; takes the place
+        of *triangles* and *normalize_winding*.
+    """
+    if faces is None:
+        faces = _mesh_faces(triangles, normalize_winding=normalize_winding)
+
+    if faces is not None:
+        if len(faces.areas):
+            xy = faces.vertices[:, :, :2].reshape(-1, 2)
+            (x_min, y_min), (x_max, y_max) = xy.min(axis=0).tolist(), xy.max(axis=0).tolist()
+            z_top = float(faces.z_hi.max())
+        else:
+            x_min = x_max = y_min = y_max = 0.0
+            z_top = z_min
+        idx = np.flatnonzero(
+            _support_mask(faces, z_min, max_overhang_angle=max_overhang_angle, layer_height=layer_height)
+        )
+        rows, cols, resolution_mm = _support_grid(x_min, x_max, y_min, y_max, resolution_mm)
+        grid = _rasterize_support_np(faces, idx, z_min, (x_min, y_min), resolution_mm, rows, cols)
+        layers = _layer_areas_np(
+            faces.z_lo[idx],
+            faces.z_hi[idx],
+            faces.areas[idx] * -faces.normals[idx, 2],
+            z_min,
+            layer_height,
+            _layer_count(z_min, z_top, layer_height),
+        )
+    else:
+        if normalize_winding:
+            triangles = _normalize_triangle_winding(triangles)
+        xs = [v[0] for tri in triangles for v in tri] or [0.0]
+        ys = [v[1] for tri in triangles for v in tri] or [0.0]
+        z_top = max((v[2] for tri in triangles for v in tri), default=z_min)
+        x_min, x_max, y_min, y_max = min(xs), max(xs), min(ys), max(ys)
+        candidates = _support_candidates(
+            triangles, z_min, max_overhang_angle=max_overhang_angle, layer_height=layer_height
+        )
+        rows, cols, resolution_mm = _support_grid(x_min, x_max, y_min, y_max, resolution_mm)
+        grid = _rasterize_support(
+            [(tri, centroid) for tri, _, centroid, _ in candidates],
+            z_min,
+            (x_min, y_min),
+            resolution_mm,
+            rows,
+            cols,
+        )
+        layers = _layer_areas(
+            [
+                (min(v[2] for v in tri), max(v[2] for v in tri), area * -nz)
+                for tri, nz, _, area in candidates
+            ],
+            z_min,
+            layer_height,
+            _layer_count(z_min, z_top, layer_height),
+        )
+
+    return _build_support_map(
+        grid,
+        layers,
+        (x_min, y_min),
+        rows,
+        cols,
+        resolution_mm=resolution_mm,
+        layer_height=layer_height,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Analysis functions
+# ---------------------------------------------------------------------------
+
+
+def _analyze_overhangs(
+    triangles: list[tuple[tuple[float, ...], ...]],
+    *,
+    max_overhang_angle: float = 45.0,
+    z_min: float | None = None,
+    layer_height: float = 0.2,
+    normalize_winding: bool = True,
+    faces: _FaceArrays | None = None,
+) -> OverhangAnalysis:
+    """Detect overhanging triangles.
+
+    A triangle is an overhang if its normal points downward (negative Z
+    component) and the face angle from vertical exceeds
+    ``max_overhang_angle``.  Overhang area, projected onto the bed, is
+    also binned per layer to find the layer that prints the most of it.
+
+    :param faces: Precomputed :func:`_mesh_faces` output; takes the place
+        of *triangles* and *normalize_winding*.
+    """
+    if faces is None:
+        faces = _mesh_faces(triangles, normalize_winding=normalize_winding)
+
+    if faces is not None:
+        total = len(faces.areas)
+        angles = _overhang_angles(faces.normals)
+        mask = (faces.normals[:, 2] < 0) & (angles >= max_overhang_angle)
+        if z_min is not None:
+            mask &= faces.z_hi > z_min + layer_height * 2.0
+        idx = np.flatnonzero(mask)
+        overhang_count = len(idx)
+        max_angle = float(angles[idx].max()) if overhang_count else 0.0
+        worst = idx[np.argsort(-angles[idx], kind="stable")[:5]]
+        worst_regions = [
+            {
+                "x": round(float(faces.centroids[i, 0]), 2),
+                "y": round(float(faces.centroids[i, 1]), 2),
+                "z": round(float(faces.centroids[i, 2]), 2),
+                "angle": round(float(angles[i]), 1),
+            }
+            for i in worst
+        ]
+        projected = faces.areas[idx] * -faces.normals[idx, 2]
+        overhang_area = float(projected.sum())
+        z_base = z_min if z_min is not None else (float(faces.z_lo.min()) if total else 0.0)
+        z_top = float(faces.z_hi.max()) if total else z_base
+        layers = _layer_areas_np(
+            faces.z_lo[idx],
+            faces.z_hi[idx],
+            projected,
+            z_base,
+            layer_height,
+            _layer_count(z_base, z_top, layer_height),
+        )
+    else:
+        if normalize_winding:
+            triangles = _normalize_triangle_winding(triangles)
+
+        total = len(triangles)
+        overhangs: list[tuple[float, tuple[float, float, float]]] = []
+        spans: list[tuple[float, float, float]] = []
+
+        for tri in triangles:
+            if z_min is not None and _is_bed_supported_triangle(tri, z_min, layer_height):
+                continue
+
+            nz = _normalize(_triangle_normal(tri[0], tri[1], tri[2]))[2]
+
+            # Only consider downward-facing normals.
+            if nz >= 0:
+                continue
+
+            overhang_angle = _overhang_angle(nz)
+            if overhang_angle < max_overhang_angle:
+                continue
+
+            overhangs.append((overhang_angle, _triangle_centroid(tri[0], tri[1], tri[2])))
+            zs = (tri[0][2], tri[1][2], tri[2][2])
+            spans.append((min(zs), max(zs), _triangle_area(tri[0], tri[1], tri[2]) * -nz))
+
+        overhang_count = len(overhangs)
+        max_angle = max((angle for angle, _ in overhangs), default=0.0)
+        worst_regions = [
+            {
+                "x": round(centroid[0], 2),
+                "y": round(centroid[1], 2),
+                "z": round(centroid[2], 2),
+                "angle": round(angle, 1),
+            }
+            for angle, centroid in sorted(overhangs, key=lambda o: o[0], reverse=True)[:5]
+        ]
+        overhang_area = sum(area for _, _, area in spans)
+        all_z = [v[2] for tri in triangles for v in tri]
+        z_base = z_min if z_min is not None else min(all_z, default=0.0)
+        z_top = max(all_z, default=z_base)
+        layers = _layer_areas(spans, z_base, layer_height, _layer_count(z_base, z_top, layer_height))
 
     overhang_pct = (overhang_count / total * 100.0) if total > 0 else 0.0
+    peak_height, peak_area = _peak_layer(layers, layer_height)
 
     return OverhangAnalysis(
         max_overhang_angle=round(max_angle, 1),
         overhang_triangle_count=overhang_count,
         overhang_percentage=round(overhang_pct, 1),
         needs_supports=overhang_count > 0,
-        worst_regions=worst_regions[:5],
+        worst_regions=worst_regions,
+        overhang_area_mm2=round(overhang_area, 2),
+        peak_layer_height_mm=peak_height,
+        peak_layer_area_mm2=peak_area,
     )
 
 
@@ -398,6 +974,7 @@ def _analyze_thin_walls(
     vertices: list[tuple[float, ...]],
     *,
     nozzle_diameter: float = 0.4,
+    faces: _FaceArrays | None = None,
 ) -> ThinWallAnalysis:
     """Detect thin walls using edge-length approximation.
 
@@ -406,32 +983,54 @@ def _analyze_thin_walls(
     use edge lengths as an approximation that works well for common
     FDM geometries.
     """
-    thin_count = 0
-    min_thickness = float("inf")
-    problematic: list[dict[str, float]] = []
-    total = len(triangles)
-
-    for tri in triangles:
-        # Compute the three edge lengths.
-        e1 = _vertex_distance(tri[0], tri[1])
-        e2 = _vertex_distance(tri[1], tri[2])
-        e3 = _vertex_distance(tri[2], tri[0])
-        shortest = min(e1, e2, e3)
-
-        if shortest < nozzle_diameter:
-            thin_count += 1
-            if shortest < min_thickness:
-                min_thickness = shortest
-            centroid = _triangle_centroid(tri[0], tri[1], tri[2])
-            if len(problematic) < 10:
-                problematic.append(
-                    {
-                        "x": round(centroid[0], 2),
-                        "y": round(centroid[1], 2),
-                        "z": round(centroid[2], 2),
-                        "thickness_mm": round(shortest, 3),
-                    }
-                )
+    if faces is None:
+        faces = _mesh_faces(triangles, normalize_winding=False)
+
+    if faces is not None:
+        total = len(faces.areas)
+        v = faces.vertices
+        edges = v - v[:, (1, 2, 0)]
+        lengths = np.sqrt(edges[:, :, 0] ** 2 + edges[:, :, 1] ** 2 + edges[:, :, 2] ** 2)
+        shortest = lengths.min(axis=1)
+        idx = np.flatnonzero(shortest < nozzle_diameter)
+        thin_count = len(idx)
+        min_thickness = float(shortest[idx].min()) if thin_count else float("inf")
+        problematic = [
+            {
+                "x": round(float(faces.centroids[i, 0]), 2),
+                "y": round(float(faces.centroids[i, 1]), 2),
+                "z": round(float(faces.centroids[i, 2]), 2),
+                "thickness_mm": round(float(shortest[i]), 3),
+            }
+            for i in idx[:5]
+        ]
+    else:
+        thin_count = 0
+        min_thickness = float("inf")
+        problematic = []
+        total = len(triangles)
+
+        for tri in triangles:
+            # Compute the three edge lengths.
+            e1 = _vertex_distance(tri[0], tri[1])
+            e2 = _vertex_distance(tri[1], tri[2])
+            e3 = _vertex_distance(tri[2], tri[0])
+            shortest = min(e1, e2, e3)
+
+            if shortest < nozzle_diameter:
+                thin_count += 1
+                if shortest < min_thickness:
+                    min_thickness = shortest
+                centroid = _triangle_centroid(tri[0], tri[1], tri[2])
+                if len(problematic) < 5:
+                    problematic.append(
+                        {
+                            "x": round(centroid[0], 2),
+                            "y": round(centroid[1], 2),
+                            "z": round(centroid[2], 2),
+                            "thickness_mm": round(shortest, 3),
+                        }
+                    )
 
     if min_thickness == float("inf"):
         min_thickness = nozzle_diameter  # No thin walls found
@@ -442,7 +1041,7 @@ def _analyze_thin_walls(
         min_wall_thickness_mm=round(min_thickness, 3),
         thin_wall_count=thin_count,
         thin_wall_percentage=round(thin_pct, 1),
-        problematic_regions=problematic[:5],
+        problematic_regions=problematic,
     )
 
 
@@ -452,6 +1051,7 @@ def _analyze_bridging(
     *,
     layer_height: float = 0.2,
     normalize_winding: bool = True,
+    faces: _FaceArrays | None = None,
 ) -> BridgingAnalysis:
     """Detect unsupported horizontal spans (bridges).
 
@@ -459,39 +1059,55 @@ def _analyze_bridging(
     that are above the first layer (not bed-touching).  Measures the
     longest edge of such triangles as the bridge length.
     """
-    if normalize_winding:
-        triangles = _normalize_triangle_winding(triangles)
+    bed_threshold = z_min + layer_height * 2
 
-    bridge_count = 0
-    max_bridge_len = 0.0
+    if faces is None:
+        faces = _mesh_faces(triangles, normalize_winding=normalize_winding)
 
-    bed_threshold = z_min + layer_height * 2
+    if faces is not None:
+        # Off the bed, centroid above the first layers, normal nearly straight down.
+        mask = (
+            (faces.z_hi > bed_threshold)
+            & (faces.centroids[:, 2] > bed_threshold)
+            & (faces.normals[:, 2] <= -0.9)
+        )
+        v = faces.vertices[mask]
+        edges = v - v[:, (1, 2, 0)]
+        lengths = np.sqrt(edges[:, :, 0] ** 2 + edges[:, :, 1] ** 2 + edges[:, :, 2] ** 2)
+        bridge_count = len(v)
+        max_bridge_len = float(lengths.max()) if bridge_count else 0.0
+    else:
+        if normalize_winding:
+            triangles = _normalize_triangle_winding(triangles)
 
-    for tri in triangles:
-        if _is_bed_supported_triangle(tri, z_min, layer_height):
-            continue
+        bridge_count = 0
+        max_bridge_len = 0.0
 
-        # Skip triangles near the bed (they're supported).
-        centroid = _triangle_centroid(tri[0], tri[1], tri[2])
-        if centroid[2] <= bed_threshold:
-            continue
+        for tri in triangles:
+            if _is_bed_supported_triangle(tri, z_min, layer_height):
+                continue
 
-        n = _triangle_normal(tri[0], tri[1], tri[2])
-        nn = _normalize(n)
+            # Skip triangles near the bed (they're supported).
+            centroid = _triangle_centroid(tri[0], tri[1], tri[2])
+            if centroid[2] <= bed_threshold:
+                continue
 
-        # Bridge: normal points nearly straight down (nz < -0.9).
-        if nn[2] > -0.9:
-            continue
+            n = _triangle_normal(tri[0], tri[1], tri[2])
+            nn = _normalize(n)
 
-        # Measure the longest edge as the bridge span.
-        e1 = _vertex_distance(tri[0], tri[1])
-        e2 = _vertex_distance(tri[1], tri[2])
-        e3 = _vertex_distance(tri[2], tri[0])
-        longest = max(e1, e2, e3)
+            # Bridge: normal points nearly straight down (nz < -0.9).
+            if nn[2] > -0.9:
+                continue
 
-        bridge_count += 1
-        if longest > max_bridge_len:
-            max_bridge_len = longest
+            # Measure the longest edge as the bridge span.
+            e1 = _vertex_distance(tri[0], tri[1])
+            e2 = _vertex_distance(tri[1], tri[2])
+            e3 = _vertex_distance(tri[2], tri[0])
+            longest = max(e1, e2, e3)
+
+            bridge_count += 1
+            if longest > max_bridge_len:
+                max_bridge_len = longest
 
     # Bridges > 10mm typically need supports.
     needs_supports = max_bridge_len > 10.0
@@ -509,6 +1125,7 @@ def _analyze_bed_adhesion(
     bbox: dict[str, float],
     *,
     layer_height: float = 0.2,
+    faces: _FaceArrays | None = None,
 ) -> BedAdhesionAnalysis:
     """Estimate bed contact area.
 
@@ -516,12 +1133,18 @@ def _analyze_bed_adhesion(
     height of the bottom of the mesh.
     """
     contact_threshold = z_min + layer_height
-    contact_area = 0.0
 
-    for tri in triangles:
-        # All three vertices must be near Z_min.
-        if tri[0][2] <= contact_threshold and tri[1][2] <= contact_threshold and tri[2][2] <= contact_threshold:
-            contact_area += _triangle_area(tri[0], tri[1], tri[2])
+    if faces is None:
+        faces = _mesh_faces(triangles, normalize_winding=False)
+
+    if faces is not None:
+        contact_area = float(faces.areas[faces.z_hi <= contact_threshold].sum())
+    else:
+        contact_area = 0.0
+        for tri in triangles:
+            # All three vertices must be near Z_min.
+            if tri[0][2] <= contact_threshold and tri[1][2] <= contact_threshold and tri[2][2] <= contact_threshold:
+                contact_area += _triangle_area(tri[0], tri[1], tri[2])
 
     # Bounding box footprint (XY projection).
     footprint = (bbox["x_max"] - bbox["x_min"]) * (bbox["y_max"] - bbox["y_min"])
@@ -548,66 +1171,89 @@ def _analyze_supports(
     max_overhang_angle: float = 45.0,
     layer_height: float = 0.2,
     normalize_winding: bool = True,
+    resolution_mm: float | None = None,
+    faces: _FaceArrays | None = None,
 ) -> SupportAnalysis:
     """Estimate support volume.
 
     For each overhang triangle, projects it downward to the build plate
     and estimates the support column volume as area x height.
-    """
-    if normalize_winding:
-        triangles = _normalize_triangle_winding(triangles)
 
-    support_volume = 0.0
-    support_regions: list[dict[str, float]] = []
-
-    for tri in triangles:
-        if _is_bed_supported_triangle(tri, z_min, layer_height):
-            continue
-
-        n = _triangle_normal(tri[0], tri[1], tri[2])
-        nn = _normalize(n)
-        nz = nn[2]
-
-        if nz >= 0:
-            continue
-
-        angle_from_down = math.degrees(math.acos(max(-1.0, min(1.0, -nz))))
-        overhang_angle = max(0.0, 90.0 - angle_from_down)
-        if overhang_angle < max_overhang_angle:
-            continue
-
-        centroid = _triangle_centroid(tri[0], tri[1], tri[2])
-        height = centroid[2] - z_min
-        if height <= 0:
-            continue
-
-        area = _triangle_area(tri[0], tri[1], tri[2])
-        volume = area * height
-        support_volume += volume
-
-        if len(support_regions) < 10:
-            support_regions.append(
-                {
-                    "x": round(centroid[0], 2),
-                    "y": round(centroid[1], 2),
-                    "z": round(centroid[2], 2),
-                    "volume_mm3": round(volume, 2),
-                }
-            )
-
-    # Sort by volume descending.
-    support_regions.sort(key=lambda r: r["volume_mm3"], reverse=True)
+    :param resolution_mm: Cell size for a :func:`_support_map` that
+        fills the ``mapped_*`` and footprint figures.  ``None`` (the
+        default) skips the map and leaves them at zero; orientation
+        scoring only needs the column estimate.
+    :param faces: Precomputed :func:`_mesh_faces` output; takes the place
+        of *triangles* and *normalize_winding*.
+    """
+    if faces is None:
+        faces = _mesh_faces(triangles, normalize_winding=normalize_winding)
 
-    # Estimate model volume for percentage calculation.
-    model_volume = abs(sum(_signed_volume_of_triangle(tri[0], tri[1], tri[2]) for tri in triangles))
+    if faces is not None:
+        idx = np.flatnonzero(
+            _support_mask(faces, z_min, max_overhang_angle=max_overhang_angle, layer_height=layer_height)
+        )
+        volumes = faces.areas[idx] * (faces.centroids[idx, 2] - z_min)
+        support_volume = float(volumes.sum())
+        order = np.argsort(-volumes, kind="stable")[:5]
+        support_regions = [
+            {
+                "x": round(float(faces.centroids[i, 0]), 2),
+                "y": round(float(faces.centroids[i, 1]), 2),
+                "z": round(float(faces.centroids[i, 2]), 2),
+                "volume_mm3": round(float(volume), 2),
+            }
+            for i, volume in zip(idx[order], volumes[order], strict=True)
+        ]
+        # Estimate model volume for percentage calculation.
+        model_volume = abs(float(faces.signed_volumes.sum()))
+    else:
+        if normalize_winding:
+            triangles = _normalize_triangle_winding(triangles)
+
+        regions: list[tuple[float, tuple[float, float, float]]] = []
+        for _, _, centroid, area in _support_candidates(
+            triangles, z_min, max_overhang_angle=max_overhang_angle, layer_height=layer_height
+        ):
+            regions.append((area * (centroid[2] - z_min), centroid))
+
+        support_volume = sum(volume for volume, _ in regions)
+        support_regions = [
+            {
+                "x": round(centroid[0], 2),
+                "y": round(centroid[1], 2),
+                "z": round(centroid[2], 2),
+                "volume_mm3": round(volume, 2),
+            }
+            for volume, centroid in sorted(regions, key=lambda r: r[0], reverse=True)[:5]
+        ]
+        # Estimate model volume for percentage calculation.
+        model_volume = abs(sum(_signed_volume_of_triangle(tri[0], tri[1], tri[2]) for tri in triangles))
 
     support_pct = (support_volume / model_volume * 100.0) if model_volume > 0 else 0.0
-
-    return SupportAnalysis(
+    result = SupportAnalysis(
         estimated_support_volume_mm3=round(support_volume, 2),
         support_percentage=round(support_pct, 1),
-        support_regions=support_regions[:5],
+        support_regions=support_regions,
     )
+    if resolution_mm is None:
+        return result
+
+    support_map = _support_map(
+        triangles,
+        z_min,
+        max_overhang_angle=max_overhang_angle,
+        layer_height=layer_height,
+        resolution_mm=resolution_mm,
+        normalize_winding=False,
+        faces=faces,
+    )
+    mapped_pct = (support_map.volume_mm3 / model_volume * 100.0) if model_volume > 0 else 0.0
+    result.footprint_area_mm2 = support_map.footprint_area_mm2
+    result.mapped_volume_mm3 = support_map.volume_mm3
+    result.mapped_percentage = round(mapped_pct, 1)
+    result.max_support_height_mm = support_map.max_height_mm
+    return result
 
 
 def _compute_score(
@@ -723,6 +1369,7 @@ def analyze_printability(
     layer_height: float = 0.2,
     max_overhang_angle: float = 45.0,
     build_volume: tuple[float, float, float] | None = None,
+    support_resolution_mm: float = 1.0,
 ) -> PrintabilityReport:
     """Run a full printability analysis on a mesh file.
 
@@ -733,12 +1380,19 @@ def analyze_printability(
         supports are needed.
     :param build_volume: Optional (X, Y, Z) build volume in mm.  If
         provided, the report will warn if the model exceeds it.
+    :param support_resolution_mm: Cell size of the support footprint
+        map behind the ``supports`` footprint and mapped volume
+        (coarsened if the map would exceed 250,000 cells).
     :returns: A :class:`PrintabilityReport` with scores, grades, and
         recommendations.
-    :raises ValueError: If the file cannot be parsed.
+    :raises ValueError: If the file cannot be parsed, or
+        *layer_height* or *support_resolution_mm* is not positive.
     """
+    _check_grid_sizes(layer_height, support_resolution_mm)
     triangles, vertices = _parse_mesh(file_path)
-    triangles = _normalize_triangle_winding(triangles)
+    faces = _mesh_faces(triangles)
+    if faces is None:
+        triangles = _normalize_triangle_winding(triangles)
 
     # Bounding box.
     xs = [v[0] for v in vertices]
@@ -760,21 +1414,25 @@ def analyze_printability(
         z_min=z_min,
         layer_height=layer_height,
         normalize_winding=False,
+        faces=faces,
     )
-    thin_walls = _analyze_thin_walls(triangles, vertices, nozzle_diameter=nozzle_diameter)
+    thin_walls = _analyze_thin_walls(triangles, vertices, nozzle_diameter=nozzle_diameter, faces=faces)
     bridging = _analyze_bridging(
         triangles,
         z_min,
         layer_height=layer_height,
         normalize_winding=False,
+        faces=faces,
     )
-    bed_adhesion = _analyze_bed_adhesion(triangles, z_min, bbox, layer_height=layer_height)
+    bed_adhesion = _analyze_bed_adhesion(triangles, z_min, bbox, layer_height=layer_height, faces=faces)
     supports = _analyze_supports(
         triangles,
         z_min,
         max_overhang_angle=max_overhang_angle,
         layer_height=layer_height,
         normalize_winding=False,
+        resolution_mm=support_resolution_mm,
+        faces=faces,
     )
 
     score = _compute_score(overhangs, thin_walls, bridging, bed_adhesion, supports)
@@ -821,6 +1479,48 @@ def analyze_printability(
     )
 
 
+def build_support_map(
+    file_path: str,
+    *,
+    resolution_mm: float = 1.0,
+    layer_height: float = 0.2,
+    max_overhang_angle: float = 45.0,
+) -> SupportMap:
+    """Rasterize where a mesh needs support in its current orientation.
+
+    Overhangs steeper than *max_overhang_angle* are projected onto the
+    build plate at *resolution_mm*; the map also carries the overhang
+    area printed in each layer of *layer_height*.
+
+    :param file_path: Path to an STL or OBJ file.
+    :param resolution_mm: Edge length of one map cell in mm.  Coarsened
+        when the map would exceed 250,000 cells; the map's
+        ``resolution_mm`` is the one actually used.
+    :param layer_height: Print layer height in mm.
+    :param max_overhang_angle: Max overhang angle (degrees) before
+        supports are needed.
+    :returns: A :class:`SupportMap`.
+    :raises ValueError: If the file cannot be parsed, or
+        *layer_height* or *resolution_mm* is not positive.
+    """
+    _check_grid_sizes(layer_height, resolution_mm)
+    triangles, vertices = _parse_mesh(file_path)
+    return _support_map(
+        triangles,
+        min(v[2] for v in vertices),
+        max_overhang_angle=max_overhang_angle,
+        layer_height=layer_height,
+        resolution_mm=resolution_mm,
+    )
+
+
+def _check_grid_sizes(layer_height: float, resolution_mm: float) -> None:
+    if layer_height <= 0:
+        raise ValueError(f"layer_height must be positive, got {layer_height}")
+    if resolution_mm <= 0:
+        raise ValueError(f"Support map resolution must be positive, got {resolution_mm}")
+
+
 # ---------------------------------------------------------------------------
 # Adhesion intelligence
 # ---------------------------------------------------------------------------
@@ -22,6 +22,7 @@ import requests
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import RequestException, Timeout
 
+from kiln.metrics import ADAPTER_LATENCY, endpoint_label
 from kiln.printers.base import (
     FirmwareComponent,
     FirmwareStatus,
@@ -436,15 +437,16 @@ class OctoPrintAdapter(PrinterAdapter):
 
         for attempt in range(self._retries):
             try:
-                response = self._session.request(
-                    method,
-                    url,
-                    json=json,
-                    params=params,
-                    files=files,
-                    data=data,
-                    timeout=self._timeout,
-                )
+                with ADAPTER_LATENCY.timer({"backend": "octoprint", "endpoint": endpoint_label(method, path)}):
+                    response = self._session.request(
+                        method,
+                        url,
+                        json=json,
+                        params=params,
+                        files=files,
+                        data=data,
+                        timeout=self._timeout,
+                    )
 
                 if response.ok:
                     return response
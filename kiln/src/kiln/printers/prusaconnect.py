@@ -26,6 +26,7 @@ import requests
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import RequestException, Timeout
 
+from kiln.metrics import ADAPTER_LATENCY, endpoint_label
 from kiln.printers.base import (
     JobProgress,
     PrinterAdapter,
@@ -158,15 +159,16 @@ class PrusaConnectAdapter(PrinterAdapter):
 
         for attempt in range(self._retries):
             try:
-                response = self._session.request(
-                    method,
-                    url,
-                    json=json,
-                    params=params,
-                    headers=headers,
-                    data=data,
-                    timeout=self._timeout,
-                )
+                with ADAPTER_LATENCY.timer({"backend": "prusaconnect", "endpoint": endpoint_label(method, path)}):
+                    response = self._session.request(
+                        method,
+                        url,
+                        json=json,
+                        params=params,
+                        headers=headers,
+                        data=data,
+                        timeout=self._timeout,
+                    )
 
                 if response.ok:
                     return response
@@ -0,0 +1,345 @@
+"""Sliding-window rate limiting with constant-time checks.
+
+Both the REST API (per client) and the MCP server (per tool) limit how
+often callers may hit them.  Keeping a list of timestamps per key makes
+every check proportional to the limit and never forgets a client, so this
+module uses the two-window weighted counter instead: each key stores only
+the request count of the current fixed window and of the one before it,
+and the sliding estimate is::
+
+    previous * (1 - elapsed_fraction_of_current_window) + current
+
+A check is O(1) and a key costs three integers.  Keys whose windows have
+both expired carry no information and are swept periodically.
+
+State lives in a :class:`RateLimitBackend`:
+
+* :class:`MemoryRateLimitBackend` -- per-process, with lock striping so
+  concurrent requests for different keys rarely contend.
+* :class:`SQLiteRateLimitBackend` -- a shared SQLite file (WAL mode), so
+  several REST workers on one host enforce one global limit.  Enabled in
+  the REST API by pointing ``KILN_RATE_LIMIT_DB`` at a file.
+
+Usage::
+
+    from kiln.rate_limit import RateLimiter
+
+    limiter = RateLimiter(max_requests=60, window_seconds=60.0)
+    allowed, remaining, reset_epoch = limiter.check("client-ip")
+    if not allowed:
+        ...  # 429, Retry-After: reset_epoch - time.time()
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Lock stripes in the in-memory backend.
+_DEFAULT_STRIPES = 16
+
+# Seconds the SQLite backend waits for another worker's write lock.
+_SQLITE_BUSY_TIMEOUT = 5.0
+
+
+# ---------------------------------------------------------------------------
+# Weighted two-window arithmetic
+# ---------------------------------------------------------------------------
+
+
+def _advance(state: tuple[int, int, int] | None, index: int) -> tuple[int, int]:
+    """Return ``(current, previous)`` counts of *state* as seen from window *index*."""
+    if state is None:
+        return 0, 0
+    state_index, current, previous = state
+    if state_index == index:
+        return current, previous
+    if state_index == index - 1:
+        return 0, current
+    return 0, 0
+
+
+def _estimate(current: int, previous: int, fraction: float) -> float:
+    return previous * (1.0 - fraction) + current
+
+
+def _retry_after(current: int, previous: int, fraction: float, limit: int, window: float) -> float:
+    """Seconds until one more request fits under *limit*."""
+    budget = limit - 1
+    if current <= budget:
+        if previous <= 0:
+            return 0.0
+        needed = 1.0 - (budget - current) / previous
+        return max(0.0, (needed - fraction) * window)
+    # The current window alone is over budget: wait for it to become the
+    # previous window and decay far enough.
+    needed = 1.0 - budget / current
+    return (1.0 - fraction + needed) * window
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class RateLimitBackend(ABC):
+    """Storage for per-key window counters.
+
+    :meth:`hit` must be atomic per key: read the counters, decide, and
+    record an admitted request without another caller interleaving.
+    """
+
+    @abstractmethod
+    def hit(self, key: str, *, now: float, window: float, limit: int) -> tuple[bool, int, int]:
+        """Try to admit one request for *key*.
+
+        Returns ``(allowed, current, previous)`` where the counts include
+        the request when it was allowed.
+        """
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        """Forget all recorded requests for *key*."""
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release any resources held by the backend."""
+
+
+def _admit(
+    state: tuple[int, int, int] | None,
+    *,
+    now: float,
+    window: float,
+    limit: int,
+) -> tuple[bool, int, int, int]:
+    index = int(now // window)
+    current, previous = _advance(state, index)
+    fraction = (now - index * window) / window
+    allowed = _estimate(current, previous, fraction) + 1 <= limit
+    if allowed:
+        current += 1
+    return allowed, index, current, previous
+
+
+class _Stripe:
+    __slots__ = ("entries", "lock", "next_sweep")
+
+    def __init__(self) -> None:
+        self.entries: dict[str, tuple[int, int, int]] = {}
+        self.lock = threading.Lock()
+        self.next_sweep = 0.0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process counters split across independently locked stripes.
+
+    Each stripe drops keys idle for two full windows at most once per
+    window, so memory tracks the number of recently active keys.
+
+    :param stripes: Number of lock stripes.
+    """
+
+    def __init__(self, stripes: int = _DEFAULT_STRIPES) -> None:
+        self._stripes = [_Stripe() for _ in range(max(1, stripes))]
+
+    def _stripe(self, key: str) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def hit(self, key: str, *, now: float, window: float, limit: int) -> tuple[bool, int, int]:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            if now >= stripe.next_sweep:
+                self._sweep(stripe, int(now // window))
+                stripe.next_sweep = now + window
+            allowed, index, current, previous = _admit(stripe.entries.get(key), now=now, window=window, limit=limit)
+            if allowed:
+                stripe.entries[key] = (index, current, previous)
+        return allowed, current, previous
+
+    @staticmethod
+    def _sweep(stripe: _Stripe, index: int) -> None:
+        # Caller holds the stripe lock.
+        stale = [key for key, state in stripe.entries.items() if state[0] < index - 1]
+        for key in stale:
+            del stripe.entries[key]
+
+    def reset(self, key: str) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.entries.pop(key, None)
+
+    def __len__(self) -> int:
+        total = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                total += len(stripe.entries)
+        return total
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """Counters in a SQLite file shared by every process that opens it.
+
+    Each :meth:`hit` runs in a ``BEGIN IMMEDIATE`` transaction, so workers
+    serialise on the file's write lock and see each other's requests.
+    Rows idle for two windows are deleted at most once per window.
+
+    :param path: Database file; created if missing.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._conn = sqlite3.connect(
+            path,
+            timeout=_SQLITE_BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit_windows (
+                key          TEXT PRIMARY KEY,
+                window_index INTEGER NOT NULL,
+                current      INTEGER NOT NULL,
+                previous     INTEGER NOT NULL
+            )
+            """
+        )
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def hit(self, key: str, *, now: float, window: float, limit: int) -> tuple[bool, int, int]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT window_index, current, previous FROM rate_limit_windows WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                allowed, index, current, previous = _admit(row, now=now, window=window, limit=limit)
+                if allowed:
+                    self._conn.execute(
+                        "INSERT INTO rate_limit_windows (key, window_index, current, previous) "
+                        "VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET window_index = excluded.window_index, "
+                        "current = excluded.current, previous = excluded.previous",
+                        (key, index, current, previous),
+                    )
+                if now >= self._next_sweep:
+                    self._conn.execute("DELETE FROM rate_limit_windows WHERE window_index < ?", (index - 1,))
+                    self._next_sweep = now + window
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return allowed, current, previous
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limit_windows WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limit_windows").fetchone()[0]
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Thread-safe sliding-window rate limiter.
+
+    Each :meth:`check` call returns ``(allowed, remaining, reset_epoch)``
+    so callers can populate standard rate-limit response headers.
+
+    :param max_requests: Requests allowed per window; ``0`` disables.
+    :param window_seconds: Window length.
+    :param backend: Counter storage; per-process memory by default.
+    :param clock: Wall-clock source (shared backends need a common clock).
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 60,
+        window_seconds: float = 60.0,
+        *,
+        backend: RateLimitBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max = max_requests
+        self._window = window_seconds
+        self._backend = backend if backend is not None else MemoryRateLimitBackend()
+        self._clock = clock
+
+    @property
+    def limit(self) -> int:
+        """Maximum requests allowed per window."""
+        return self._max
+
+    @property
+    def window(self) -> float:
+        """Window duration in seconds."""
+        return self._window
+
+    @property
+    def enabled(self) -> bool:
+        """Whether rate limiting is active (max > 0)."""
+        return self._max > 0
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        return self._backend
+
+    def check(self, key: str, *, limit: int | None = None) -> tuple[bool, int, float]:
+        """Check whether a request from *key* is allowed, counting it if so.
+
+        :param limit: Override the configured limit for this call (keys
+            with per-call limits, such as MCP tools).
+        :returns: ``(allowed, remaining, reset_epoch)`` where
+            *reset_epoch* is when the current window ends (allowed) or
+            when the next request would be admitted (denied).
+        """
+        limit = self._max if limit is None else limit
+        now = self._clock()
+        if limit <= 0:
+            return True, limit, now + self._window
+
+        allowed, current, previous = self._backend.hit(key, now=now, window=self._window, limit=limit)
+        fraction = (now % self._window) / self._window
+        if not allowed:
+            return False, 0, now + _retry_after(current, previous, fraction, limit, self._window)
+        remaining = max(0, int(limit - _estimate(current, previous, fraction)))
+        return True, remaining, now + (1.0 - fraction) * self._window
+
+    def reset(self, key: str) -> None:
+        """Forget all recorded requests for *key*."""
+        self._backend.reset(key)
+
+
+__all__ = [
+    "MemoryRateLimitBackend",
+    "RateLimitBackend",
+    "RateLimiter",
+    "SQLiteRateLimitBackend",
+]
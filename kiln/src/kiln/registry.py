@@ -12,19 +12,30 @@ Example::
 
     state = registry.get("voron").get_state()
     all_idle = registry.get_idle_printers()
+
+Fleet queries fan out over a long-lived thread pool owned by the
+registry.  Each printer has a circuit breaker: after repeated errors (or
+a single timeout) it is reported OFFLINE without being contacted until
+an exponential backoff elapses, so dead printers do not stall every
+fleet query.  A printer that reports itself OFFLINE counts as a failure,
+and a printer whose previous query is still blocked in the pool is not
+queried again until that call returns, so hung adapters cannot exhaust
+the pool.  :meth:`PrinterRegistry.iter_fleet_status` yields results as
+each printer answers.
 """
 
 from __future__ import annotations
 
 import logging
+import os
 import threading
 import time
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from typing import Any, TypeVar
 
-from kiln.printers.base import PrinterAdapter, PrinterStatus
+from kiln.printers.base import PrinterAdapter, PrinterState, PrinterStatus
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +44,91 @@ _T = TypeVar("_T")
 # Per-printer timeout for fleet queries (seconds).
 _FLEET_QUERY_TIMEOUT: float = 10.0
 
+# Default size of the registry's fleet query pool.  Override with
+# KILN_FLEET_QUERY_WORKERS or the ``max_workers`` constructor argument.
+_DEFAULT_FLEET_WORKERS: int = 20
+
+# Circuit breaker: consecutive errors before a printer is skipped.  A
+# timeout opens the circuit immediately since it is the expensive case.
+_CIRCUIT_FAILURE_THRESHOLD: int = 3
+
+# Backoff while a printer's circuit is open.
+_CIRCUIT_INITIAL_DELAY: float = 2.0  # seconds
+_CIRCUIT_MULTIPLIER: float = 2.0
+_CIRCUIT_MAX_DELAY: float = 120.0  # seconds
+
+
+class _CircuitOpenError(Exception):
+    """Raised in place of querying a printer whose circuit is open."""
+
+
+class _QueryInFlightError(_CircuitOpenError):
+    """Raised in place of querying a printer whose last query is still running."""
+
+
+def _reachable_state(name: str, adapter: PrinterAdapter) -> PrinterState:
+    """Return *adapter*'s state, raising if the printer is unreachable.
+
+    Adapters such as OctoPrint report connection failures as an OFFLINE
+    state rather than raising; fleet queries treat that as a failure so
+    the circuit breaker backs off from the printer.
+    """
+    state = adapter.get_state()
+    if state.state == PrinterStatus.OFFLINE:
+        raise ConnectionError(f"Printer {name!r} is offline")
+    return state
+
+
+@dataclass
+class PrinterHealth:
+    """Fleet-query health for one printer, with exponential backoff.
+
+    :param consecutive_failures: Failed queries since the last success.
+    :param next_retry_time: :func:`time.monotonic` timestamp before which
+        the printer is not queried (``0`` when the circuit is closed).
+    :param last_error: Message of the most recent failure.
+    :param last_success_time: :func:`time.monotonic` timestamp of the last
+        successful query.
+    """
+
+    consecutive_failures: int = 0
+    next_retry_time: float = 0.0
+    last_error: str | None = None
+    last_success_time: float | None = None
+
+    def record_failure(self, error: str, *, timed_out: bool = False) -> None:
+        """Record a failed query and open the circuit if warranted."""
+        self.consecutive_failures += 1
+        if timed_out:
+            # A timeout trips the breaker at once, and each further
+            # timeout doubles the backoff like any other failure.
+            self.consecutive_failures = max(self.consecutive_failures, _CIRCUIT_FAILURE_THRESHOLD)
+        self.last_error = error
+        if self.consecutive_failures < _CIRCUIT_FAILURE_THRESHOLD:
+            return
+        trips = self.consecutive_failures - _CIRCUIT_FAILURE_THRESHOLD
+        delay = min(_CIRCUIT_INITIAL_DELAY * (_CIRCUIT_MULTIPLIER**trips), _CIRCUIT_MAX_DELAY)
+        self.next_retry_time = time.monotonic() + delay
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful query."""
+        self.consecutive_failures = 0
+        self.next_retry_time = 0.0
+        self.last_error = None
+        self.last_success_time = time.monotonic()
+
+    def in_cooldown(self) -> bool:
+        """Return ``True`` while the circuit is open."""
+        return time.monotonic() < self.next_retry_time
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "consecutive_failures": self.consecutive_failures,
+            "circuit_open": self.in_cooldown(),
+            "retry_in_seconds": round(max(self.next_retry_time - time.monotonic(), 0.0), 1),
+            "last_error": self.last_error,
+        }
+
 
 @dataclass
 class PrinterMetadata:
@@ -70,11 +166,17 @@ class PrinterRegistry:
     queried from MCP tool handlers running on different threads.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, max_workers: int | None = None) -> None:
         self._printers: dict[str, PrinterAdapter] = {}
         self._metadata: dict[str, PrinterMetadata] = {}
         self._lock = threading.Lock()
         self._printer_locks: dict[str, threading.Lock] = {}
+        self._health: dict[str, PrinterHealth] = {}
+        self._inflight: dict[str, Future[Any]] = {}
+        if max_workers is None:
+            max_workers = int(os.environ.get("KILN_FLEET_QUERY_WORKERS", _DEFAULT_FLEET_WORKERS))
+        self._max_workers = max(1, max_workers)
+        self._pool: ThreadPoolExecutor | None = None
 
     # ------------------------------------------------------------------
     # Registration
@@ -116,6 +218,7 @@ class PrinterRegistry:
                 raise PrinterNotFoundError(name)
             del self._printers[name]
             self._metadata.pop(name, None)
+            self._health.pop(name, None)
             logger.info("Unregistered printer %r", name)
 
     # ------------------------------------------------------------------
@@ -157,13 +260,138 @@ class PrinterRegistry:
     # Parallel fleet helpers
     # ------------------------------------------------------------------
 
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Return the registry's fleet query pool, creating it on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="kiln-fleet",
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        """Release the fleet query pool.  It is recreated on next use."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._inflight.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _health_for(self, name: str) -> PrinterHealth:
+        # Must be called with ``_lock`` held.
+        health = self._health.get(name)
+        if health is None:
+            health = self._health[name] = PrinterHealth()
+        return health
+
+    def _clear_inflight(self, name: str, future: Future[Any]) -> None:
+        with self._lock:
+            if self._inflight.get(name) is future:
+                del self._inflight[name]
+
+    def get_printer_health(self) -> dict[str, dict[str, Any]]:
+        """Return circuit-breaker state for every printer queried so far."""
+        with self._lock:
+            return {name: health.to_dict() for name, health in sorted(self._health.items())}
+
+    def reset_printer_health(self, name: str | None = None) -> None:
+        """Close the circuit for *name* (or for every printer)."""
+        with self._lock:
+            if name is None:
+                self._health.clear()
+            else:
+                self._health.pop(name, None)
+
+    def _iter_query_printers(
+        self,
+        printers: dict[str, PrinterAdapter],
+        query_fn: Callable[[str, PrinterAdapter], _T],
+        error_fn: Callable[[str, PrinterAdapter, Exception], _T],
+        *,
+        timeout: float = _FLEET_QUERY_TIMEOUT,
+    ) -> Iterator[_T]:
+        """Query printers on the shared pool, yielding results as they arrive.
+
+        Printers whose circuit is open are answered from *error_fn*
+        immediately without being contacted.  Printers that have not
+        answered within *timeout* seconds are answered from *error_fn*
+        with a :class:`TimeoutError` and their circuit is opened.  A
+        timed-out call cannot be interrupted, so the printer is not
+        resubmitted until it returns; each query that finds it still
+        running counts as another timeout and lengthens the backoff.
+
+        Args:
+            printers: Name-to-adapter mapping to query.
+            query_fn: Called with (name, adapter) for each printer.
+                Must return a result of type *_T*.
+            error_fn: Called with (name, adapter, exception) when *query_fn*
+                raises, times out, or is skipped.  Must return a fallback
+                result of type *_T*.
+            timeout: Seconds to wait for the slowest printer.
+        """
+        if not printers:
+            return
+
+        skipped: dict[str, Exception] = {}
+        with self._lock:
+            for name in printers:
+                health = self._health_for(name)
+                running = self._inflight.get(name)
+                if running is not None and not running.done():
+                    exc: Exception = _QueryInFlightError(f"Printer {name!r} has not answered its previous query")
+                    health.record_failure(str(exc), timed_out=True)
+                    skipped[name] = exc
+                elif health.in_cooldown():
+                    skipped[name] = _CircuitOpenError(f"Printer {name!r} is in backoff after failures")
+        for name in sorted(skipped):
+            yield error_fn(name, printers[name], skipped[name])
+
+        live = {name: adapter for name, adapter in printers.items() if name not in skipped}
+        if not live:
+            return
+
+        pool = self._get_pool()
+        pending: dict[Future[_T], str] = {}
+        for name, adapter in live.items():
+            future = pool.submit(query_fn, name, adapter)
+            pending[future] = name
+            with self._lock:
+                self._inflight[name] = future
+            future.add_done_callback(lambda f, n=name: self._clear_inflight(n, f))
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    with self._lock:
+                        self._health_for(name).record_failure(str(exc))
+                    yield error_fn(name, live[name], exc)
+                else:
+                    with self._lock:
+                        self._health_for(name).record_success()
+                    yield result
+
+        for future, name in pending.items():
+            future.cancel()
+            exc = TimeoutError(f"Printer {name!r} did not respond within {timeout:.0f}s")
+            with self._lock:
+                self._health_for(name).record_failure(str(exc), timed_out=True)
+            yield error_fn(name, live[name], exc)
+
     def _query_printers_parallel(
         self,
         printers: dict[str, PrinterAdapter],
         query_fn: Callable[[str, PrinterAdapter], _T],
         error_fn: Callable[[str, PrinterAdapter, Exception], _T],
     ) -> list[_T]:
-        """Query all printers in parallel using a thread pool.
+        """Query all printers in parallel using the shared thread pool.
 
         Args:
             printers: Name-to-adapter mapping to query.
@@ -175,24 +403,7 @@ class PrinterRegistry:
         Returns:
             A list of results, one per printer (order not guaranteed).
         """
-        if not printers:
-            return []
-
-        max_workers = min(len(printers), 20)
-        results: list[_T] = []
-
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            future_to_name = {
-                pool.submit(query_fn, name, adapter): (name, adapter) for name, adapter in printers.items()
-            }
-            for future in as_completed(future_to_name, timeout=_FLEET_QUERY_TIMEOUT + 5):
-                name, adapter = future_to_name[future]
-                try:
-                    results.append(future.result(timeout=_FLEET_QUERY_TIMEOUT))
-                except Exception as exc:
-                    results.append(error_fn(name, adapter, exc))
-
-        return results
+        return list(self._iter_query_printers(printers, query_fn, error_fn))
 
     # ------------------------------------------------------------------
     # Fleet queries
@@ -207,6 +418,16 @@ class PrinterRegistry:
 
         Queries are executed in parallel for speed.
         """
+        return list(self.iter_fleet_status())
+
+    def iter_fleet_status(self, *, timeout: float = _FLEET_QUERY_TIMEOUT) -> Iterator[dict]:
+        """Yield :meth:`get_fleet_status` entries as each printer answers.
+
+        Printers in backoff are yielded first (as OFFLINE, without being
+        contacted), then reachable printers in completion order.
+        Printers that have not answered after *timeout* seconds are
+        yielded last as OFFLINE.
+        """
         printers = self.list_all()
         with self._lock:
             metadata_snapshot = dict(self._metadata)
@@ -216,7 +437,7 @@ class PrinterRegistry:
             return meta.site if meta else ""
 
         def _query(name: str, adapter: PrinterAdapter) -> dict:
-            state = adapter.get_state()
+            state = _reachable_state(name, adapter)
             return {
                 "name": name,
                 "backend": adapter.name,
@@ -230,7 +451,10 @@ class PrinterRegistry:
             }
 
         def _error(name: str, adapter: PrinterAdapter, exc: Exception) -> dict:
-            logger.warning("Failed to query printer %r: %s", name, exc)
+            if isinstance(exc, _CircuitOpenError):
+                logger.debug("Skipping printer %r: %s", name, exc)
+            else:
+                logger.warning("Failed to query printer %r: %s", name, exc)
             return {
                 "name": name,
                 "backend": adapter.name,
@@ -243,7 +467,7 @@ class PrinterRegistry:
                 "bed_temp_target": None,
             }
 
-        return self._query_printers_parallel(printers, _query, _error)
+        return self._iter_query_printers(printers, _query, _error, timeout=timeout)
 
     def get_idle_printers(self) -> list[str]:
         """Return names of printers that are currently idle and ready.
@@ -254,7 +478,7 @@ class PrinterRegistry:
         printers = self.list_all()
 
         def _query(name: str, adapter: PrinterAdapter) -> tuple[str, bool]:
-            state = adapter.get_state()
+            state = _reachable_state(name, adapter)
             return (name, state.connected and state.state == PrinterStatus.IDLE)
 
         def _error(name: str, adapter: PrinterAdapter, exc: Exception) -> tuple[str, bool]:
@@ -271,7 +495,7 @@ class PrinterRegistry:
         printers = self.list_all()
 
         def _query(name: str, adapter: PrinterAdapter) -> tuple[str, bool]:
-            state = adapter.get_state()
+            state = _reachable_state(name, adapter)
             return (name, state.state == status)
 
         def _error(name: str, adapter: PrinterAdapter, exc: Exception) -> tuple[str, bool]:
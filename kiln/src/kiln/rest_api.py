@@ -22,6 +22,10 @@ Agent endpoint (runs the full agent loop via HTTP)::
     POST /api/agent
     Body: {"prompt": "...", "model": "...", "api_key": "..."}
 
+Prometheus metrics (tool latency, adapter requests, scheduler, DB, events)::
+
+    GET /metrics
+
 FastAPI and uvicorn are optional dependencies.  Install them with::
 
     pip install kiln3d[rest]
@@ -37,16 +41,18 @@ import json as _json
 import logging
 import math
 import os
+import sqlite3
 import sys
-import threading
 import time as _time
-from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from starlette.requests import Request  # module-level so PEP 563 deferred annotations resolve
 
+from kiln.metrics import record_tool_call
+from kiln.rate_limit import RateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+
 if TYPE_CHECKING:
     from fastapi import FastAPI
 
@@ -80,79 +86,14 @@ def _extract_bearer_token(auth_header: str | None) -> str | None:
 # ---------------------------------------------------------------------------
 
 
-class RateLimiter:
-    """Thread-safe in-memory sliding-window rate limiter.
-
-    Tracks request timestamps per client key (API key or IP address)
-    within a rolling time window.  Configurable via the ``KILN_RATE_LIMIT``
-    environment variable (requests per minute; ``0`` to disable).
-
-    Each :meth:`check` call returns ``(allowed, remaining, reset_epoch)``
-    so callers can populate standard rate-limit response headers.
-    """
-
-    def __init__(self, max_requests: int = 60, window_seconds: float = 60.0):
-        self._max = max_requests
-        self._window = window_seconds
-        self._hits: dict[str, list[float]] = defaultdict(list)
-        self._lock = threading.Lock()
-
-    @property
-    def limit(self) -> int:
-        """Maximum requests allowed per window."""
-        return self._max
-
-    @property
-    def window(self) -> float:
-        """Window duration in seconds."""
-        return self._window
-
-    @property
-    def enabled(self) -> bool:
-        """Whether rate limiting is active (max > 0)."""
-        return self._max > 0
-
-    def check(self, key: str) -> tuple[bool, int, float]:
-        """Check whether a request from *key* is allowed.
-
-        Returns:
-            A 3-tuple ``(allowed, remaining, reset_epoch)`` where:
-
-            - *allowed*: ``True`` if the request should proceed.
-            - *remaining*: How many requests remain in the current window.
-            - *reset_epoch*: Unix timestamp when the window resets (for
-              the ``X-RateLimit-Reset`` / ``Retry-After`` headers).
-        """
-        if not self.enabled:
-            return True, self._max, _time.time() + self._window
-
-        now_mono = _time.monotonic()
-        now_wall = _time.time()
-        cutoff = now_mono - self._window
-
-        with self._lock:
-            hits = self._hits[key]
-            # Purge expired entries
-            self._hits[key] = hits = [t for t in hits if t > cutoff]
-
-            if len(hits) >= self._max:
-                # Earliest hit determines when the window opens next
-                oldest = hits[0] if hits else now_mono
-                retry_after = oldest + self._window - now_mono
-                reset_epoch = now_wall + retry_after
-                return False, 0, reset_epoch
-
-            hits.append(now_mono)
-            remaining = max(0, self._max - len(hits))
-            reset_epoch = now_wall + self._window
-            return True, remaining, reset_epoch
-
-
 def _build_rate_limiter() -> RateLimiter:
     """Create a :class:`RateLimiter` from the ``KILN_RATE_LIMIT`` env var.
 
     The env var is interpreted as *requests per minute*.  Defaults to
     ``60``.  Set to ``0`` to disable rate limiting entirely.
+
+    When ``KILN_RATE_LIMIT_DB`` names a file, counters are kept in that
+    SQLite database so every worker process on the host shares one limit.
     """
     raw = os.environ.get("KILN_RATE_LIMIT", "60").strip()
     try:
@@ -162,7 +103,14 @@ def _build_rate_limiter() -> RateLimiter:
         limit = 60
     if limit < 0:
         limit = 0
-    return RateLimiter(max_requests=limit, window_seconds=60.0)
+    backend: RateLimitBackend | None = None
+    db_path = os.environ.get("KILN_RATE_LIMIT_DB", "").strip()
+    if db_path and limit > 0:
+        try:
+            backend = SQLiteRateLimitBackend(db_path)
+        except sqlite3.Error as exc:
+            logger.warning("Cannot open KILN_RATE_LIMIT_DB %r (%s); using per-process limits", db_path, exc)
+    return RateLimiter(max_requests=limit, window_seconds=60.0, backend=backend)
 
 
 _rate_limiter = _build_rate_limiter()
@@ -280,6 +228,7 @@ def create_app(config: RestApiConfig | None = None) -> FastAPI:
 
     - ``GET /api/tools`` -- list all available tools with schemas
     - ``GET /api/health`` -- server health check
+    - ``GET /metrics`` -- Prometheus text exposition (see :mod:`kiln.metrics`)
     - ``POST /api/agent`` -- run agent loop (requires OpenRouter/OpenAI key)
     """
     # Load .env file if present.
@@ -336,8 +285,8 @@ def create_app(config: RestApiConfig | None = None) -> FastAPI:
         """Middleware that enforces rate limits and injects headers."""
 
         async def dispatch(self, request: Request, call_next):
-            # Skip rate limiting for health checks
-            if request.url.path == "/api/health":
+            # Skip rate limiting for health checks and metrics scrapes
+            if request.url.path in ("/api/health", "/metrics"):
                 return await call_next(request)
 
             # Determine client identity: auth token > IP
@@ -465,6 +414,17 @@ def create_app(config: RestApiConfig | None = None) -> FastAPI:
         """Server health check."""
         return {"status": "ok", "version": "0.1.0"}
 
+    # ----- Prometheus metrics ---------------------------------------------
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(_=_auth_dep):
+        """Prometheus text exposition of Kiln's in-process metrics."""
+        from fastapi.responses import Response
+
+        from kiln.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics
+
+        return Response(get_metrics().export_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
     # ----- Tool discovery -------------------------------------------------
 
     @app.get("/api/tools")
@@ -546,18 +506,22 @@ def create_app(config: RestApiConfig | None = None) -> FastAPI:
             )
 
         # Execute the tool function
+        started = _time.perf_counter()
         try:
             result = func(**filtered)
             # Handle async tool functions
             if inspect.isawaitable(result):
                 result = await result
+            record_tool_call(tool_name, _time.perf_counter() - started, result=result)
             return result
         except TypeError as exc:
+            record_tool_call(tool_name, _time.perf_counter() - started, error=True)
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid parameters: {exc}",
             ) from exc
         except Exception as exc:
+            record_tool_call(tool_name, _time.perf_counter() - started, error=True)
             logger.exception("Tool execution failed: %s", tool_name)
             return JSONResponse(
                 {"success": False, "error": f"Tool '{tool_name}' execution failed: {type(exc).__name__}"},
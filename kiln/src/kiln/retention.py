@@ -4,6 +4,11 @@ Defines configurable retention windows for each data category (audit logs,
 print history, traceability records, agent memory, event logs) and provides
 a manager that identifies stale records for purging.
 
+Audit and event logs are stored in monthly partitions (see
+:mod:`kiln.partitions`), so purging them drops whole partitions rather
+than deleting rows.  A partition is kept until every row in it is past
+its retention window.
+
 Default retention periods follow manufacturing compliance standards:
 
 - **Traceability records**: 7 years (2555 days) -- ISO 9001 / 21 CFR 820
@@ -17,9 +22,10 @@ custom :class:`RetentionPolicy`.
 
 Usage::
 
+    from kiln.persistence import get_db
     from kiln.retention import RetentionManager
 
-    mgr = RetentionManager()
+    mgr = RetentionManager(db=get_db())
     result = mgr.apply(dry_run=True)
     print(result)  # RetentionResult(...)
 """
@@ -30,7 +36,10 @@ import logging
 import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kiln.persistence import KilnDB
 
 logger = logging.getLogger(__name__)
 
@@ -160,9 +169,19 @@ class RetentionManager:
     - ``KILN_RETENTION_AUDIT_DAYS``
     - ``KILN_RETENTION_PRINT_DAYS``
     - ``KILN_RETENTION_TRACE_DAYS``
+
+    :param policy: Retention windows; defaults to the environment overrides.
+    :param db: Database to purge.  Without one, :meth:`apply` only logs the
+        cutoffs and reports zero counts.
     """
 
-    def __init__(self, *, policy: RetentionPolicy | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        policy: RetentionPolicy | None = None,
+        db: KilnDB | None = None,
+    ) -> None:
+        self._db = db
         if policy is not None:
             self._policy = policy
         else:
@@ -192,10 +211,12 @@ class RetentionManager:
         simply reports what *would* be removed.  When ``dry_run=False``,
         records are purged from the backing store.
 
+        Audit and event logs are purged by dropping expired monthly
+        partitions of the database passed to the constructor.
+
         .. note::
-            The current implementation has no backing store and always returns
-            zero counts.  When a storage backend is wired in, this method
-            will query each table for records older than the cutoff.
+            Print history, traceability records and agent memory are not
+            wired to a backing store yet and always report zero.
 
         :returns: A :class:`RetentionResult` with per-category counts.
         """
@@ -215,5 +236,16 @@ class RetentionManager:
             {k: v.isoformat() for k, v in cutoffs.items()},
         )
 
-        # No backing store wired yet -- return empty result with cutoff info.
-        return RetentionResult(dry_run=dry_run)
+        result = RetentionResult(dry_run=dry_run)
+        if self._db is not None:
+            result.audit_log_expired = self._db.drop_expired_partitions(
+                "safety_audit_log",
+                cutoffs["audit_log"].timestamp(),
+                dry_run=dry_run,
+            )
+            result.event_log_expired = self._db.drop_expired_partitions(
+                "events",
+                cutoffs["event_log"].timestamp(),
+                dry_run=dry_run,
+            )
+        return result
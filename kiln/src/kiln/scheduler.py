@@ -7,6 +7,13 @@ The scheduler runs in a background thread, periodically checking for:
 
 It bridges the gap between the job queue (where agents submit work)
 and the printer registry (where physical printers live).
+
+When a persistence layer is configured, each tick assigns *all*
+dispatchable queued jobs to *all* idle printers at once, maximising the
+total historical success rate.  Success rates come from an in-memory
+:class:`OutcomeMatrix` that is seeded from ``print_outcomes`` and kept
+current from ``JOB_COMPLETED`` / ``JOB_FAILED`` events, so ranking does
+not query the database on every tick.
 """
 
 from __future__ import annotations
@@ -16,9 +23,11 @@ import threading
 import time
 from typing import Any
 
-from kiln.events import EventBus, EventType
+from kiln.assignment import solve_assignment
+from kiln.events import Event, EventBus, EventType
+from kiln.metrics import QUEUE_DEPTH, SCHEDULER_TICK
 from kiln.printers.base import PrinterError, PrinterStatus
-from kiln.queue import JobStatus, PrintQueue
+from kiln.queue import JobStatus, PrintJob, PrintQueue
 from kiln.registry import PrinterNotFoundError, PrinterRegistry
 
 logger = logging.getLogger(__name__)
@@ -27,6 +36,101 @@ logger = logging.getLogger(__name__)
 # Jobs in PRINTING state longer than this are considered stuck.
 _STUCK_JOB_TIMEOUT_SECONDS: float = 7200.0  # 2 hours
 
+# How often the outcome matrix is reloaded from persistence, to pick up
+# outcomes recorded by agents rather than observed via scheduler events.
+_OUTCOME_MATRIX_REFRESH_SECONDS: float = 300.0
+
+# Assignment score for a printer with no history for a job.  Below any
+# real success rate, so printers with a track record are preferred.
+_UNKNOWN_PRINTER_SCORE: float = -1.0
+
+
+class OutcomeMatrix:
+    """In-memory success counts over (printer × material × file hash).
+
+    Rates are answered at the most specific level that has data: the
+    exact material + file combination, then the same file on any
+    material, then the same material on any file.  Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Each value is [successes, total].
+        self._exact: dict[tuple[str, str | None, str | None], list[int]] = {}
+        self._by_file: dict[tuple[str, str], list[int]] = {}
+        self._by_material: dict[tuple[str, str], list[int]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._exact)
+
+    def _add(
+        self,
+        printer_name: str,
+        material_type: str | None,
+        file_hash: str | None,
+        successes: int,
+        total: int,
+    ) -> None:
+        for table, key in (
+            (self._exact, (printer_name, material_type, file_hash)),
+            (self._by_file, (printer_name, file_hash) if file_hash else None),
+            (self._by_material, (printer_name, material_type) if material_type else None),
+        ):
+            if key is None:
+                continue
+            cell = table.setdefault(key, [0, 0])  # type: ignore[arg-type]
+            cell[0] += successes
+            cell[1] += total
+
+    def load(self, rows: Any) -> None:
+        """Replace all counts with *rows* from ``KilnDB.print_outcome_counts``."""
+        with self._lock:
+            self._exact.clear()
+            self._by_file.clear()
+            self._by_material.clear()
+            for row in rows:
+                self._add(
+                    row["printer_name"],
+                    row.get("material_type"),
+                    row.get("file_hash"),
+                    int(row.get("successes") or 0),
+                    int(row.get("total") or 0),
+                )
+
+    def record(
+        self,
+        printer_name: str,
+        *,
+        material_type: str | None,
+        file_hash: str | None,
+        success: bool,
+    ) -> None:
+        """Count one finished job."""
+        with self._lock:
+            self._add(printer_name, material_type, file_hash, 1 if success else 0, 1)
+
+    def success_rate(
+        self,
+        printer_name: str,
+        *,
+        material_type: str | None = None,
+        file_hash: str | None = None,
+    ) -> float | None:
+        """Return the success rate for a printer, or ``None`` without history."""
+        with self._lock:
+            candidates: list[list[int] | None] = []
+            if file_hash and material_type:
+                candidates.append(self._exact.get((printer_name, material_type, file_hash)))
+            if file_hash:
+                candidates.append(self._by_file.get((printer_name, file_hash)))
+            if material_type:
+                candidates.append(self._by_material.get((printer_name, material_type)))
+            for cell in candidates:
+                if cell is not None and cell[1] > 0:
+                    return cell[0] / cell[1]
+        return None
+
 
 class JobScheduler:
     """Background scheduler that dispatches print jobs to printers.
@@ -64,6 +168,11 @@ class JobScheduler:
         self._retry_counts: dict[str, int] = {}  # job_id -> attempts so far
         self._retry_not_before: dict[str, float] = {}  # job_id -> earliest retry timestamp
         self._lock = threading.Lock()
+        self._outcomes = OutcomeMatrix()
+        self._outcomes_loaded_at: float | None = None
+        if persistence is not None:
+            event_bus.subscribe(EventType.JOB_COMPLETED, self._on_job_finished)
+            event_bus.subscribe(EventType.JOB_FAILED, self._on_job_finished)
 
     @property
     def is_running(self) -> bool:
@@ -146,49 +255,167 @@ class JobScheduler:
         self._retry_counts.pop(job_id, None)
         self._retry_not_before.pop(job_id, None)
         self._queue.mark_failed(job_id, error_msg)
-        self._event_bus.publish(
-            EventType.JOB_FAILED,
-            {"job_id": job_id, "error": error_msg},
-            source="scheduler",
-        )
+        payload = {"job_id": job_id, "error": error_msg}
+        if printer_name:
+            payload["printer_name"] = printer_name
+        self._event_bus.publish(EventType.JOB_FAILED, payload, source="scheduler")
         if printer_name:
             self._auto_record_outcome(job_id, printer_name, "failed", error_msg=error_msg)
         failed_list.append({"job_id": job_id, "error": error_msg})
         return False
 
-    def _rank_printers(self, available: list[str], job) -> list[str]:
-        """Reorder available printers by historical success rate for this job.
+    # ------------------------------------------------------------------
+    # Outcome-aware ranking
+    # ------------------------------------------------------------------
+
+    def _refresh_outcomes(self, *, force: bool = False) -> None:
+        """Reload the outcome matrix from persistence when it is stale."""
+        if not self._persistence:
+            return
+        now = time.time()
+        if (
+            not force
+            and self._outcomes_loaded_at is not None
+            and now - self._outcomes_loaded_at < _OUTCOME_MATRIX_REFRESH_SECONDS
+        ):
+            return
+        self._outcomes_loaded_at = now
+        try:
+            self._outcomes.load(self._persistence.print_outcome_counts())
+        except Exception:
+            logger.debug("Failed to load outcome matrix (non-fatal)", exc_info=True)
+
+    def _on_job_finished(self, event: Event) -> None:
+        """Fold a ``JOB_COMPLETED`` / ``JOB_FAILED`` event into the outcome matrix."""
+        printer_name = event.data.get("printer_name")
+        job_id = event.data.get("job_id")
+        if not printer_name or not job_id:
+            return
+        try:
+            job = self._queue.get_job(job_id)
+        except Exception:
+            return
+        metadata = job.metadata or {}
+        self._outcomes.record(
+            printer_name,
+            material_type=metadata.get("material_type"),
+            file_hash=metadata.get("file_hash"),
+            success=event.type == EventType.JOB_COMPLETED,
+        )
 
-        When a persistence layer is configured and the job metadata contains
-        ``file_hash`` or ``material_type``, printers are sorted so that those
-        with the highest historical success rate for the given criteria come
-        first.  Printers without history are placed last (original order
-        preserved among them).
+    def _job_scores(self, job: PrintJob, printers: list[str]) -> list[float] | None:
+        """Return one success-rate score per printer, or ``None`` if unrankable.
 
-        If no persistence is configured or no ranking data is available, the
-        list is returned unchanged.
+        A job is unrankable without persistence or without ``file_hash``
+        / ``material_type`` metadata.  Printers without history score
+        :data:`_UNKNOWN_PRINTER_SCORE`.
         """
         if not self._persistence:
-            return available
-        file_hash = job.metadata.get("file_hash") if job.metadata else None
-        material_type = job.metadata.get("material_type") if job.metadata else None
+            return None
+        metadata = job.metadata or {}
+        file_hash = metadata.get("file_hash")
+        material_type = metadata.get("material_type")
         if not file_hash and not material_type:
+            return None
+        rates = [
+            self._outcomes.success_rate(p, material_type=material_type, file_hash=file_hash)
+            for p in printers
+        ]
+        if all(r is None for r in rates):
+            return None
+        return [_UNKNOWN_PRINTER_SCORE if r is None else r for r in rates]
+
+    def _rank_printers(self, available: list[str], job: PrintJob) -> list[str]:
+        """Reorder available printers by historical success rate for this job.
+
+        Printers with the highest success rate for the job's ``file_hash``
+        / ``material_type`` come first.  Printers without history are
+        placed last (original order preserved among them).  Without
+        persistence, metadata, or any history, the list is returned
+        unchanged.
+        """
+        self._refresh_outcomes()
+        scores = self._job_scores(job, available)
+        if scores is None:
             return available
-        rankings = self._persistence.suggest_printer_for_outcome(
-            file_hash=file_hash,
-            material_type=material_type,
-        )
-        if not rankings:
-            return available
-        # Build a score map: printer_name -> success_rate
-        score = {r["printer_name"]: r["success_rate"] for r in rankings}
-        # Sort available printers by score (highest first); unknown printers
-        # sort last (score -1) but preserve their relative order via the
-        # enumerate index as a tiebreaker.
         indexed = list(enumerate(available))
-        indexed.sort(key=lambda pair: (-score.get(pair[1], -1), pair[0]))
+        indexed.sort(key=lambda pair: (-scores[pair[0]], pair[0]))
         return [name for _, name in indexed]
 
+    def _plan_dispatch(self, available: list[str]) -> list[tuple[str, PrintJob]]:
+        """Assign queued jobs to available printers for this tick.
+
+        Jobs are admitted in priority order (skipping those still in
+        retry backoff) until every available printer has a candidate,
+        then a single assignment over the job × printer score matrix
+        decides who goes where.  Jobs pinned to a printer may only be
+        matched to that printer.  Emergency-latched printers are
+        excluded up front, with a ``SAFETY_ESCALATED`` event if a job
+        was waiting for them.
+        """
+        now = time.time()
+        queued = [
+            j
+            for j in self._queue.list_jobs(status=JobStatus.QUEUED, limit=max(1, self._queue.total_count))
+            if self._retry_not_before.get(j.id, 0.0) <= now
+        ]
+        if not queued:
+            return []
+
+        printers: list[str] = []
+        for printer_name in available:
+            estop_reason = self._emergency_block_reason(printer_name)
+            if not estop_reason:
+                printers.append(printer_name)
+                continue
+            blocked = next((j for j in queued if j.printer_name in (None, printer_name)), None)
+            if blocked is None:
+                continue
+            logger.warning(
+                "Dispatch blocked for %s (job %s): %s",
+                printer_name,
+                blocked.id,
+                estop_reason,
+            )
+            self._event_bus.publish(
+                EventType.SAFETY_ESCALATED,
+                {
+                    "printer_name": printer_name,
+                    "job_id": blocked.id,
+                    "reason": "emergency_latched",
+                    "message": estop_reason,
+                },
+                source="scheduler",
+            )
+        if not printers:
+            return []
+
+        printer_set = set(printers)
+        claimed: set[str] = set()
+        jobs: list[PrintJob] = []
+        for job in queued:
+            if len(jobs) >= len(printers):
+                break
+            if job.printer_name is not None:
+                if job.printer_name not in printer_set or job.printer_name in claimed:
+                    continue
+                claimed.add(job.printer_name)
+            jobs.append(job)
+        if not jobs:
+            return []
+
+        self._refresh_outcomes()
+        matrix: list[list[float | None]] = []
+        for job in jobs:
+            scores = self._job_scores(job, printers) or [0.0] * len(printers)
+            matrix.append(
+                [
+                    score if job.printer_name is None or job.printer_name == printer else None
+                    for printer, score in zip(printers, scores, strict=True)
+                ]
+            )
+        return [(printers[col], jobs[row]) for row, col in solve_assignment(matrix)]
+
     def _auto_record_outcome(
         self,
         job_id: str,
@@ -259,6 +486,14 @@ class JobScheduler:
             failed: list of {job_id, error}
             checked: number of active jobs checked
         """
+        with SCHEDULER_TICK.timer():
+            result = self._tick()
+        depth = self._queue.summary()
+        for status in JobStatus:
+            QUEUE_DEPTH.set(depth.get(status.value, 0), labels={"status": status.value})
+        return result
+
+    def _tick(self) -> dict[str, Any]:
         dispatched: list[dict[str, Any]] = []
         completed: list[str] = []
         failed: list[dict[str, str]] = []
@@ -281,7 +516,7 @@ class JobScheduler:
                     self._queue.mark_failed(job_id, error_msg)
                     self._event_bus.publish(
                         EventType.JOB_FAILED,
-                        {"job_id": job_id, "error": error_msg},
+                        {"job_id": job_id, "error": error_msg, "printer_name": printer_name},
                         source="scheduler",
                     )
                     self._auto_record_outcome(job_id, printer_name, "failed", error_msg=error_msg)
@@ -373,44 +608,8 @@ class JobScheduler:
             busy_printers = set(self._active_jobs.values())
         available = [p for p in idle_printers if p not in busy_printers]
 
-        # Smart routing: rank printers by historical success rate for the
-        # next queued unassigned job.  This ensures the best-performing
-        # printer for the job's file/material gets first dispatch priority.
-        if self._persistence and available:
-            queued = [j for j in self._queue.list_jobs(status=JobStatus.QUEUED) if j.printer_name is None]
-            if queued:
-                available = self._rank_printers(available, queued[0])
-
-        for printer_name in available:
-            next_job = self._queue.next_job(printer_name=printer_name)
-            if next_job is None:
-                continue
-
-            estop_reason = self._emergency_block_reason(printer_name)
-            if estop_reason:
-                logger.warning(
-                    "Dispatch blocked for %s (job %s): %s",
-                    printer_name,
-                    next_job.id,
-                    estop_reason,
-                )
-                self._event_bus.publish(
-                    EventType.SAFETY_ESCALATED,
-                    {
-                        "printer_name": printer_name,
-                        "job_id": next_job.id,
-                        "reason": "emergency_latched",
-                        "message": estop_reason,
-                    },
-                    source="scheduler",
-                )
-                continue
-
-            # Respect exponential backoff for retried jobs
-            not_before = self._retry_not_before.get(next_job.id)
-            if not_before is not None and time.time() < not_before:
-                continue
-
+        # Outcome-aware batch assignment of queued jobs to idle printers.
+        for printer_name, next_job in self._plan_dispatch(available):
             # Clear the backoff gate once we're past it
             self._retry_not_before.pop(next_job.id, None)
 
@@ -0,0 +1,347 @@
+"""Versioned schema migrations for :class:`~kiln.persistence.KilnDB`.
+
+The base schema (``CREATE TABLE IF NOT EXISTS ...``) describes tables as
+they were first shipped.  Everything added afterwards -- new columns and
+the indexes behind hot queries -- is declared here as a numbered
+:class:`Migration` made of idempotent operations:
+
+* :class:`AddColumn` -- ``ALTER TABLE ... ADD COLUMN`` unless the column
+  already exists;
+* :class:`CreateIndex` -- ``CREATE INDEX IF NOT EXISTS``;
+* :class:`DropIndex` -- ``DROP INDEX IF EXISTS`` (an index superseded by
+  a wider one);
+* :class:`PartitionByMonth` -- split a table into monthly partitions (see
+  :mod:`kiln.partitions`) unless it already is.
+
+Once a table is partitioned its columns and indexes are cloned from the
+newest partition, so later changes to it must be applied to every
+partition rather than through :class:`AddColumn` or :class:`CreateIndex`.
+
+Applied versions are recorded in the ``schema_migrations`` table, so each
+migration runs once per database.  Because every operation is idempotent,
+databases created before this table existed are brought up to date by
+running all migrations once.  Both the SQLite and PostgreSQL backends are
+supported; the only dialect difference is how existing columns are
+listed.
+
+To change the schema, append a migration with the next version number;
+never edit one that has shipped.
+
+Usage::
+
+    from kiln.schema_migrations import apply_migrations
+
+    newly_applied = apply_migrations(backend, postgres=False)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from kiln.partitions import partition_table
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Operations
+# ---------------------------------------------------------------------------
+
+
+def _columns(conn: Any, table: str, *, postgres: bool) -> set[str]:
+    if postgres:
+        rows = conn.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = ?",
+            (table,),
+        ).fetchall()
+        return {row[0] for row in rows}
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+@dataclass(frozen=True)
+class AddColumn:
+    """Add *column* to *table* unless it is already there.
+
+    :param definition: Column type and constraints, e.g. ``"TEXT DEFAULT ''"``.
+    """
+
+    table: str
+    column: str
+    definition: str
+
+    def apply(self, conn: Any, *, postgres: bool = False) -> None:
+        if self.column in _columns(conn, self.table, postgres=postgres):
+            return
+        conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.definition}")
+
+
+@dataclass(frozen=True)
+class CreateIndex:
+    """Create index *name* on *table* over *columns*.
+
+    :param columns: Column list as written in SQL, e.g. ``"status, priority DESC"``.
+    :param where: Optional partial-index predicate.
+    """
+
+    name: str
+    table: str
+    columns: str
+    unique: bool = False
+    where: str | None = None
+
+    def sql(self) -> str:
+        unique = "UNIQUE " if self.unique else ""
+        where = f" WHERE {self.where}" if self.where else ""
+        return f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {self.table}({self.columns}){where}"
+
+    def apply(self, conn: Any, *, postgres: bool = False) -> None:
+        conn.execute(self.sql())
+
+
+@dataclass(frozen=True)
+class DropIndex:
+    """Drop index *name* if it exists."""
+
+    name: str
+
+    def apply(self, conn: Any, *, postgres: bool = False) -> None:
+        conn.execute(f"DROP INDEX IF EXISTS {self.name}")
+
+
+@dataclass(frozen=True)
+class PartitionByMonth:
+    """Convert *table* into monthly partitions on *time_column* (SQLite only)."""
+
+    table: str
+    time_column: str
+
+    def apply(self, conn: Any, *, postgres: bool = False) -> None:
+        # SQLite only until native partitioning has a PostgreSQL-backed
+        # test; PostgreSQL keeps the plain table.
+        if postgres:
+            return
+        partition_table(conn, self.table, self.time_column)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema version.
+
+    :param version: Strictly increasing version number.
+    :param description: Short summary, stored alongside the version.
+    :param operations: Idempotent operations applied in order.
+    """
+
+    version: int
+    description: str
+    operations: tuple[AddColumn | CreateIndex | DropIndex | PartitionByMonth, ...]
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "audit log HMAC signatures",
+        (AddColumn("safety_audit_log", "hmac_signature", "TEXT"),),
+    ),
+    Migration(
+        2,
+        "audit log session ids",
+        (
+            AddColumn("safety_audit_log", "session_id", "TEXT"),
+            CreateIndex("idx_audit_session", "safety_audit_log", "session_id"),
+        ),
+    ),
+    Migration(
+        3,
+        "audit log hash chain",
+        (AddColumn("safety_audit_log", "prev_hash", "TEXT DEFAULT ''"),),
+    ),
+    Migration(
+        4,
+        "per-user billing charges",
+        (
+            AddColumn("billing_charges", "user_email", "TEXT"),
+            CreateIndex("idx_billing_charges_user", "billing_charges", "user_email"),
+        ),
+    ),
+    Migration(
+        5,
+        "print DNA shape descriptors",
+        (AddColumn("print_dna", "shape_descriptor", "BLOB"),),
+    ),
+    Migration(
+        6,
+        "agent memory versions and expiry",
+        (
+            AddColumn("agent_memory", "version", "INTEGER NOT NULL DEFAULT 1"),
+            AddColumn("agent_memory", "expires_at", "REAL DEFAULT NULL"),
+        ),
+    ),
+    Migration(
+        7,
+        "indexes for hot queries",
+        (
+            # recent_events(event_type=...): newest events of one type.
+            CreateIndex("idx_events_type_id", "events", "event_type, id"),
+            # get_unsynced_events / cleanup / last_event_id_before.
+            CreateIndex("idx_events_timestamp", "events", "timestamp"),
+            # list_jobs(status=...) and list_jobs(): queue order without a sort.
+            CreateIndex("idx_jobs_status_priority", "jobs", "status, priority DESC, submitted_at"),
+            CreateIndex("idx_jobs_priority", "jobs", "priority DESC, submitted_at"),
+            # Keyset pages for cloud sync.
+            CreateIndex("idx_jobs_submitted", "jobs", "submitted_at, id"),
+            # Sync bookkeeping: unsynced lookups and per-stream cursors.
+            CreateIndex("idx_sync_log_type_status", "sync_log", "entity_type, status, entity_id"),
+            # print_dna lookups ordered by recency, and the similarity range scan.
+            CreateIndex("idx_print_dna_signature_time", "print_dna", "geometric_signature, timestamp"),
+            CreateIndex("idx_print_dna_hash_time", "print_dna", "file_hash, timestamp"),
+            CreateIndex("idx_print_dna_surface_volume", "print_dna", "surface_area, volume"),
+            DropIndex("idx_print_dna_geometric_sig"),
+            DropIndex("idx_print_dna_file_hash"),
+            # Filtered newest-first listings: equality column, then sort key.
+            CreateIndex("idx_billing_charges_status_created", "billing_charges", "payment_status, created_at"),
+            CreateIndex("idx_print_history_status_completed", "print_history", "status, completed_at"),
+            CreateIndex("idx_model_cache_source_created", "model_cache", "source, created_at"),
+            DropIndex("idx_print_history_status"),
+            DropIndex("idx_model_cache_source"),
+            # suggest_printer_for_outcome: per-material win rates from the index alone.
+            CreateIndex(
+                "idx_print_outcomes_material_printer", "print_outcomes", "material_type, printer_name, outcome"
+            ),
+            DropIndex("idx_print_outcomes_material"),
+            # audit_summary: a skip-scan per action over a recent window.
+            CreateIndex("idx_audit_action_time", "safety_audit_log", "action, timestamp"),
+            # Per-printer leveling history.
+            CreateIndex("idx_leveling_printer_started", "leveling_history", "printer_name, started_at"),
+            # Print history by job, and the unfiltered newest-first listing.
+            CreateIndex("idx_print_history_job", "print_history", "job_id"),
+            CreateIndex("idx_print_history_completed", "print_history", "completed_at"),
+            # Newest-first listings and age-based purges.
+            CreateIndex("idx_print_outcomes_created", "print_outcomes", "created_at"),
+            CreateIndex("idx_model_cache_created", "model_cache", "created_at"),
+            CreateIndex("idx_snapshots_created", "snapshots", "created_at"),
+            CreateIndex("idx_payments_created", "payments", "created_at"),
+            CreateIndex("idx_payment_methods_user", "payment_methods", "user_id, created_at"),
+            CreateIndex("idx_webhook_dead_letters_time", "webhook_dead_letters", "timestamp"),
+            # Expiry sweep touches only rows that can expire.
+            CreateIndex(
+                "idx_agent_memory_expires",
+                "agent_memory",
+                "expires_at",
+                where="expires_at IS NOT NULL",
+            ),
+            # list_active_fulfillment_orders: only open orders are indexed.
+            CreateIndex(
+                "idx_fulfillment_orders_active",
+                "fulfillment_orders",
+                "created_at",
+                where="status NOT IN ('delivered', 'completed', 'failed', 'cancelled', 'canceled')",
+            ),
+        ),
+    ),
+    Migration(
+        8,
+        "monthly partitions for events, audit log and snapshots",
+        (
+            # Indexes from the base schema; partitions copy every index.
+            CreateIndex("idx_audit_tool", "safety_audit_log", "tool_name"),
+            CreateIndex("idx_audit_action", "safety_audit_log", "action"),
+            CreateIndex("idx_audit_time", "safety_audit_log", "timestamp"),
+            CreateIndex("idx_snapshots_job", "snapshots", "job_id"),
+            CreateIndex("idx_snapshots_printer", "snapshots", "printer_name"),
+            CreateIndex("idx_snapshots_phase", "snapshots", "phase"),
+            PartitionByMonth("events", "timestamp"),
+            PartitionByMonth("safety_audit_log", "timestamp"),
+            PartitionByMonth("snapshots", "created_at"),
+        ),
+    ),
+    Migration(
+        9,
+        "drop indexes superseded in 7 that the base schema recreated",
+        (
+            DropIndex("idx_print_history_status"),
+            DropIndex("idx_print_outcomes_material"),
+            DropIndex("idx_model_cache_source"),
+            DropIndex("idx_print_dna_file_hash"),
+            DropIndex("idx_print_dna_geometric_sig"),
+        ),
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def _ensure_table(conn: Any) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version     INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at  REAL NOT NULL
+        )
+        """
+    )
+
+
+def applied_versions(conn: Any) -> list[int]:
+    """Return the migration versions recorded in *conn*, ascending."""
+    _ensure_table(conn)
+    rows = conn.execute("SELECT version FROM schema_migrations ORDER BY version").fetchall()
+    return [row[0] for row in rows]
+
+
+def apply_migrations(
+    conn: Any,
+    *,
+    postgres: bool = False,
+    migrations: tuple[Migration, ...] = MIGRATIONS,
+) -> list[int]:
+    """Apply every migration not yet recorded in *conn*.
+
+    Each migration is committed together with its ``schema_migrations``
+    row, in one transaction.  Returns the versions applied by this call.
+    """
+    done = set(applied_versions(conn))
+    applied: list[int] = []
+    for migration in migrations:
+        if migration.version in done:
+            continue
+        conn.execute("SAVEPOINT schema_migration")
+        try:
+            for operation in migration.operations:
+                operation.apply(conn, postgres=postgres)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, time.time()),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK TO SAVEPOINT schema_migration")
+            conn.execute("RELEASE SAVEPOINT schema_migration")
+            raise
+        conn.execute("RELEASE SAVEPOINT schema_migration")
+        conn.commit()
+        applied.append(migration.version)
+        logger.info("Applied schema migration %d: %s", migration.version, migration.description)
+    return applied
+
+
+__all__ = [
+    "MIGRATIONS",
+    "AddColumn",
+    "CreateIndex",
+    "DropIndex",
+    "Migration",
+    "PartitionByMonth",
+    "applied_versions",
+    "apply_migrations",
+]
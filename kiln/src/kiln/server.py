@@ -56,6 +56,7 @@ import tempfile
 import threading
 import time
 import uuid as _uuid_mod
+from collections import deque
 from contextvars import ContextVar
 from pathlib import Path
 from types import MethodType
@@ -127,6 +128,7 @@ from kiln.marketplaces import (
     MarketplaceNotFoundError as MktNotFoundError,
 )
 from kiln.materials import MaterialTracker
+from kiln.metrics import record_tool_call, start_metrics_server
 from kiln.payments.base import PaymentError
 from kiln.payments.manager import PaymentManager
 from kiln.persistence import get_db
@@ -486,15 +488,26 @@ def _install_mcp_request_context_capture() -> None:
         convert_result: bool = False,
     ):
         token = _current_mcp_request_context.set(context)
+        # Only label known tools so arbitrary names cannot grow the metric.
+        instrumented = self.get_tool(name) is not None
+        started = time.perf_counter()
+        result: Any = None
+        error = False
         try:
-            return await original_call_tool(
+            result = await original_call_tool(
                 name,
                 arguments,
                 context=context,
                 convert_result=convert_result,
             )
+            return result
+        except BaseException:
+            error = True
+            raise
         finally:
             _current_mcp_request_context.reset(token)
+            if instrumented:
+                record_tool_call(name, time.perf_counter() - started, result=result, error=error)
 
     tool_mgr.call_tool = MethodType(_call_tool_with_context, tool_mgr)
     tool_mgr._kiln_request_context_capture_installed = True
@@ -683,6 +696,9 @@ class _ToolRateLimiter:
 
     Prevents agents from spamming physically-dangerous commands in tight
     retry loops.  Uses a simple minimum-interval + max-per-minute model.
+    The per-minute cap keeps the last ``max_per_minute`` call times per
+    tool and the circuit breaker the last ``_BLOCK_THRESHOLD`` block
+    times, so both checks are exact and still O(1).
 
     **Circuit breaker:** When the same tool is blocked 3+ times within 60
     seconds, the tool enters a 5-minute emergency cooldown.  This catches
@@ -695,10 +711,11 @@ class _ToolRateLimiter:
     _COOLDOWN_DURATION: float = 300.0  # 5 minutes
 
     def __init__(self) -> None:
+        self._lock = threading.Lock()
         self._last_call: dict[str, float] = {}
-        self._call_history: dict[str, list[float]] = {}
-        self._block_history: dict[str, list[float]] = {}
         self._cooldown_until: dict[str, float] = {}
+        self._call_times: dict[str, deque[float]] = {}
+        self._block_times: dict[str, deque[float]] = {}
 
     def record_block(self, tool_name: str) -> str | None:
         """Record a blocked attempt for the circuit breaker.
@@ -706,58 +723,59 @@ class _ToolRateLimiter:
         Returns an escalation message if the threshold is hit, else ``None``.
         """
         now = time.monotonic()
-        history = self._block_history.get(tool_name, [])
-        cutoff = now - self._BLOCK_WINDOW
-        history = [t for t in history if t > cutoff]
-        history.append(now)
-        self._block_history[tool_name] = history
-
-        if len(history) >= self._BLOCK_THRESHOLD:
+        with self._lock:
+            times = self._block_times.get(tool_name)
+            if times is None:
+                times = self._block_times[tool_name] = deque(maxlen=self._BLOCK_THRESHOLD)
+            times.append(now)
+            if len(times) < self._BLOCK_THRESHOLD or now - times[0] > self._BLOCK_WINDOW:
+                return None
             self._cooldown_until[tool_name] = now + self._COOLDOWN_DURATION
-            self._block_history[tool_name] = []  # Reset after escalation
-            return (
-                f"SAFETY ESCALATED: {tool_name} has been blocked "
-                f"{len(history)} times in {self._BLOCK_WINDOW:.0f}s. "
-                f"Tool is suspended for {self._COOLDOWN_DURATION / 60:.0f} "
-                f"minutes. Please review your approach."
-            )
-        return None
+            times.clear()  # Reset after escalation
+        return (
+            f"SAFETY ESCALATED: {tool_name} has been blocked "
+            f"{self._BLOCK_THRESHOLD} times in {self._BLOCK_WINDOW:.0f}s. "
+            f"Tool is suspended for {self._COOLDOWN_DURATION / 60:.0f} "
+            f"minutes. Please review your approach."
+        )
 
     def check(self, tool_name: str, min_interval_ms: int = 0, max_per_minute: int = 0) -> str | None:
         """Return ``None`` if allowed, or an error message if rate-limited."""
         now = time.monotonic()
 
-        # Check circuit breaker cooldown first.
-        cooldown_end = self._cooldown_until.get(tool_name, 0.0)
-        if now < cooldown_end:
-            remaining = cooldown_end - now
-            return (
-                f"Tool {tool_name} is in emergency cooldown due to repeated "
-                f"blocked attempts. Cooldown expires in {remaining:.0f}s."
-            )
-
-        # Minimum interval between consecutive calls.
-        if min_interval_ms > 0:
-            last = self._last_call.get(tool_name, 0.0)
-            elapsed_ms = (now - last) * 1000
-            if elapsed_ms < min_interval_ms:
-                wait = (min_interval_ms - elapsed_ms) / 1000
-                return f"Rate limited: {tool_name} called too rapidly. Wait {wait:.1f}s before retrying."
-
-        # Max calls per rolling 60-second window.
-        if max_per_minute > 0:
-            history = self._call_history.get(tool_name, [])
-            cutoff = now - 60.0
-            history = [t for t in history if t > cutoff]
-            if len(history) >= max_per_minute:
+        with self._lock:
+            # Check circuit breaker cooldown first.
+            cooldown_end = self._cooldown_until.get(tool_name, 0.0)
+            if now < cooldown_end:
+                remaining = cooldown_end - now
                 return (
-                    f"Rate limited: {tool_name} called {max_per_minute} times in the last minute. Wait before retrying."
+                    f"Tool {tool_name} is in emergency cooldown due to repeated "
+                    f"blocked attempts. Cooldown expires in {remaining:.0f}s."
                 )
-            self._call_history[tool_name] = history
 
-        self._last_call[tool_name] = now
-        self._call_history.setdefault(tool_name, []).append(now)
-        return None
+            # Minimum interval between consecutive calls.
+            if min_interval_ms > 0:
+                last = self._last_call.get(tool_name)
+                elapsed_ms = (now - last) * 1000 if last is not None else float("inf")
+                if elapsed_ms < min_interval_ms:
+                    wait = (min_interval_ms - elapsed_ms) / 1000
+                    return f"Rate limited: {tool_name} called too rapidly. Wait {wait:.1f}s before retrying."
+
+            # Max calls per rolling 60-second window.
+            if max_per_minute > 0:
+                times = self._call_times.get(tool_name)
+                if times is None or times.maxlen != max_per_minute:
+                    times = self._call_times[tool_name] = deque(times or (), maxlen=max_per_minute)
+                if len(times) == max_per_minute and now - times[0] < 60.0:
+                    return (
+                        f"Rate limited: {tool_name} called {max_per_minute} times in the last minute. "
+                        "Wait before retrying."
+                    )
+
+            if max_per_minute > 0:
+                times.append(now)
+            self._last_call[tool_name] = now
+            return None
 
 
 _tool_limiter = _ToolRateLimiter()
@@ -918,7 +936,7 @@ _registry = PrinterRegistry()
 _queue = PrintQueue(db_path=os.path.join(str(Path.home()), ".kiln", "queue.db"))
 _event_bus = EventBus()
 _scheduler = JobScheduler(_queue, _registry, _event_bus, persistence=get_db())
-_webhook_mgr = WebhookManager(_event_bus)
+_webhook_mgr = WebhookManager(_event_bus, persistence=get_db())
 _auth = AuthManager()
 _billing = BillingLedger(db=get_db())
 _payment_mgr: PaymentManager | None = None
@@ -9446,17 +9464,10 @@ def list_design_templates() -> dict:
     - Category and description
     """
     try:
-        import json as _json
-        from pathlib import Path as _Path
-
-        tpl_path = _Path(__file__).parent / "data" / "design_templates.json"
-        with open(tpl_path) as fh:
-            data = _json.load(fh)
+        from kiln.template_store import get_template_store
 
         templates = []
-        for key, tpl in data.items():
-            if key.startswith("_"):
-                continue
+        for key, tpl in get_template_store().templates().items():
             templates.append({
                 "id": key,
                 "name": tpl["display_name"],
@@ -9504,17 +9515,14 @@ def generate_from_template(
     if err := _check_auth("generate"):
         return err
     try:
-        import json as _json
-        from pathlib import Path as _Path
         from string import Template
 
-        tpl_path = _Path(__file__).parent / "data" / "design_templates.json"
-        with open(tpl_path) as fh:
-            data = _json.load(fh)
+        from kiln.template_store import get_template_store
 
-        tpl = data.get(template_id)
-        if not tpl or template_id.startswith("_"):
-            available = [k for k in data if not k.startswith("_")]
+        store = get_template_store()
+        tpl = store.get(template_id)
+        if not tpl:
+            available = store.ids()
             return _error_dict(
                 f"Template {template_id!r} not found. Available: {', '.join(available)}",
                 code="NOT_FOUND",
@@ -10087,19 +10095,17 @@ def generate_template_variations(
     """
     if err := _check_auth("generate"):
         return err
-    import json
     from string import Template
 
+    from kiln.template_store import get_template_store
+
     variation_count = max(1, min(10, variation_count))
 
     try:
-        tpl_path = os.path.join(os.path.dirname(__file__), "data", "design_templates.json")
-        with open(tpl_path) as fh:
-            templates = json.load(fh)
-
-        tpl = templates.get(template_id)
+        store = get_template_store()
+        tpl = store.get(template_id)
         if not tpl:
-            available = [k for k in templates if not k.startswith("_")]
+            available = store.ids()
             return _error_dict(
                 f"Unknown template '{template_id}'. Available: {available}",
                 code="UNKNOWN_TEMPLATE",
@@ -10174,16 +10180,14 @@ def design_advisor(prompt: str, printer_model: str = "") -> dict:
     :param printer_model: Optional printer model for constraints.
     :returns: Dict with recommendations.
     """
-    import json
+    from kiln.template_store import get_template_store
 
     prompt_lower = prompt.lower()
     recommendations: dict[str, Any] = {"prompt": prompt}
 
     # Check for template matches
     try:
-        tpl_path = os.path.join(os.path.dirname(__file__), "data", "design_templates.json")
-        with open(tpl_path) as fh:
-            templates = json.load(fh)
+        store = get_template_store()
 
         matching_templates: list[dict[str, str]] = []
         template_keywords: dict[str, list[str]] = {
@@ -10197,7 +10201,7 @@ def design_advisor(prompt: str, printer_model: str = "") -> dict:
 
         for tid, keywords in template_keywords.items():
             if any(kw in prompt_lower for kw in keywords):
-                tpl = templates.get(tid, {})
+                tpl = store.get(tid) or {}
                 matching_templates.append({
                     "template_id": tid,
                     "display_name": tpl.get("display_name", tid),
@@ -14172,6 +14176,14 @@ def main() -> None:
         logger.warning(msg)
         print(f"\n  ⚠  {msg}\n", file=sys.stderr)
 
+    # Optional Prometheus exporter -- stdio mode has no HTTP app to serve /metrics.
+    metrics_port = os.environ.get("KILN_METRICS_PORT", "").strip()
+    if metrics_port:
+        try:
+            start_metrics_server(int(metrics_port), host=os.environ.get("KILN_METRICS_HOST", "127.0.0.1"))
+        except (ValueError, OSError) as exc:
+            logger.warning("Could not start metrics exporter on port %r: %s", metrics_port, exc)
+
     # Start background services
     _scheduler.start()
     _webhook_mgr.start()
@@ -0,0 +1,295 @@
+"""Content-addressed cache of sliced G-code.
+
+Slicing the same model with the same profile produces the same G-code, yet
+``quick_print``, ``reslice_and_print`` and benchmark runs used to shell out
+to the slicer every time.  This cache stores the output keyed by:
+
+* SHA-256 of the input model's bytes,
+* SHA-256 of the profile file's bytes (not its path, so an edited profile
+  misses and a copied one hits),
+* slicer name and version string,
+* the extra CLI arguments, in order.
+
+Entries live under ``<design cache dir>/sliced/<key[:2]>/<key>.gcode``
+(``KILN_SLICE_CACHE_DIR`` overrides the location) next to a small JSON
+sidecar.  Writes are atomic (temp file + ``os.replace``) so concurrent
+slicers never see a half-written entry.  Total size is capped; the least
+recently used entries are evicted first.
+
+Usage::
+
+    from kiln.slice_cache import get_slice_cache, slice_cache_key
+
+    cache = get_slice_cache()
+    key = slice_cache_key("part.stl", profile="pla.ini", slicer="prusa-slicer 2.7.1")
+    cached = cache.get(key)              # path to G-code, or None
+    if cached is None:
+        ...                              # slice to out.gcode
+        cache.put(key, "out.gcode")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from kiln.design_cache import _DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Default cap on the total size of cached G-code.
+_DEFAULT_MAX_BYTES = 2 * 1024**3
+
+_HASH_CHUNK = 1 << 20
+
+# Bumped when the key derivation changes so stale entries simply miss.
+_KEY_VERSION = "1"
+
+
+def _default_cache_dir() -> str:
+    explicit = os.environ.get("KILN_SLICE_CACHE_DIR")
+    if explicit:
+        return explicit
+    return os.path.join(os.environ.get("KILN_CACHE_DIR", _DEFAULT_CACHE_DIR), "sliced")
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def slice_cache_key(
+    input_path: str,
+    *,
+    profile: str | None = None,
+    slicer: str = "",
+    extra_args: Sequence[str] | None = None,
+) -> str:
+    """Derive the cache key for one slicing invocation.
+
+    :param input_path: Model file to slice.
+    :param profile: Slicer profile file, hashed by content.
+    :param slicer: Slicer identity, e.g. ``"prusa-slicer 2.7.1"``.
+    :param extra_args: Additional CLI arguments passed to the slicer.
+    :raises OSError: If the input or profile cannot be read.
+    """
+    parts = [
+        _KEY_VERSION,
+        _sha256_file(input_path),
+        _sha256_file(profile) if profile else "",
+        slicer,
+        *(extra_args or ()),
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SliceCacheStats:
+    """Hit/miss counters and current footprint of a :class:`SliceCache`.
+
+    :param hits: Lookups that found an entry.
+    :param misses: Lookups that did not.
+    :param entries: Number of cached G-code files.
+    :param total_bytes: Combined size of cached G-code files.
+    :param evictions: Entries removed to stay under the size cap.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    total_bytes: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SliceCache:
+    """On-disk, content-addressed store of sliced G-code.
+
+    :param cache_dir: Root directory.  Defaults to ``KILN_SLICE_CACHE_DIR``
+        or ``<KILN_CACHE_DIR>/sliced``.
+    :param max_bytes: Size cap across all entries; least recently used
+        entries are evicted once it is exceeded.
+    """
+
+    def __init__(self, cache_dir: str | None = None, *, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self._cache_dir = cache_dir or _default_cache_dir()
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def cache_dir(self) -> str:
+        """Root directory of the cache."""
+        return self._cache_dir
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key[:2], f"{key}.gcode")
+
+    def get(self, key: str) -> str | None:
+        """Return the cached G-code path for *key*, or ``None`` on a miss."""
+        path = self._entry_path(key)
+        try:
+            # Refresh mtime so eviction treats this entry as recently used.
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return path
+
+    def get_metadata(self, key: str) -> dict[str, Any]:
+        """Return the sidecar metadata stored with *key* (empty if none)."""
+        try:
+            with open(self._entry_path(key)[: -len(".gcode")] + ".json", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def put(self, key: str, gcode_path: str, metadata: dict[str, Any] | None = None) -> str:
+        """Copy *gcode_path* into the cache under *key*.
+
+        :returns: Path of the cached copy.
+        :raises OSError: If the file cannot be copied.
+        """
+        dest = self._entry_path(key)
+        directory = os.path.dirname(dest)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, open(gcode_path, "rb") as src:
+                shutil.copyfileobj(src, out, _HASH_CHUNK)
+            os.replace(tmp, dest)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+        sidecar = dict(metadata or {})
+        sidecar.setdefault("cached_at", time.time())
+        with contextlib.suppress(OSError):
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(sidecar, fh)
+            os.replace(tmp, dest[: -len(".gcode")] + ".json")
+
+        self._evict(keep=dest)
+        return dest
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries: list[tuple[float, int, str]] = []
+        if not os.path.isdir(self._cache_dir):
+            return entries
+        for bucket in os.scandir(self._cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if not entry.name.endswith(".gcode"):
+                    continue
+                with contextlib.suppress(OSError):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def _evict(self, *, keep: str) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self._max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+                total -= size
+                with self._lock:
+                    self._evictions += 1
+            with contextlib.suppress(OSError):
+                os.unlink(path[: -len(".gcode")] + ".json")
+
+    def clear(self) -> int:
+        """Delete every cached entry.  Returns the number removed."""
+        removed = 0
+        for _, _, path in self._entries():
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+                removed += 1
+            with contextlib.suppress(OSError):
+                os.unlink(path[: -len(".gcode")] + ".json")
+        return removed
+
+    def stats(self) -> SliceCacheStats:
+        """Return hit/miss counters and the current on-disk footprint."""
+        entries = self._entries()
+        with self._lock:
+            return SliceCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(entries),
+                total_bytes=sum(size for _, size, _ in entries),
+                evictions=self._evictions,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_slice_cache: SliceCache | None = None
+_slice_cache_lock = threading.Lock()
+
+
+def get_slice_cache() -> SliceCache:
+    """Return the process-wide :class:`SliceCache`."""
+    global _slice_cache
+    if _slice_cache is None:
+        with _slice_cache_lock:
+            if _slice_cache is None:
+                _slice_cache = SliceCache()
+    return _slice_cache
+
+
+def _reset_slice_cache() -> None:
+    """Drop the singleton so the next call re-reads the environment (tests)."""
+    global _slice_cache
+    with _slice_cache_lock:
+        _slice_cache = None
+
+
+__all__ = [
+    "SliceCache",
+    "SliceCacheStats",
+    "get_slice_cache",
+    "slice_cache_key",
+]
@@ -0,0 +1,303 @@
+"""Bounded worker pool for slicing several plates in parallel.
+
+Each slicer process is single-model and mostly CPU bound, but a fleet job
+often needs several plates (one per printer, or one per split part).  The
+pool runs up to N :func:`kiln.slicer.slice_file` calls at once, where N is
+derived from the CPU count and physical memory (a slicer can use well over
+a gigabyte on dense models) unless ``KILN_SLICE_WORKERS`` or
+``max_workers`` says otherwise.  Further submissions queue.
+
+Every submission returns a :class:`SliceJob` that records queue wait and
+run time.  Queued jobs can be cancelled; jobs already handed to the slicer
+run to completion (or their own ``timeout``).  Jobs go through the slice
+cache by default, so re-slicing an identical plate is a file copy.
+
+Usage::
+
+    from kiln.slice_pool import get_slice_pool
+
+    pool = get_slice_pool()
+    jobs = [
+        pool.submit("bracket.stl", profile="mk4.ini", output_dir="/tmp/mk4"),
+        pool.submit("bracket.stl", profile="x1c.ini", output_dir="/tmp/x1c"),
+    ]
+    for job in pool.wait(jobs):
+        print(job.status, job.run_seconds, job.result.output_path)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as _wait_futures
+from dataclasses import dataclass, field
+from typing import Any
+
+from kiln.slicer import SliceResult, slice_file
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Rough peak resident size of one slicer process on a large plate.
+_MEMORY_PER_SLICER_BYTES = 1536 * 1024**2
+
+# Upper bound on automatically sized pools.
+_MAX_AUTO_WORKERS = 8
+
+# Finished jobs kept for get_job()/list_jobs() before the oldest are dropped.
+_MAX_JOB_HISTORY = 200
+
+# Job states.
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def _physical_memory_bytes() -> int | None:
+    with contextlib.suppress(AttributeError, ValueError, OSError):
+        pages = os.sysconf("SC_PHYS_PAGES")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        if pages > 0 and page_size > 0:
+            return pages * page_size
+    return None
+
+
+def default_worker_count() -> int:
+    """Number of concurrent slicers this machine can sustain.
+
+    ``KILN_SLICE_WORKERS`` wins when set.  Otherwise the smaller of the CPU
+    count and physical memory divided by a per-slicer budget, capped at 8.
+    """
+    env = os.environ.get("KILN_SLICE_WORKERS")
+    if env:
+        with contextlib.suppress(ValueError):
+            return max(1, int(env))
+    workers = os.cpu_count() or 1
+    memory = _physical_memory_bytes()
+    if memory is not None:
+        workers = min(workers, memory // _MEMORY_PER_SLICER_BYTES)
+    return max(1, min(workers, _MAX_AUTO_WORKERS))
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SliceJob:
+    """One slicing request submitted to a :class:`SlicePool`.
+
+    :param id: Opaque job identifier.
+    :param input_path: Model being sliced.
+    :param status: One of ``queued``, ``running``, ``completed``,
+        ``failed`` or ``cancelled``.
+    :param submitted_at: Wall-clock submission time.
+    :param started_at: When a worker picked the job up.
+    :param finished_at: When the job completed, failed or was cancelled.
+    :param result: The :class:`~kiln.slicer.SliceResult` on success.
+    :param error: Error message on failure.
+    """
+
+    id: str
+    input_path: str
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: SliceResult | None = None
+    error: str | None = None
+    _future: Future[SliceResult] | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, FAILED, CANCELLED)
+
+    @property
+    def wait_seconds(self) -> float | None:
+        """Time spent queued before a worker started the job."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_seconds(self) -> float | None:
+        """Time the slicer (or cache lookup) took."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "input_path": self.input_path,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_seconds": self.wait_seconds,
+            "run_seconds": self.run_seconds,
+            "result": self.result.to_dict() if self.result else None,
+            "error": self.error,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+
+class SlicePool:
+    """Fixed-size pool of slicer workers with a FIFO queue.
+
+    :param max_workers: Concurrent slicer processes.  Defaults to
+        :func:`default_worker_count`.
+    :param slice_fn: Slicing callable, ``slice_file`` by default.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        slice_fn: Callable[..., SliceResult] | None = None,
+    ) -> None:
+        self._max_workers = max(1, max_workers) if max_workers is not None else default_worker_count()
+        self._slice_fn = slice_fn or slice_file
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="kiln-slice")
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, SliceJob] = OrderedDict()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def submit(self, input_path: str, *, use_cache: bool = True, **slice_kwargs: Any) -> SliceJob:
+        """Queue *input_path* for slicing.
+
+        Keyword arguments are passed through to ``slice_file``.
+
+        :raises RuntimeError: If the pool has been shut down.
+        """
+        job = SliceJob(id=secrets.token_hex(6), input_path=input_path)
+        kwargs = {"use_cache": use_cache, **slice_kwargs}
+        job._future = self._executor.submit(self._run, job, kwargs)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_history()
+        job._future.add_done_callback(lambda fut, job=job: self._on_done(job, fut))
+        return job
+
+    def _run(self, job: SliceJob, kwargs: dict[str, Any]) -> SliceResult:
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+        # Record the outcome before the future resolves so wait() callers
+        # always observe the final status.
+        try:
+            result = self._slice_fn(job.input_path, **kwargs)
+        except Exception as exc:
+            with self._lock:
+                job.finished_at = time.time()
+                job.status = FAILED
+                job.error = str(exc) or type(exc).__name__
+            logger.warning("Slice job %s failed: %s", job.id, job.error)
+            raise
+        with self._lock:
+            job.finished_at = time.time()
+            job.status = COMPLETED
+            job.result = result
+        return result
+
+    def _on_done(self, job: SliceJob, future: Future[SliceResult]) -> None:
+        if not future.cancelled():
+            return
+        with self._lock:
+            job.finished_at = time.time()
+            job.status = CANCELLED
+
+    def _trim_history(self) -> None:
+        # Caller holds the lock.
+        excess = len(self._jobs) - _MAX_JOB_HISTORY
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.done][:excess]:
+            del self._jobs[job_id]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job.  Returns ``False`` if it already started."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job._future is None:
+            return False
+        return job._future.cancel()
+
+    def get_job(self, job_id: str) -> SliceJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[SliceJob]:
+        """All tracked jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, jobs: Iterable[SliceJob], *, timeout: float | None = None) -> list[SliceJob]:
+        """Block until every job in *jobs* is done or *timeout* elapses."""
+        jobs = list(jobs)
+        _wait_futures([job._future for job in jobs if job._future is not None], timeout=timeout)
+        return jobs
+
+    def shutdown(self, *, wait: bool = True, cancel_pending: bool = False) -> None:
+        """Stop accepting jobs; optionally cancel anything still queued."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+_slice_pool: SlicePool | None = None
+_slice_pool_lock = threading.Lock()
+
+
+def get_slice_pool() -> SlicePool:
+    """Return the process-wide :class:`SlicePool`."""
+    global _slice_pool
+    if _slice_pool is None:
+        with _slice_pool_lock:
+            if _slice_pool is None:
+                _slice_pool = SlicePool()
+    return _slice_pool
+
+
+def _reset_slice_pool() -> None:
+    """Shut down and drop the singleton (tests)."""
+    global _slice_pool
+    with _slice_pool_lock:
+        pool, _slice_pool = _slice_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_pending=True)
+
+
+__all__ = [
+    "CANCELLED",
+    "COMPLETED",
+    "FAILED",
+    "QUEUED",
+    "RUNNING",
+    "SliceJob",
+    "SlicePool",
+    "default_worker_count",
+    "get_slice_pool",
+]
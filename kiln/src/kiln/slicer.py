@@ -28,6 +28,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -111,6 +112,8 @@ class SliceResult:
     message: str = ""
     stdout: str = ""
     stderr: str = ""
+    cached: bool = False
+    duration_seconds: float | None = None
 
     def to_dict(self) -> dict:
         d = {
@@ -118,6 +121,8 @@ class SliceResult:
             "output_path": self.output_path,
             "slicer": self.slicer,
             "message": self.message,
+            "cached": self.cached,
+            "duration_seconds": self.duration_seconds,
         }
         if self.stderr:
             d["stderr"] = self.stderr[:500]
@@ -212,6 +217,7 @@ def slice_file(
     slicer_path: str | None = None,
     extra_args: list[str] | None = None,
     timeout: int = 300,
+    use_cache: bool = False,
 ) -> SliceResult:
     """Slice a 3D model file to G-code.
 
@@ -225,6 +231,9 @@ def slice_file(
         slicer_path: Explicit slicer binary path.  Auto-detected if omitted.
         extra_args: Additional CLI arguments to pass to the slicer.
         timeout: Maximum slicing time in seconds (default 300).
+        use_cache: Reuse G-code from :mod:`kiln.slice_cache` when the same
+            model, profile contents, slicer version and arguments were
+            sliced before, and store fresh output there otherwise.
 
     Returns:
         A :class:`SliceResult` with the path to the generated G-code.
@@ -283,7 +292,36 @@ def slice_file(
     if extra_args:
         cmd.extend(extra_args)
 
+    cache_key: str | None = None
+    if use_cache:
+        from kiln.slice_cache import get_slice_cache, slice_cache_key
+
+        started = time.monotonic()
+        cache = get_slice_cache()
+        try:
+            cache_key = slice_cache_key(
+                input_abs,
+                profile=profile,
+                slicer=f"{slicer.name} {slicer.version or ''}".strip(),
+                extra_args=extra_args,
+            )
+            cached_path = cache.get(cache_key)
+            if cached_path is not None:
+                shutil.copyfile(cached_path, out_file)
+                return SliceResult(
+                    success=True,
+                    output_path=out_file,
+                    slicer=slicer.name,
+                    message=f"Sliced {Path(input_abs).name} -> {Path(out_file).name} (cached)",
+                    cached=True,
+                    duration_seconds=time.monotonic() - started,
+                )
+        except OSError as exc:
+            logger.warning("Slice cache unavailable, slicing normally: %s", exc)
+            cache_key = None
+
     logger.info("Slicing: %s", " ".join(cmd))
+    started = time.monotonic()
 
     # Run
     try:
@@ -313,6 +351,17 @@ def slice_file(
             f"Slicer completed but output file was not created. "
             f"stdout: {(result.stdout or '').strip()[:200]}"
         )
+    duration = time.monotonic() - started
+
+    if cache_key is not None:
+        try:
+            get_slice_cache().put(
+                cache_key,
+                out_file,
+                {"slicer": slicer.name, "version": slicer.version, "input": Path(input_abs).name},
+            )
+        except OSError as exc:
+            logger.warning("Failed to store sliced G-code in cache: %s", exc)
 
     return SliceResult(
         success=True,
@@ -321,6 +370,7 @@ def slice_file(
         message=f"Sliced {Path(input_abs).name} -> {Path(out_file).name}",
         stdout=(result.stdout or "").strip(),
         stderr=(result.stderr or "").strip(),
+        duration_seconds=duration,
     )
 
 
@@ -357,24 +407,18 @@ def estimate_print(
 def _parse_gcode_estimates(gcode_path: str) -> dict[str, Any]:
     """Parse G-code file for slicer-generated estimates.
 
-    Reads the first and last 200 lines (where PrusaSlicer/OrcaSlicer
-    place their estimate comments) to avoid reading the entire file.
+    Looks at the first and last 200 lines (where PrusaSlicer/OrcaSlicer
+    place their estimate comments), taken from the shared streaming pass
+    in :mod:`kiln.gcode_stats` so the file is never held in memory.
     """
     import re as _re
 
+    from kiln.gcode_stats import get_gcode_stats
+
     estimates: dict[str, Any] = {"gcode_path": gcode_path}
-    lines: list[str] = []
 
     try:
-        with open(gcode_path, errors="replace") as fh:
-            head = []
-            for i, line in enumerate(fh):
-                if i < 200:
-                    head.append(line)
-                lines.append(line)
-            # Keep last 200 lines
-            tail = lines[-200:] if len(lines) > 200 else []
-            search_lines = head + tail
+        search_lines = get_gcode_stats(gcode_path).boundary_lines()
     except OSError:
         return estimates
 
@@ -0,0 +1,464 @@
+"""In-memory, indexed store for parametric design templates.
+
+``data/design_templates.json`` is read by template search, parameter
+optimisation, constraint solving, and several MCP tools.  Rather than
+re-parsing the file on every call, this module loads it once, builds an
+inverted token index over each template's ID, display name, tags,
+category, description, and parameter names, and reloads automatically
+when the file's mtime or size changes on disk.
+
+Search uses BM25 ranking with field boosts, plus prefix expansion
+(``"brack"`` → ``"bracket"``) and single-edit fuzzy matching
+(``"hoook"`` → ``"hook"``) for query tokens that are not in the
+vocabulary.  Fuzzy candidates come from a deletion-neighbourhood index,
+so lookups stay sub-millisecond as the template library grows.
+
+Usage::
+
+    from kiln.template_store import get_template_store
+
+    store = get_template_store()
+    tpl = store.get("phone_stand")
+    for match in store.search("wall hook", limit=5):
+        print(match.template_id, match.score)
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import json
+import logging
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = Path(__file__).resolve().parent / "data" / "design_templates.json"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Per-field term-frequency boosts (BM25F-style).  Identity fields count
+# for more than free-text description.
+_FIELD_BOOSTS: dict[str, float] = {
+    "id": 3.0,
+    "name": 3.0,
+    "tags": 2.0,
+    "category": 1.5,
+    "parameters": 1.0,
+    "description": 1.0,
+}
+
+# Weight applied to a query token's contribution when it only matched
+# via expansion rather than exactly.
+_PREFIX_WEIGHT = 0.7
+_FUZZY_WEIGHT = 0.5
+
+# Expansion limits: short tokens expand to too much of the vocabulary.
+_MIN_PREFIX_LEN = 3
+_MIN_FUZZY_LEN = 4
+_MAX_PREFIX_EXPANSIONS = 25
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _deletes(term: str) -> set[str]:
+    """Return every string obtained by deleting one character of *term*."""
+    return {term[:i] + term[i + 1 :] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Return ``True`` if *a* and *b* differ by at most one edit.
+
+    Edits are insertion, deletion, substitution, or an adjacent
+    transposition.
+    """
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diffs = [i for i in range(la) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]]
+            and a[diffs[1]] == b[diffs[0]]
+        )
+    if la > lb:
+        a, b = b, a
+    # b is one character longer than a.
+    for i in range(len(a)):
+        if a[i] != b[i]:
+            return a[i:] == b[i + 1 :]
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Data model
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TemplateMatch:
+    """A single ranked template search hit.
+
+    :param template_id: Template key in ``design_templates.json``.
+    :param score: Normalised relevance in ``(0, 1]``.
+    :param description: Template description.
+    :param category: Template category.
+    :param matched_terms: Vocabulary terms that contributed to the score.
+    """
+
+    template_id: str
+    score: float
+    description: str = ""
+    category: str = ""
+    matched_terms: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialise to a plain dict suitable for JSON output."""
+        return asdict(self)
+
+
+class _TemplateIndex:
+    """Immutable snapshot of the templates plus their inverted index."""
+
+    def __init__(self, raw: dict[str, Any], *, k1: float, b: float) -> None:
+        self.meta: dict[str, Any] = raw.get("_meta", {}) if isinstance(raw.get("_meta"), dict) else {}
+        self.templates: dict[str, dict[str, Any]] = {
+            k: v for k, v in raw.items() if not k.startswith("_") and isinstance(v, dict)
+        }
+        self.ids: list[str] = list(self.templates)
+        self.k1 = k1
+        self.b = b
+
+        # term -> {doc_idx: boosted term frequency}
+        postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self.doc_lengths: list[float] = []
+        for doc_idx, tid in enumerate(self.ids):
+            length = 0.0
+            for field_name, text in self._fields(tid, self.templates[tid]).items():
+                boost = _FIELD_BOOSTS[field_name]
+                for term in _tokenize(text):
+                    bucket = postings[term]
+                    bucket[doc_idx] = bucket.get(doc_idx, 0.0) + boost
+                    length += boost
+            self.doc_lengths.append(length)
+
+        self.postings: dict[str, dict[int, float]] = dict(postings)
+        n_docs = len(self.ids)
+        self.avg_doc_length = (sum(self.doc_lengths) / n_docs) if n_docs else 0.0
+        self.idf: dict[str, float] = {
+            term: math.log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+        # Upper bound on any term's IDF; used to normalise scores and to
+        # penalise query tokens that match nothing.
+        self.max_idf = math.log(1.0 + (n_docs + 0.5) / 0.5) if n_docs else 0.0
+
+        self.vocabulary: list[str] = sorted(self.postings)
+        deletions: dict[str, list[str]] = defaultdict(list)
+        for term in self.vocabulary:
+            if len(term) >= _MIN_FUZZY_LEN - 1:
+                for variant in _deletes(term):
+                    deletions[variant].append(term)
+        self.deletions: dict[str, list[str]] = dict(deletions)
+
+    @staticmethod
+    def _fields(tid: str, tpl: dict[str, Any]) -> dict[str, str]:
+        tags = tpl.get("tags", [])
+        params = tpl.get("parameters", {})
+        return {
+            "id": tid.replace("_", " "),
+            "name": str(tpl.get("display_name", "")),
+            "tags": " ".join(str(t) for t in tags) if isinstance(tags, list) else "",
+            "category": str(tpl.get("category", "")).replace("_", " "),
+            "parameters": " ".join(p.replace("_", " ") for p in params) if isinstance(params, dict) else "",
+            "description": str(tpl.get("description", "")),
+        }
+
+    def expand(self, token: str) -> list[tuple[str, float]]:
+        """Map a query token to ``(vocabulary term, weight)`` pairs."""
+        expansions: dict[str, float] = {}
+        if token in self.postings:
+            expansions[token] = 1.0
+
+        if len(token) >= _MIN_PREFIX_LEN:
+            start = bisect.bisect_left(self.vocabulary, token)
+            count = 0
+            for pos in range(start, len(self.vocabulary)):
+                term = self.vocabulary[pos]
+                if not term.startswith(token) or count >= _MAX_PREFIX_EXPANSIONS:
+                    break
+                if term != token:
+                    expansions.setdefault(term, _PREFIX_WEIGHT)
+                    count += 1
+
+        if token not in self.postings and len(token) >= _MIN_FUZZY_LEN:
+            candidates: set[str] = set(self.deletions.get(token, ()))
+            for variant in _deletes(token):
+                if variant in self.postings:
+                    candidates.add(variant)
+                candidates.update(self.deletions.get(variant, ()))
+            for term in candidates:
+                if term not in expansions and _within_one_edit(token, term):
+                    expansions[term] = _FUZZY_WEIGHT
+
+        return list(expansions.items())
+
+    def term_score(self, term: str, doc_idx: int, tf: float) -> float:
+        norm = 1.0 - self.b + self.b * (self.doc_lengths[doc_idx] / self.avg_doc_length)
+        return self.idf[term] * (tf * (self.k1 + 1.0)) / (tf + self.k1 * norm)
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class TemplateStore:
+    """Load-once, mtime-invalidated design template repository.
+
+    Thread-safe: the index is rebuilt under a lock and swapped in as a
+    single immutable snapshot, so readers never observe a partial index.
+
+    :param path: Path to the templates JSON.  Defaults to the bundled
+        ``data/design_templates.json``.
+    :param k1: BM25 term-frequency saturation parameter.
+    :param b: BM25 document-length normalisation parameter.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self._path = Path(path) if path is not None else _DEFAULT_PATH
+        self._k1 = k1
+        self._b = b
+        self._lock = threading.Lock()
+        self._index: _TemplateIndex | None = None
+        self._signature: tuple[int, int] | None = None
+
+    @property
+    def path(self) -> Path:
+        """Path of the backing JSON file."""
+        return self._path
+
+    def exists(self) -> bool:
+        """Return ``True`` if the backing file is present."""
+        return self._path.is_file()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            st = self._path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _snapshot(self) -> _TemplateIndex:
+        """Return the current index, reloading if the file changed."""
+        signature = self._file_signature()
+        index = self._index
+        if index is not None and signature == self._signature:
+            return index
+
+        with self._lock:
+            if self._index is not None and signature == self._signature:
+                return self._index
+            raw: dict[str, Any] = {}
+            if signature is not None:
+                try:
+                    with open(self._path, encoding="utf-8") as fh:
+                        loaded = json.load(fh)
+                    if isinstance(loaded, dict):
+                        raw = loaded
+                    else:
+                        logger.warning("Template file %s is not a JSON object; ignoring", self._path)
+                except (OSError, json.JSONDecodeError) as exc:
+                    logger.warning("Failed to load design templates from %s: %s", self._path, exc)
+            self._index = _TemplateIndex(raw, k1=self._k1, b=self._b)
+            self._signature = signature
+            logger.debug(
+                "Indexed %d design templates (%d terms) from %s",
+                len(self._index.ids),
+                len(self._index.vocabulary),
+                self._path,
+            )
+            return self._index
+
+    def invalidate(self) -> None:
+        """Drop the cached index so the next access reloads from disk."""
+        with self._lock:
+            self._index = None
+            self._signature = None
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, template_id: str) -> dict[str, Any] | None:
+        """Return the template dict for *template_id*, or ``None``.
+
+        Keys starting with ``_`` (such as ``_meta``) are never returned.
+        The dict is shared with the store and must not be mutated.
+        """
+        return self._snapshot().templates.get(template_id)
+
+    def ids(self) -> list[str]:
+        """Return all template IDs in file order."""
+        return list(self._snapshot().ids)
+
+    def templates(self) -> dict[str, dict[str, Any]]:
+        """Return a ``{template_id: template}`` mapping in file order."""
+        return dict(self._snapshot().templates)
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        """The file's ``_meta`` block, if any."""
+        return dict(self._snapshot().meta)
+
+    def __len__(self) -> int:
+        return len(self._snapshot().ids)
+
+    def __contains__(self, template_id: object) -> bool:
+        return isinstance(template_id, str) and template_id in self._snapshot().templates
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        category: str = "",
+        fuzzy: bool = True,
+    ) -> list[TemplateMatch]:
+        """Rank templates against a free-text query.
+
+        Each query token contributes its best BM25 score across its exact,
+        prefix, and (optionally) fuzzy expansions.  Scores are normalised
+        by the best achievable score for the query so they fall in
+        ``(0, 1]``; a query token that matches nothing lowers every
+        template's score.
+
+        :param query: Free-text search string.
+        :param limit: Maximum number of matches to return.
+        :param category: If set, only templates in this category match.
+        :param fuzzy: Enable prefix and single-edit fuzzy expansion.
+        :returns: Matches sorted by descending score, then template ID.
+        """
+        index = self._snapshot()
+        tokens = _tokenize(query)
+        if not tokens or not index.ids or limit <= 0:
+            return []
+
+        scores: dict[int, float] = defaultdict(float)
+        matched: dict[int, list[str]] = defaultdict(list)
+        max_possible = 0.0
+
+        for token in tokens:
+            if fuzzy:
+                expansions = index.expand(token)
+            else:
+                expansions = [(token, 1.0)] if token in index.postings else []
+            if not expansions:
+                max_possible += index.max_idf * (index.k1 + 1.0)
+                continue
+
+            # Expansions are down-weighted, so a typo or prefix can never
+            # score as well as the exact term would have.
+            max_possible += max(index.idf[t] for t, _ in expansions) * (index.k1 + 1.0)
+            best: dict[int, tuple[float, str]] = {}
+            for term, weight in expansions:
+                for doc_idx, tf in index.postings[term].items():
+                    s = weight * index.term_score(term, doc_idx, tf)
+                    if doc_idx not in best or s > best[doc_idx][0]:
+                        best[doc_idx] = (s, term)
+            for doc_idx, (s, term) in best.items():
+                scores[doc_idx] += s
+                if term not in matched[doc_idx]:
+                    matched[doc_idx].append(term)
+
+        if not scores or max_possible <= 0:
+            return []
+
+        candidates = (
+            (s, index.ids[doc_idx], doc_idx)
+            for doc_idx, s in scores.items()
+            if not category or index.templates[index.ids[doc_idx]].get("category", "") == category
+        )
+        top = heapq.nsmallest(limit, candidates, key=lambda c: (-c[0], c[1]))
+
+        results: list[TemplateMatch] = []
+        for s, tid, doc_idx in top:
+            tpl = index.templates[tid]
+            results.append(
+                TemplateMatch(
+                    template_id=tid,
+                    score=round(min(1.0, s / max_possible), 3) or 0.001,
+                    description=tpl.get("description", ""),
+                    category=tpl.get("category", ""),
+                    matched_terms=matched[doc_idx],
+                )
+            )
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Module-level stores
+# ---------------------------------------------------------------------------
+
+_stores: dict[Path, TemplateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_template_store(path: str | Path | None = None) -> TemplateStore:
+    """Return the shared :class:`TemplateStore` for *path*.
+
+    One store is kept per resolved path, so callers that pass a custom
+    templates file also benefit from the cached index.
+
+    :param path: Templates JSON path, or ``None`` for the bundled file.
+    """
+    key = Path(path).resolve() if path is not None else _DEFAULT_PATH
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = TemplateStore(key)
+                _stores[key] = store
+    return store
+
+
+def _reset_template_stores() -> None:
+    """Drop all cached stores (for testing)."""
+    with _stores_lock:
+        _stores.clear()
+
+
+__all__ = [
+    "TemplateMatch",
+    "TemplateStore",
+    "get_template_store",
+]
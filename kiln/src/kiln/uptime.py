@@ -4,8 +4,12 @@ Tracks health check results over time and calculates rolling uptime
 percentages for SLA visibility. Integrates with the existing
 ``health_check()`` MCP tool infrastructure.
 
-Data is persisted to ``~/.kiln/uptime.json`` and rotated to keep
-only the last 30 days of history.
+Data is persisted to ``~/.kiln/uptime.jsonl`` as an append-only log: each
+check appends one line, and the log is periodically compacted so that
+checks older than a day are folded into per-hour rollup lines.  In memory
+the tracker keeps per-hour and per-minute buckets, so ``uptime_report``
+sums at most a few hundred buckets instead of scanning every check.
+Only the last 30 days of history are retained.
 
 Usage::
 
@@ -19,9 +23,14 @@ Usage::
 
 from __future__ import annotations
 
+import contextlib
 import json
 import logging
+import math
+import os
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -29,11 +38,24 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 _UPTIME_DIR = Path.home() / ".kiln"
-_UPTIME_FILE = _UPTIME_DIR / "uptime.json"
+_UPTIME_FILE = _UPTIME_DIR / "uptime.jsonl"
+# Pre-log format: one JSON document rewritten on every check.  Migrated
+# into the log the first time the default tracker starts.
+_LEGACY_UPTIME_FILE = _UPTIME_DIR / "uptime.json"
 
 # Retention: keep 30 days of check history.
 _RETENTION_SECONDS: float = 30 * 24 * 3600
 
+# Checks newer than this stay as raw log lines (and minute buckets);
+# older ones are folded into hourly rollups on compaction.
+_RAW_RETENTION_SECONDS: float = 24 * 3600
+
+# Compact the log after this many appends (one day of 30-second checks).
+_COMPACT_AFTER_APPENDS = 2880
+
+# Unhealthy checks remembered for ``recent_incidents``.
+_MAX_INCIDENTS = 100
+
 # Check intervals for rolling windows.
 _WINDOW_1H: float = 3600
 _WINDOW_24H: float = 86400
@@ -57,54 +79,234 @@ class HealthCheck:
     response_ms: float | None = None
     details: str | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "healthy": self.healthy,
+            "response_ms": self.response_ms,
+            "details": self.details,
+        }
+
+
+@dataclass
+class _Bucket:
+    """Aggregated check counts for one minute or hour."""
+
+    checks: int = 0
+    healthy: int = 0
+    timed: int = 0
+    response_ms_sum: float = 0.0
+
+    def add(self, other: _Bucket) -> None:
+        self.checks += other.checks
+        self.healthy += other.healthy
+        self.timed += other.timed
+        self.response_ms_sum += other.response_ms_sum
+
+    def add_check(self, check: HealthCheck) -> None:
+        self.checks += 1
+        if check.healthy:
+            self.healthy += 1
+        if check.response_ms is not None:
+            self.timed += 1
+            self.response_ms_sum += check.response_ms
+
 
 class UptimeTracker:
     """Tracks health check history and computes rolling uptime.
 
-    Persists checks to ``~/.kiln/uptime.json``. Old entries beyond
-    the retention window are pruned on save.
+    Appends each check to a JSONL log and compacts it every
+    ``_COMPACT_AFTER_APPENDS`` checks.  Window edges resolve to the minute
+    for the last day and to the hour beyond that: a check counts when its
+    whole minute (or folded hour) lies inside the window.
     """
 
     def __init__(self, *, data_file: Path | None = None) -> None:
         self._data_file = data_file or _UPTIME_FILE
-        self._checks: list[HealthCheck] = []
-        self._load()
+        self._lock = threading.Lock()
+        self._hours: dict[int, _Bucket] = {}
+        self._minutes: dict[int, _Bucket] = {}
+        self._recent: deque[HealthCheck] = deque()
+        self._incidents: deque[HealthCheck] = deque(maxlen=_MAX_INCIDENTS)
+        self._last_check: HealthCheck | None = None
+        self._appends_since_compaction = 0
+
+        legacy = _LEGACY_UPTIME_FILE if data_file is None else None
+        if legacy is not None and not self._data_file.exists() and legacy.exists():
+            if self._load(legacy):
+                self._compact()
+                with contextlib.suppress(OSError):
+                    legacy.unlink()
+        elif self._load(self._data_file):
+            self._compact()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _load(self, path: Path) -> bool:
+        """Replay a log (or legacy JSON document) into memory.
 
-    def _load(self) -> None:
-        """Load check history from disk."""
-        if not self._data_file.exists():
-            return
+        Returns:
+            ``True`` when the file should be rewritten: it was in the
+            legacy format, held expired entries, or is due for compaction.
+        """
+        if not path.exists():
+            return False
+        needs_compaction = False
+        cutoff = time.time() - _RETENTION_SECONDS
+        lines = 0
         try:
-            data = json.loads(self._data_file.read_text(encoding="utf-8"))
-            for entry in data.get("checks", []):
-                self._checks.append(HealthCheck(
-                    timestamp=entry["timestamp"],
-                    healthy=entry["healthy"],
-                    response_ms=entry.get("response_ms"),
-                    details=entry.get("details"),
-                ))
-        except (json.JSONDecodeError, OSError, KeyError) as exc:
+            with path.open(encoding="utf-8") as fh:
+                for raw in fh:
+                    raw = raw.strip()
+                    if not raw:
+                        continue
+                    lines += 1
+                    try:
+                        entry = json.loads(raw)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted append.
+                        needs_compaction = True
+                        continue
+                    if "checks" in entry and isinstance(entry["checks"], list):
+                        needs_compaction = True
+                        for legacy_check in entry["checks"]:
+                            needs_compaction |= not self._load_check(legacy_check, cutoff)
+                    elif "hour" in entry:
+                        needs_compaction |= not self._load_rollup(entry, cutoff)
+                    elif "incident" in entry:
+                        incident = _check_from_dict(entry["incident"])
+                        if incident.timestamp >= cutoff:
+                            self._incidents.append(incident)
+                    else:
+                        needs_compaction |= not self._load_check(entry, cutoff)
+        except (OSError, KeyError, TypeError, ValueError) as exc:
             logger.error("Failed to load uptime data: %s", exc)
+            return False
+        self._appends_since_compaction = len(self._recent)
+        return needs_compaction or lines > 2 * _COMPACT_AFTER_APPENDS
+
+    def _load_check(self, entry: dict[str, Any], cutoff: float) -> bool:
+        check = _check_from_dict(entry)
+        if check.timestamp < cutoff:
+            return False
+        self._ingest(check)
+        return True
+
+    def _load_rollup(self, entry: dict[str, Any], cutoff: float) -> bool:
+        hour = int(entry["hour"]) // 3600
+        if (hour + 1) * 3600 <= cutoff:
+            return False
+        self._hours.setdefault(hour, _Bucket()).add(
+            _Bucket(
+                checks=int(entry.get("checks", 0)),
+                healthy=int(entry.get("healthy", 0)),
+                timed=int(entry.get("timed", 0)),
+                response_ms_sum=float(entry.get("response_ms_sum", 0.0)),
+            )
+        )
+        return True
 
-    def _save(self) -> None:
-        """Persist check history, pruning old entries."""
-        cutoff = time.time() - _RETENTION_SECONDS
-        self._checks = [c for c in self._checks if c.timestamp >= cutoff]
+    def _append(self, check: HealthCheck) -> None:
+        """Append one check to the log."""
+        self._data_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._data_file.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(check.to_dict()) + "\n")
+
+    def _compact(self) -> None:
+        """Fold old raw checks into hourly rollups and rewrite the log.
+
+        Writes to a temporary file and renames it over the log, so a crash
+        mid-compaction leaves the previous log intact.
+        """
+        now = time.time()
+        self._prune(now)
+        boundary_hour = int(now - _RAW_RETENTION_SECONDS) // 3600
+        while self._recent and self._recent[0].timestamp // 3600 < boundary_hour:
+            self._recent.popleft()
+        for minute in [m for m in self._minutes if m // 60 < boundary_hour]:
+            del self._minutes[minute]
+
+        lines: list[str] = []
+        for hour in sorted(h for h in self._hours if h < boundary_hour):
+            bucket = self._hours[hour]
+            lines.append(
+                json.dumps(
+                    {
+                        "hour": hour * 3600,
+                        "checks": bucket.checks,
+                        "healthy": bucket.healthy,
+                        "timed": bucket.timed,
+                        "response_ms_sum": bucket.response_ms_sum,
+                    }
+                )
+            )
+        for incident in self._incidents:
+            if incident.timestamp // 3600 < boundary_hour:
+                lines.append(json.dumps({"incident": incident.to_dict()}))
+        for check in self._recent:
+            lines.append(json.dumps(check.to_dict()))
 
         self._data_file.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "checks": [
-                {
-                    "timestamp": c.timestamp,
-                    "healthy": c.healthy,
-                    "response_ms": c.response_ms,
-                    "details": c.details,
-                }
-                for c in self._checks
-            ],
-            "updated_at": time.time(),
-        }
-        self._data_file.write_text(json.dumps(data), encoding="utf-8")
+        tmp = self._data_file.with_name(self._data_file.name + ".tmp")
+        try:
+            tmp.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+            os.replace(tmp, self._data_file)
+        except OSError as exc:
+            logger.error("Failed to compact uptime log: %s", exc)
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+            return
+        self._appends_since_compaction = 0
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    def _ingest(self, check: HealthCheck) -> None:
+        """Fold one raw check into the in-memory buckets."""
+        self._hours.setdefault(int(check.timestamp // 3600), _Bucket()).add_check(check)
+        self._minutes.setdefault(int(check.timestamp // 60), _Bucket()).add_check(check)
+        self._recent.append(check)
+        if not check.healthy:
+            self._incidents.append(check)
+        if self._last_check is None or check.timestamp >= self._last_check.timestamp:
+            self._last_check = check
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets and checks that have left the retention window."""
+        cutoff = now - _RETENTION_SECONDS
+        first_hour = math.ceil(cutoff / 3600)
+        for hour in [h for h in self._hours if h < first_hour]:
+            del self._hours[hour]
+        first_minute = math.ceil(cutoff / 60)
+        for minute in [m for m in self._minutes if m < first_minute]:
+            del self._minutes[minute]
+        while self._recent and self._recent[0].timestamp < cutoff:
+            self._recent.popleft()
+        while self._incidents and self._incidents[0].timestamp < cutoff:
+            self._incidents.popleft()
+
+    def _window_totals(self, window_seconds: float, now: float) -> _Bucket:
+        """Sum the buckets lying inside ``[now - window_seconds, now]``."""
+        cutoff = now - window_seconds
+        totals = _Bucket()
+        first_full_hour = math.ceil(cutoff / 3600)
+        for hour in range(first_full_hour, int(now // 3600) + 1):
+            bucket = self._hours.get(hour)
+            if bucket is not None:
+                totals.add(bucket)
+        # Leading partial hour: whole minutes after the cutoff.
+        for minute in range(math.ceil(cutoff / 60), first_full_hour * 60):
+            bucket = self._minutes.get(minute)
+            if bucket is not None:
+                totals.add(bucket)
+        return totals
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     def record_check(
         self,
@@ -129,36 +331,28 @@ class UptimeTracker:
             response_ms=response_ms,
             details=details,
         )
-        self._checks.append(check)
-        self._save()
+        with self._lock:
+            self._ingest(check)
+            try:
+                self._append(check)
+            except OSError as exc:
+                logger.error("Failed to append uptime check: %s", exc)
+            self._appends_since_compaction += 1
+            if self._appends_since_compaction >= _COMPACT_AFTER_APPENDS:
+                self._compact()
         return check
 
-    def _uptime_for_window(self, window_seconds: float) -> float | None:
+    def _uptime_for_window(self, window_seconds: float, *, now: float | None = None) -> float | None:
         """Calculate uptime percentage for a time window.
 
         Returns:
             Percentage (0-100) or ``None`` if no checks in the window.
         """
-        cutoff = time.time() - window_seconds
-        window_checks = [c for c in self._checks if c.timestamp >= cutoff]
-
-        if not window_checks:
-            return None
+        return _uptime_pct(self._window_totals(window_seconds, time.time() if now is None else now))
 
-        healthy_count = sum(1 for c in window_checks if c.healthy)
-        return round((healthy_count / len(window_checks)) * 100, 4)
-
-    def _avg_response_ms(self, window_seconds: float) -> float | None:
+    def _avg_response_ms(self, window_seconds: float, *, now: float | None = None) -> float | None:
         """Average response time in a window (only checks with response_ms)."""
-        cutoff = time.time() - window_seconds
-        times = [
-            c.response_ms
-            for c in self._checks
-            if c.timestamp >= cutoff and c.response_ms is not None
-        ]
-        if not times:
-            return None
-        return round(sum(times) / len(times), 1)
+        return _avg_response(self._window_totals(window_seconds, time.time() if now is None else now))
 
     def uptime_report(self) -> dict[str, Any]:
         """Generate a comprehensive uptime report.
@@ -169,43 +363,43 @@ class UptimeTracker:
         """
         now = time.time()
 
-        # Rolling uptime for each window
-        uptime_1h = self._uptime_for_window(_WINDOW_1H)
-        uptime_24h = self._uptime_for_window(_WINDOW_24H)
-        uptime_7d = self._uptime_for_window(_WINDOW_7D)
-        uptime_30d = self._uptime_for_window(_WINDOW_30D)
-
-        # Total checks in each window
-        checks_24h = sum(1 for c in self._checks if c.timestamp >= now - _WINDOW_24H)
-        checks_7d = sum(1 for c in self._checks if c.timestamp >= now - _WINDOW_7D)
-        checks_30d = sum(1 for c in self._checks if c.timestamp >= now - _WINDOW_30D)
+        with self._lock:
+            self._prune(now)
+            windows = {
+                name: self._window_totals(seconds, now)
+                for name, seconds in (
+                    ("1h", _WINDOW_1H),
+                    ("24h", _WINDOW_24H),
+                    ("7d", _WINDOW_7D),
+                    ("30d", _WINDOW_30D),
+                )
+            }
+            total_checks = sum(b.checks for b in self._hours.values())
+            last = self._last_check
 
         # Last check
         last_check = None
-        if self._checks:
-            last = self._checks[-1]
+        if last is not None:
             last_check = {
-                "timestamp": last.timestamp,
-                "healthy": last.healthy,
-                "response_ms": last.response_ms,
-                "details": last.details,
+                **last.to_dict(),
                 "age_seconds": round(now - last.timestamp, 1),
             }
 
         # SLA status (99.9% threshold)
+        uptime_30d = _uptime_pct(windows["30d"])
         sla_met = uptime_30d is not None and uptime_30d >= 99.9
 
         return {
-            "uptime_1h": uptime_1h,
-            "uptime_24h": uptime_24h,
-            "uptime_7d": uptime_7d,
+            "uptime_1h": _uptime_pct(windows["1h"]),
+            "uptime_24h": _uptime_pct(windows["24h"]),
+            "uptime_7d": _uptime_pct(windows["7d"]),
             "uptime_30d": uptime_30d,
-            "avg_response_ms_24h": self._avg_response_ms(_WINDOW_24H),
-            "avg_response_ms_7d": self._avg_response_ms(_WINDOW_7D),
-            "checks_24h": checks_24h,
-            "checks_7d": checks_7d,
-            "checks_30d": checks_30d,
-            "total_checks": len(self._checks),
+            "avg_response_ms_24h": _avg_response(windows["24h"]),
+            "avg_response_ms_7d": _avg_response(windows["7d"]),
+            "checks_24h": windows["24h"].checks,
+            "checks_7d": windows["7d"].checks,
+            "checks_30d": windows["30d"].checks,
+            "total_checks": total_checks,
             "last_check": last_check,
             "sla_target": 99.9,
             "sla_met": sla_met,
@@ -216,21 +410,43 @@ class UptimeTracker:
         """Return recent unhealthy checks (incidents).
 
         Args:
-            limit: Max incidents to return.
+            limit: Max incidents to return (at most ``_MAX_INCIDENTS`` are
+                retained).
 
         Returns:
             List of incident dicts, newest first.
         """
-        incidents = [
+        with self._lock:
+            incidents = list(self._incidents)
+        return [
             {
                 "timestamp": c.timestamp,
                 "response_ms": c.response_ms,
                 "details": c.details,
             }
-            for c in reversed(self._checks)
-            if not c.healthy
-        ]
-        return incidents[:limit]
+            for c in reversed(incidents)
+        ][:limit]
+
+
+def _uptime_pct(totals: _Bucket) -> float | None:
+    if not totals.checks:
+        return None
+    return round((totals.healthy / totals.checks) * 100, 4)
+
+
+def _avg_response(totals: _Bucket) -> float | None:
+    if not totals.timed:
+        return None
+    return round(totals.response_ms_sum / totals.timed, 1)
+
+
+def _check_from_dict(entry: dict[str, Any]) -> HealthCheck:
+    return HealthCheck(
+        timestamp=float(entry["timestamp"]),
+        healthy=bool(entry["healthy"]),
+        response_ms=entry.get("response_ms"),
+        details=entry.get("details"),
+    )
 
 
 # ---------------------------------------------------------------------------
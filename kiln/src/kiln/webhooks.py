@@ -4,8 +4,15 @@ Allows users and integrations to register HTTP endpoints that receive
 POST requests whenever certain events occur (job completed, print failed,
 temperature warning, etc.).
 
-Delivery is best-effort with configurable retries. Failed deliveries
-are logged but do not block the event pipeline.
+Delivery is best-effort with configurable retries.  Each endpoint has
+its own delivery lane drained by a shared worker pool, so one slow or
+dead endpoint does not hold up the others.  Failed attempts are retried
+from a delay queue with exponential backoff and jitter, and HTTP
+connections are kept alive per host.  Queued progress events can be
+coalesced, and endpoints can opt into batched payloads.  Deliveries that
+exhaust their retries go to a dead-letter queue (persisted in
+:class:`~kiln.persistence.KilnDB` when one is given) that can be
+replayed.
 
 Example::
 
@@ -16,27 +23,36 @@ Example::
         secret="my-signing-secret",
     )
     hooks.start()  # begins listening and delivering
+
+    # Later: re-send deliveries that failed all retries.
+    hooks.replay_dead_letters()
 """
 
 from __future__ import annotations
 
 import copy
 import hashlib
+import heapq
 import hmac
 import ipaddress
+import itertools
 import json
 import logging
 import os
-import queue
+import random
 import socket
 import threading
 import time
 import urllib.parse
 import uuid
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from typing import Any
 
-from kiln.events import Event, EventBus
+from kiln.events import Event, EventBus, EventType
+from kiln.metrics import WEBHOOK_DELIVERY_LAG
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +84,26 @@ _BLOCKED_NETWORKS = [
 _REDIRECT_STATUS_CODES = {301, 302, 303, 307, 308}
 _MAX_REDIRECT_HOPS_DEFAULT = 3
 
+# ---------------------------------------------------------------------------
+# Delivery tuning
+# ---------------------------------------------------------------------------
+
+# Shared delivery workers (override with KILN_WEBHOOK_WORKERS).
+_DEFAULT_WORKERS = 4
+
+# Queued deliveries per endpoint before new events are dropped.
+_MAX_LANE_DEPTH = 1000
+
+# Deliveries a worker sends from one lane before yielding to other lanes.
+_LANE_QUANTUM = 16
+
+# Keep-alive connections per host, and hosts with a pooled session.
+_SESSION_POOL_SIZE = 4
+_MAX_SESSIONS = 64
+
+# Event types where only the newest queued event per job matters.
+_COALESCIBLE_EVENTS = frozenset({EventType.PRINT_PROGRESS})
+
 
 def _env_truthy(name: str, default: bool = False) -> bool:
     """Parse a boolean environment variable."""
@@ -185,6 +221,11 @@ class WebhookEndpoint:
     active: bool = True
     created_at: float = field(default_factory=time.time)
     description: str = ""
+    # Replace a queued, not yet sent progress event with a newer one for
+    # the same job instead of delivering every intermediate value.
+    coalesce_progress: bool = True
+    # Deliver up to this many queued events in one POST (1 = no batching).
+    batch_size: int = 1
 
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
@@ -210,11 +251,197 @@ class DeliveryRecord:
         return asdict(self)
 
 
+# ---------------------------------------------------------------------------
+# Delivery internals
+# ---------------------------------------------------------------------------
+
+
+class _Delivery:
+    """One POST to one endpoint: a single event, a batch, or a replay.
+
+    *payload* stays ``None`` until the first attempt so that queued
+    progress events can still be coalesced or batched.
+    """
+
+    __slots__ = ("coalesce_key", "endpoint", "event_id", "events", "payload", "record", "replay")
+
+    def __init__(
+        self,
+        endpoint: WebhookEndpoint,
+        events: list[Event],
+        *,
+        payload: str | None = None,
+        event_id: str | None = None,
+        event_type: str | None = None,
+        replay: bool = False,
+    ) -> None:
+        self.endpoint = endpoint
+        self.events = events
+        self.payload = payload
+        self.event_id = event_id
+        # Replays of dead letters keep their queue entry until delivered.
+        self.replay = replay
+        self.coalesce_key: tuple[str, str] | None = None
+        self.record = DeliveryRecord(
+            id=uuid.uuid4().hex[:12],
+            webhook_id=endpoint.id,
+            event_type=event_type or events[0].type.value,
+            url=endpoint.url,
+        )
+
+
+class _Lane:
+    """Pending deliveries for one endpoint.
+
+    At most one worker serves a lane at a time, so an endpoint sees its
+    events in order and a slow endpoint ties up at most one worker.  A
+    failed delivery stays at the head of the lane and the whole lane
+    backs off on the retry delay queue until it is delivered or
+    dead-lettered.  ``scheduled`` is set while a worker runs the lane or
+    the lane is backing off.
+    """
+
+    __slots__ = ("coalesced", "endpoint_id", "failures", "pending", "scheduled")
+
+    def __init__(self, endpoint_id: str) -> None:
+        self.endpoint_id = endpoint_id
+        self.pending: deque[_Delivery] = deque()
+        self.coalesced: dict[tuple[str, str], _Delivery] = {}
+        self.scheduled = False
+        # Consecutive failed attempts; sets the lane's backoff.
+        self.failures = 0
+
+
+class _DelayQueue:
+    """Single timer thread that hands items to *callback* once they are due."""
+
+    def __init__(self, name: str, callback: Callable[[Any], None]) -> None:
+        self._name = name
+        self._callback = callback
+        self._heap: list[tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def schedule(self, delay: float, item: Any) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), item))
+            self._cond.notify()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if not self._running:
+                    return
+                _, _, item = heapq.heappop(self._heap)
+            try:
+                self._callback(item)
+            except Exception:
+                logger.exception("Webhook retry scheduling error")
+
+
+# ---------------------------------------------------------------------------
+# Keep-alive HTTP sessions
+# ---------------------------------------------------------------------------
+
+_sessions: OrderedDict[str, Any] = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def _session_for(url: str) -> Any:
+    """Return a pooled ``requests.Session`` for the scheme and host of *url*.
+
+    Reusing one session per host keeps TCP and TLS connections alive
+    between deliveries.  Cookies are never stored, so deliveries stay
+    independent of each other.
+    """
+    import http.cookiejar
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    parsed = urllib.parse.urlparse(url)
+    key = f"{parsed.scheme}://{parsed.netloc}".lower()
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is not None:
+            _sessions.move_to_end(key)
+            return session
+        session = requests.Session()
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_SESSION_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sessions[key] = session
+        while len(_sessions) > _MAX_SESSIONS:
+            _, evicted = _sessions.popitem(last=False)
+            evicted.close()
+        return session
+
+
+def _reset_sessions() -> None:
+    """Close and forget all pooled sessions (for tests)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _default_worker_count() -> int:
+    raw = os.environ.get("KILN_WEBHOOK_WORKERS", "").strip()
+    try:
+        return max(1, int(raw)) if raw else _DEFAULT_WORKERS
+    except ValueError:
+        return _DEFAULT_WORKERS
+
+
+# ---------------------------------------------------------------------------
+# Manager
+# ---------------------------------------------------------------------------
+
+
 class WebhookManager:
     """Manages webhook registrations and event delivery.
 
-    Uses a background thread with a delivery queue for async,
-    non-blocking delivery. Supports HMAC-SHA256 signing for
+    Each endpoint gets its own delivery lane; a shared worker pool drains
+    the lanes, so a slow or dead endpoint only delays its own events.
+    A failed attempt stays at the head of its lane, and the lane backs
+    off on a delay queue with exponential backoff and jitter rather than
+    blocking a worker, so each endpoint still sees its events in order.
+    Deliveries that exhaust their retries are dead-lettered -- in
+    *persistence* (a :class:`~kiln.persistence.KilnDB`) when given,
+    otherwise in memory -- and can be re-sent with
+    :meth:`replay_dead_letters`.  Supports HMAC-SHA256 signing for
     webhook verification.
     """
 
@@ -224,28 +451,41 @@ class WebhookManager:
         max_retries: int = 3,
         retry_delay: float = 2.0,
         delivery_timeout: float = 10.0,
+        *,
+        workers: int | None = None,
+        max_retry_delay: float = 300.0,
+        persistence: Any | None = None,
     ) -> None:
         self._event_bus = event_bus
         self._max_retries = max_retries
         self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
         self._delivery_timeout = delivery_timeout
+        self._workers = workers or _default_worker_count()
+        self._persistence = persistence
 
         self._endpoints: dict[str, WebhookEndpoint] = {}
         self._delivery_history: list[DeliveryRecord] = []
         self._max_history = 500
         self._lock = threading.Lock()
 
-        self._delivery_queue: queue.Queue = queue.Queue(maxsize=10_000)
+        self._lanes: dict[str, _Lane] = {}
+        self._lanes_lock = threading.Lock()
+        self._max_lane_depth = _MAX_LANE_DEPTH
+        self._executor: ThreadPoolExecutor | None = None
+        self._retries = _DelayQueue("kiln-webhook-retries", self._resume_lane)
         self._running = False
-        self._thread: threading.Thread | None = None
         self._handler_ref: Any | None = None
 
         # HTTP sender (injectable for testing)
         self._send_func = self._default_send
 
-        # Dead-letter queue for events that fail all retries
+        # Dead-letter queue for events that fail all retries (used when
+        # no persistence layer is configured)
         self._dead_letters: list[dict[str, Any]] = []
         self._max_dead_letters = 1000
+        # Event IDs of dead letters currently queued for replay.
+        self._replaying: set[str] = set()
 
     @property
     def is_running(self) -> bool:
@@ -259,6 +499,9 @@ class WebhookManager:
         events: list[str] | None = None,
         secret: str | None = None,
         description: str = "",
+        *,
+        coalesce_progress: bool = True,
+        batch_size: int = 1,
     ) -> WebhookEndpoint:
         """Register a new webhook endpoint.
 
@@ -268,6 +511,10 @@ class WebhookManager:
                 If None or empty, subscribes to ALL events.
             secret: Optional HMAC-SHA256 signing secret.
             description: Human-readable description.
+            coalesce_progress: Drop a queued progress event when a newer
+                one for the same job arrives before it was sent.
+            batch_size: Send up to this many queued events per POST as a
+                ``{"type": "batch", "events": [...]}`` payload.
 
         Returns:
             The created WebhookEndpoint.
@@ -289,6 +536,8 @@ class WebhookManager:
             events=event_set,
             secret=secret,
             description=description,
+            coalesce_progress=coalesce_progress,
+            batch_size=max(1, batch_size),
         )
         with self._lock:
             self._endpoints[endpoint_id] = endpoint
@@ -296,15 +545,22 @@ class WebhookManager:
         return endpoint
 
     def unregister(self, endpoint_id: str) -> bool:
-        """Remove a webhook endpoint.
+        """Remove a webhook endpoint and drop its queued deliveries.
 
         Returns True if the endpoint existed and was removed.
         """
         with self._lock:
-            if endpoint_id in self._endpoints:
-                del self._endpoints[endpoint_id]
-                return True
-            return False
+            if endpoint_id not in self._endpoints:
+                return False
+            del self._endpoints[endpoint_id]
+        with self._lanes_lock:
+            lane = self._lanes.pop(endpoint_id, None)
+            if lane is not None:
+                for delivery in lane.pending:
+                    self._release_replay(delivery)
+                lane.pending.clear()
+                lane.coalesced.clear()
+        return True
 
     def list_endpoints(self) -> list[WebhookEndpoint]:
         """Return all registered endpoints with secrets masked.
@@ -338,31 +594,37 @@ class WebhookManager:
         if self._running:
             return
         self._running = True
+        with self._lanes_lock:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers,
+                thread_name_prefix="kiln-webhooks",
+            )
+            for lane in self._lanes.values():
+                if lane.pending:
+                    self._schedule_lane(lane)
+        self._retries.start()
         # Store bound method ref so unsubscribe's identity check works
         self._handler_ref = self._on_event
         self._event_bus.subscribe(None, self._handler_ref)  # wildcard
-        self._thread = threading.Thread(
-            target=self._delivery_loop,
-            name="kiln-webhooks",
-            daemon=True,
-        )
-        self._thread.start()
-        logger.info("Webhook manager started")
+        logger.info("Webhook manager started (%d workers)", self._workers)
 
     def stop(self) -> None:
-        """Stop the webhook delivery thread."""
+        """Stop delivering webhooks and discard queued deliveries."""
         self._running = False
         self._event_bus.unsubscribe(None, self._handler_ref)
-        if self._thread is not None:
-            self._delivery_queue.put(None)  # sentinel to unblock
-            self._thread.join(timeout=5.0)
-            self._thread = None
-        # Drain any leftover items so they don't leak into the next start()
-        while not self._delivery_queue.empty():
-            try:
-                self._delivery_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._retries.stop()
+        with self._lanes_lock:
+            executor, self._executor = self._executor, None
+            # Drop leftovers so they don't leak into the next start()
+            for lane in self._lanes.values():
+                lane.pending.clear()
+                lane.coalesced.clear()
+            self._lanes.clear()
+        # Unsent replays stay in the dead-letter queue for a later replay.
+        with self._lock:
+            self._replaying.clear()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
         logger.info("Webhook manager stopped")
 
     def _on_event(self, event: Event) -> None:
@@ -377,36 +639,115 @@ class WebhookManager:
             # Empty events set = subscribe to all
             if endpoint.events and event_value not in endpoint.events:
                 continue
-            try:
-                self._delivery_queue.put_nowait((endpoint, event))
-            except queue.Full:
+            self._enqueue_event(endpoint, event)
+
+    def _enqueue_event(self, endpoint: WebhookEndpoint, event: Event) -> None:
+        key: tuple[str, str] | None = None
+        if endpoint.coalesce_progress and event.type in _COALESCIBLE_EVENTS:
+            key = (event.type.value, str(event.data.get("job_id") or event.source))
+        with self._lanes_lock:
+            lane = self._lanes.get(endpoint.id)
+            if lane is None:
+                lane = self._lanes[endpoint.id] = _Lane(endpoint.id)
+            if key is not None:
+                queued = lane.coalesced.get(key)
+                if queued is not None:
+                    queued.events[-1] = event
+                    return
+            if len(lane.pending) >= self._max_lane_depth:
                 logger.warning(
-                    "Webhook delivery queue full, dropping event %s for endpoint %s",
-                    event_value,
+                    "Webhook lane full, dropping event %s for endpoint %s",
+                    event.type.value,
                     endpoint.url,
                 )
+                return
+            delivery = _Delivery(endpoint, [event])
+            if key is not None:
+                delivery.coalesce_key = key
+                lane.coalesced[key] = delivery
+            lane.pending.append(delivery)
+            self._schedule_lane(lane)
+
+    def _resume_lane(self, lane: _Lane) -> None:
+        """Delay-queue callback: hand a lane back to the workers after its backoff."""
+        with self._lanes_lock:
+            lane.scheduled = False
+            # Lanes dropped by stop() or unregister() have released their
+            # deliveries already.
+            if self._lanes.get(lane.endpoint_id) is lane and lane.pending:
+                self._schedule_lane(lane)
+
+    def _schedule_lane(self, lane: _Lane) -> None:
+        # Caller holds _lanes_lock.
+        if lane.scheduled or self._executor is None:
+            return
+        lane.scheduled = True
+        self._executor.submit(self._run_lane, lane)
+
+    def _take(self, lane: _Lane) -> _Delivery | None:
+        """Pop the next delivery of *lane*, merging queued events into a batch."""
+        # Caller holds _lanes_lock.
+        if not lane.pending:
+            return None
+        delivery = lane.pending.popleft()
+        self._forget_coalesced(lane, delivery)
+        limit = delivery.endpoint.batch_size
+        if delivery.payload is None and limit > 1:
+            while lane.pending and len(delivery.events) < limit and lane.pending[0].payload is None:
+                queued = lane.pending.popleft()
+                self._forget_coalesced(lane, queued)
+                delivery.events.extend(queued.events)
+        return delivery
 
-    def _delivery_loop(self) -> None:
-        """Background delivery worker."""
-        while self._running:
+    @staticmethod
+    def _forget_coalesced(lane: _Lane, delivery: _Delivery) -> None:
+        key = delivery.coalesce_key
+        if key is not None and lane.coalesced.get(key) is delivery:
+            del lane.coalesced[key]
+
+    def _run_lane(self, lane: _Lane) -> None:
+        """Worker task: send a bounded run of deliveries from one lane."""
+        for _ in range(_LANE_QUANTUM):
+            with self._lanes_lock:
+                delivery = self._take(lane)
+                if delivery is None:
+                    lane.scheduled = False
+                    return
             try:
-                item = self._delivery_queue.get(timeout=1.0)
-                if item is None:
-                    break
-                endpoint, event = item
-                self._deliver(endpoint, event)
-            except queue.Empty:
-                continue
+                delivered = self._attempt(delivery)
+                if delivered or delivery.record.attempts >= self._max_retries:
+                    self._finish(delivery)
+                else:
+                    with self._lanes_lock:
+                        if self._lanes.get(lane.endpoint_id) is lane:
+                            # Hold the head so later events wait for it.
+                            lane.pending.appendleft(delivery)
+                        else:
+                            self._release_replay(delivery)
             except Exception:
                 logger.exception("Webhook delivery error")
-
-    def _deliver(self, endpoint: WebhookEndpoint, event: Event) -> DeliveryRecord:
-        """Attempt to deliver an event to an endpoint with retries."""
-        event_data = event.to_dict()
-        event_data["event_id"] = uuid.uuid4().hex
-        payload = json.dumps(event_data, default=str)
+                continue
+            if delivered:
+                lane.failures = 0
+                continue
+            # The endpoint is failing: back off the whole lane on the
+            # delay queue instead of holding a worker.
+            lane.failures += 1
+            self._retries.schedule(self._backoff(lane.failures), lane)
+            return
+        # Yield the worker so other lanes get a turn, then continue.
+        with self._lanes_lock:
+            lane.scheduled = False
+            if lane.pending:
+                self._schedule_lane(lane)
+
+    def _backoff(self, attempt: int) -> float:
+        """Delay before retry number *attempt*: exponential, with jitter."""
+        delay = min(self._max_retry_delay, self._retry_delay * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0.0, delay / 2)
+
+    def _signed_headers(self, endpoint: WebhookEndpoint, payload: str) -> dict[str, str]:
         headers = {"Content-Type": "application/json"}
-
         if endpoint.secret:
             signature = hmac.new(
                 endpoint.secret.encode(),
@@ -414,84 +755,207 @@ class WebhookManager:
                 hashlib.sha256,
             ).hexdigest()
             headers["X-Kiln-Signature"] = f"sha256={signature}"
+        return headers
 
-        record = DeliveryRecord(
-            id=uuid.uuid4().hex[:12],
-            webhook_id=endpoint.id,
-            event_type=event.type.value,
-            url=endpoint.url,
-        )
+    @staticmethod
+    def _serialize(delivery: _Delivery) -> None:
+        delivery.event_id = uuid.uuid4().hex
+        if len(delivery.events) == 1:
+            event_data = delivery.events[0].to_dict()
+            event_data["event_id"] = delivery.event_id
+        else:
+            batch = []
+            for event in delivery.events:
+                item = event.to_dict()
+                item["event_id"] = uuid.uuid4().hex
+                batch.append(item)
+            event_data = {"type": "batch", "event_id": delivery.event_id, "count": len(batch), "events": batch}
+            delivery.record.event_type = "batch"
+        delivery.payload = json.dumps(event_data, default=str)
+
+    def _attempt(self, delivery: _Delivery) -> bool:
+        """Make one delivery attempt; return True on a 2xx response."""
+        if delivery.payload is None:
+            self._serialize(delivery)
+        record = delivery.record
+        record.attempts += 1
+        headers = self._signed_headers(delivery.endpoint, delivery.payload)
+        try:
+            status_code = self._send_func(delivery.endpoint.url, delivery.payload, headers, self._delivery_timeout)
+            record.status_code = status_code
+            if 200 <= status_code < 300:
+                record.success = True
+                return True
+            record.error = f"HTTP {status_code}"
+        except Exception as exc:
+            record.error = str(exc)
+        return False
 
-        for attempt in range(1, self._max_retries + 1):
-            record.attempts = attempt
-            try:
-                status_code = self._send_func(endpoint.url, payload, headers, self._delivery_timeout)
-                record.status_code = status_code
-                if 200 <= status_code < 300:
-                    record.success = True
-                    break
-                else:
-                    record.error = f"HTTP {status_code}"
-            except Exception as exc:
-                record.error = str(exc)
+    def _deliver(self, endpoint: WebhookEndpoint, event: Event) -> DeliveryRecord:
+        """Deliver an event to an endpoint synchronously, with retries.
 
-            if attempt < self._max_retries:
-                time.sleep(self._retry_delay)
+        Sleeps between attempts in the calling thread; the background
+        workers use the retry delay queue instead.
+        """
+        delivery = _Delivery(endpoint, [event])
+        while not self._attempt(delivery) and delivery.record.attempts < self._max_retries:
+            time.sleep(self._backoff(delivery.record.attempts))
+        self._finish(delivery)
+        return delivery.record
+
+    def _finish(self, delivery: _Delivery) -> None:
+        """Record the outcome of a delivery and dead-letter it on failure."""
+        record = delivery.record
+        status = "delivered" if record.success else "failed"
+        now = time.time()
+        for event in delivery.events:
+            WEBHOOK_DELIVERY_LAG.observe(max(0.0, now - event.timestamp), labels={"status": status})
 
         with self._lock:
             self._delivery_history.append(record)
             if len(self._delivery_history) > self._max_history:
                 self._delivery_history = self._delivery_history[-self._max_history :]
+        self._release_replay(delivery)
 
         if record.success:
             logger.debug(
                 "Delivered %s to %s (attempt %d)",
-                event.type.value,
-                endpoint.url,
+                record.event_type,
+                record.url,
                 record.attempts,
             )
+            if delivery.replay:
+                self._remove_dead_letters([delivery.event_id or ""])
+            return
+
+        logger.warning(
+            "Failed to deliver %s to %s after %d attempts: %s",
+            record.event_type,
+            record.url,
+            record.attempts,
+            record.error,
+        )
+        # Add to the dead-letter queue for inspection and replay
+        dead_entry: dict[str, Any] = {
+            "event_id": delivery.event_id,
+            "event_type": record.event_type,
+            "webhook_id": record.webhook_id,
+            "url": record.url,
+            "payload": delivery.payload,
+            "error": record.error,
+            "attempts": record.attempts,
+            "timestamp": record.timestamp,
+        }
+        if self._persistence is not None:
+            try:
+                self._persistence.save_webhook_dead_letter(dead_entry, keep=self._max_dead_letters)
+            except Exception:
+                logger.exception("Failed to persist webhook dead letter %s", delivery.event_id)
         else:
-            logger.warning(
-                "Failed to deliver %s to %s after %d attempts: %s",
-                event.type.value,
-                endpoint.url,
-                record.attempts,
-                record.error,
-            )
-            # Add to dead-letter list for later inspection
-            dead_entry: dict[str, Any] = {
-                "event_id": event_data["event_id"],
-                "event_type": event.type.value,
-                "webhook_id": endpoint.id,
-                "url": endpoint.url,
-                "error": record.error,
-                "attempts": record.attempts,
-                "timestamp": record.timestamp,
-            }
             with self._lock:
+                # A failed replay replaces its original entry.
+                self._dead_letters = [e for e in self._dead_letters if e["event_id"] != delivery.event_id]
                 self._dead_letters.append(dead_entry)
                 if len(self._dead_letters) > self._max_dead_letters:
                     self._dead_letters = self._dead_letters[-self._max_dead_letters :]
-            logger.info(
-                "Dead-lettered event %s for webhook %s (%d total)",
-                event_data["event_id"],
-                endpoint.id,
-                len(self._dead_letters),
-            )
+        logger.info(
+            "Dead-lettered event %s for webhook %s",
+            delivery.event_id,
+            record.webhook_id,
+        )
 
-        return record
+    # -- Dead letters ------------------------------------------------------
 
     def get_dead_letters(self) -> list[dict[str, Any]]:
         """Return the dead-letter list (failed deliveries after all retries)."""
+        if self._persistence is not None:
+            return self._persistence.list_webhook_dead_letters(limit=self._max_dead_letters)
         with self._lock:
             return list(self._dead_letters)
 
     @property
     def dead_letter_count(self) -> int:
         """Return the number of dead-lettered events."""
+        if self._persistence is not None:
+            return self._persistence.count_webhook_dead_letters()
         with self._lock:
             return len(self._dead_letters)
 
+    def replay_dead_letters(self, webhook_id: str | None = None, limit: int = 100) -> int:
+        """Re-queue dead-lettered deliveries for their endpoints.
+
+        Entries are re-sent with their original payload, signed with the
+        endpoint's current secret.  Each entry stays in the dead-letter
+        queue until its replay is delivered; a replay that fails again
+        replaces it, and one dropped by :meth:`stop` or :meth:`unregister`
+        leaves it untouched.  Entries already queued for replay are not
+        queued twice.  An entry goes to its original endpoint or, after a
+        restart, to an endpoint registered with the same URL; entries with
+        no active endpoint are left in place.  Deliveries are sent once
+        the manager is running.
+
+        Args:
+            webhook_id: Only replay entries for this endpoint.
+            limit: Maximum number of entries to replay.
+
+        Returns:
+            The number of entries queued for delivery.
+        """
+        entries = [
+            entry
+            for entry in self.get_dead_letters()
+            if webhook_id is None or entry["webhook_id"] == webhook_id
+        ]
+        with self._lock:
+            endpoints = dict(self._endpoints)
+        by_url = {ep.url: ep for ep in endpoints.values() if ep.active}
+        replayed: list[str] = []
+        for entry in entries:
+            if len(replayed) >= limit:
+                break
+            endpoint = endpoints.get(entry["webhook_id"]) or by_url.get(entry["url"])
+            if endpoint is None or not endpoint.active or not entry.get("payload"):
+                continue
+            with self._lock:
+                if entry["event_id"] in self._replaying:
+                    continue
+                self._replaying.add(entry["event_id"])
+            delivery = _Delivery(
+                endpoint,
+                [],
+                payload=entry["payload"],
+                event_id=entry["event_id"],
+                event_type=entry["event_type"],
+                replay=True,
+            )
+            with self._lanes_lock:
+                lane = self._lanes.get(endpoint.id)
+                if lane is None:
+                    lane = self._lanes[endpoint.id] = _Lane(endpoint.id)
+                lane.pending.append(delivery)
+                self._schedule_lane(lane)
+            replayed.append(entry["event_id"])
+
+        if replayed:
+            logger.info("Replaying %d dead-lettered webhook deliveries", len(replayed))
+        return len(replayed)
+
+    def _release_replay(self, delivery: _Delivery) -> None:
+        if delivery.replay:
+            with self._lock:
+                self._replaying.discard(delivery.event_id or "")
+
+    def _remove_dead_letters(self, event_ids: list[str]) -> None:
+        if self._persistence is not None:
+            try:
+                self._persistence.delete_webhook_dead_letters(event_ids)
+            except Exception:
+                logger.exception("Failed to remove replayed webhook dead letters %s", event_ids)
+            return
+        done = set(event_ids)
+        with self._lock:
+            self._dead_letters = [e for e in self._dead_letters if e["event_id"] not in done]
+
     def recent_deliveries(self, limit: int = 50) -> list[DeliveryRecord]:
         """Return recent delivery records, newest first."""
         with self._lock:
@@ -505,9 +969,7 @@ class WebhookManager:
 
     @staticmethod
     def _default_send(url: str, payload: str, headers: dict[str, str], timeout: float) -> int:
-        """Default HTTP sender using requests with SSRF-safe redirect handling."""
-        import requests
-
+        """Default HTTP sender using pooled keep-alive sessions with SSRF-safe redirect handling."""
         allow_redirects, max_hops = _get_webhook_redirect_policy()
         current_url = url
         hops = 0
@@ -518,7 +980,7 @@ class WebhookManager:
             if not valid:
                 raise RuntimeError(f"Webhook delivery blocked by URL validation for {current_url!r}: {reason}")
 
-            resp = requests.post(
+            resp = _session_for(current_url).post(
                 current_url,
                 data=payload,
                 headers=headers,
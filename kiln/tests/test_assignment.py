@@ -0,0 +1,82 @@
+"""Tests for kiln.assignment -- job × printer assignment solver."""
+
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+from kiln.assignment import solve_assignment
+
+
+def _total(scores, pairs):
+    return sum(scores[r][c] for r, c in pairs)
+
+
+def _brute_force_best(scores):
+    n_rows, n_cols = len(scores), len(scores[0])
+    best = 0.0
+    k = min(n_rows, n_cols)
+    for rows in itertools.combinations(range(n_rows), k):
+        for cols in itertools.permutations(range(n_cols), k):
+            pairs = list(zip(rows, cols, strict=True))
+            if any(scores[r][c] is None for r, c in pairs):
+                continue
+            best = max(best, _total(scores, pairs))
+    return best
+
+
+class TestSolveAssignment:
+    def test_empty(self):
+        assert solve_assignment([]) == []
+        assert solve_assignment([[], []]) == []
+
+    def test_beats_greedy_choice(self):
+        scores = [[0.9, 0.8], [0.9, 0.1]]
+        assert solve_assignment(scores, method="hungarian") == [(0, 1), (1, 0)]
+
+    def test_forbidden_pairs_respected(self):
+        scores = [[None, 0.1], [0.5, 0.9]]
+        assert solve_assignment(scores) == [(0, 1), (1, 0)]
+
+    def test_row_with_no_allowed_column_omitted(self):
+        assert solve_assignment([[None, None], [0.5, 0.2]]) == [(1, 0)]
+
+    def test_ties_preserve_identity(self):
+        scores = [[0.0] * 3 for _ in range(3)]
+        assert solve_assignment(scores) == [(0, 0), (1, 1), (2, 2)]
+
+    def test_more_rows_than_columns(self):
+        scores = [[0.1], [0.7], [0.3]]
+        assert solve_assignment(scores) == [(1, 0)]
+
+    def test_more_columns_than_rows(self):
+        scores = [[0.1, 0.2, 0.9]]
+        assert solve_assignment(scores) == [(0, 2)]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_hungarian_is_optimal(self, seed):
+        rng = random.Random(seed)
+        n_rows, n_cols = rng.randint(1, 5), rng.randint(1, 5)
+        scores = [
+            [None if rng.random() < 0.2 else round(rng.random(), 3) for _ in range(n_cols)]
+            for _ in range(n_rows)
+        ]
+        pairs = solve_assignment(scores, method="hungarian")
+        assert len({r for r, _ in pairs}) == len(pairs)
+        assert len({c for _, c in pairs}) == len(pairs)
+        assert _total(scores, pairs) == pytest.approx(_brute_force_best(scores), abs=1e-6)
+
+    def test_greedy_is_valid(self):
+        rng = random.Random(1)
+        scores = [[rng.random() for _ in range(6)] for _ in range(4)]
+        pairs = solve_assignment(scores, method="greedy")
+        assert len(pairs) == 4
+        assert len({c for _, c in pairs}) == 4
+
+    def test_invalid_input(self):
+        with pytest.raises(ValueError):
+            solve_assignment([[0.1], [0.1, 0.2]])
+        with pytest.raises(ValueError):
+            solve_assignment([[0.1]], method="simplex")
@@ -293,6 +293,23 @@ class TestEstimateSupports:
         with pytest.raises(ValueError, match="File not found"):
             estimate_supports("/nonexistent/model.stl")
 
+    def test_overhanging_shelf_reports_support_map(self):
+        # A 10 mm block 5 mm above the bed, resting on a 2x2 post.
+        post = [
+            tuple((v[0] + 4, v[1] + 4, v[2] * 2.5) for v in tri)
+            for tri in _cube_triangles(2.0)
+            if not all(v[2] == 2.0 for v in tri)
+        ]
+        block = [tuple((v[0], v[1], v[2] + 5.0) for v in tri) for tri in _cube_triangles(10.0)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_stl(tmpdir, post + block)
+            result = estimate_supports(path, resolution_mm=1.0)
+        assert result.needs_supports
+        assert result.support_footprint_area_mm2 == 100.0
+        assert result.max_support_height_mm == 5.0
+        assert result.mapped_support_volume_mm3 == 500.0
+        assert result.peak_overhang_layer_mm == pytest.approx(5.2)
+
 
 # ---------------------------------------------------------------------------
 # TestOrientationDataclasses
@@ -9,25 +9,33 @@ Covers:
 - BackupScheduler lifecycle (start/stop/is_running)
 - BackupScheduler env var fallback (KILN_BACKUP_INTERVAL, KILN_BACKUP_KEEP)
 - BackupScheduler runs backup cycles and handles failures
+- incremental_backup() chunk deduplication, rotation and checksummed,
+  point-in-time restore
 """
 
 from __future__ import annotations
 
+import json
 import os
 import sqlite3
+import threading
 import time
 from unittest.mock import patch
 
 import pytest
 
+import kiln.backup as backup_mod
 from kiln.backup import (
     BackupError,
     BackupScheduler,
     IntegrityResult,
     ScheduledBackupResult,
     _generate_backup_filename,
+    _online_copy,
     _rotate_backups,
     backup_database,
+    incremental_backup,
+    list_incremental_backups,
     restore_database,
     snapshot_database,
     verify_integrity,
@@ -500,3 +508,239 @@ class TestBackupSchedulerExecution:
         sched.start()
         assert sched._thread.name == "kiln-backup-scheduler"
         sched.stop()
+
+
+# ---------------------------------------------------------------------------
+# Tests — incremental_backup()
+# ---------------------------------------------------------------------------
+
+def _create_large_db(path: str, rows: int = 2000) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, payload BLOB)")
+    conn.executemany("INSERT INTO events (payload) VALUES (randomblob(1000))", [()] * rows)
+    conn.commit()
+    conn.close()
+
+
+def _touch_row(path: str, row_id: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE events SET payload = randomblob(1000) WHERE id = ?", (row_id,))
+    conn.commit()
+    conn.close()
+
+
+class TestIncrementalBackup:
+    """Tests for incremental_backup() and restoring its manifests."""
+
+    def test_second_backup_stores_only_changed_chunks(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_large_db(db)
+        backup_dir = str(tmp_path / "backups")
+
+        first = incremental_backup(db, backup_dir, chunk_size=64 * 1024)
+        assert first.success is True
+        assert first.mode == "incremental"
+        assert first.bytes_copied == first.size_bytes
+        assert first.duration_seconds > 0
+
+        _touch_row(db, 1000)
+        second = incremental_backup(db, backup_dir, chunk_size=64 * 1024)
+        assert second.success is True
+        assert 0 < second.bytes_copied <= 2 * 64 * 1024
+        assert second.sha256 != first.sha256
+        assert [p["path"] for p in list_incremental_backups(backup_dir)] == [first.path, second.path]
+
+    def test_point_in_time_restore(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_large_db(db, rows=100)
+        backup_dir = str(tmp_path / "backups")
+        first = incremental_backup(db, backup_dir)
+        conn = sqlite3.connect(db)
+        conn.execute("DELETE FROM events WHERE id > 50")
+        conn.commit()
+        conn.close()
+        incremental_backup(db, backup_dir)
+
+        first_at = list_incremental_backups(backup_dir)[0]["created_at"]
+        early = str(tmp_path / "early.db")
+        latest = str(tmp_path / "latest.db")
+        assert restore_database(backup_dir, early, at=first_at) == os.path.abspath(early)
+        restore_database(backup_dir, latest)
+        restore_database(first.path, str(tmp_path / "by_manifest.db"))
+
+        for path, expected in ((early, 100), (latest, 50), (str(tmp_path / "by_manifest.db"), 100)):
+            conn = sqlite3.connect(path)
+            assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == expected
+            conn.close()
+
+        with pytest.raises(BackupError, match="No incremental backup"):
+            restore_database(backup_dir, str(tmp_path / "x.db"), at=first_at - 3600)
+
+    def test_shared_directory_restores_matching_database(self, tmp_path):
+        backup_dir = str(tmp_path / "backups")
+        kiln_db = str(tmp_path / "kiln.db")
+        queue_db = str(tmp_path / "queue.db")
+        kiln2_db = str(tmp_path / "kiln2.db")
+        _create_large_db(kiln_db, rows=10)
+        incremental_backup(kiln_db, backup_dir)
+        for path in (queue_db, kiln2_db):
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY)")
+            conn.commit()
+            conn.close()
+            incremental_backup(path, backup_dir)
+
+        assert [p["database"] for p in list_incremental_backups(backup_dir, prefix="kiln")] == ["kiln"]
+
+        # queue.db and kiln2.db were backed up last, but kiln.db is restored
+        target = tmp_path / "restore" / "kiln.db"
+        restore_database(backup_dir, str(target))
+        conn = sqlite3.connect(target)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        assert tables == {"events"}
+
+        with pytest.raises(BackupError, match="several databases"):
+            restore_database(backup_dir, str(tmp_path / "other.db"))
+
+    def test_rotation_keeps_databases_with_shared_prefix(self, tmp_path):
+        backup_dir = str(tmp_path / "backups")
+        kiln_db = str(tmp_path / "kiln.db")
+        kiln2_db = str(tmp_path / "kiln2.db")
+        _create_large_db(kiln_db, rows=10)
+        _create_large_db(kiln2_db, rows=10)
+        incremental_backup(kiln2_db, backup_dir, keep=1)
+        incremental_backup(kiln_db, backup_dir, keep=1)
+        incremental_backup(kiln_db, backup_dir, keep=1)
+        assert len(list_incremental_backups(backup_dir, prefix="kiln2")) == 1
+        assert len(list_incremental_backups(backup_dir, prefix="kiln")) == 1
+
+    def test_restore_rejects_corrupt_chunk(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_large_db(db, rows=100)
+        backup_dir = str(tmp_path / "backups")
+        result = incremental_backup(db, backup_dir)
+        chunk_root = tmp_path / "backups" / "chunks"
+        victim = next(p for p in chunk_root.rglob("*") if p.is_file())
+        victim.write_bytes(b"\0" + victim.read_bytes()[1:])
+
+        target = tmp_path / "restored.db"
+        target.write_bytes(b"original")
+        with pytest.raises(BackupError, match="checksum"):
+            restore_database(result.path, str(target), force=True)
+        assert target.read_bytes() == b"original"
+        assert not (tmp_path / "restored.db.restore-tmp").exists()
+
+    def test_rotation_removes_unreferenced_chunks(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_large_db(db, rows=200)
+        backup_dir = str(tmp_path / "backups")
+        for row_id in (1, 2, 3):
+            _touch_row(db, row_id * 60)
+            assert incremental_backup(db, backup_dir, keep=1, chunk_size=32 * 1024).success
+
+        [point] = list_incremental_backups(backup_dir)
+        with open(point["path"]) as fh:
+            referenced = set(json.load(fh)["chunks"])
+        stored = {p.name for p in (tmp_path / "backups" / "chunks").rglob("*") if p.is_file()}
+        assert stored == referenced
+
+    def test_rotation_waits_for_concurrent_manifest(self, tmp_path):
+        backup_dir = str(tmp_path / "backups")
+        kiln_db = str(tmp_path / "kiln.db")
+        queue_db = str(tmp_path / "queue.db")
+        _create_large_db(kiln_db, rows=50)
+        _create_large_db(queue_db, rows=300)
+        assert incremental_backup(kiln_db, backup_dir, keep=1).success
+        _touch_row(kiln_db, 1)
+
+        store_chunks = backup_mod._store_chunks
+        rotations: list[threading.Thread] = []
+
+        def store_then_rotate(*args, **kwargs):
+            stored = store_chunks(*args, **kwargs)
+            if not rotations:
+                # queue.db's chunks are on disk but no manifest references
+                # them yet; kiln.db's rotation must not collect them.
+                rotation = threading.Thread(target=incremental_backup, args=(kiln_db, backup_dir), kwargs={"keep": 1})
+                rotations.append(rotation)
+                rotation.start()
+                rotation.join(timeout=0.5)
+            return stored
+
+        with patch.object(backup_mod, "_store_chunks", side_effect=store_then_rotate):
+            result = incremental_backup(queue_db, backup_dir)
+            rotations[0].join(timeout=10)
+
+        assert result.success is True
+        assert not rotations[0].is_alive()
+        assert len(list_incremental_backups(backup_dir, prefix="kiln")) == 1
+        restore_database(result.path, str(tmp_path / "restored.db"))
+
+    def test_source_not_found(self, tmp_path):
+        result = incremental_backup(str(tmp_path / "nope.db"), str(tmp_path / "backups"))
+        assert result.success is False
+        assert result.mode == "incremental"
+        assert "not found" in result.error
+
+    def test_online_copy_survives_concurrent_writes(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_large_db(db, rows=500)
+        stop = threading.Event()
+
+        def writer():
+            conn = sqlite3.connect(db)
+            while not stop.is_set():
+                conn.execute("INSERT INTO events (payload) VALUES (randomblob(100))")
+                conn.commit()
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            _online_copy(db, str(tmp_path / "copy.db"), pages_per_step=1, step_sleep=0.001, max_restarts=2)
+        finally:
+            stop.set()
+            thread.join()
+        assert verify_integrity(str(tmp_path / "copy.db")).ok is True
+
+    def test_restore_discards_stale_wal(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_test_db(db)
+        backup = backup_database(db, str(tmp_path / "b.db"), redact_credentials=False)
+        target = str(tmp_path / "target.db")
+        _create_test_db(target)
+        with open(target + "-wal", "wb") as fh:
+            fh.write(b"stale")
+        restore_database(backup, target, force=True)
+        assert not os.path.exists(target + "-wal")
+
+
+class TestBackupSchedulerIncremental:
+    """Tests for BackupScheduler in incremental mode."""
+
+    def test_mode_from_env_and_invalid_mode(self, monkeypatch):
+        monkeypatch.setenv("KILN_BACKUP_MODE", "incremental")
+        assert BackupScheduler("/db", "/backups")._mode == "incremental"
+        monkeypatch.setenv("KILN_BACKUP_MODE", "bogus")
+        assert BackupScheduler("/db", "/backups")._mode == "snapshot"
+        with pytest.raises(ValueError):
+            BackupScheduler("/db", "/backups", mode="bogus")
+
+    def test_runs_incremental_cycle_and_reports_lag(self, tmp_path):
+        db = str(tmp_path / "kiln.db")
+        _create_test_db(db)
+        backup_dir = str(tmp_path / "backups")
+        sched = BackupScheduler(db, backup_dir, interval_seconds=3600.0, mode="incremental")
+        assert sched.lag_seconds is None
+        sched.start()
+        deadline = time.monotonic() + 5
+        while sched.last_result is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sched.stop()
+
+        assert sched.last_result.success is True
+        assert sched.last_result.path.endswith(".json")
+        assert 0 <= sched.lag_seconds < 5
+        assert len(list_incremental_backups(backup_dir)) == 1
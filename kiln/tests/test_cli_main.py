@@ -303,6 +303,104 @@ class TestIngestWatch:
         adapter.start_print.assert_called_once_with("widget.gcode")
 
 
+class TestIngestState:
+    def test_changes_are_journaled_and_replayed(self, tmp_path):
+        from kiln.cli.main import (
+            _load_ingest_seen_state,
+            _persist_ingest_seen_changes,
+        )
+
+        state_path = tmp_path / "watch_state.json"
+        journal_path = tmp_path / "watch_state.json.journal"
+        seen = {"/in/a.gcode": 1.0}
+        # First write creates the snapshot.
+        _persist_ingest_seen_changes(state_path, tmp_path, seen, {"/in/a.gcode": 1.0})
+        assert state_path.exists() and not journal_path.exists()
+        snapshot = state_path.read_text()
+
+        seen["/in/b.gcode"] = 2.0
+        del seen["/in/a.gcode"]
+        _persist_ingest_seen_changes(state_path, tmp_path, seen, {"/in/b.gcode": 2.0, "/in/a.gcode": None})
+        _persist_ingest_seen_changes(state_path, tmp_path, seen, {})
+        assert state_path.read_text() == snapshot
+        assert len(journal_path.read_text().splitlines()) == 1
+        with open(journal_path, "a") as fh:
+            fh.write('{"/in/c.gcode": 3')  # torn write
+        assert _load_ingest_seen_state(state_path) == {"/in/b.gcode": 2.0}
+
+    def test_large_journal_is_compacted(self, tmp_path, monkeypatch):
+        from kiln.cli.main import _load_ingest_seen_state, _persist_ingest_seen_changes
+
+        monkeypatch.setattr("kiln.cli.main._INGEST_JOURNAL_COMPACT_BYTES", 10)
+        state_path = tmp_path / "watch_state.json"
+        seen: dict[str, float] = {}
+        for i in range(20):
+            seen[f"/in/{i}.gcode"] = float(i)
+            _persist_ingest_seen_changes(state_path, tmp_path, seen, {f"/in/{i}.gcode": float(i)})
+        journal_path = tmp_path / "watch_state.json.journal"
+        assert not journal_path.exists() or journal_path.stat().st_size <= state_path.stat().st_size + 64
+        assert _load_ingest_seen_state(state_path) == seen
+
+    def test_event_paths_filter_and_forget(self, tmp_path):
+        from kiln.cli.main import _ingest_event_paths
+        from kiln.ingest_watch import REMOVED, WRITTEN, WatchEvent
+
+        (tmp_path / "part.gcode").write_text("G28\n")
+        (tmp_path / "notes.txt").write_text("x")
+        seen = {str(tmp_path / "old.gcode"): 1.0}
+        changes: dict[str, float | None] = {}
+        events = [
+            WatchEvent(WRITTEN, "part.gcode"),
+            WatchEvent(WRITTEN, "notes.txt"),
+            WatchEvent(WRITTEN, "part.gcode"),
+            WatchEvent(REMOVED, "old.gcode"),
+            WatchEvent(WRITTEN, "vanished.gcode"),
+        ]
+        detected = _ingest_event_paths(tmp_path, events, seen, changes)
+        assert detected == [tmp_path / "part.gcode"]
+        assert set(seen) == {str(tmp_path / "part.gcode")}
+        assert changes[str(tmp_path / "old.gcode")] is None
+
+
+    def test_watch_rearmed_after_directory_recreated(self, runner, tmp_path):
+        import shutil
+
+        from kiln.ingest_watch import LOST, WatchEvent
+
+        watch_dir = tmp_path / "incoming"
+        watch_dir.mkdir()
+
+        def _delete_dir(timeout=None):
+            shutil.rmtree(watch_dir)
+            return [WatchEvent(LOST)]
+
+        def _recreate_dir(seconds):
+            watch_dir.mkdir(exist_ok=True)
+            (watch_dir / "part.gcode").write_text("G28\n", encoding="utf-8")
+
+        lost = MagicMock()
+        lost.read.side_effect = _delete_dir
+        rearmed = MagicMock()
+        rearmed.read.side_effect = KeyboardInterrupt
+        opener = MagicMock(side_effect=[lost, rearmed])
+
+        with (
+            patch("kiln.ingest_watch.open_directory_watcher", opener),
+            patch("kiln.cli.main.time.sleep", side_effect=_recreate_dir),
+        ):
+            result = runner.invoke(
+                cli,
+                ["ingest", "watch", "--dir", str(watch_dir), "--min-stable-seconds", "0"],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert opener.call_count == 2
+        lost.close.assert_called_once()
+        rearmed.close.assert_called_once()
+        assert "re-armed" in result.output
+        assert "Detected: part.gcode" in result.output
+
+
 class TestIngestService:
     def test_service_install_and_status(self, runner, tmp_path):
         watch_dir = tmp_path / "incoming"
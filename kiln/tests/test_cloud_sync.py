@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import email.utils
+import gzip
 import hashlib
 import hmac
 import json
@@ -11,7 +13,13 @@ from unittest.mock import MagicMock
 import pytest
 import responses
 
-from kiln.cloud_sync import CloudSyncManager, SyncConfig, SyncStatus, _compute_signature
+from kiln.cloud_sync import (
+    CloudSyncManager,
+    SyncConfig,
+    SyncStatus,
+    _compute_signature,
+    _parse_retry_after,
+)
 from kiln.persistence import KilnDB
 
 # ---------------------------------------------------------------------------
@@ -218,8 +226,8 @@ class TestCloudSyncManagerSync:
         mgr.sync_now()
         # Second sync should not push same job
         result = mgr.sync_now()
-        # May be 0 or push again depending on cursor, but mark_synced was called
-        assert mgr.status().jobs_synced >= 1
+        assert result["jobs_pushed"] == 0
+        assert mgr.status().jobs_synced == 1
 
     @responses.activate
     def test_sync_updates_status(self, mgr, db):
@@ -335,3 +343,160 @@ class TestCloudSyncManagerLifecycle:
         mgr = CloudSyncManager(db=db, event_bus=None, config=config)
         # Should not crash
         assert mgr.status().enabled is True
+
+
+# ---------------------------------------------------------------------------
+# Batching, compression, cursors and rate limiting
+# ---------------------------------------------------------------------------
+
+SYNC_URL = "https://cloud.example.com/api/sync"
+
+
+def _pushed(call) -> dict:
+    body = call.request.body
+    if call.request.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+@pytest.fixture
+def batched(db, bus):
+    return CloudSyncManager(db=db, event_bus=bus, config=SyncConfig(
+        cloud_url="https://cloud.example.com", api_key="test-api-key-12345",
+        batch_size=4, sync_printers=False,
+    ))
+
+
+class TestBatchedSync:
+    @responses.activate
+    def test_events_pushed_in_bounded_batches(self, batched, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        for i in range(10):
+            db.log_event("test.event", {"i": i})
+        result = batched.sync_now()
+        assert result["events_pushed"] == 10
+        sizes = [len(_pushed(c)["records"]) for c in responses.calls]
+        assert sizes == [4, 4, 2]
+        assert batched.sync_now()["events_pushed"] == 0
+
+    @responses.activate
+    def test_interrupted_sync_resumes_after_last_batch(self, batched, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        responses.add(responses.POST, SYNC_URL, status=500)
+        for i in range(10):
+            db.log_event("test.event", {"i": i})
+        first = batched.sync_now()
+        assert first["events_pushed"] == 4
+        assert "error" in batched.status().last_sync_status
+
+        responses.replace(responses.POST, SYNC_URL, json={"ok": True})
+        second = batched.sync_now()
+        assert second["events_pushed"] == 6
+        assert [r["data"]["i"] for r in _pushed(responses.calls[2])["records"]] == [4, 5, 6, 7]
+
+    @responses.activate
+    def test_job_cursor_handles_equal_timestamps(self, batched, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        for i in range(6):
+            db.save_job({
+                "id": f"job{i}", "file_name": "t.gcode", "status": "queued",
+                "submitted_at": 1000.0, "priority": 0,
+            })
+        assert batched.sync_now()["jobs_pushed"] == 6
+        ids = [r["id"] for c in responses.calls for r in _pushed(c)["records"]]
+        assert ids == [f"job{i}" for i in range(6)]
+
+    @responses.activate
+    def test_legacy_timestamp_cursor_is_honoured(self, batched, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        db.log_event("old.event", {})
+        db.set_setting("sync_cursor", str(time.time() + 1))
+        time.sleep(0.01)
+        assert batched.sync_now()["events_pushed"] == 0
+
+
+class TestCompression:
+    @responses.activate
+    def test_large_body_is_gzipped_and_signed_as_sent(self, batched, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        db.log_event("test.event", {"blob": "x" * 5000})
+        batched.sync_now()
+        req = responses.calls[0].request
+        assert req.headers["Content-Encoding"] == "gzip"
+        assert len(req.body) < 5000
+        expected = _compute_signature("test-api-key-12345", req.body)
+        assert req.headers["X-Kiln-Signature"] == f"sha256={expected}"
+        assert _pushed(responses.calls[0])["records"][0]["data"]["blob"] == "x" * 5000
+
+    @responses.activate
+    def test_small_body_and_none_are_uncompressed(self, db, bus):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        mgr = CloudSyncManager(db=db, event_bus=bus, config=SyncConfig(
+            cloud_url="https://cloud.example.com", api_key="k", compression="none",
+        ))
+        db.log_event("test.event", {"blob": "x" * 5000})
+        mgr.sync_now()
+        assert "Content-Encoding" not in responses.calls[0].request.headers
+
+
+class TestPrinterSync:
+    @responses.activate
+    def test_printers_pushed_only_when_config_changes(self, mgr, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        db.save_printer("voron", "klipper", "http://10.0.0.5")
+        assert mgr.sync_now()["printers_pushed"] is True
+        time.sleep(0.01)
+        db.save_printer("voron", "klipper", "http://10.0.0.5")
+        assert mgr.sync_now()["printers_pushed"] is False
+        db.save_printer("voron", "klipper", "http://10.0.0.6")
+        assert mgr.sync_now()["printers_pushed"] is True
+        assert len(responses.calls) == 2
+
+
+class TestRateLimiting:
+    @responses.activate
+    def test_429_backs_off_and_halves_batch(self, batched, db, bus):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        responses.add(responses.POST, SYNC_URL, status=429, headers={"Retry-After": "120"})
+        for i in range(10):
+            db.log_event("test.event", {"i": i})
+        result = batched.sync_now()
+        assert result["rate_limited"] is True
+        assert result["events_pushed"] == 4
+        status = batched.status()
+        assert status.last_sync_status == "rate_limited"
+        assert status.batch_size == 2
+        assert status.rate_limited_until == pytest.approx(time.time() + 120, abs=5)
+        assert batched._next_wait() > 100
+        # Deferred while the server asked us to wait.
+        assert "retry_after" in batched.sync_now()
+        assert len(responses.calls) == 2
+
+        batched._rate_limited_until = time.time() - 1
+        responses.replace(responses.POST, SYNC_URL, json={"ok": True})
+        assert batched.sync_now()["events_pushed"] == 6
+        assert batched.status().batch_size == 4
+        assert batched.status().rate_limited_until is None
+
+    def test_parse_retry_after(self):
+        assert _parse_retry_after("15") == 15.0
+        assert _parse_retry_after(None) == 30.0
+        assert _parse_retry_after("soon") == 30.0
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        assert _parse_retry_after(date) == pytest.approx(60, abs=2)
+
+
+class TestThroughput:
+    @responses.activate
+    def test_status_reports_throughput(self, batched, db):
+        responses.add(responses.POST, SYNC_URL, json={"ok": True})
+        for i in range(5):
+            db.log_event("test.event", {"i": i})
+        result = batched.sync_now()
+        status = batched.status()
+        assert status.rows_per_second > 0
+        assert status.bytes_per_second > 0
+        assert status.bytes_synced == result["bytes_sent"] > 0
+        # An idle cycle keeps the last measurement.
+        batched.sync_now()
+        assert batched.status().rows_per_second == status.rows_per_second
@@ -255,6 +255,20 @@ class TestSuggestPrinter:
         assert results[0]["total_prints"] == 5
 
 
+class TestPrintOutcomeCounts:
+    def test_groups_by_printer_material_file(self, db: KilnDB) -> None:
+        db.save_print_outcome(_outcome(job_id="j1", printer_name="voron", file_hash="aaa", outcome="success"))
+        db.save_print_outcome(_outcome(job_id="j2", printer_name="voron", file_hash="aaa", outcome="failed"))
+        db.save_print_outcome(_outcome(job_id="j3", printer_name="ender3", file_hash="aaa", outcome="success"))
+        rows = {(r["printer_name"], r["file_hash"]): r for r in db.print_outcome_counts()}
+        assert rows[("voron", "aaa")]["total"] == 2
+        assert rows[("voron", "aaa")]["successes"] == 1
+        assert rows[("ender3", "aaa")]["successes"] == 1
+
+    def test_empty(self, db: KilnDB) -> None:
+        assert db.print_outcome_counts() == []
+
+
 class TestDuplicateJobId:
     """Verify duplicate job_id is rejected at the DB level."""
 
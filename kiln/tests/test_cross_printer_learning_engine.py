@@ -11,10 +11,13 @@ Coverage areas:
 - Thread safety
 - Max outcomes eviction
 - Module-level singleton
+- Incremental statistics and bulk loading
 """
 
 from __future__ import annotations
 
+import json
+import random
 import threading
 import time
 from unittest import mock
@@ -28,8 +31,10 @@ from kiln.cross_printer_learning import (
     MaterialInsight,
     PrinterModelInsight,
     PrintOutcome,
+    _histogram_median,
     _mean,
     _median,
+    _RunningStat,
     _std_dev,
     _validate_outcome,
     get_learning_engine,
@@ -924,3 +929,131 @@ class TestStatisticsHelpers:
 
     def test_median_even(self) -> None:
         assert _median([1.0, 2.0, 3.0, 4.0]) == 2.5
+
+
+# ---------------------------------------------------------------------------
+# Incremental statistics
+# ---------------------------------------------------------------------------
+
+
+class TestIncrementalStatistics:
+    """Running statistics stay equal to a full recomputation."""
+
+    def test_running_stat_add_and_remove(self) -> None:
+        rng = random.Random(7)
+        values = [rng.uniform(180, 260) for _ in range(200)]
+        stat = _RunningStat()
+        for v in values:
+            stat.add(v)
+        for v in values[:150]:
+            stat.remove(v)
+        assert stat.count == 50
+        assert stat.mean == pytest.approx(_mean(values[150:]))
+        assert stat.std_dev == pytest.approx(_std_dev(values[150:]))
+
+    def test_removal_residue_clamped_to_zero(self) -> None:
+        rng = random.Random(11)
+        values = [rng.uniform(180, 260) for _ in range(30)] + [200.0] * 6
+        stat = _RunningStat()
+        for v in values:
+            stat.add(v)
+        for v in values[:30]:
+            stat.remove(v)
+        assert stat.count == 6
+        assert stat.std_dev == 0.0
+
+    def test_identical_window_does_not_flag_small_deviation(self) -> None:
+        engine = CrossPrinterLearningEngine(max_outcomes=6)
+        for i, temp in enumerate([180.0, 260.0, 200.0, 240.0, 190.0, 230.0] + [200.0] * 6):
+            engine.record_outcome(_make_outcome(hotend_temp=temp, file_hash=f"{i:064x}"))
+        outcome = _make_outcome(hotend_temp=201.0, file_hash=f"{99:064x}")
+        engine.record_outcome(outcome)
+        assert outcome.is_outlier is False
+
+    def test_histogram_median_matches_median(self) -> None:
+        import collections
+
+        for values in ([200.0], [200.0, 210.0], [195.0, 200.0, 200.0, 215.0, 230.0], [1.0, 1.0, 2.0, 9.0]):
+            assert _histogram_median(collections.Counter(values)) == _median(values)
+
+    def test_insights_track_eviction(self) -> None:
+        rng = random.Random(3)
+        engine = CrossPrinterLearningEngine(max_outcomes=40)
+        models = ["Ender 3", "MK4"]
+        materials = ["PLA", "PETG"]
+        for i in range(150):
+            success = rng.random() < 0.7
+            outcome = _make_outcome(
+                printer_model=models[i % 2],
+                material=materials[(i // 2) % 2],
+                hotend_temp=float(rng.randint(195, 235)),
+                bed_temp=float(rng.randint(55, 80)),
+                success=success,
+                failure_mode=None if success else rng.choice(["clog", "warping"]),
+                file_hash=f"{i:064x}",
+            )
+            with mock.patch("kiln.cross_printer_learning.time.time", return_value=float(i * 10)):
+                engine.record_outcome(outcome)
+
+        kept = [o for o in engine._outcomes if not o.is_outlier]
+        pla = [o for o in kept if o.material == "PLA"]
+        insight = engine.get_material_insights("PLA")
+        assert insight.sample_count == len(pla)
+        assert insight.success_rate == round(sum(o.success for o in pla) / len(pla), 4)
+        ok_temps = [o.hotend_temp for o in pla if o.success]
+        assert insight.recommended_hotend_temp_range == (min(ok_temps), max(ok_temps))
+        failures = sum(1 for o in pla if not o.success)
+        assert sum(f["count"] for f in insight.common_failures) == failures
+
+        rec = engine.get_recommendation("MK4", "PETG")
+        pair_ok = [o.hotend_temp for o in kept if o.printer_model == "MK4" and o.material == "PETG" and o.success]
+        assert rec["recommended_hotend_temp"] == round(_median(pair_ok), 1)
+
+        stats = engine.get_network_stats()
+        assert stats["total_outcomes"] == 40
+        assert stats["overall_success_rate"] == round(sum(o.success for o in engine._outcomes) / 40, 4)
+
+
+class TestBulkLoading:
+    """load_outcomes() and load_from_db()."""
+
+    def test_load_outcomes_bypasses_rate_limit(self) -> None:
+        engine = CrossPrinterLearningEngine(max_outcomes=1000)
+        outcomes = [_make_outcome(file_hash=f"{i:064x}") for i in range(300)]
+        outcomes.append(_make_outcome(file_hash="nope"))
+        assert engine.load_outcomes(outcomes) == 300
+        assert engine.get_network_stats()["total_outcomes"] == 300
+        # Loading does not consume the live rate-limit budget.
+        engine.record_outcome(_make_outcome())
+
+    def test_load_from_db(self, tmp_path) -> None:
+        from kiln.persistence import KilnDB
+
+        db = KilnDB(db_path=str(tmp_path / "kiln.db"))
+        try:
+            rows = [
+                ("MK4", "PLA", {"hotend_temp": 210, "bed_temp": 60}, "success", None),
+                ("MK4", "PLA", {"nozzle_temp": 215, "bed_temp": 60}, "failed", "clog"),
+                ("MK4", "PLA", {"layer_height": 0.2}, "success", None),
+                ("MK4", "PETG", {"hotend_temp": 240, "bed_temp": 80}, "success", None),
+            ]
+            for i, (model, material, settings, outcome, failure) in enumerate(rows):
+                db._conn.execute(
+                    "INSERT INTO print_dna (file_hash, geometric_signature, printer_model, material, "
+                    "settings, outcome, failure_mode, print_time_seconds, timestamp) "
+                    "VALUES (?, 'sig', ?, ?, ?, ?, ?, 600, ?)",
+                    (f"{i:064x}", model, material, json.dumps(settings), outcome, failure, 1000.0 + i),
+                )
+            db._conn.commit()
+
+            engine = CrossPrinterLearningEngine(max_outcomes=100)
+            assert engine.load_from_db(db) == 3
+            insight = engine.get_material_insights("PLA")
+            assert insight.sample_count == 2
+            assert insight.common_failures == [{"failure_mode": "clog", "count": 1}]
+
+            newest_only = CrossPrinterLearningEngine(max_outcomes=100)
+            assert newest_only.load_from_db(db, limit=1) == 1
+            assert newest_only.get_network_stats()["unique_materials"] == 1
+        finally:
+            db.close()
@@ -0,0 +1,246 @@
+"""Tests for the compiled design knowledge snapshot.
+
+Coverage:
+- Compilation output, metadata, and atomic replacement
+- Staleness detection (format version, source content)
+- Cross-indexes (material → patterns, requirement → materials)
+- Regression: every design_intelligence query returns identical
+  results whether served from JSON or from the snapshot
+- Env var override / disable
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+from dataclasses import asdict, is_dataclass
+
+import pytest
+
+import kiln.design_intelligence as di
+from kiln.design_knowledge_snapshot import (
+    _DEFAULT_DATA_DIR,
+    SECTION_FILES,
+    build_material_pattern_index,
+    build_requirement_material_index,
+    compile_snapshot,
+    default_snapshot_path,
+    load_section,
+    main,
+    open_snapshot,
+)
+
+
+@pytest.fixture()
+def snapshot_path(tmp_path):
+    path = tmp_path / "kb.sqlite"
+    compile_snapshot(path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _reset_kb():
+    di._reset_knowledge_base()
+    yield
+    di._reset_knowledge_base()
+
+
+def _normalise(value):
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, list):
+        return [_normalise(v) for v in value]
+    return value
+
+
+def _run_queries() -> dict[str, object]:
+    """Exercise every public query with a spread of inputs."""
+    results: dict[str, object] = {}
+    materials = sorted(di._get_kb().materials)
+    patterns = sorted(di._get_kb().patterns)
+    printers = sorted(di._get_kb().printers)
+
+    for mid in materials + ["unobtainium"]:
+        results[f"material:{mid}"] = di.get_material_profile(mid)
+        results[f"load:{mid}"] = di.estimate_load_capacity(mid, 24.0, 80.0)
+        results[f"load_along:{mid}"] = di.estimate_load_capacity(mid, 24.0, 80.0, load_across_layers=False)
+        results[f"env:{mid}"] = di.check_environment_compatibility(mid, "outdoor")
+        results[f"trouble:{mid}"] = di.troubleshoot_print_issue(mid, "stringing")
+        results[f"trouble_all:{mid}"] = di.troubleshoot_print_issue(mid)
+        results[f"post:{mid}"] = di.get_post_processing(mid)
+        results[f"support:{mid}"] = di.get_support_material_options(mid)
+        results[f"patterns_for:{mid}"] = di.find_patterns_for_material(mid, include_poor=True)
+        results[f"diag:{mid}"] = di.get_print_diagnostic(mid, symptom="warping", printer_id="ender3")
+    for pid in patterns + ["nope"]:
+        results[f"pattern:{pid}"] = di.get_design_pattern(pid)
+    for printer in printers + ["bambu", "unknown_printer"]:
+        results[f"printer:{printer}"] = di.get_printer_design_profile(printer)
+        results[f"compat:{printer}"] = di.check_printer_material_compatibility(printer)
+        results[f"compat_petg:{printer}"] = di.check_printer_material_compatibility(printer, "petg")
+    for a, b in [("pla", "pva"), ("pla", "tpu"), ("abs", "hips"), ("petg", "pla")]:
+        results[f"multi:{a}:{b}"] = di.check_multi_material_compatibility(a, b)
+    for text in [
+        "outdoor shelf bracket that holds 10 lbs",
+        "food safe cup",
+        "phone mount for car dashboard, survives summer heat",
+        "flexible watertight gasket with snap fit",
+        "",
+    ]:
+        results[f"match:{text}"] = di.match_requirements(text)
+        results[f"recommend:{text}"] = di.recommend_material_for_design(text)
+        results[f"recommend_closed:{text}"] = di.recommend_material_for_design(
+            text, printer_has_enclosure=True, max_hotend_temp_c=260, supported_materials=["pla", "petg", "abs"]
+        )
+        results[f"brief:{text}"] = di.get_design_constraints(text, printer_model="ender3")
+        results[f"brief_mat:{text}"] = di.get_design_constraints(text, material="asa")
+    for use_case in ["enclosures", "gears", "hinges"]:
+        results[f"use_case:{use_case}"] = di.find_patterns_for_use_case(use_case)
+    results["list_materials"] = di.list_material_profiles()
+    results["list_patterns"] = di.list_design_patterns()
+    results["list_printers"] = di.list_printer_profiles()
+    results["list_trouble"] = di.list_troubleshooting_materials()
+    results["list_compat"] = di.list_compatibility_printers()
+    results["list_c_materials"] = di.list_construction_materials()
+    results["list_c_patterns"] = di.list_construction_patterns()
+    results["list_c_requirements"] = di.list_construction_requirements()
+    results["c_material"] = di.get_construction_material("standard_concrete_mix")
+    for text in ["affordable housing for 50 families", "emergency shelter"]:
+        results[f"c_match:{text}"] = di.match_construction_requirements(text)
+        results[f"c_brief:{text}"] = di.get_construction_design_brief(text)
+    return {k: _normalise(v) for k, v in results.items()}
+
+
+class TestCompile:
+    def test_info_and_counts(self, tmp_path):
+        info = compile_snapshot(tmp_path / "kb.sqlite")
+        assert info.size_bytes > 0
+        assert info.entry_counts["materials"] == len(load_section(_DEFAULT_DATA_DIR, "materials"))
+        assert set(info.entry_counts) == set(SECTION_FILES)
+
+    def test_creates_parent_dirs(self, tmp_path):
+        path = tmp_path / "a" / "b" / "kb.sqlite"
+        compile_snapshot(path)
+        assert path.is_file()
+
+    def test_overwrite_leaves_no_temp_files(self, tmp_path):
+        path = tmp_path / "kb.sqlite"
+        compile_snapshot(path)
+        compile_snapshot(path)
+        assert [p.name for p in tmp_path.iterdir()] == ["kb.sqlite"]
+
+    def test_main_build_step(self, tmp_path, capsys):
+        path = tmp_path / "kb.sqlite"
+        assert main(["-o", str(path)]) == 0
+        assert json.loads(capsys.readouterr().out)["path"] == str(path)
+
+
+class TestOpen:
+    def test_fresh_snapshot_opens(self, snapshot_path):
+        snapshot = open_snapshot(snapshot_path)
+        assert snapshot is not None
+        assert snapshot.get("materials", "pla")["display_name"]
+        assert snapshot.get("materials", "_meta") is None
+        snapshot.close()
+
+    def test_missing_file(self, tmp_path):
+        assert open_snapshot(tmp_path / "nope.sqlite") is None
+
+    def test_garbage_file(self, tmp_path):
+        path = tmp_path / "kb.sqlite"
+        path.write_bytes(b"not a database")
+        assert open_snapshot(path) is None
+
+    def test_stale_source_rejected(self, tmp_path):
+        data_dir = tmp_path / "src"
+        shutil.copytree(_DEFAULT_DATA_DIR, data_dir)
+        path = tmp_path / "kb.sqlite"
+        compile_snapshot(path, data_dir=data_dir)
+        assert open_snapshot(path, data_dir=data_dir) is not None
+
+        materials = data_dir / "materials.json"
+        raw = json.loads(materials.read_text(encoding="utf-8"))
+        raw["pla"]["display_name"] = "Changed"
+        materials.write_text(json.dumps(raw), encoding="utf-8")
+        assert open_snapshot(path, data_dir=data_dir) is None
+
+    def test_touched_but_unchanged_source_accepted(self, tmp_path):
+        data_dir = tmp_path / "src"
+        shutil.copytree(_DEFAULT_DATA_DIR, data_dir)
+        path = tmp_path / "kb.sqlite"
+        compile_snapshot(path, data_dir=data_dir)
+        (data_dir / "materials.json").touch()
+        assert open_snapshot(path, data_dir=data_dir) is not None
+
+    def test_format_version_mismatch_rejected(self, snapshot_path):
+        conn = sqlite3.connect(snapshot_path)
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'format_version'")
+        conn.commit()
+        conn.close()
+        assert open_snapshot(snapshot_path) is None
+
+
+class TestCrossIndexes:
+    def test_material_patterns_match_json(self, snapshot_path):
+        snapshot = open_snapshot(snapshot_path)
+        index = build_material_pattern_index(load_section(_DEFAULT_DATA_DIR, "patterns"))
+        assert index
+        for material, pairs in index.items():
+            assert snapshot.patterns_for_material(material) == pairs
+        snapshot.close()
+
+    def test_material_patterns_best_rating_first(self):
+        order = {"excellent": 0, "good": 1, "poor": 2, "avoid": 3}
+        index = build_material_pattern_index(load_section(_DEFAULT_DATA_DIR, "patterns"))
+        for pairs in index.values():
+            ranks = [order[r] for _, r in pairs]
+            assert ranks == sorted(ranks)
+
+    def test_requirement_materials_match_json(self, snapshot_path):
+        snapshot = open_snapshot(snapshot_path)
+        index = build_requirement_material_index(load_section(_DEFAULT_DATA_DIR, "requirements"))
+        for req_id, relations in index.items():
+            assert snapshot.materials_for_requirement(req_id) == relations
+        snapshot.close()
+
+    def test_find_patterns_for_material_excludes_poor_by_default(self):
+        all_patterns = {p.pattern_id for p in di.find_patterns_for_material("pla", include_poor=True)}
+        good_patterns = {p.pattern_id for p in di.find_patterns_for_material("pla")}
+        assert good_patterns <= all_patterns
+        for pid in good_patterns:
+            rating_lists = di.get_design_pattern(pid).material_compatibility
+            assert "pla" in rating_lists.get("excellent", []) + rating_lists.get("good", [])
+
+
+class TestRegression:
+    def test_identical_query_results(self, snapshot_path, monkeypatch):
+        monkeypatch.setattr(di, "_kb", di._DesignKnowledgeBase(use_snapshot=False))
+        assert di._get_kb().source == "json"
+        from_json = _run_queries()
+
+        di._reset_knowledge_base()
+        monkeypatch.setattr(di, "_kb", di._DesignKnowledgeBase(snapshot_path=snapshot_path))
+        assert di._get_kb().source == "snapshot"
+        from_snapshot = _run_queries()
+
+        assert from_json.keys() == from_snapshot.keys()
+        for key in from_json:
+            assert from_snapshot[key] == from_json[key], key
+
+    def test_point_lookup_does_not_decode_section(self, snapshot_path):
+        kb = di._DesignKnowledgeBase(snapshot_path=snapshot_path)
+        assert kb.lookup("materials", "petg") is not None
+        assert "materials" not in kb._sections
+
+
+class TestSnapshotPath:
+    def test_env_override(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("KILN_DESIGN_KB_SNAPSHOT", str(tmp_path / "x.sqlite"))
+        assert default_snapshot_path() == tmp_path / "x.sqlite"
+
+    def test_env_disable(self, monkeypatch):
+        monkeypatch.setenv("KILN_DESIGN_KB_SNAPSHOT", "off")
+        assert default_snapshot_path() is None
+        assert open_snapshot() is None
+        with pytest.raises(ValueError):
+            compile_snapshot()
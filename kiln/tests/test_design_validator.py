@@ -2,7 +2,7 @@
 
 Coverage areas:
 - Individual validation checks (wall thickness, overhang, stability,
-  bridge length, bed adhesion)
+  bridge length, bed adhesion, support volume)
 - Full DesignValidationReport construction and aggregation
 - validation_to_feedback conversion to PrintFeedback items
 - design_validation_to_feedback bridge function in generation_feedback
@@ -26,6 +26,7 @@ from kiln.design_validator import (
     _check_bridge_length,
     _check_overhang_angle,
     _check_stability,
+    _check_support_volume,
     _check_wall_thickness,
     _resolve_wall_thickness,
     validate_design,
@@ -344,6 +345,46 @@ class TestBedAdhesionCheck:
         assert check.check_name == "bed_adhesion"
 
 
+# ---------------------------------------------------------------------------
+# TestSupportVolumeCheck
+# ---------------------------------------------------------------------------
+
+
+class TestSupportVolumeCheck:
+    def test_light_supports_pass(self):
+        check = _check_support_volume(5.0)
+        assert check.passed
+        assert check.check_name == "support_volume"
+
+    def test_heavy_supports_warn_with_map_figures(self):
+        check = _check_support_volume(35.0, footprint_mm2=420.0, max_height_mm=18.0)
+        assert not check.passed
+        assert check.severity == "warning"
+        assert "420 mm2" in check.fix_suggestion
+        assert "18.0 mm" in check.fix_suggestion
+
+    def test_heavy_supports_generate_printability_feedback(self):
+        check = _check_support_volume(35.0)
+        report = DesignValidationReport(
+            file_path="/fake.stl",
+            requirements_text="test",
+            material=None,
+            overall_pass=True,
+            checks=[check],
+            warning_count=1,
+        )
+        feedback = validation_to_feedback(report, "a shelf bracket")
+        assert len(feedback) == 1
+        assert feedback[0].feedback_type.value == "printability"
+        assert any("45 degrees" in c for c in feedback[0].constraints)
+
+    def test_validate_design_includes_support_check(self, cube_stl):
+        report = validate_design(cube_stl, "simple cube")
+        support = [c for c in report.checks if c.check_name == "support_volume"]
+        assert len(support) == 1
+        assert support[0].passed
+
+
 # ---------------------------------------------------------------------------
 # TestResolveWallThickness
 # ---------------------------------------------------------------------------
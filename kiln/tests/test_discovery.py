@@ -7,6 +7,7 @@ Covers:
 - discover_printers with all methods mocked
 - _try_mdns when zeroconf is not installed
 - _try_http_probe with mocked concurrent futures
+- scan_subnets: CIDR expansion, the TCP sweep and sweep -> HTTP staging
 - Deduplication (same host found by multiple methods)
 - Timeout handling
 - probe_host with connection refused
@@ -14,9 +15,11 @@ Covers:
 
 from __future__ import annotations
 
+import socket
 import time
 from unittest.mock import MagicMock, patch
 
+import pytest
 import requests
 import responses
 
@@ -24,10 +27,13 @@ from kiln.discovery import (
     DiscoveredPrinter,
     _deduplicate,
     _detect_subnet,
+    _expand_hosts,
+    _sweep_open_ports,
     _try_http_probe,
     _try_mdns,
     discover_printers,
     probe_host,
+    scan_subnets,
 )
 
 # ---------------------------------------------------------------------------
@@ -374,9 +380,19 @@ class TestTryMdns:
 # ---------------------------------------------------------------------------
 
 
+def _report_all_open(targets, **kwargs):
+    """Stand-in for the TCP sweep that reports every target as open."""
+    return list(targets)
+
+
 class TestTryHttpProbe:
     """Tests for _try_http_probe with mocked HTTP requests."""
 
+    @pytest.fixture(autouse=True)
+    def _all_ports_open(self):
+        with patch("kiln.discovery._sweep_open_ports", side_effect=_report_all_open):
+            yield
+
     @responses.activate
     def test_finds_octoprint_on_subnet(self):
         """Discovers an OctoPrint instance on the subnet."""
@@ -458,6 +474,88 @@ class TestTryHttpProbe:
         assert "moonraker" in types
 
 
+# ---------------------------------------------------------------------------
+# scan_subnets
+# ---------------------------------------------------------------------------
+
+
+class TestScanSubnets:
+    """Tests for the two-stage subnet scanner."""
+
+    def test_expand_hosts_accepts_prefixes_and_cidr(self):
+        hosts = _expand_hosts(["192.168.1", "10.0.0.0/30", "10.0.0.1", "172.16.0.9"])
+        assert len(hosts) == 254 + 2 + 1
+        assert hosts[0] == "192.168.1.1"
+        assert hosts[-3:] == ["10.0.0.1", "10.0.0.2", "172.16.0.9"]
+        assert len(_expand_hosts(["10.1.0.0/22"])) == 1022
+
+    def test_expand_hosts_rejects_huge_ranges(self):
+        with pytest.raises(ValueError):
+            _expand_hosts(["10.0.0.0/8"])
+
+    def test_sweep_finds_listening_port(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(8)
+        open_port = listener.getsockname()[1]
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind(("127.0.0.1", 0))
+        closed_port = closed.getsockname()[1]
+        closed.close()
+        try:
+            found = _sweep_open_ports(
+                [("127.0.0.1", open_port), ("127.0.0.1", closed_port)],
+                connect_timeout=1.0,
+                budget=2.0,
+            )
+        finally:
+            listener.close()
+        assert found == [("127.0.0.1", open_port)]
+
+    @responses.activate
+    def test_http_probes_only_open_ports(self):
+        responses.add(
+            responses.GET,
+            "http://10.0.0.2:7125/server/info",
+            json={"klippy_state": "ready", "hostname": "voron"},
+            status=200,
+        )
+        streamed: list[DiscoveredPrinter] = []
+
+        def _sweep(targets, **kwargs):
+            assert len(targets) == 2 * 5
+            return [("10.0.0.2", 7125)]
+
+        with patch("kiln.discovery._sweep_open_ports", side_effect=_sweep):
+            printers, timings = scan_subnets("10.0.0.0/30", timeout=5.0, on_found=streamed.append)
+
+        assert [(p.host, p.port, p.printer_type) for p in printers] == [("10.0.0.2", 7125, "moonraker")]
+        assert streamed == printers
+        assert len(responses.calls) == 1
+        assert timings.hosts == 2
+        assert timings.open_ports == 1
+        assert timings.identified == 1
+        assert timings.total_seconds >= timings.sweep_seconds
+
+    def test_discover_streams_each_printer_once(self):
+        dup = DiscoveredPrinter(host="10.0.0.2", port=80, printer_type="octoprint")
+
+        def _mdns(timeout, on_found=None):
+            on_found(dup)
+            return [dup]
+
+        def _http(subnet, timeout, on_found=None):
+            on_found(dup)
+            return [dup]
+
+        streamed: list[DiscoveredPrinter] = []
+        with patch("kiln.discovery._try_mdns", side_effect=_mdns), \
+             patch("kiln.discovery._try_http_probe", side_effect=_http):
+            results = discover_printers(timeout=1.0, subnet="10.0.0", on_found=streamed.append)
+        assert len(streamed) == 1
+        assert len(results) == 1
+
+
 # ---------------------------------------------------------------------------
 # discover_printers (integration with mocked methods)
 # ---------------------------------------------------------------------------
@@ -662,23 +760,26 @@ class TestTimeoutHandling:
             results = discover_printers(timeout=0.001)
         assert isinstance(results, list)
 
-    def test_timeout_skips_later_methods(self):
-        """If deadline passes during first method, later methods are skipped."""
-        def slow_mdns(timeout: float) -> list:
-            # Simulate slow mDNS that uses up the entire timeout
+    def test_methods_run_concurrently(self):
+        """mDNS and the subnet scan overlap instead of running back to back."""
+        def slow_mdns(timeout: float, on_found=None) -> list:
+            time.sleep(0.5)
+            return []
+
+        def slow_http(subnet, timeout: float, on_found=None) -> list:
+            time.sleep(0.5)
             return []
 
         with patch("kiln.discovery._try_mdns", side_effect=slow_mdns), \
-             patch("kiln.discovery._try_http_probe") as mock_http, \
-             patch("kiln.discovery._detect_subnet", return_value="192.168.1"), \
-             patch("kiln.discovery.time.monotonic") as mock_monotonic:
-            # First call: start time. Second call: within deadline.
-            # Third call (before http_probe): past deadline.
-            mock_monotonic.side_effect = [0.0, 0.0, 100.0]
+             patch("kiln.discovery._try_http_probe", side_effect=slow_http) as mock_http, \
+             patch("kiln.discovery._detect_subnet", return_value="192.168.1"):
+            start = time.monotonic()
             results = discover_printers(timeout=5.0)
+            elapsed = time.monotonic() - start
 
-        mock_http.assert_not_called()
+        mock_http.assert_called_once()
         assert results == []
+        assert elapsed < 0.9
 
     def test_probe_host_timeout_parameter_respected(self):
         """probe_host passes the timeout to requests."""
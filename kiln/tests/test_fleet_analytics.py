@@ -11,6 +11,7 @@ import time
 
 import pytest
 
+import kiln.fleet_analytics as fleet_analytics_mod
 from kiln.fleet_analytics import (
     FleetAnalytics,
     TimeSeriesPoint,
@@ -689,3 +690,87 @@ class TestEventRecording:
         pa = analytics.get_printer_analytics("p1")
         assert pa.printer_model == "Prusa MK4"
         assert pa.current_state == "printing"
+
+
+# ---------------------------------------------------------------------------
+# Rolling aggregates
+# ---------------------------------------------------------------------------
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    # 2023-11-14 22:13:20 UTC: deliberately not aligned to a minute or hour.
+    fake = _Clock(1_700_000_000.0 + 17.0)
+    monkeypatch.setattr(fleet_analytics_mod, "time", fake)
+    return fake
+
+
+class TestRollingAggregates:
+    """Windows and trends are served from minute/hour/day rollups."""
+
+    def test_raw_records_evicted_after_rollup(self, analytics: FleetAnalytics, clock: _Clock) -> None:
+        _register_printer(analytics, "p1", "printing")
+        for i in range(10):
+            _record_job(analytics, f"j{i}", "p1", success=i % 5 != 0, recorded_at=clock.now - 60)
+        analytics.record_error("p1", "nozzle clog", timestamp=clock.now - 60)
+        analytics.record_revenue(40.0, timestamp=clock.now - 60)
+
+        clock.now += 2 * 3600
+        _register_printer(analytics, "p1", "idle")
+
+        assert analytics._job_records == []
+        assert analytics._error_records == []
+        assert analytics._revenue_records == []
+        snap = analytics.get_fleet_snapshot()
+        assert snap.total_jobs_today == 10
+        assert snap.successful_jobs_today == 8
+        assert snap.revenue_today == pytest.approx(40.0)
+        pa = analytics.get_printer_analytics("p1")
+        assert pa.error_count_24h == 1
+        assert pa.filament_used_24h_mm == pytest.approx(50000.0)
+
+    def test_window_edges(self, analytics: FleetAnalytics, clock: _Clock) -> None:
+        _register_printer(analytics, "p1", "idle")
+        _record_job(analytics, "in-24h", "p1", recorded_at=clock.now - 86400 + 120)
+        _record_job(analytics, "out-24h", "p1", recorded_at=clock.now - 86400 - 120)
+        _record_job(analytics, "in-30d", "p1", recorded_at=clock.now - 20 * 86400)
+        _record_job(analytics, "expired", "p1", recorded_at=clock.now - 40 * 86400)
+
+        assert analytics.get_fleet_snapshot().total_jobs_today == 1
+        assert analytics.generate_report("7d").fleet_snapshot.total_jobs_today == 2
+        assert analytics.generate_report("30d").fleet_snapshot.total_jobs_today == 3
+
+    def test_trend_buckets(self, analytics: FleetAnalytics, clock: _Clock) -> None:
+        _register_printer(analytics, "p1", "idle")
+        _record_job(analytics, "a", "p1", success=True, recorded_at=clock.now - 30 * 60)
+        _record_job(analytics, "b", "p1", success=False, recorded_at=clock.now - 30 * 60)
+        _record_job(analytics, "c", "p1", success=True, recorded_at=clock.now - 5 * 3600 + 600)
+        analytics.record_revenue(12.5, timestamp=clock.now - 5 * 3600 + 600)
+
+        report = analytics.generate_report("24h")
+        rates = [p.value for p in report.success_rate_history]
+        revenue = [p.value for p in report.revenue_history]
+        assert len(rates) == 24
+        assert rates[-1] == pytest.approx(50.0)
+        assert rates[-5] == pytest.approx(100.0)
+        assert sum(1 for r in rates if r) == 2
+        assert revenue[-5] == pytest.approx(12.5)
+        assert sum(revenue) == pytest.approx(12.5)
+        assert report.material_breakdown == {"PLA": 3}
+
+    def test_utilization_counts_unique_printers(self, analytics: FleetAnalytics, clock: _Clock) -> None:
+        for i in range(6):
+            analytics.record_printer_state("p1", "printing", timestamp=clock.now - 600 + i * 60)
+            analytics.record_printer_state("p2", "idle", timestamp=clock.now - 600 + i * 60)
+
+        points = analytics.get_utilization_trend(period="24h", interval_minutes=60)
+        assert points[-1].value == pytest.approx(50.0)
+        assert analytics.get_printer_analytics("p1").uptime_pct == pytest.approx(100.0)
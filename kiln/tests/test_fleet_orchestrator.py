@@ -11,6 +11,7 @@ Covers:
 - Purge: completed jobs, time-based cutoff
 - Properties: job_count, queued_count, active_count
 - PrinterSelector: preferred printer, failed printer filtering
+- Batched assignment: single fleet snapshot, strategy selectors, metrics
 - Singleton: get/reset
 """
 
@@ -22,9 +23,14 @@ import pytest
 
 from kiln.fleet_orchestrator import (
     AssignmentResult,
+    BuildVolumeSelector,
+    CompositeSelector,
     FleetOrchestrator,
+    FleetSnapshot,
     FleetUtilization,
     JobNotFoundError,
+    LoadBalancingSelector,
+    MaterialSelector,
     OrchestratedJob,
     OrchestratedJobStatus,
     OrchestratorError,
@@ -510,6 +516,161 @@ class TestOrchestratedJobDataclass:
         assert job.elapsed_seconds is None
 
 
+# ---------------------------------------------------------------------------
+# Batched assignment
+# ---------------------------------------------------------------------------
+
+
+def _make_tagged_orch(printers: dict[str, dict[str, str]], selector=None) -> FleetOrchestrator:
+    registry = MagicMock()
+    registry.get_idle_printers.return_value = list(printers)
+    registry.get_metadata.side_effect = lambda name: MagicMock(tags=printers[name])
+    return FleetOrchestrator(registry=registry, event_bus=MagicMock(), selector=selector)
+
+
+class TestBatchedAssignment:
+
+    def test_single_fleet_query_per_round(self):
+        orch = _make_orch(idle_printers=[f"p{i}" for i in range(5)])
+        for i in range(8):
+            orch.submit_job(f"/path/{i}.gcode")
+        results = orch.assign_jobs()
+        assert orch._registry.get_idle_printers.call_count == 1
+        assert sum(r.success for r in results) == 5
+        assert {r.message for r in results if not r.success} == {"No idle printers remaining"}
+        metrics = orch.get_assignment_metrics()
+        assert metrics.fleet_queries == 1
+        assert metrics.fleet_queries_avoided == 7
+        assert metrics.jobs_assigned == 5
+        assert metrics.to_dict()["avg_latency_ms"] >= 0
+
+    def test_no_printer_double_booked(self):
+        orch = _make_orch(idle_printers=["voron", "ender"])
+        for i in range(4):
+            orch.submit_job(f"/path/{i}.gcode")
+        results = orch.assign_jobs()
+        names = [r.printer_name for r in results if r.success]
+        assert sorted(names) == ["ender", "voron"]
+
+    def test_assigned_printer_excluded_from_next_round(self):
+        orch = _make_orch(idle_printers=["voron", "ender"])
+        orch.submit_job("/path/a.gcode")
+        orch.assign_jobs()
+        job_b = orch.submit_job("/path/b.gcode")
+        results = orch.assign_jobs()
+        assert results[0].success is True
+        assert orch.get_job_status(job_b)["printer_name"] == "voron"
+
+    def test_preferred_printer_honoured(self):
+        orch = _make_orch(idle_printers=["ender", "voron"])
+        orch.submit_job("/path/a.gcode")
+        job_b = orch.submit_job("/path/b.gcode", preferred_printer="ender")
+        orch.assign_jobs()
+        assert orch.get_job_status(job_b)["printer_name"] == "ender"
+
+    def test_high_priority_not_displaced(self):
+        orch = _make_tagged_orch({"voron": {"materials": "PLA"}}, selector=MaterialSelector())
+        low = orch.submit_job("/path/low.gcode", priority=1, metadata={"material": "PLA"})
+        high = orch.submit_job("/path/high.gcode", priority=9, metadata={"material": "PLA"})
+        orch.assign_jobs()
+        assert orch.get_job_status(high)["status"] == "assigned"
+        assert orch.get_job_status(low)["status"] == "queued"
+
+    def test_priority_beats_preferred_printer_bonus(self):
+        orch = _make_tagged_orch(
+            {"a-pla": {"materials": "PLA"}, "b-petg": {"materials": "PETG"}},
+            selector=MaterialSelector(),
+        )
+        high = orch.submit_job("/path/high.gcode", priority=9, metadata={"material": "PLA"})
+        low = orch.submit_job(
+            "/path/low.gcode", priority=1, preferred_printer="a-pla", metadata={"material": "PLA"}
+        )
+        results = orch.assign_jobs()
+        assert orch.get_job_status(high)["printer_name"] == "a-pla"
+        assert orch.get_job_status(low)["status"] == "queued"
+        assert results[1].message == "No suitable idle printer available"
+
+    def test_assign_job_uses_strategy_rank(self):
+        orch = _make_tagged_orch(
+            {"a-petg": {"materials": "PETG"}, "b-pla": {"materials": "PLA"}},
+            selector=MaterialSelector(),
+        )
+        job = orch.submit_job("/path/a.gcode", metadata={"material": "PLA"})
+        result = orch.assign_job(job)
+        assert result.printer_name == "b-pla"
+
+    def test_material_selector(self):
+        orch = _make_tagged_orch(
+            {"a-petg": {"materials": "PETG"}, "b-pla": {"materials": "pla, petg"}},
+            selector=MaterialSelector(),
+        )
+        job = orch.submit_job("/path/a.gcode", metadata={"material": "PLA"})
+        orch.assign_jobs()
+        assert orch.get_job_status(job)["printer_name"] == "b-pla"
+
+    def test_material_selector_excludes_incompatible(self):
+        orch = _make_tagged_orch({"a": {"materials": "PETG"}}, selector=MaterialSelector())
+        orch.submit_job("/path/a.gcode", metadata={"material": "TPU"})
+        results = orch.assign_jobs()
+        assert results[0].success is False
+        assert "No suitable" in results[0].message
+
+    def test_build_volume_prefers_tightest_fit(self):
+        orch = _make_tagged_orch(
+            {"big": {"build_volume": "350x350x350"}, "small": {"build_volume": "220x220x250"}, "tiny": {"build_volume": "100x100x100"}},
+            selector=BuildVolumeSelector(),
+        )
+        job = orch.submit_job("/path/a.gcode", metadata={"min_build_volume": [200, 200, 200]})
+        orch.assign_jobs()
+        assert orch.get_job_status(job)["printer_name"] == "small"
+
+    def test_jobs_matched_to_fit(self):
+        """Batched matching puts the big job on the big printer even
+        though the small job comes first."""
+        orch = _make_tagged_orch(
+            {"a-big": {"build_volume": "350x350x350"}, "b-small": {"build_volume": "220x220x250"}},
+            selector=BuildVolumeSelector(),
+        )
+        small = orch.submit_job("/path/small.gcode", priority=5, metadata={"min_build_volume": [50, 50, 50]})
+        big = orch.submit_job("/path/big.gcode", metadata={"min_build_volume": [300, 300, 300]})
+        orch.assign_jobs()
+        assert orch.get_job_status(small)["printer_name"] == "b-small"
+        assert orch.get_job_status(big)["printer_name"] == "a-big"
+
+    def test_load_balancing_prefers_less_used(self):
+        orch = _make_tagged_orch({"a": {}, "b": {}}, selector=LoadBalancingSelector())
+        first = orch.submit_job("/path/1.gcode", preferred_printer="a")
+        orch.assign_jobs()
+        orch.mark_printing(first)
+        orch.mark_completed(first)
+        job = orch.submit_job("/path/2.gcode")
+        orch.assign_jobs()
+        assert orch.get_job_status(job)["printer_name"] == "b"
+
+    def test_composite_selector_excludes_if_any_excludes(self):
+        snapshot = FleetSnapshot(idle_printers=["a"], materials={"a": ["PETG"]})
+        job = OrchestratedJob(job_id="j", file_path="/p", metadata={"material": "PLA"})
+        selector = CompositeSelector(LoadBalancingSelector(), MaterialSelector())
+        assert selector.score(job, "a", snapshot) is None
+        assert CompositeSelector(LoadBalancingSelector()).score(job, "a", snapshot) == 1.0
+
+    def test_fleet_query_failure(self):
+        registry = MagicMock()
+        registry.get_idle_printers.side_effect = RuntimeError("network down")
+        orch = FleetOrchestrator(registry=registry, event_bus=MagicMock())
+        orch.submit_job("/path/a.gcode")
+        results = orch.assign_jobs()
+        assert results[0].success is False
+        assert "network down" in results[0].message
+
+    def test_explicit_snapshot_skips_fleet_query(self):
+        orch = _make_orch(idle_printers=["voron"])
+        orch.submit_job("/path/a.gcode")
+        results = orch.assign_jobs(FleetSnapshot(idle_printers=["ender"]))
+        assert results[0].printer_name == "ender"
+        orch._registry.get_idle_printers.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Singleton
 # ---------------------------------------------------------------------------
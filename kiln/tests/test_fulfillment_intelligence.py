@@ -15,6 +15,8 @@ Coverage areas:
       min_wall_mm, search text, combined filters, edge cases, to_dict
     - BatchQuoteItem / BatchQuoteResult / BatchQuote: to_dict, labels
     - batch_quote: multi-item quoting, totals, failure counting, empty
+    - QuoteEngine: concurrency, per-provider caps, deadline partial results,
+      hedged retries, quote cache read-through, latency stats
     - RetryResult: to_dict with/without optional fields
     - place_order_with_retry: retry logic, fallback providers, error collection,
       default provider from list_providers, health recording
@@ -42,6 +44,7 @@ from kiln.fulfillment.base import (
     OrderResult,
     OrderStatus,
     Quote,
+    QuoteRequest,
 )
 from kiln.fulfillment.intelligence import (
     BatchQuote,
@@ -52,9 +55,12 @@ from kiln.fulfillment.intelligence import (
     MaterialFilter,
     OrderHistory,
     ProviderHealth,
+    ProviderLatencyStats,
     ProviderQuote,
     ProviderStatus,
     QuoteComparison,
+    QuoteEngine,
+    QuoteEngineConfig,
     RetryResult,
     batch_quote,
     compare_providers,
@@ -64,6 +70,7 @@ from kiln.fulfillment.intelligence import (
     get_order_history,
     place_order_with_retry,
 )
+from kiln.quote_cache import QuoteCache
 
 # ---------------------------------------------------------------------------
 # Fixtures — reset module-level singletons between tests
@@ -1848,3 +1855,192 @@ class TestInsuranceOptions:
         assert "currency" in d
         assert "coverage_percent" in d
         assert "max_coverage" in d
+
+
+# ---------------------------------------------------------------------------
+# TestQuoteEngine
+# ---------------------------------------------------------------------------
+
+
+def _slow_provider(name: str, delay: float, *, price: float = 10.0, calls: list | None = None) -> MagicMock:
+    prov = _mock_provider(name=name, display_name=name.title())
+
+    def _quote(req):
+        if calls is not None:
+            calls.append(time.monotonic())
+        time.sleep(delay)
+        return _make_quote(provider=name, total_price=price)
+
+    prov.get_quote.side_effect = _quote
+    return prov
+
+
+def _engine(**overrides) -> QuoteEngine:
+    config = QuoteEngineConfig(use_cache=False, hedge_after_seconds=None, **overrides)
+    return QuoteEngine(config, cache=QuoteCache())
+
+
+class TestQuoteEngine:
+    """QuoteEngine: concurrent quoting, caps, deadline, hedging, cache."""
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_providers_quoted_concurrently(self, mock_monitor, mock_get):
+        mock_monitor.return_value = HealthMonitor()
+        providers = {n: _slow_provider(n, 0.2) for n in ("a", "b", "c")}
+        mock_get.side_effect = lambda n: providers[n]
+
+        start = time.monotonic()
+        result = compare_providers("x.stl", "pla", providers=["a", "b", "c"], engine=_engine())
+        assert time.monotonic() - start < 0.5
+        assert all(q.quote is not None for q in result.quotes)
+        assert [s.provider_name for s in result.provider_stats] == ["a", "b", "c"]
+        assert result.provider_stats[0].successes == 1
+        assert result.provider_stats[0].p50_ms >= 200
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_per_provider_concurrency_cap(self, mock_monitor, mock_get):
+        mock_monitor.return_value = HealthMonitor()
+        active = []
+        peak = []
+        lock = threading.Lock()
+        prov = _mock_provider(name="prov")
+
+        def _quote(req):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return _make_quote()
+
+        prov.get_quote.side_effect = _quote
+        mock_get.return_value = prov
+
+        items = [BatchQuoteItem(file_path=f"/{i}.stl", material_id="pla") for i in range(8)]
+        result = batch_quote(items, provider_name="prov", engine=_engine(max_concurrency_per_provider=2))
+        assert result.successful_count == 8
+        assert max(peak) == 2
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_deadline_returns_partial_results(self, mock_monitor, mock_get):
+        mock_monitor.return_value = HealthMonitor()
+        providers = {"fast": _slow_provider("fast", 0.0, price=20.0), "slow": _slow_provider("slow", 2.0, price=5.0)}
+        mock_get.side_effect = lambda n: providers[n]
+
+        start = time.monotonic()
+        result = compare_providers("x.stl", "pla", providers=["fast", "slow"], engine=_engine(deadline_seconds=0.3))
+        assert time.monotonic() - start < 1.0
+        assert result.cheapest == "fast"
+        slow = next(q for q in result.quotes if q.provider_name == "slow")
+        assert "deadline" in slow.error
+        assert result.provider_stats[1].timeouts == 1
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_slow_request_is_hedged(self, mock_monitor, mock_get):
+        mock_monitor.return_value = HealthMonitor()
+        calls: list[float] = []
+        prov = _mock_provider(name="prov")
+
+        def _quote(req):
+            calls.append(time.monotonic())
+            # First call hangs, the hedged duplicate answers quickly.
+            time.sleep(2.0 if len(calls) == 1 else 0.0)
+            return _make_quote(total_price=7.0)
+
+        prov.get_quote.side_effect = _quote
+        mock_get.return_value = prov
+
+        engine = QuoteEngine(QuoteEngineConfig(use_cache=False, hedge_after_seconds=0.1), cache=QuoteCache())
+        start = time.monotonic()
+        result = compare_providers("x.stl", "pla", providers=["prov"], engine=engine)
+        assert time.monotonic() - start < 1.0
+        assert result.quotes[0].quote.total_price == 7.0
+        assert len(calls) == 2
+        assert result.provider_stats[0].hedged == 1
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_requests_queued_on_cap_are_not_hedged(self, mock_monitor, mock_get):
+        mock_monitor.return_value = HealthMonitor()
+        prov = _mock_provider(name="prov")
+
+        def _quote(req):
+            time.sleep(0.15)
+            return _make_quote()
+
+        prov.get_quote.side_effect = _quote
+        mock_get.return_value = prov
+
+        config = QuoteEngineConfig(use_cache=False, hedge_after_seconds=0.25, max_concurrency_per_provider=1)
+        tasks = [("prov", QuoteRequest(file_path=f"/{i}.stl", material_id="pla")) for i in range(3)]
+        outcomes, stats = QuoteEngine(config, cache=QuoteCache()).run(tasks, providers={"prov": prov})
+        assert all(o.quote is not None and not o.hedged for o in outcomes)
+        assert stats["prov"].hedged == 0
+        assert prov.get_quote.call_count == 3
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_cache_read_through_and_write_back(self, mock_monitor, mock_get, tmp_path):
+        mock_monitor.return_value = HealthMonitor()
+        model = tmp_path / "part.stl"
+        model.write_bytes(b"solid part")
+        prov = _mock_provider(name="prov", display_name="Prov", quote=_make_quote(quote_id="q-9", total_price=12.0))
+        mock_get.return_value = prov
+
+        cache = QuoteCache()
+        engine = QuoteEngine(QuoteEngineConfig(hedge_after_seconds=None), cache=cache)
+        first = compare_providers(str(model), "pla", providers=["prov"], engine=engine)
+        second = compare_providers(str(model), "pla", providers=["prov"], engine=engine)
+
+        assert prov.get_quote.call_count == 1
+        assert first.quotes[0].cached is False
+        assert second.quotes[0].cached is True
+        assert second.quotes[0].quote.quote_id == "q-9"
+        assert second.quotes[0].provider_display_name == "Prov"
+        assert second.provider_stats[0].cache_hits == 1
+
+        # Changed model content misses the cache.
+        model.write_bytes(b"solid other part")
+        compare_providers(str(model), "pla", providers=["prov"], engine=engine)
+        assert prov.get_quote.call_count == 2
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_expired_provider_quote_not_served_from_cache(self, mock_monitor, mock_get, tmp_path):
+        mock_monitor.return_value = HealthMonitor()
+        model = tmp_path / "part.stl"
+        model.write_bytes(b"solid part")
+        quote = _make_quote()
+        quote.expires_at = time.time() - 1
+        prov = _mock_provider(name="prov", quote=quote)
+        mock_get.return_value = prov
+
+        engine = QuoteEngine(QuoteEngineConfig(hedge_after_seconds=None), cache=QuoteCache())
+        compare_providers(str(model), "pla", providers=["prov"], engine=engine)
+        compare_providers(str(model), "pla", providers=["prov"], engine=engine)
+        assert prov.get_quote.call_count == 2
+
+    @patch("kiln.fulfillment.intelligence.get_provider")
+    @patch("kiln.fulfillment.intelligence.get_health_monitor")
+    def test_unhealthy_provider_not_contacted(self, mock_monitor, mock_get):
+        monitor = HealthMonitor()
+        for _ in range(3):
+            monitor.record_failure("prov", error="down")
+        mock_monitor.return_value = monitor
+        prov = _mock_provider(name="prov")
+        mock_get.return_value = prov
+
+        items = [BatchQuoteItem(file_path="/a.stl", material_id="pla")]
+        result = batch_quote(items, provider_name="prov", engine=_engine())
+        assert result.failed_count == 1
+        assert "unhealthy" in result.items[0].error
+        prov.get_quote.assert_not_called()
+
+    def test_comparison_to_dict_includes_stats(self):
+        comparison = QuoteComparison(quotes=[], provider_stats=[ProviderLatencyStats(provider_name="a")])
+        assert comparison.to_dict()["provider_stats"][0]["provider_name"] == "a"
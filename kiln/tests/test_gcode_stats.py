@@ -0,0 +1,151 @@
+"""Tests for kiln.gcode_stats -- streaming G-code statistics."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from kiln.gcode_stats import (
+    _reset_gcode_stats_cache,
+    analyze_gcode_file,
+    analyze_gcode_lines,
+    get_gcode_stats,
+)
+from kiln.job_splitter import _estimate_print_time
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    _reset_gcode_stats_cache()
+    yield
+    _reset_gcode_stats_cache()
+
+
+def _layered_gcode(layers: int = 5, time_comment: str | None = None) -> list[str]:
+    lines = ["; generated for tests", "G90", "M82", "G92 E0"]
+    if time_comment:
+        lines.insert(0, time_comment)
+    e = 0.0
+    for layer in range(layers):
+        z = 0.2 * (layer + 1)
+        lines.append(f"G1 Z{z:.2f} F600")
+        for x in (10, 50, 50, 10):
+            e += 2.0
+            lines.append(f"G1 X{x} Y{x} E{e:.3f} F1800")
+        # Z-hop travel must not start a new layer.
+        lines.append(f"G0 Z{z + 0.4:.2f}")
+        lines.append(f"G0 Z{z:.2f}")
+    return lines
+
+
+class TestExtrusion:
+    def test_absolute_mode_with_reset(self):
+        stats = analyze_gcode_lines(["M82", "G1 E10", "G1 E8", "G1 E15", "G92 E0", "G1 E5"])
+        assert stats.extrusion_mm == pytest.approx(22.0)
+        assert stats.retraction_mm == pytest.approx(2.0)
+
+    def test_relative_mode(self):
+        stats = analyze_gcode_lines(["M83", "G1 E3", "G1 E-1", "G1 E4"])
+        assert stats.extrusion_mm == pytest.approx(7.0)
+        assert stats.retraction_mm == pytest.approx(1.0)
+
+    def test_g91_leaves_e_absolute(self):
+        stats = analyze_gcode_lines(["G91", "G1 X1 E2", "G1 X1 E2"])
+        assert stats.extrusion_mm == pytest.approx(2.0)
+
+    def test_m83_survives_g90(self):
+        stats = analyze_gcode_lines(["M83", "G90", "G1 X1 E2", "G1 X2 E2"])
+        assert stats.extrusion_mm == pytest.approx(4.0)
+
+    def test_m82_resets_reference(self):
+        stats = analyze_gcode_lines(["G1 E10", "M82", "G1 E3"])
+        assert stats.extrusion_mm == pytest.approx(13.0)
+
+    def test_per_tool_totals(self):
+        stats = analyze_gcode_lines(["M83", "T0", "G1 E5", "T1", "G1 E2", "G1 E1", "T0", "G1 E1"])
+        assert stats.extrusion_by_tool == {0: pytest.approx(6.0), 1: pytest.approx(3.0)}
+
+    def test_comments_and_lowercase(self):
+        stats = analyze_gcode_lines(["m83", "g1 x10 e2.5 ; inline comment E99", "; G1 E100"])
+        assert stats.extrusion_mm == pytest.approx(2.5)
+
+
+class TestTimingAndLayers:
+    def test_layers_ignore_z_hop(self):
+        stats = analyze_gcode_lines(_layered_gcode(layers=5))
+        assert stats.layer_count == 5
+        assert stats.max_z == pytest.approx(1.0)
+
+    def test_motion_time_from_feedrate(self):
+        # 60 mm at 1800 mm/min = 2 s.
+        stats = analyze_gcode_lines(["G1 X60 F1800"])
+        assert stats.motion_time_seconds == pytest.approx(2.0)
+        assert stats.slicer_time_seconds is None
+        assert stats.estimated_time_seconds == 2
+
+    def test_dwell(self):
+        stats = analyze_gcode_lines(["G4 P1500", "G4 S2"])
+        assert stats.motion_time_seconds == pytest.approx(3.5)
+
+    def test_slicer_time_preferred_and_layers_rescaled(self):
+        stats = analyze_gcode_lines(_layered_gcode(layers=4, time_comment=";TIME:400"))
+        assert stats.slicer_time_seconds == 400
+        assert stats.estimated_time_seconds == 400
+        assert sum(stats.layer_time_seconds) == pytest.approx(400.0)
+
+    def test_to_dict_omits_raw_lines(self):
+        data = analyze_gcode_lines(_layered_gcode()).to_dict()
+        assert "header_lines" not in data
+        assert data["layer_count"] == 5
+
+
+class TestFileStreaming:
+    def test_chunk_boundaries_do_not_change_result(self, tmp_path):
+        path = tmp_path / "part.gcode"
+        lines = _layered_gcode(layers=30, time_comment="; estimated printing time (normal mode) = 1h 2m 3s")
+        path.write_text("\n".join(lines) + "\n")
+
+        whole = analyze_gcode_lines(lines)
+        chunked = analyze_gcode_file(str(path), chunk_size=7)
+        assert chunked.extrusion_mm == pytest.approx(whole.extrusion_mm)
+        assert chunked.layer_z == whole.layer_z
+        assert chunked.line_count == whole.line_count
+        assert chunked.slicer_time_seconds == 3723
+        assert chunked.bytes_read == path.stat().st_size
+
+    def test_boundary_lines_are_bounded(self, tmp_path):
+        path = tmp_path / "big.gcode"
+        lines = [f"G1 X{i % 100} E{i * 0.01:.2f}" for i in range(2000)]
+        lines.append("; total filament used [g] = 12.5")
+        path.write_text("\n".join(lines) + "\n")
+
+        stats = analyze_gcode_file(str(path))
+        boundary = stats.boundary_lines()
+        assert len(boundary) == 400
+        assert boundary[0] == lines[0]
+        assert boundary[-1] == lines[-1]
+
+    def test_cache_invalidated_on_change(self, tmp_path):
+        path = tmp_path / "part.gcode"
+        path.write_text("M83\nG1 E5\n")
+        first = get_gcode_stats(str(path))
+        assert get_gcode_stats(str(path)) is first
+
+        path.write_text("M83\nG1 E5\nG1 E5\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = get_gcode_stats(str(path))
+        assert second is not first
+        assert second.extrusion_mm == pytest.approx(10.0)
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            get_gcode_stats(str(tmp_path / "nope.gcode"))
+
+
+class TestJobSplitterIntegration:
+    def test_uses_slicer_time(self, tmp_path):
+        path = tmp_path / "part.gcode"
+        path.write_text(";TIME:5400\nG1 X10 E1\n")
+        assert _estimate_print_time(str(path)) == 5400
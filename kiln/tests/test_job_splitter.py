@@ -25,10 +25,14 @@ from kiln.job_splitter import (
     SplitPlan,
     SplitProgress,
     cancel_split_plan,
+    execute_split_plan,
     get_split_progress,
     plan_assembly_split,
     plan_multi_copy_split,
 )
+from kiln.printers.base import UploadResult
+from kiln.slice_pool import SlicePool
+from kiln.slicer import SliceResult
 
 
 class TestSplitJobDataclass:
@@ -355,3 +359,115 @@ class TestSplitPlanPersistence:
 
         result = cancel_split_plan("nonexistent")
         assert result["success"] is False
+
+
+class TestExecuteSplitPlan:
+    """execute_split_plan slices, validates and uploads each distinct item once."""
+
+    _PRINTERS = [{"name": f"p{i}", "model": "unknown"} for i in range(1, 6)]
+
+    def _fake_slicer(self, calls, body=";TIME:1200\nG28\nG1 X10 E1\n"):
+        def fake_slice(path, *, profile=None, output_dir=None, **kwargs):
+            calls.append((path, profile))
+            os.makedirs(output_dir, exist_ok=True)
+            out = os.path.join(output_dir, "out.gcode")
+            with open(out, "w") as fh:
+                fh.write(body)
+            return SliceResult(success=True, output_path=out)
+
+        return fake_slice
+
+    def _registry(self, uploads, fail_for=()):
+        registry = MagicMock()
+
+        def get(name):
+            adapter = MagicMock()
+
+            def upload_file(path):
+                if name in fail_for:
+                    raise ConnectionError("printer offline")
+                uploads.append((name, path))
+                return UploadResult(success=True, file_name=f"{name}.gcode", message="ok")
+
+            adapter.upload_file.side_effect = upload_file
+            return adapter
+
+        registry.get.side_effect = get
+        return registry
+
+    def test_ten_copies_slice_once_upload_per_printer(self, tmp_path):
+        model = tmp_path / "widget.stl"
+        model.write_bytes(b"solid w\nendsolid w\n")
+        plan = plan_multi_copy_split(str(model), 10, available_printers=self._PRINTERS)
+        calls: list = []
+        uploads: list = []
+        pool = SlicePool(2, slice_fn=self._fake_slicer(calls))
+        try:
+            result = execute_split_plan(
+                plan,
+                profiles={"unknown": "pla.ini"},
+                output_dir=str(tmp_path / "out"),
+                registry=self._registry(uploads),
+                pool=pool,
+            )
+        finally:
+            pool.shutdown()
+
+        assert result.success, result.errors
+        assert calls == [(os.path.realpath(model), "pla.ini")]
+        assert len(result.validations) == 1
+        assert sorted(name for name, _ in uploads) == ["p1", "p2", "p3", "p4", "p5"]
+        assert all(p.settings["remote_name"] == f"{p.printer_name}.gcode" for p in plan.parts)
+        # Two copies of a 20-minute print per printer.
+        assert result.critical_path_seconds == 2400
+        assert plan.estimated_total_time_seconds == 2400
+        assert plan.estimated_sequential_time_seconds == 12000
+
+    def test_distinct_profiles_slice_separately(self, tmp_path):
+        model = tmp_path / "widget.stl"
+        model.write_bytes(b"solid w\nendsolid w\n")
+        plan = plan_multi_copy_split(str(model), 4, available_printers=self._PRINTERS[:2])
+        calls: list = []
+        pool = SlicePool(2, slice_fn=self._fake_slicer(calls))
+        try:
+            result = execute_split_plan(
+                plan, profiles={"p1": "a.ini", "p2": "b.ini"}, output_dir=str(tmp_path), upload=False, pool=pool
+            )
+        finally:
+            pool.shutdown()
+        assert sorted(profile for _, profile in calls) == ["a.ini", "b.ini"]
+        assert result.uploads == []
+        assert {s["profile"]: len(s["part_ids"]) for s in result.slices} == {"a.ini": 2, "b.ini": 2}
+
+    def test_blocked_gcode_and_upload_failures_mark_parts(self, tmp_path):
+        safe = tmp_path / "safe.gcode"
+        safe.write_text("G28\nG1 X10 E1\n")
+        unsafe = tmp_path / "unsafe.gcode"
+        unsafe.write_text("G28\nM112\n")
+        plan = plan_assembly_split([str(safe), str(unsafe), str(safe)], available_printers=self._PRINTERS[:3])
+        uploads: list = []
+        result = execute_split_plan(plan, registry=self._registry(uploads, fail_for={"p3"}))
+
+        statuses = {p.printer_name: p.status for p in plan.parts}
+        assert statuses == {"p1": "pending", "p2": "failed", "p3": "failed"}
+        assert uploads == [("p1", str(safe))]
+        assert len(result.validations) == 2
+        assert len(result.errors) == 2
+        assert result.critical_printer == "p1"
+
+    def test_defaults_to_server_registry(self, tmp_path):
+        from kiln.server import _registry
+
+        gcode = tmp_path / "part.gcode"
+        gcode.write_text("G28\nG1 X10 E1\n")
+        plan = plan_assembly_split([str(gcode), str(gcode)], available_printers=self._PRINTERS[:2])
+        uploads: list = []
+        _registry.register("p1", self._registry(uploads).get("p1"))
+        try:
+            result = execute_split_plan(plan)
+        finally:
+            _registry.unregister("p1")
+
+        assert uploads == [("p1", str(gcode))]
+        assert {p.printer_name: p.status for p in plan.parts} == {"p1": "pending", "p2": "failed"}
+        assert any("p2" in error for error in result.errors)
@@ -18,6 +18,8 @@ from kiln.licensing import (
     LicenseManager,
     LicenseTier,
     TierRequiredError,
+    _load_v2_verify_keys,
+    _reset_verify_keys_cache,
     check_tier,
     generate_license_key,
     get_license_manager,
@@ -674,6 +676,21 @@ class TestEdgeCases:
             tier2 = mgr.get_tier()
             assert tier1 == tier2 == LicenseTier.PRO
 
+    def test_verify_keys_parsed_once_per_env_value(self):
+        """v2 verify keys are memoized until the env override changes."""
+        _reset_verify_keys_cache()
+        try:
+            with mock.patch.dict(os.environ, {}, clear=True), \
+                    mock.patch("kiln.licensing._parse_v2_verify_keys", return_value={}) as parse:
+                _load_v2_verify_keys()
+                _load_v2_verify_keys()
+                assert parse.call_count == 1
+                os.environ["KILN_LICENSE_VERIFY_KEYS_JSON"] = "{}"
+                _load_v2_verify_keys()
+                assert parse.call_count == 2
+        finally:
+            _reset_verify_keys_cache()
+
     def test_corrupted_cache_file_handled(self, tmp_path):
         """Corrupted cache file doesn't crash, falls back gracefully."""
         cache_file = tmp_path / "cache.json"
@@ -0,0 +1,106 @@
+"""Tests for kiln.metrics -- exposition format, timers and the exporter."""
+
+from __future__ import annotations
+
+import asyncio
+import urllib.error
+import urllib.request
+
+import pytest
+
+from kiln.events import EventBus, EventType
+from kiln.metrics import (
+    EVENT_DISPATCH_LATENCY,
+    TOOL_CALLS,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    endpoint_label,
+    record_tool_call,
+    start_metrics_server,
+)
+
+
+class TestPrometheusExport:
+    def test_labels_are_quoted_and_escaped(self):
+        registry = MetricsRegistry()
+        counter = Counter("c_total", "A counter", labels=["path"])
+        registry.register(counter)
+        counter.inc(labels={"path": 'a"b\\c'})
+        assert 'c_total{path="a\\"b\\\\c"} 1' in registry.export_prometheus()
+
+    def test_histogram_buckets(self):
+        registry = MetricsRegistry()
+        hist = Histogram("h_seconds", "A histogram", buckets=[0.1, 1.0], labels=["op"])
+        registry.register(hist)
+        hist.observe(0.5, labels={"op": "x"})
+        text = registry.export_prometheus()
+        assert 'h_seconds_bucket{op="x",le="0.1"} 0' in text
+        assert 'h_seconds_bucket{op="x",le="1.0"} 1' in text
+        assert 'h_seconds_bucket{op="x",le="+Inf"} 1' in text
+        assert 'h_seconds_count{op="x"} 1' in text
+
+    def test_timer_observes_on_exception(self):
+        hist = Histogram("t_seconds", "Timer", buckets=[10.0])
+        with pytest.raises(RuntimeError), hist.timer():
+            raise RuntimeError("boom")
+        assert hist.get()["count"] == 1
+
+
+class TestInstrumentationHelpers:
+    def test_endpoint_label_truncates_path(self):
+        assert endpoint_label("get", "/api/files/local/benchy.gcode?recursive=1") == "GET /api/files/local"
+        assert endpoint_label("POST", "/printer/print/start") == "POST /printer/print/start"
+
+    def test_error_dicts_count_as_errors(self):
+        labels = {"tool": "unit_test_tool", "status": "error"}
+        before = TOOL_CALLS.get(labels)
+        record_tool_call("unit_test_tool", 0.01, result={"success": False, "error": "nope"})
+        record_tool_call("unit_test_tool", 0.01, error=True)
+        assert TOOL_CALLS.get(labels) == before + 2
+
+    def test_failures_counted_through_mcp_call_tool(self):
+        from kiln.server import mcp
+
+        def unit_test_failing_tool() -> dict:
+            return {"success": False, "error": "nope"}
+
+        def unit_test_ok_tool() -> dict:
+            return {"success": True}
+
+        mcp.add_tool(unit_test_failing_tool)
+        mcp.add_tool(unit_test_ok_tool)
+        try:
+            failed_before = TOOL_CALLS.get({"tool": "unit_test_failing_tool", "status": "error"})
+            ok_before = TOOL_CALLS.get({"tool": "unit_test_ok_tool", "status": "ok"})
+            asyncio.run(mcp.call_tool("unit_test_failing_tool", {}))
+            asyncio.run(mcp.call_tool("unit_test_ok_tool", {}))
+        finally:
+            mcp.remove_tool("unit_test_failing_tool")
+            mcp.remove_tool("unit_test_ok_tool")
+        assert TOOL_CALLS.get({"tool": "unit_test_failing_tool", "status": "error"}) == failed_before + 1
+        assert TOOL_CALLS.get({"tool": "unit_test_ok_tool", "status": "ok"}) == ok_before + 1
+
+    def test_event_dispatch_is_timed(self):
+        labels = {"event": EventType.JOB_QUEUED.value}
+        before = EVENT_DISPATCH_LATENCY.get(labels)["count"]
+        bus = EventBus()
+        bus.subscribe(EventType.JOB_QUEUED, lambda event: None)
+        bus.publish(EventType.JOB_QUEUED, {"job_id": "j1"})
+        assert EVENT_DISPATCH_LATENCY.get(labels)["count"] == before + 1
+
+
+class TestStandaloneExporter:
+    def test_serves_metrics(self):
+        server = start_metrics_server(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+                body = resp.read().decode()
+                assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "# TYPE kiln_scheduler_tick_seconds histogram" in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
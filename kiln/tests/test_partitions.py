@@ -0,0 +1,214 @@
+"""Tests for kiln.partitions -- monthly partitions behind KilnDB's log tables."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from kiln import partitions, persistence
+from kiln.partitions import period_bounds, period_of
+from kiln.persistence import KilnDB
+
+JAN = datetime(2026, 1, 15, tzinfo=timezone.utc).timestamp()
+FEB = datetime(2026, 2, 15, tzinfo=timezone.utc).timestamp()
+MAR = datetime(2026, 3, 15, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Pin the wall clock seen by KilnDB and the partition manager."""
+    fake = SimpleNamespace(now=JAN)
+    patched = SimpleNamespace(time=lambda: fake.now)
+    monkeypatch.setattr(partitions, "time", patched)
+    monkeypatch.setattr(persistence, "time", patched)
+    return fake
+
+
+@pytest.fixture()
+def db(tmp_path, clock):
+    instance = KilnDB(str(tmp_path / "kiln.db"))
+    yield instance
+    instance.close()
+
+
+def _names(db: KilnDB, table: str) -> list[str]:
+    return [p["name"] for p in db.list_partitions(table)]
+
+
+class TestPeriods:
+    def test_period_of_and_bounds(self):
+        assert period_of(JAN) == "202601"
+        start, end = period_bounds("202612")
+        assert datetime.fromtimestamp(start, tz=timezone.utc) == datetime(2026, 12, 1, tzinfo=timezone.utc)
+        assert datetime.fromtimestamp(end, tz=timezone.utc) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+
+class TestRollover:
+    def test_fresh_database_opens_current_month(self, db):
+        for table in ("events", "safety_audit_log", "snapshots"):
+            assert _names(db, table) == [f"{table}_p202601"]
+        kind = db._conn.execute("SELECT type FROM sqlite_master WHERE name = 'events'").fetchone()[0]
+        assert kind == "view"
+
+    def test_new_month_opens_partition_and_ids_continue(self, db, clock):
+        first = db.log_event("a", {})
+        clock.now = FEB
+        second = db.log_event("b", {})
+        assert second == first + 1
+        assert _names(db, "events") == ["events_p202601", "events_p202602"]
+        assert [e["event_type"] for e in db.recent_events()] == ["b", "a"]
+        stored = db._conn.execute("SELECT event_type FROM events_p202602").fetchall()
+        assert [row[0] for row in stored] == ["b"]
+
+    def test_view_accepts_ad_hoc_writes(self, db, clock):
+        db.log_event("a", {})
+        clock.now = FEB
+        db.log_event("b", {})
+        db._conn.execute("INSERT INTO events (event_type, timestamp) VALUES ('raw', 1.0)")
+        db._conn.execute("UPDATE events SET source = 'edited' WHERE event_type = 'a'")
+        db._conn.execute("DELETE FROM events WHERE event_type = 'b'")
+        rows = db._conn.execute("SELECT event_type, source, data FROM events ORDER BY id").fetchall()
+        assert [tuple(r) for r in rows] == [("a", "edited", "{}"), ("raw", "", "{}")]
+        newest = db._conn.execute("SELECT event_type FROM events_p202602").fetchall()
+        assert [row[0] for row in newest] == ["raw"]
+
+
+class TestRetention:
+    def test_drop_expired_keeps_straddling_and_newest(self, db, clock):
+        db.log_event("jan", {}, timestamp=JAN)
+        clock.now = FEB
+        db.log_event("feb", {}, timestamp=FEB)
+        clock.now = MAR
+        db.log_event("mar", {}, timestamp=MAR)
+
+        assert db.drop_expired_partitions("events", FEB, dry_run=True) == 1
+        assert len(_names(db, "events")) == 3
+        assert db.drop_expired_partitions("events", FEB) == 1
+        assert _names(db, "events") == ["events_p202602", "events_p202603"]
+        # Every row is expired, but the newest partition receives writes.
+        assert db.drop_expired_partitions("events", MAR + 86400) == 1
+        assert _names(db, "events") == ["events_p202603"]
+        assert db._conn.execute("SELECT name FROM sqlite_master WHERE name = 'events_p202601'").fetchone() is None
+
+    def test_cleanup_and_snapshot_purge_remove_exact_rows(self, db, clock):
+        db.log_event("jan", {}, timestamp=JAN)
+        db.save_snapshot("p1", "/jan.jpg")
+        clock.now = FEB
+        db.log_event("feb-early", {}, timestamp=FEB - 2 * 86400)
+        db.log_event("feb-late", {}, timestamp=FEB + 86400)
+        db.save_snapshot("p1", "/feb.jpg")
+
+        assert db.cleanup(max_age_days=1)["events_deleted"] == 2
+        assert [e["event_type"] for e in db.recent_events()] == ["feb-late"]
+        assert _names(db, "events") == ["events_p202602"]
+        assert db.delete_snapshots(older_than=FEB) == 1
+        assert [s["image_path"] for s in db.get_snapshots()] == ["/feb.jpg"]
+
+    def test_audit_chain_survives_retention(self, db, clock):
+        db.log_audit("t1", "safe", "executed")
+        db.log_audit("t2", "safe", "executed")
+        clock.now = FEB
+        db.log_audit("t3", "guarded", "blocked")
+        clock.now = MAR
+        db.log_audit("t4", "safe", "executed")
+
+        result = db.verify_audit_log()
+        assert result["verified"] is True
+        assert [p["total"] for p in result["partitions"]] == [2, 1, 1]
+
+        assert db.drop_expired_partitions("safety_audit_log", FEB) == 2
+        head = db.list_partitions("safety_audit_log")[0]["head"]
+        assert len(head) == 64
+        result = db.verify_audit_log()
+        assert result["verified"] is True
+        assert result["total"] == 2
+        clock.now = MAR + 60
+        db.log_audit("t5", "safe", "executed")
+        assert db.verify_audit_log()["hash_chain_intact"] is True
+
+    def test_verify_single_partition(self, db, clock):
+        db.log_audit("t1", "safe", "executed")
+        clock.now = FEB
+        db.log_audit("t2", "safe", "executed")
+        db._conn.execute("UPDATE safety_audit_log SET action = 'forged' WHERE tool_name = 't1'")
+        db._conn.commit()
+
+        assert db.verify_audit_log(partition="safety_audit_log_p202602")["verified"] is True
+        january = db.verify_audit_log(partition="safety_audit_log_p202601")
+        assert january["invalid"] == 1
+        assert january["integrity"] == "compromised"
+        with pytest.raises(ValueError, match="Unknown audit log partition"):
+            db.verify_audit_log(partition="safety_audit_log_p199901")
+
+    def test_rejects_unpartitioned_table(self, db):
+        with pytest.raises(ValueError, match="not a partitioned table"):
+            db.drop_expired_partitions("jobs", JAN)
+
+
+class TestLegacyConversion:
+    def test_rows_split_by_month_with_contiguous_ids(self, tmp_path, clock):
+        path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, event_type TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT '', data TEXT NOT NULL DEFAULT '{}',
+                timestamp REAL NOT NULL, created_at REAL
+            );
+            """
+        )
+        conn.executemany(
+            "INSERT INTO events (event_type, timestamp) VALUES (?, ?)",
+            [("nov", JAN - 60 * 86400), ("dec", JAN - 30 * 86400), ("dec-late", JAN - 20 * 86400), ("jan", JAN)],
+        )
+        conn.commit()
+        conn.close()
+
+        db = KilnDB(path)
+        try:
+            assert _names(db, "events") == ["events_p202511", "events_p202512", "events_p202601"]
+            ids = db._conn.execute("SELECT id FROM events_p202512 ORDER BY id").fetchall()
+            assert [row[0] for row in ids] == [2, 3]
+            assert [e["event_type"] for e in db.recent_events()] == ["jan", "dec-late", "dec", "nov"]
+            assert db.log_event("new", {}) == 5
+        finally:
+            db.close()
+
+
+class _RecordingConn:
+    """Stands in for a PostgreSQL connection: records SQL, answers catalog queries."""
+
+    def __init__(self, answers: dict[str, object]) -> None:
+        self.answers = answers
+        self.statements: list[str] = []
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+        answer = next((value for prefix, value in self.answers.items() if sql.startswith(prefix)), None)
+        return SimpleNamespace(fetchone=lambda: answer, fetchall=lambda: answer or [], rowcount=0)
+
+
+class TestPostgres:
+    def test_migration_leaves_postgres_tables_plain(self):
+        from kiln.schema_migrations import PartitionByMonth
+
+        conn = _RecordingConn({})
+        PartitionByMonth("events", "timestamp").apply(conn, postgres=True)
+        assert conn.statements == []
+
+    def test_manager_uses_plain_table(self, clock):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, event_type TEXT, timestamp REAL)")
+        conn.executemany("INSERT INTO events (event_type, timestamp) VALUES (?, ?)", [("old", JAN), ("new", MAR)])
+        partitions._ensure_catalog(conn)
+        manager = partitions.PartitionManager(conn, postgres=True)
+
+        assert manager.write_target("events") == "events"
+        assert manager.last_value("events", "event_type") == "new"
+        assert manager.drop_expired("events", FEB) == 0
+        assert manager.purge_before("events", FEB, time_column="timestamp") == 1
+        assert [row[0] for row in conn.execute("SELECT event_type FROM events")] == ["new"]
@@ -82,8 +82,9 @@ class TestSchemaCreation:
         assert row is not None
 
     def test_events_table_exists(self, db):
+        # Partitioned by month; ``events`` is a view over the partitions.
         row = db._conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='events'"
+            "SELECT name FROM sqlite_master WHERE type='view' AND name='events'"
         ).fetchone()
         assert row is not None
 
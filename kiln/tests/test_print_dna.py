@@ -6,6 +6,9 @@ similar model search, model history, and success rate computation.
 
 from __future__ import annotations
 
+import math
+import random
+import sqlite3
 import struct
 import time
 from pathlib import Path
@@ -16,12 +19,19 @@ import pytest
 
 from kiln.persistence import KilnDB
 from kiln.print_dna import (
+    SHAPE_DESCRIPTOR_LENGTH,
     ModelFingerprint,
     PrintDNARecord,
     SettingsPrediction,
+    ShapeIndex,
+    _pack_descriptor,
+    _reset_shape_index,
+    _unpack_descriptor,
+    descriptor_similarity,
     find_similar_models,
     fingerprint_model,
     get_model_history,
+    get_shape_index,
     get_success_rate,
     predict_settings,
     record_print_dna,
@@ -48,6 +58,13 @@ def _patch_db(db: KilnDB) -> None:
         yield
 
 
+@pytest.fixture(autouse=True)
+def _fresh_shape_index() -> None:
+    _reset_shape_index()
+    yield
+    _reset_shape_index()
+
+
 def _make_fingerprint(**overrides: Any) -> ModelFingerprint:
     """Create a ModelFingerprint with sensible defaults."""
     defaults = {
@@ -81,6 +98,43 @@ def _write_binary_stl(path: Path, triangles: list[tuple]) -> None:
             f.write(struct.pack("<H", 0))  # attribute byte count
 
 
+def _box_triangles(sx: float, sy: float, sz: float, *, div: int = 1, rot: float = 0.0) -> list[tuple]:
+    """Closed box mesh, each face split into ``div`` x ``div`` quads, rotated about Z."""
+    c, s = math.cos(rot), math.sin(rot)
+
+    def corner(axis: int, side: int, u: float, v: float) -> tuple[float, float, float]:
+        q = [0.0, 0.0, 0.0]
+        q[axis], q[(axis + 1) % 3], q[(axis + 2) % 3] = side, u, v
+        x, y, z = q[0] * sx, q[1] * sy, q[2] * sz
+        return (x * c - y * s, x * s + y * c, z)
+
+    triangles = []
+    for axis in range(3):
+        normal = [0.0, 0.0, 0.0]
+        for side in (0, 1):
+            normal[axis] = 1.0 if side else -1.0
+            for i in range(div):
+                for j in range(div):
+                    a, b, d, e = i / div, (i + 1) / div, j / div, (j + 1) / div
+                    p00, p10 = corner(axis, side, a, d), corner(axis, side, b, d)
+                    p11, p01 = corner(axis, side, b, e), corner(axis, side, a, e)
+                    if side:
+                        triangles += [(tuple(normal), p00, p10, p11), (tuple(normal), p00, p11, p01)]
+                    else:
+                        triangles += [(tuple(normal), p00, p11, p10), (tuple(normal), p00, p01, p11)]
+    return triangles
+
+
+def _fingerprint_box(tmp_path: Path, name: str, *dims: float, **kwargs: Any) -> ModelFingerprint:
+    path = tmp_path / f"{name}.stl"
+    _write_binary_stl(path, _box_triangles(*dims, **kwargs))
+    return fingerprint_model(str(path))
+
+
+def _random_descriptor(rng: random.Random) -> list[float]:
+    return [round(rng.random(), 4) for _ in range(SHAPE_DESCRIPTOR_LENGTH)]
+
+
 # ---------------------------------------------------------------------------
 # ModelFingerprint dataclass
 # ---------------------------------------------------------------------------
@@ -250,6 +304,139 @@ class TestFingerprintModel:
         assert fp1.geometric_signature == fp2.geometric_signature
 
 
+# ---------------------------------------------------------------------------
+# Shape descriptor
+# ---------------------------------------------------------------------------
+
+
+def _similarity(a: ModelFingerprint, b: ModelFingerprint) -> float:
+    return descriptor_similarity(math.dist(a.shape_descriptor, b.shape_descriptor))
+
+
+class TestShapeDescriptor:
+    def test_length_and_range(self, tmp_path: Path) -> None:
+        fp = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        assert len(fp.shape_descriptor) == SHAPE_DESCRIPTOR_LENGTH
+        assert all(0.0 <= v <= 1.0 for v in fp.shape_descriptor)
+
+    def test_deterministic(self, tmp_path: Path) -> None:
+        fp1 = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        fp2 = fingerprint_model(str(tmp_path / "cube.stl"))
+        assert fp1.shape_descriptor == fp2.shape_descriptor
+
+    def test_invariant_to_scale_tessellation_and_rotation(self, tmp_path: Path) -> None:
+        cube = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        big_fine = _fingerprint_box(tmp_path, "big", 40, 40, 40, div=6)
+        rotated = _fingerprint_box(tmp_path, "rot", 10, 10, 10, rot=0.5)
+        assert _similarity(cube, big_fine) > 0.85
+        assert _similarity(cube, rotated) > 0.85
+
+    def test_distinguishes_shapes(self, tmp_path: Path) -> None:
+        cube = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        plate = _fingerprint_box(tmp_path, "plate", 50, 50, 2)
+        bar = _fingerprint_box(tmp_path, "bar", 100, 8, 8)
+        assert _similarity(cube, plate) < 0.5
+        assert _similarity(cube, bar) < 0.5
+        assert _similarity(plate, bar) < 0.5
+
+    def test_pack_roundtrip(self) -> None:
+        descriptor = _random_descriptor(random.Random(1))
+        assert _unpack_descriptor(_pack_descriptor(descriptor)) == descriptor
+        assert len(_pack_descriptor(descriptor)) == 4 * SHAPE_DESCRIPTOR_LENGTH
+        assert _pack_descriptor([]) is None
+        assert _unpack_descriptor(None) == []
+        assert _unpack_descriptor(b"\x00" * 8) == []  # stale layout
+
+    def test_stored_with_record(self, tmp_path: Path) -> None:
+        fp = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        record_print_dna(fp, "ender3", "PLA", {}, "success")
+        assert get_model_history(fp.file_hash)[0].fingerprint.shape_descriptor == fp.shape_descriptor
+
+    def test_column_added_to_existing_database(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE print_dna (id INTEGER PRIMARY KEY AUTOINCREMENT, file_hash TEXT NOT NULL,"
+            " geometric_signature TEXT NOT NULL, triangle_count INTEGER, bounding_box TEXT,"
+            " surface_area REAL, volume REAL, overhang_ratio REAL, complexity_score REAL,"
+            " printer_model TEXT, material TEXT, settings TEXT, outcome TEXT NOT NULL,"
+            " quality_grade TEXT DEFAULT 'B', failure_mode TEXT, print_time_seconds INTEGER DEFAULT 0,"
+            " timestamp REAL NOT NULL)"
+        )
+        conn.commit()
+        conn.close()
+        upgraded = KilnDB(db_path=db_path)
+        columns = {row[1] for row in upgraded._conn.execute("PRAGMA table_info(print_dna)").fetchall()}
+        upgraded.close()
+        assert "shape_descriptor" in columns
+
+
+# ---------------------------------------------------------------------------
+# ShapeIndex
+# ---------------------------------------------------------------------------
+
+
+class TestShapeIndex:
+    def _populate(self, count: int, seed: int = 7) -> list[ModelFingerprint]:
+        rng = random.Random(seed)
+        fps = []
+        for i in range(count):
+            fp = _make_fingerprint(file_hash=f"hash_{i}", shape_descriptor=_random_descriptor(rng))
+            record_print_dna(fp, "ender3" if i % 2 else "voron", "PLA", {}, "success")
+            fps.append(fp)
+        return fps
+
+    def test_matches_brute_force(self) -> None:
+        fps = self._populate(300)
+        index = get_shape_index()
+        rng = random.Random(99)
+        for _ in range(10):
+            query = _random_descriptor(rng)
+            got = [entry.file_hash for _, entry in index.nearest(query, k=5)]
+            expected = [fp.file_hash for fp in sorted(fps, key=lambda f: math.dist(query, f.shape_descriptor))[:5]]
+            assert got == expected
+
+    def test_rebuilds_after_many_inserts(self) -> None:
+        self._populate(200)
+        index = get_shape_index()
+        index.sync()
+        assert len(index) == 200
+        assert len(index._indexed) > len(index._pending)
+
+    def test_picks_up_new_rows(self) -> None:
+        fps = self._populate(20)
+        index = get_shape_index()
+        index.nearest(fps[0].shape_descriptor)  # initial load
+        newcomer = _make_fingerprint(file_hash="new", shape_descriptor=fps[3].shape_descriptor)
+        record_print_dna(newcomer, "ender3", "PLA", {}, "success")
+        hashes = {entry.file_hash for _, entry in index.nearest(fps[3].shape_descriptor, k=2)}
+        assert hashes == {"hash_3", "new"}
+
+    def test_accept_filter_does_not_consume_slots(self) -> None:
+        self._populate(50)
+        results = get_shape_index().nearest(
+            [0.5] * SHAPE_DESCRIPTOR_LENGTH, k=5, accept=lambda e: e.printer_model == "voron"
+        )
+        assert len(results) == 5
+        assert all(entry.printer_model == "voron" for _, entry in results)
+
+    def test_max_distance(self) -> None:
+        fps = self._populate(30)
+        results = get_shape_index().nearest(fps[0].shape_descriptor, k=10, max_distance=1e-6)
+        assert [entry.file_hash for _, entry in results] == ["hash_0"]
+
+    def test_skips_rows_without_descriptor(self) -> None:
+        record_print_dna(_make_fingerprint(), "ender3", "PLA", {}, "success")
+        index = get_shape_index()
+        assert index.sync() == 0
+        assert index.nearest([0.5] * SHAPE_DESCRIPTOR_LENGTH) == []
+
+    def test_index_follows_database(self, db: KilnDB) -> None:
+        assert get_shape_index() is get_shape_index()
+        assert isinstance(get_shape_index(), ShapeIndex)
+        assert get_shape_index().db is db
+
+
 # ---------------------------------------------------------------------------
 # record_print_dna
 # ---------------------------------------------------------------------------
@@ -354,6 +541,26 @@ class TestPredictSettings:
         prediction = predict_settings(fp, "ender3", "PLA")
         assert prediction.source == "no_data"
 
+    def test_nearest_neighbour_history(self, tmp_path: Path) -> None:
+        small_cube = _fingerprint_box(tmp_path, "small", 10, 10, 10)
+        plate = _fingerprint_box(tmp_path, "plate", 50, 50, 2)
+        record_print_dna(small_cube, "ender3", "PLA", {"speed": 40}, "success")
+        record_print_dna(small_cube, "voron", "PLA", {"speed": 200}, "success")
+        record_print_dna(plate, "ender3", "PLA", {"speed": 80}, "success")
+
+        big_cube = _fingerprint_box(tmp_path, "big", 30, 30, 30, div=3)
+        prediction = predict_settings(big_cube, "ender3", "PLA")
+        assert prediction.source == "similar_geometry"
+        assert prediction.based_on_prints == 1
+        assert prediction.recommended_settings == {"speed": 40}
+
+    def test_dissimilar_neighbours_fall_through(self, tmp_path: Path) -> None:
+        plate = _fingerprint_box(tmp_path, "plate", 50, 50, 2)
+        record_print_dna(plate, "ender3", "PLA", {"speed": 80}, "success")
+
+        cube = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        assert predict_settings(cube, "ender3", "PLA").source == "material_default"
+
 
 # ---------------------------------------------------------------------------
 # find_similar_models
@@ -412,6 +619,29 @@ class TestFindSimilarModels:
         results = find_similar_models(fp_query, limit=3, threshold=1.0)
         assert len(results) <= 3
 
+    def test_nearest_first_by_descriptor(self, tmp_path: Path) -> None:
+        cube = _fingerprint_box(tmp_path, "cube", 10, 10, 10)
+        big_cube = _fingerprint_box(tmp_path, "big", 40, 40, 40, div=4)
+        plate = _fingerprint_box(tmp_path, "plate", 50, 50, 2)
+        for fp in (plate, big_cube, cube):
+            record_print_dna(fp, "ender3", "PLA", {}, "success")
+
+        results = find_similar_models(cube, threshold=0.0)
+        assert [r.fingerprint.file_hash for r in results] == [big_cube.file_hash, plate.file_hash]
+
+        results = find_similar_models(cube)
+        assert [r.fingerprint.file_hash for r in results] == [big_cube.file_hash]
+
+    def test_descriptor_search_respects_limit(self) -> None:
+        rng = random.Random(3)
+        base = _random_descriptor(rng)
+        for i in range(5):
+            record_print_dna(
+                _make_fingerprint(file_hash=f"hash_{i}", shape_descriptor=base), "ender3", "PLA", {}, "success"
+            )
+        query = _make_fingerprint(file_hash="query", shape_descriptor=base)
+        assert len(find_similar_models(query, limit=3)) == 3
+
 
 # ---------------------------------------------------------------------------
 # get_model_history
@@ -17,14 +17,10 @@ from kiln.persistence import KilnDB
 from kiln.print_trend_analysis import (
     TrendAlert,
     TrendReport,
-    _avg_duration,
     _classify_duration_trend,
     _classify_rate_trend,
     _compute_health_score,
-    _failure_mode_counts,
-    _material_stats,
-    _split_halves,
-    _success_rate,
+    analyze_fleet_trends,
     analyze_printer_trends,
 )
 
@@ -89,52 +85,6 @@ def _outcome(
 # ---------------------------------------------------------------------------
 
 
-class TestSplitHalves:
-    def test_empty(self) -> None:
-        older, newer = _split_halves([])
-        assert older == []
-        assert newer == []
-
-    def test_single(self) -> None:
-        recs = [{"id": 1}]
-        older, newer = _split_halves(recs)
-        assert older == recs
-        assert newer == recs
-
-    def test_even_split(self) -> None:
-        recs = [{"id": i} for i in range(10)]
-        older, newer = _split_halves(recs)
-        assert len(older) == 5
-        assert len(newer) == 5
-
-    def test_odd_split(self) -> None:
-        recs = [{"id": i} for i in range(7)]
-        older, newer = _split_halves(recs)
-        assert len(older) == 3
-        assert len(newer) == 4
-
-
-class TestSuccessRate:
-    def test_empty(self) -> None:
-        assert _success_rate([]) == 0.0
-
-    def test_all_success_outcomes(self) -> None:
-        recs = [{"outcome": "success"} for _ in range(5)]
-        assert _success_rate(recs) == 1.0
-
-    def test_all_failed_outcomes(self) -> None:
-        recs = [{"outcome": "failed"} for _ in range(5)]
-        assert _success_rate(recs) == 0.0
-
-    def test_mixed_outcomes(self) -> None:
-        recs = [{"outcome": "success"}, {"outcome": "failed"}, {"outcome": "success"}]
-        assert abs(_success_rate(recs) - 2 / 3) < 0.01
-
-    def test_status_field_fallback(self) -> None:
-        recs = [{"status": "completed"}, {"status": "failed"}]
-        assert _success_rate(recs) == 0.5
-
-
 class TestClassifyRateTrend:
     def test_stable(self) -> None:
         assert _classify_rate_trend(0.8, 0.8) == "stable"
@@ -149,22 +99,6 @@ class TestClassifyRateTrend:
         assert _classify_rate_trend(0.8, 0.75) == "stable"
 
 
-class TestAvgDuration:
-    def test_empty(self) -> None:
-        assert _avg_duration([]) is None
-
-    def test_no_durations(self) -> None:
-        assert _avg_duration([{"duration_seconds": None}]) is None
-
-    def test_zero_durations_excluded(self) -> None:
-        recs = [{"duration_seconds": 0}, {"duration_seconds": 100}]
-        assert _avg_duration(recs) == 100.0
-
-    def test_normal_avg(self) -> None:
-        recs = [{"duration_seconds": 100}, {"duration_seconds": 200}]
-        assert _avg_duration(recs) == 150.0
-
-
 class TestClassifyDurationTrend:
     def test_stable(self) -> None:
         assert _classify_duration_trend(100, 105) == "stable"
@@ -185,64 +119,6 @@ class TestClassifyDurationTrend:
         assert _classify_duration_trend(0, 100) == "stable"
 
 
-class TestFailureModeCounts:
-    def test_empty(self) -> None:
-        assert _failure_mode_counts([]) == []
-
-    def test_counts_only_failed(self) -> None:
-        recs = [
-            {"outcome": "failed", "failure_mode": "warping"},
-            {"outcome": "success", "failure_mode": "warping"},
-        ]
-        result = _failure_mode_counts(recs)
-        assert len(result) == 1
-        assert result[0]["count"] == 1
-
-    def test_sorted_by_frequency(self) -> None:
-        recs = [
-            {"outcome": "failed", "failure_mode": "clog"},
-            {"outcome": "failed", "failure_mode": "warping"},
-            {"outcome": "failed", "failure_mode": "warping"},
-        ]
-        result = _failure_mode_counts(recs)
-        assert result[0]["mode"] == "warping"
-        assert result[0]["count"] == 2
-        assert result[1]["mode"] == "clog"
-
-    def test_none_failure_mode_excluded(self) -> None:
-        recs = [{"outcome": "failed", "failure_mode": None}]
-        assert _failure_mode_counts(recs) == []
-
-
-class TestMaterialStats:
-    def test_empty(self) -> None:
-        assert _material_stats([]) == {}
-
-    def test_single_material(self) -> None:
-        recs = [
-            {"material_type": "PLA", "outcome": "success"},
-            {"material_type": "PLA", "outcome": "failed"},
-        ]
-        result = _material_stats(recs)
-        assert "PLA" in result
-        assert result["PLA"]["total"] == 2
-        assert result["PLA"]["success_rate"] == 0.5
-
-    def test_multiple_materials(self) -> None:
-        recs = [
-            {"material_type": "PLA", "outcome": "success"},
-            {"material_type": "ABS", "outcome": "failed"},
-        ]
-        result = _material_stats(recs)
-        assert len(result) == 2
-        assert result["PLA"]["success_rate"] == 1.0
-        assert result["ABS"]["success_rate"] == 0.0
-
-    def test_none_material_excluded(self) -> None:
-        recs = [{"material_type": None, "outcome": "success"}]
-        assert _material_stats(recs) == {}
-
-
 class TestHealthScore:
     def test_perfect_health(self) -> None:
         score = _compute_health_score(1.0, "stable", "stable", 20)
@@ -370,6 +246,128 @@ class TestAnalyzePrinterTrends:
         assert report.health_score < 0.5
 
 
+class TestSqlAggregates:
+    def _seed(self, db: KilnDB) -> list[dict[str, Any]]:
+        now = time.time()
+        outcomes = []
+        for i in range(12):
+            failed = i >= 7 or i == 2
+            outcomes.append(_outcome(
+                job_id=f"o-{i}",
+                outcome="failed" if failed else "success",
+                failure_mode=("clog" if i % 2 else "warping") if failed else None,
+                material_type="PETG" if i % 3 == 0 else "PLA",
+                created_at=now - 86400 * (12 - i),
+            ))
+            db.save_print_outcome(outcomes[-1])
+            db.save_print_record(_print_record(
+                job_id=f"h-{i}",
+                status="failed" if failed else "completed",
+                duration_seconds=1000 + 100 * i if i != 4 else 0,
+                completed_at=now - 86400 * (12 - i),
+            ))
+        return outcomes
+
+    def test_aggregates_match_seeded_history(self, db: KilnDB) -> None:
+        self._seed(db)
+        stats = db.get_print_trend_stats("ender3", since=time.time() - 30 * 86400)
+        outcomes = stats["outcomes"]
+        assert outcomes["total"] == 12
+        assert (outcomes["older_total"], outcomes["older_successes"]) == (6, 5)
+        assert (outcomes["newer_total"], outcomes["newer_successes"]) == (6, 1)
+        assert stats["failure_modes"] == [{"mode": "warping", "count": 3}, {"mode": "clog", "count": 3}]
+        assert stats["materials"] == {"PETG": {"total": 4, "successes": 3}, "PLA": {"total": 8, "successes": 3}}
+        h = stats["history"]
+        # The zero-length print is left out of the duration averages.
+        assert (h["duration_sum"], h["duration_count"]) == (17200, 11)
+        assert (h["older_duration_sum"], h["older_duration_count"]) == (6100, 5)
+
+    def test_window_and_single_record(self, db: KilnDB) -> None:
+        db.save_print_outcome(_outcome(job_id="old", created_at=time.time() - 90 * 86400))
+        db.save_print_outcome(_outcome(job_id="new"))
+        outcomes = db.get_print_trend_stats("ender3", since=time.time() - 86400)["outcomes"]
+        assert outcomes["total"] == 1
+        assert outcomes["older_total"] == outcomes["newer_total"] == 1
+
+    def test_uses_printer_time_indexes(self, db: KilnDB) -> None:
+        indexes = {row[1] for row in db._conn.execute("SELECT * FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_print_history_printer_completed" in indexes
+        assert "idx_print_outcomes_printer_created" in indexes
+        plan = " ".join(
+            str(row[3])
+            for row in db._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM print_outcomes WHERE printer_name = ? AND created_at >= ?",
+                ("ender3", 0),
+            )
+        )
+        assert "idx_print_outcomes_printer_created" in plan
+
+
+class TestDailyRollups:
+    def test_updated_on_save(self, db: KilnDB) -> None:
+        now = time.time()
+        db.save_print_record(_print_record(job_id="a", completed_at=now, duration_seconds=100))
+        db.save_print_record(_print_record(job_id="b", status="failed", completed_at=now, duration_seconds=300))
+        db.save_print_outcome(_outcome(job_id="c", outcome="failed", failure_mode="clog", created_at=now))
+        rows = {r["source"]: r for r in db.list_daily_rollups(since=now - 86400)}
+        assert rows["history"]["prints"] == 2
+        assert rows["history"]["successes"] == 1
+        assert rows["history"]["duration_sum"] == pytest.approx(400)
+        assert rows["outcome"]["failure_mode"] == "clog"
+        assert rows["outcome"]["material_type"] == "PLA"
+
+    def test_backfilled_for_existing_databases(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "legacy.db")
+        first = KilnDB(db_path=path)
+        for i in range(3):
+            first.save_print_outcome(_outcome(job_id=f"j{i}", outcome="success" if i else "failed"))
+        first._conn.execute("DELETE FROM printer_daily_rollups")
+        first._conn.commit()
+        first.close()
+
+        reopened = KilnDB(db_path=path)
+        try:
+            rows = reopened.list_daily_rollups(since=time.time() - 86400)
+            assert sum(r["prints"] for r in rows) == 3
+            assert sum(r["successes"] for r in rows) == 2
+        finally:
+            reopened.close()
+
+    def test_printer_filter(self, db: KilnDB) -> None:
+        db.save_print_outcome(_outcome(job_id="a", printer_name="ender3"))
+        db.save_print_outcome(_outcome(job_id="b", printer_name="mk4"))
+        rows = db.list_daily_rollups(since=0, printer_names=["mk4"])
+        assert [r["printer_name"] for r in rows] == ["mk4"]
+        assert db.list_daily_rollups(since=0, printer_names=[]) == []
+
+
+class TestAnalyzeFleetTrends:
+    def test_reports_every_printer(self, db: KilnDB) -> None:
+        now = time.time()
+        for i in range(10):
+            # ender3 degrades in the second half of the window, mk4 stays healthy.
+            db.save_print_outcome(_outcome(
+                job_id=f"e{i}",
+                outcome="failed" if i >= 5 else "success",
+                failure_mode="clog" if i >= 5 else None,
+                created_at=now - 86400 * (25 - 2 * i),
+            ))
+            db.save_print_outcome(_outcome(job_id=f"m{i}", printer_name="mk4", created_at=now - 86400 * i))
+        reports = analyze_fleet_trends(db=db)
+        assert set(reports) == {"ender3", "mk4"}
+        ender = reports["ender3"]
+        assert ender.total_prints == 10
+        assert ender.failure_rate_trend == "worsening"
+        assert ender.top_failure_modes == [{"mode": "clog", "count": 5}]
+        assert any(a.category == "recurring_failure" for a in ender.alerts)
+        assert reports["mk4"].success_rate == 1.0
+
+    def test_unknown_printer_gets_empty_report(self, db: KilnDB) -> None:
+        report = analyze_fleet_trends(db=db, printer_names=["ghost"])["ghost"]
+        assert report.total_prints == 0
+        assert any(a.category == "sample_size" for a in report.alerts)
+
+
 class TestTrendReportSerialization:
     def test_to_dict_roundtrip(self) -> None:
         report = TrendReport(
@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+import math
 import os
+import random
 import struct
 import tempfile
 
 import pytest
 
+from kiln import printability
 from kiln.printability import (
+    _MAX_SUPPORT_CELLS,
     BedAdhesionAnalysis,
     BridgingAnalysis,
     OverhangAnalysis,
     PrintabilityReport,
     SupportAnalysis,
+    SupportMap,
     ThinWallAnalysis,
     _analyze_bed_adhesion,
     _analyze_bridging,
@@ -21,11 +26,15 @@ from kiln.printability import (
     _analyze_supports,
     _analyze_thin_walls,
     _compute_score,
+    _layer_areas,
+    _layer_areas_np,
     _score_to_grade,
+    _support_map,
     _triangle_area,
     _triangle_centroid,
     _triangle_normal,
     analyze_printability,
+    build_support_map,
 )
 
 # ---------------------------------------------------------------------------
@@ -76,6 +85,45 @@ def _cube_triangles(size: float = 10.0) -> list[tuple]:
     return [(verts[a], verts[b], verts[c]) for a, b, c in faces]
 
 
+def _box_triangles(lo: tuple, hi: tuple, *, top: bool = True) -> list[tuple]:
+    """Outward-wound triangles of the box between corners *lo* and *hi*."""
+    (x0, y0, z0), (x1, y1, z1) = lo, hi
+    sx, sy, sz = x1 - x0, y1 - y0, z1 - z0
+    # _cube_triangles winds inward; swap two vertices to face out.
+    faces = [(a, c, b) for a, b, c in _cube_triangles(10.0)]
+    if not top:
+        del faces[2:4]
+    return [
+        tuple((x0 + v[0] / 10.0 * sx, y0 + v[1] / 10.0 * sy, z0 + v[2] / 10.0 * sz) for v in tri)
+        for tri in faces
+    ]
+
+
+def _mushroom_triangles() -> list[tuple]:
+    """A 10x10x10 cap on a 2x2x2 stem: 100 mm2 of ceiling 2 mm above the bed."""
+    return _box_triangles((4, 4, 0), (6, 6, 2), top=False) + _box_triangles((0, 0, 2), (10, 10, 12))
+
+
+def _sphere_triangles(n: int = 12, radius: float = 10.0) -> list[tuple]:
+    """UV sphere resting on the bed, with sloped overhangs across many layers."""
+
+    def point(theta: float, phi: float) -> tuple:
+        return (
+            radius * math.sin(theta) * math.cos(phi),
+            radius * math.sin(theta) * math.sin(phi),
+            radius + radius * math.cos(theta),
+        )
+
+    triangles = []
+    for i in range(n):
+        t0, t1 = math.pi * i / n, math.pi * (i + 1) / n
+        for j in range(2 * n):
+            p0, p1 = math.pi * j / n, math.pi * (j + 1) / n
+            a, b, c, d = point(t0, p0), point(t1, p0), point(t1, p1), point(t0, p1)
+            triangles += [(a, b, c), (a, c, d)]
+    return triangles
+
+
 def _write_stl(tmpdir: str, triangles: list[tuple]) -> str:
     """Write a binary STL file and return its path."""
     path = os.path.join(tmpdir, "test_model.stl")
@@ -401,3 +449,158 @@ class TestAnalyzePrintability:
             path = _write_stl(tmpdir, _cube_triangles(10.0))
             report = analyze_printability(path)
             assert report.estimated_print_time_modifier >= 1.0
+
+
+# ---------------------------------------------------------------------------
+# TestSupportMap
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test once with the numpy face arrays and once with the plain loops."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(printability, "np", None)
+    return request.param
+
+
+class TestSupportMap:
+    def test_mushroom_cap_fills_footprint(self, backend):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_stl(tmpdir, _mushroom_triangles())
+            smap = build_support_map(path, resolution_mm=1.0, layer_height=0.25)
+        assert isinstance(smap, SupportMap)
+        assert len(smap.heights_mm) == 10
+        assert all(h == 2.0 for row in smap.heights_mm for h in row)
+        assert smap.footprint_area_mm2 == 100.0
+        assert smap.volume_mm3 == 200.0
+        assert smap.max_height_mm == 2.0
+        assert len(smap.layer_overhang_area_mm2) == 48
+        assert smap.layer_overhang_area_mm2[8] == pytest.approx(100.0)
+        assert sum(smap.layer_overhang_area_mm2) == pytest.approx(100.0)
+
+    def test_cube_needs_no_support(self, backend):
+        smap = _support_map(_cube_triangles(), 0.0, resolution_mm=2.0)
+        assert smap.footprint_area_mm2 == 0.0
+        assert smap.volume_mm3 == 0.0
+        assert len(smap.heights_mm) == 5
+        assert sum(smap.layer_overhang_area_mm2) == 0.0
+
+    def test_lowest_overhang_sets_column_height(self, backend):
+        # A second ceiling directly above the first does not add support.
+        tris = _mushroom_triangles() + _box_triangles((0, 0, 20), (10, 10, 22))
+        smap = _support_map(tris, 0.0, normalize_winding=False)
+        assert smap.max_height_mm == 2.0
+        assert smap.volume_mm3 == 200.0
+
+    def test_small_faces_mark_their_cell(self, backend):
+        # A ceiling sliver between cell centres still marks the cell it sits in.
+        tris = _box_triangles((0, 0, 0), (10, 10, 10)) + [((3.1, 3.1, 5.0), (3.3, 3.4, 5.0), (3.4, 3.1, 5.0))]
+        smap = _support_map(tris, 0.0, normalize_winding=False)
+        assert smap.footprint_area_mm2 == 1.0
+        assert smap.heights_mm[3][3] == pytest.approx(5.0)
+
+    def test_fine_resolution_is_coarsened_to_cell_cap(self, backend):
+        smap = _support_map(_mushroom_triangles(), 0.0, resolution_mm=0.001, normalize_winding=False)
+        rows, cols = len(smap.heights_mm), len(smap.heights_mm[0])
+        assert rows * cols <= _MAX_SUPPORT_CELLS
+        assert smap.resolution_mm > 0.001
+        assert smap.footprint_area_mm2 == pytest.approx(100.0, rel=0.02)
+        assert smap.volume_mm3 == pytest.approx(200.0, rel=0.02)
+
+    def test_supports_report_map_summary(self, backend):
+        result = _analyze_supports(_mushroom_triangles(), 0.0, resolution_mm=1.0)
+        assert result.footprint_area_mm2 == 100.0
+        assert result.mapped_volume_mm3 == 200.0
+        assert result.max_support_height_mm == 2.0
+        assert result.mapped_percentage == pytest.approx(200.0 / 1008.0 * 100.0, abs=0.1)
+
+    def test_supports_skip_map_by_default(self, backend, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("support map built")
+
+        monkeypatch.setattr(printability, "_support_map", fail)
+        result = _analyze_supports(_mushroom_triangles(), 0.0)
+        assert result.estimated_support_volume_mm3 > 0
+        assert result.footprint_area_mm2 == 0.0
+        assert result.mapped_volume_mm3 == 0.0
+
+    def test_resolution_must_be_positive(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_stl(tmpdir, _cube_triangles())
+            with pytest.raises(ValueError, match="resolution must be positive"):
+                build_support_map(path, resolution_mm=0.0)
+            with pytest.raises(ValueError, match="layer_height must be positive"):
+                analyze_printability(path, layer_height=0.0)
+
+
+# ---------------------------------------------------------------------------
+# TestOverhangLayers
+# ---------------------------------------------------------------------------
+
+
+class TestOverhangLayers:
+    def test_sloped_face_spreads_evenly(self):
+        assert _layer_areas([(0.0, 1.0, 10.0)], 0.0, 0.25, 4) == pytest.approx([2.5] * 4)
+
+    def test_flat_face_lands_in_its_layer(self):
+        assert _layer_areas([(0.6, 0.6, 3.0)], 0.0, 0.25, 4) == [0.0, 0.0, 3.0, 0.0]
+
+    def test_vectorized_layers_match_loop(self):
+        np = pytest.importorskip("numpy")
+        rng = random.Random(7)
+        spans = []
+        for _ in range(200):
+            lo = rng.uniform(0.0, 20.0)
+            spans.append((lo, lo + rng.choice([0.0, 1e-5, rng.uniform(0.0, 5.0)]), rng.uniform(0.0, 4.0)))
+        lo, hi, weights = (np.array(column) for column in zip(*spans, strict=True))
+        n_layers = 125
+        expected = _layer_areas(spans, 0.0, 0.2, n_layers)
+        assert _layer_areas_np(lo, hi, weights, 0.0, 0.2, n_layers) == pytest.approx(expected, abs=1e-9)
+
+    def test_peak_layer_and_projected_area(self, backend):
+        result = _analyze_overhangs(_mushroom_triangles(), z_min=0.0, layer_height=0.25)
+        assert result.overhang_area_mm2 == 100.0
+        assert result.peak_layer_height_mm == 2.25
+        assert result.peak_layer_area_mm2 == 100.0
+
+    def test_worst_regions_span_whole_mesh(self, backend):
+        # Twelve shallow ceilings come first; the steepest overhang is last.
+        shallow = [((i, 0, 5.0), (i, 1, 5.0), (i + 1, 0, 5.5)) for i in range(12)]
+        steep = [((0, 5, 9.0), (0, 6, 9.0), (1, 5, 9.0))]
+        result = _analyze_overhangs(shallow + steep, normalize_winding=False)
+        assert result.overhang_triangle_count == 13
+        assert result.worst_regions[0]["angle"] == 90.0
+        assert result.worst_regions[0]["z"] == 9.0
+
+
+# ---------------------------------------------------------------------------
+# TestBackendsAgree
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "triangles",
+    [_cube_triangles(), _mushroom_triangles(), _sphere_triangles()],
+    ids=["cube", "mushroom", "sphere"],
+)
+def test_vectorized_analysis_matches_loops(triangles, monkeypatch):
+    pytest.importorskip("numpy")
+    bbox = {"x_min": -10.0, "x_max": 10.0, "y_min": -10.0, "y_max": 10.0}
+
+    def run() -> list:
+        return [
+            _analyze_overhangs(triangles),
+            _analyze_overhangs(triangles, z_min=0.0),
+            _analyze_thin_walls(triangles, [], nozzle_diameter=2.0),
+            _analyze_bridging(triangles, 0.0),
+            _analyze_bed_adhesion(triangles, 0.0, bbox),
+            _analyze_supports(triangles, 0.0, resolution_mm=0.5),
+        ]
+
+    vectorized = run()
+    monkeypatch.setattr(printability, "np", None)
+    assert vectorized == run()
+
@@ -2,6 +2,7 @@
 
 Covers:
 - License validation (valid key, invalid key, empty key)
+- License decision cache (hits, fingerprints, revocation, TTL, LRU bound)
 - Material listing delegation and error propagation
 - Quote handling with fee calculation and server-side quote caching
 - Order handling (quote token validation, free tier limits, fee charging,
@@ -29,7 +30,7 @@ from kiln.fulfillment.base import (
     Quote,
     QuoteRequest,
 )
-from kiln.fulfillment.proxy_server import ProxyOrchestrator, get_orchestrator
+from kiln.fulfillment.proxy_server import LicenseDecisionCache, ProxyOrchestrator, get_orchestrator
 from kiln.licensing import LicenseInfo, LicenseTier
 from kiln.payments.base import PaymentError
 
@@ -206,6 +207,107 @@ class TestLicenseValidation:
         assert result["tier"] == "pro"
 
 
+# ---------------------------------------------------------------------------
+# TestLicenseDecisionCache
+# ---------------------------------------------------------------------------
+
+
+def _entitled(jti: str = "jti-1") -> MagicMock:
+    decision = MagicMock()
+    decision.valid = True
+    decision.jti = jti
+    decision.source = "supabase"
+    decision.activation_count = 1
+    decision.max_activations = 3
+    return decision
+
+
+class TestLicenseDecisionCache:
+    @pytest.fixture()
+    def entitled_orch(self, orch: ProxyOrchestrator) -> ProxyOrchestrator:
+        orch._pilot_store = MagicMock()
+        orch._entitlement = MagicMock()
+        orch._entitlement.evaluate_license.return_value = _entitled()
+        return orch
+
+    def test_repeat_validation_served_from_cache(self, entitled_orch: ProxyOrchestrator):
+        with patch("kiln.fulfillment.proxy_server.LicenseManager") as MockMgr:
+            MockMgr.return_value.get_tier.return_value = LicenseTier.PRO
+            MockMgr.return_value.get_info.return_value = LicenseInfo(tier=LicenseTier.PRO)
+            first = entitled_orch.validate_license("kiln_pro_abc", device_fingerprint="dev-a")
+            first["info"]["tier"] = "mutated"
+            second = entitled_orch.validate_license("kiln_pro_abc", device_fingerprint="dev-a")
+            other = entitled_orch.validate_license("kiln_pro_abc", device_fingerprint="dev-b")
+
+        assert MockMgr.call_count == 2
+        assert entitled_orch._entitlement.evaluate_license.call_count == 2
+        assert second["valid"] is True and other["valid"] is True
+        assert second["info"]["tier"] == "pro"
+
+    def test_record_event_bypasses_cache(self, entitled_orch: ProxyOrchestrator):
+        with patch("kiln.fulfillment.proxy_server.LicenseManager") as MockMgr:
+            MockMgr.return_value.get_tier.return_value = LicenseTier.PRO
+            MockMgr.return_value.get_info.return_value = LicenseInfo(tier=LicenseTier.PRO)
+            entitled_orch.validate_license("kiln_pro_abc", record_event=True)
+            entitled_orch.validate_license("kiln_pro_abc", record_event=True)
+        assert MockMgr.call_count == 2
+
+    def test_errors_are_not_cached(self, orch: ProxyOrchestrator):
+        with patch("kiln.fulfillment.proxy_server.LicenseManager") as MockMgr:
+            MockMgr.side_effect = ValueError("boom")
+            orch.validate_license("kiln_pro_abc")
+            orch.validate_license("kiln_pro_abc")
+        assert MockMgr.call_count == 2
+
+    def test_revocation_invalidates_cached_decision(self, entitled_orch: ProxyOrchestrator):
+        with patch("kiln.fulfillment.proxy_server.LicenseManager") as MockMgr:
+            MockMgr.return_value.get_tier.return_value = LicenseTier.PRO
+            MockMgr.return_value.get_info.return_value = LicenseInfo(tier=LicenseTier.PRO)
+            entitled_orch.validate_license("kiln_pro_abc")
+            entitled_orch._entitlement.is_revoked.return_value = True
+            assert entitled_orch.is_revoked(" jti-1 ") is True
+            entitled_orch.validate_license("kiln_pro_abc")
+            entitled_orch._entitlement.list_revocations.return_value = [{"jti": "jti-1"}]
+            entitled_orch.list_revocations()
+            entitled_orch.validate_license("kiln_pro_abc")
+        assert MockMgr.call_count == 3
+
+    def test_ttl_and_license_expiry_bound_entries(self, monkeypatch: pytest.MonkeyPatch):
+        now = [1000.0]
+        monkeypatch.setattr("kiln.fulfillment.proxy_server.time.time", lambda: now[0])
+        cache = LicenseDecisionCache(ttl_seconds=60)
+        result = {"valid": True, "source": "local", "jti": "", "info": {"expires_at": 1030.0}}
+        cache.put(("a",), result)
+        cache.put(("b",), {**result, "info": {}})
+        now[0] = 1031.0
+        assert cache.get(("a",)) is None
+        assert cache.get(("b",)) is not None
+        now[0] = 1061.0
+        assert cache.get(("b",)) is None
+        assert len(cache) == 0
+
+    def test_lru_bound(self):
+        cache = LicenseDecisionCache(ttl_seconds=60, max_entries=2)
+        for name in ("a", "b"):
+            cache.put((name,), {"valid": True, "source": "local", "jti": name})
+        cache.get(("a",))
+        cache.put(("c",), {"valid": True, "source": "local", "jti": "c"})
+        assert len(cache) == 2
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) is not None
+        assert cache.invalidate_jti("b") == 0
+
+    def test_zero_ttl_disables_cache(self, orch: ProxyOrchestrator, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("KILN_LICENSE_DECISION_CACHE_TTL_SECONDS", "0")
+        uncached = ProxyOrchestrator(db=MagicMock())
+        with patch("kiln.fulfillment.proxy_server.LicenseManager") as MockMgr:
+            MockMgr.return_value.get_tier.return_value = LicenseTier.PRO
+            MockMgr.return_value.get_info.return_value = LicenseInfo(tier=LicenseTier.PRO)
+            uncached.validate_license("kiln_pro_abc")
+            uncached.validate_license("kiln_pro_abc")
+        assert MockMgr.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # TestHandleMaterials
 # ---------------------------------------------------------------------------
@@ -0,0 +1,659 @@
+"""Query-plan regression tests for KilnDB.
+
+Every public :class:`~kiln.persistence.KilnDB` method (plus the print DNA
+similarity search) is called against a seeded database while the SQL it
+issues is recorded.  Each statement is then run through ``EXPLAIN QUERY
+PLAN`` and the test fails if SQLite would read a whole table.
+
+Seeding a million rows per table would take minutes, so the tables are
+filled with ``KILN_QUERY_PLAN_ROWS`` rows (default 5000) drawn from
+realistic distributions, analysed, and their ``sqlite_stat1`` statistics
+are scaled to a million rows before planning.  Set the variable to
+``1000000`` to plan against a fully populated database instead.
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+import random
+import re
+import time
+
+import pytest
+
+from kiln.model_cache import ModelCacheEntry
+from kiln.persistence import KilnDB, SQLiteBackend
+from kiln.schema_migrations import MIGRATIONS, applied_versions
+
+_SEED_ROWS = int(os.environ.get("KILN_QUERY_PLAN_ROWS", "5000"))
+_PLANNED_ROWS = 1_000_000
+
+# Tables that only ever hold a handful of rows per printer or user, the
+# pre-aggregated daily rollups (one row per printer, day and bucket) and
+# the partition catalog (one row per table and month).
+_SMALL_TABLES = frozenset(
+    {"printers", "settings", "printer_materials", "spools", "printer_daily_rollups", "table_partitions"}
+)
+
+# Statements that must visit every row, by the method that issues them.
+_FULL_SCAN_METHODS = {
+    "print_outcome_counts": "aggregates every outcome for the learning model",
+    "rebuild_daily_rollups": "rebuilds aggregates from the whole history",
+    "verify_audit_log": "walks the entire hash chain",
+}
+
+# Public methods that issue no query worth planning.
+_UNPLANNED_METHODS = frozenset({"close", "db_size_bytes"})
+
+
+# ---------------------------------------------------------------------------
+# Recording backend and seeded database
+# ---------------------------------------------------------------------------
+
+
+class _RecordingBackend(SQLiteBackend):
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path)
+        self.method = "<schema>"
+        self.statements: list[tuple[str, str, tuple]] = []
+
+    def execute(self, sql, parameters=(), /):
+        self.statements.append((self.method, sql, parameters))
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        rows = list(seq_of_parameters)
+        if rows:
+            self.statements.append((self.method, sql, rows[0]))
+        return super().executemany(sql, rows)
+
+
+def _seed(conn, n: int) -> None:
+    rnd = random.Random(7)
+    now = time.time()
+    printers = [f"printer-{i}" for i in range(20)]
+    hashes = [f"{i:064x}" for i in range(max(1, n // 4))]
+    ts = [now - (n - i) * 60.0 for i in range(n)]
+
+    def rows(fn):
+        return [fn(i) for i in range(n)]
+
+    conn.executemany(
+        "INSERT INTO jobs (id, file_name, printer_name, status, priority, submitted_by, submitted_at) "
+        "VALUES (?, ?, ?, ?, ?, 'agent', ?)",
+        rows(
+            lambda i: (
+                f"job-{i}",
+                "part.gcode",
+                rnd.choice(printers),
+                rnd.choice(["queued", "printing", "completed", "failed", "cancelled"]),
+                rnd.randint(0, 3),
+                ts[i],
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO events (event_type, source, data, timestamp) VALUES (?, 'test', '{}', ?)",
+        rows(lambda i: (f"event.type{i % 30}", ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO print_history (job_id, printer_name, file_name, status, duration_seconds, "
+        "material_type, file_hash, started_at, completed_at, created_at) VALUES (?, ?, 'f', ?, 600, ?, ?, ?, ?, ?)",
+        rows(
+            lambda i: (
+                f"job-{i}",
+                rnd.choice(printers),
+                rnd.choice(["completed", "failed"]),
+                rnd.choice(["PLA", "PETG", "ABS"]),
+                rnd.choice(hashes),
+                ts[i] - 600,
+                ts[i],
+                ts[i],
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO print_outcomes (job_id, printer_name, file_hash, material_type, outcome, settings, created_at) "
+        "VALUES (?, ?, ?, ?, ?, '{}', ?)",
+        rows(
+            lambda i: (
+                f"job-{i}",
+                rnd.choice(printers),
+                rnd.choice(hashes),
+                rnd.choice(["PLA", "PETG", "ABS"]),
+                rnd.choice(["success", "failed", "partial"]),
+                ts[i],
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO safety_audit_log (timestamp, tool_name, safety_level, action, agent_id, printer_name, "
+        "details, session_id) VALUES (?, ?, 'safe', ?, 'agent', ?, '{}', ?)",
+        rows(
+            lambda i: (
+                ts[i],
+                f"tool_{i % 40}",
+                rnd.choice(["executed", "blocked", "rate_limited"]),
+                rnd.choice(printers),
+                f"session-{i // 50}",
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO snapshots (job_id, printer_name, phase, image_path, created_at) VALUES (?, ?, ?, '/x.jpg', ?)",
+        rows(lambda i: (f"job-{i // 10}", rnd.choice(printers), rnd.choice(["start", "mid", "end"]), ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO billing_charges (id, job_id, fee_amount, fee_percent, job_cost, total_cost, payment_status, "
+        "user_email, created_at) VALUES (?, ?, 1, 5, 20, 21, ?, ?, ?)",
+        rows(
+            lambda i: (
+                f"charge-{i}",
+                f"job-{i}",
+                rnd.choice(["pending", "paid", "failed", "refunded"]),
+                f"user{i % 200}@example.com",
+                ts[i],
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO payments (id, charge_id, provider_id, rail, amount, currency, status, created_at, updated_at) "
+        "VALUES (?, ?, 'stripe', 'card', 21, 'USD', 'completed', ?, ?)",
+        rows(lambda i: (f"pay-{i}", f"charge-{i}", ts[i], ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO payment_methods (id, user_id, rail, provider_ref, is_default, created_at) "
+        "VALUES (?, ?, 'card', 'ref', ?, ?)",
+        rows(lambda i: (f"pm-{i}", f"user-{i // 2}", i % 2, ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO sync_log (entity_type, entity_id, synced_at) VALUES (?, ?, ?)",
+        rows(lambda i: ("job" if i % 2 else "event", str(i), ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO model_cache (cache_id, file_name, file_path, file_hash, file_size_bytes, source, prompt, "
+        "tags, created_at) VALUES (?, 'm.stl', '/m.stl', ?, 100, ?, 'a bracket', '[]', ?)",
+        rows(lambda i: (f"cache-{i}", hashes[i % len(hashes)], rnd.choice(["meshy", "thingiverse", "local"]), ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO print_dna (file_hash, geometric_signature, surface_area, volume, complexity_score, "
+        "printer_model, material, outcome, timestamp) VALUES (?, ?, ?, ?, ?, ?, 'PLA', ?, ?)",
+        rows(
+            lambda i: (
+                rnd.choice(hashes),
+                f"sig-{i % (n // 8 + 1)}",
+                rnd.uniform(100, 1e5),
+                rnd.uniform(10, 1e6),
+                rnd.random(),
+                rnd.choice(printers),
+                rnd.choice(["success", "failed"]),
+                ts[i],
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO agent_memory (agent_id, scope, key, value, created_at, updated_at, expires_at) "
+        "VALUES (?, ?, ?, '1', ?, ?, ?)",
+        rows(
+            lambda i: (
+                f"agent-{i % 10}",
+                rnd.choice(["global", "fleet", "printer"]),
+                f"key-{i}",
+                ts[i],
+                ts[i],
+                ts[i] + 86400 if i % 5 == 0 else None,
+            )
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO leveling_history (printer_name, started_at, success) VALUES (?, ?, 1)",
+        rows(lambda i: (rnd.choice(printers), ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO webhook_dead_letters (event_id, webhook_id, url, event_type, payload, timestamp) "
+        "VALUES (?, ?, 'https://h', 'job.completed', '{}', ?)",
+        rows(lambda i: (f"evt-{i}", f"wh-{i % 5}", ts[i])),
+    )
+    conn.executemany(
+        "INSERT INTO fulfillment_orders (id, order_id, provider, status, file_path, material_id, created_at, "
+        "updated_at) VALUES (?, ?, 'craftcloud', ?, '/m.stl', 'pla', ?, ?)",
+        rows(
+            lambda i: (
+                f"fo-{i}",
+                f"order-{i}",
+                rnd.choice(["submitted", "shipped", "delivered", "cancelled"]),
+                ts[i],
+                ts[i],
+            )
+        ),
+    )
+    for name in printers:
+        conn.execute(
+            "INSERT INTO printers (name, printer_type, host, registered_at) VALUES (?, 'octoprint', 'h', ?)",
+            (name, now),
+        )
+    conn.commit()
+
+
+def _scale_statistics(conn, n: int) -> None:
+    """Rewrite ``sqlite_stat1`` as if every seeded table held a million rows.
+
+    Columns with many rows per value (status, printer, event type) keep
+    their cardinality, so their per-value counts grow with the table;
+    near-unique columns (ids, hashes) keep their per-value counts.
+    """
+    conn.execute("ANALYZE")
+    factor = _PLANNED_ROWS / n
+    if factor <= 1:
+        return
+    for tbl, idx, stat in conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall():
+        if tbl in _SMALL_TABLES:
+            continue
+        parts = stat.split()
+        scaled = [str(round(int(parts[0]) * factor))]
+        for value in parts[1:]:
+            if value.isdigit():
+                count = int(value)
+                scaled.append(str(round(count * factor)) if count > 10 else value)
+            else:
+                scaled.append(value)
+        conn.execute(
+            "UPDATE sqlite_stat1 SET stat = ? WHERE tbl = ? AND idx IS ?",
+            (" ".join(scaled), tbl, idx),
+        )
+    conn.commit()
+    # Reload the statistics into the query planner.
+    conn.execute("ANALYZE sqlite_schema")
+
+
+def build_plan_db(path: str, rows: int = _SEED_ROWS) -> tuple[KilnDB, _RecordingBackend]:
+    backend = _RecordingBackend(path)
+    db = KilnDB(path, backend=backend)
+    _seed(backend._conn, rows)
+    _scale_statistics(backend._conn, rows)
+    return db, backend
+
+
+# ---------------------------------------------------------------------------
+# Workload: one or more calls per public method
+# ---------------------------------------------------------------------------
+
+
+def _cache_entry() -> ModelCacheEntry:
+    return ModelCacheEntry(
+        cache_id="cache-new",
+        file_name="m.stl",
+        file_path="/m.stl",
+        file_hash="ab" * 32,
+        file_size_bytes=100,
+        source="local",
+        created_at=time.time(),
+    )
+
+
+def _workload(monkeypatch) -> list[tuple[str, object]]:
+    now = time.time()
+    charge = {
+        "id": "charge-new",
+        "job_id": "job-new",
+        "fee_amount": 1.0,
+        "fee_percent": 5.0,
+        "job_cost": 20.0,
+        "total_cost": 21.0,
+        "user_email": "user1@example.com",
+    }
+    outcome = {
+        "job_id": "job-new",
+        "printer_name": "printer-1",
+        "outcome": "success",
+        "quality_grade": "good",
+        "failure_mode": None,
+        "material_type": "PLA",
+        "file_hash": "ab" * 32,
+    }
+    calls: list[tuple[str, object]] = [
+        (
+            "save_job",
+            lambda db: db.save_job({"id": "job-new", "file_name": "f", "status": "queued", "submitted_at": now}),
+        ),
+        ("get_job", lambda db: db.get_job("job-1")),
+        ("get_job_status", lambda db: db.get_job_status("job-1")),
+        ("list_jobs", lambda db: db.list_jobs()),
+        ("list_jobs", lambda db: db.list_jobs(status="queued")),
+        ("get_jobs_page", lambda db: db.get_jobs_page(None, 100)),
+        ("get_jobs_page", lambda db: db.get_jobs_page((now - 3600, "job-9"), 100)),
+        ("log_event", lambda db: db.log_event("job.completed", {"id": 1})),
+        ("recent_events", lambda db: db.recent_events()),
+        ("recent_events", lambda db: db.recent_events(event_type="event.type3")),
+        ("get_events_page", lambda db: db.get_events_page(100, 100)),
+        ("last_event_id_before", lambda db: db.last_event_id_before(now - 3600)),
+        ("save_printer", lambda db: db.save_printer("printer-new", "klipper", "h")),
+        ("list_printers", lambda db: db.list_printers()),
+        ("remove_printer", lambda db: db.remove_printer("printer-new")),
+        ("set_setting", lambda db: db.set_setting("k", "v")),
+        ("get_setting", lambda db: db.get_setting("k")),
+        ("save_material", lambda db: db.save_material("printer-1", 0, "PLA")),
+        ("get_material", lambda db: db.get_material("printer-1", 0)),
+        ("list_materials", lambda db: db.list_materials("printer-1")),
+        ("update_material_remaining", lambda db: db.update_material_remaining("printer-1", 0, 500.0)),
+        ("save_spool", lambda db: db.save_spool({"id": "spool-1", "material_type": "PLA"})),
+        ("get_spool", lambda db: db.get_spool("spool-1")),
+        ("list_spools", lambda db: db.list_spools()),
+        ("update_spool_remaining", lambda db: db.update_spool_remaining("spool-1", 10.0)),
+        ("remove_spool", lambda db: db.remove_spool("spool-1")),
+        ("save_leveling", lambda db: db.save_leveling({"printer_name": "printer-1", "started_at": now})),
+        ("last_leveling", lambda db: db.last_leveling("printer-1")),
+        ("leveling_count_since", lambda db: db.leveling_count_since("printer-1", now - 86400)),
+        ("log_sync", lambda db: db.log_sync("job", "job-1")),
+        ("get_unsynced_jobs", lambda db: db.get_unsynced_jobs(now - 600)),
+        ("get_unsynced_events", lambda db: db.get_unsynced_events(now - 600)),
+        ("mark_synced", lambda db: db.mark_synced("job", ["job-2"])),
+        ("save_sync_cursor", lambda db: db.save_sync_cursor("events", "100")),
+        ("get_sync_cursor", lambda db: db.get_sync_cursor("events")),
+        ("save_billing_charge", lambda db: db.save_billing_charge(charge)),
+        ("get_billing_charge", lambda db: db.get_billing_charge("charge-1")),
+        ("list_billing_charges", lambda db: db.list_billing_charges()),
+        ("list_billing_charges", lambda db: db.list_billing_charges(month=1, year=2026)),
+        ("monthly_billing_summary", lambda db: db.monthly_billing_summary()),
+        ("billing_charges_this_month", lambda db: db.billing_charges_this_month()),
+        ("billing_charges_this_month_for_user", lambda db: db.billing_charges_this_month_for_user("user1@example.com")),
+        ("monthly_fee_total", lambda db: db.monthly_fee_total()),
+        ("update_billing_charge", lambda db: db.update_billing_charge("charge-1", payment_status="paid")),
+        ("list_billing_charges_by_status", lambda db: db.list_billing_charges_by_status("pending")),
+        (
+            "save_payment_method",
+            lambda db: db.save_payment_method(
+                {"id": "pm-new", "user_id": "user-1", "rail": "card", "provider_ref": "r", "is_default": True}
+            ),
+        ),
+        ("get_default_payment_method", lambda db: db.get_default_payment_method("user-1")),
+        ("list_payment_methods", lambda db: db.list_payment_methods("user-1")),
+        (
+            "save_payment",
+            lambda db: db.save_payment(
+                {"id": "pay-new", "charge_id": "charge-1", "provider_id": "p", "rail": "card", "amount": 1.0}
+            ),
+        ),
+        ("update_payment_status", lambda db: db.update_payment_status("pay-1", "completed")),
+        ("purge_old_billing_charges", lambda db: db.purge_old_billing_charges(retain_days=30)),
+        ("purge_old_payments", lambda db: db.purge_old_payments(retain_days=30)),
+        ("delete_user_billing_data", lambda db: db.delete_user_billing_data("user-3")),
+        (
+            "save_print_record",
+            lambda db: db.save_print_record(
+                {"job_id": "job-new", "printer_name": "printer-1", "status": "completed", "completed_at": now}
+            ),
+        ),
+        ("get_print_record", lambda db: db.get_print_record("job-1")),
+        ("list_print_history", lambda db: db.list_print_history()),
+        ("list_print_history", lambda db: db.list_print_history(printer_name="printer-1")),
+        ("list_print_history", lambda db: db.list_print_history(status="failed")),
+        ("list_print_history", lambda db: db.list_print_history(printer_name="printer-1", status="failed")),
+        ("get_printer_stats", lambda db: db.get_printer_stats("printer-1")),
+        ("update_print_notes", lambda db: db.update_print_notes("job-1", "ok")),
+        ("save_memory", lambda db: db.save_memory("agent-1", "global", "k", {"v": 1}, ttl_seconds=60)),
+        ("get_memory", lambda db: db.get_memory("agent-1", "global", "k")),
+        ("list_memory", lambda db: db.list_memory("agent-1")),
+        ("list_memory", lambda db: db.list_memory("agent-1", scope="global")),
+        ("delete_memory", lambda db: db.delete_memory("agent-1", "global", "k")),
+        ("clean_expired_notes", lambda db: db.clean_expired_notes()),
+        ("list_daily_rollups", lambda db: db.list_daily_rollups(since=now - 30 * 86400)),
+        (
+            "list_daily_rollups",
+            lambda db: db.list_daily_rollups(since=now - 30 * 86400, printer_names=["printer-1", "printer-2"]),
+        ),
+        ("get_print_trend_stats", lambda db: db.get_print_trend_stats("printer-1", since=now - 30 * 86400)),
+        ("save_print_outcome", lambda db: db.save_print_outcome(outcome)),
+        ("get_print_outcome", lambda db: db.get_print_outcome("job-1")),
+        ("list_print_outcomes", lambda db: db.list_print_outcomes()),
+        ("list_print_outcomes", lambda db: db.list_print_outcomes(printer_name="printer-1", outcome="failed")),
+        ("list_print_outcomes", lambda db: db.list_print_outcomes(file_hash="ab" * 32)),
+        ("get_printer_learning_insights", lambda db: db.get_printer_learning_insights("printer-1")),
+        ("get_file_outcomes", lambda db: db.get_file_outcomes("ab" * 32)),
+        ("suggest_printer_for_outcome", lambda db: db.suggest_printer_for_outcome(file_hash="ab" * 32)),
+        ("suggest_printer_for_outcome", lambda db: db.suggest_printer_for_outcome(material_type="PLA")),
+        ("print_outcome_counts", lambda db: db.print_outcome_counts()),
+        ("get_successful_settings", lambda db: db.get_successful_settings(printer_name="printer-1")),
+        ("get_successful_settings", lambda db: db.get_successful_settings(material_type="PLA")),
+        ("get_successful_settings", lambda db: db.get_successful_settings(file_hash="ab" * 32)),
+        ("save_cache_entry", lambda db: db.save_cache_entry(_cache_entry())),
+        ("get_cache_entry", lambda db: db.get_cache_entry("cache-1")),
+        ("get_cache_entry_by_hash", lambda db: db.get_cache_entry_by_hash("ab" * 32)),
+        ("search_cache", lambda db: db.search_cache(source="meshy")),
+        ("list_cache_entries", lambda db: db.list_cache_entries()),
+        ("record_cache_print", lambda db: db.record_cache_print("cache-1")),
+        ("delete_cache_entry", lambda db: db.delete_cache_entry("cache-new")),
+        ("log_audit", lambda db: db.log_audit("start_print", "guarded", "executed", session_id="s")),
+        ("query_audit", lambda db: db.query_audit()),
+        ("query_audit", lambda db: db.query_audit(action="blocked")),
+        ("query_audit", lambda db: db.query_audit(tool_name="tool_3")),
+        ("query_audit", lambda db: db.query_audit(session_id="session-3")),
+        ("audit_summary", lambda db: db.audit_summary()),
+        ("export_audit_trail", lambda db: db.export_audit_trail(start_time=now - 3600, limit=100)),
+        ("export_audit_trail", lambda db: db.export_audit_trail(tool_name="tool_3", format="csv", limit=100)),
+        ("verify_audit_log", lambda db: db.verify_audit_log()),
+        ("save_snapshot", lambda db: db.save_snapshot("printer-1", "/x.jpg", job_id="job-1")),
+        ("get_snapshots", lambda db: db.get_snapshots()),
+        ("get_snapshots", lambda db: db.get_snapshots(job_id="job-1")),
+        ("get_snapshots", lambda db: db.get_snapshots(printer_name="printer-1", phase="mid")),
+        ("delete_snapshots", lambda db: db.delete_snapshots(job_id="job-2")),
+        ("delete_snapshots", lambda db: db.delete_snapshots(older_than=now - 300 * 86400)),
+        (
+            "save_webhook_dead_letter",
+            lambda db: db.save_webhook_dead_letter(
+                {"event_id": "evt-new", "webhook_id": "wh-1", "url": "https://h", "event_type": "x", "payload": "{}"},
+                keep=10_000,
+            ),
+        ),
+        ("list_webhook_dead_letters", lambda db: db.list_webhook_dead_letters(limit=10)),
+        ("list_webhook_dead_letters", lambda db: db.list_webhook_dead_letters(webhook_id="wh-1", limit=10)),
+        ("count_webhook_dead_letters", lambda db: db.count_webhook_dead_letters()),
+        ("delete_webhook_dead_letters", lambda db: db.delete_webhook_dead_letters(["evt-1"])),
+        ("list_active_fulfillment_orders", lambda db: db.list_active_fulfillment_orders()),
+        ("update_fulfillment_order_status", lambda db: db.update_fulfillment_order_status("order-1", "shipped")),
+        ("rebuild_daily_rollups", lambda db: db.rebuild_daily_rollups()),
+        ("find_similar_models", _find_similar_models(monkeypatch)),
+        ("list_partitions", lambda db: db.list_partitions("events")),
+        ("drop_expired_partitions", lambda db: db.drop_expired_partitions("events", now - 30 * 86400, dry_run=True)),
+        ("drop_expired_partitions", lambda db: db.drop_expired_partitions("safety_audit_log", now - 400 * 86400)),
+        ("cleanup", lambda db: db.cleanup(max_age_days=3)),
+    ]
+    return calls
+
+
+def _find_similar_models(monkeypatch):
+    def call(db: KilnDB) -> None:
+        from kiln import persistence, print_dna
+
+        monkeypatch.setattr(persistence, "_db", db)
+        fp = print_dna.ModelFingerprint(
+            file_hash="ab" * 32,
+            geometric_signature="sig-3",
+            triangle_count=100,
+            vertex_count=52,
+            bounding_box={"min_x": 0, "max_x": 1},
+            surface_area_mm2=5000.0,
+            volume_mm3=20000.0,
+            overhang_ratio=0.1,
+            complexity_score=0.5,
+        )
+        print_dna.find_similar_models(fp, threshold=1.0)
+        print_dna.find_similar_models(fp, threshold=0.9)
+        print_dna.get_model_history("ab" * 32)
+
+    return call
+
+
+def run_workload(db: KilnDB, monkeypatch) -> None:
+    backend = db._conn
+    for method, call in _workload(monkeypatch):
+        backend.method = method
+        call(db)
+    backend.method = "<done>"
+
+
+# ---------------------------------------------------------------------------
+# Plan inspection
+# ---------------------------------------------------------------------------
+
+_PLANNED_VERBS = ("SELECT", "UPDATE", "DELETE", "WITH", "INSERT")
+_SCAN_RE = re.compile(r"^SCAN (\S+)(?: USING (COVERING )?INDEX (\w+))?$")
+_SUBQUERY_RE = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\S+)")
+_STREAMED_RE = re.compile(r"^SELECT (?:(?!\bWHERE\b).)* ORDER BY [^()]* LIMIT [^()]*$", re.IGNORECASE)
+
+
+def explain(db: KilnDB, sql: str, params) -> list[str]:
+    conn = db._conn._conn
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def full_scans(sql: str, plan: list[str], partial_indexes: set[str]) -> list[str]:
+    """Tables (or aliases) that *sql* reads in full.
+
+    A scan counts unless it walks a covering index or a partial index,
+    or it is an unfiltered ``ORDER BY ... LIMIT`` that streams rows in
+    index order and stops after *limit* rows.
+    """
+    if _STREAMED_RE.search(" ".join(sql.split())) and not any("TEMP B-TREE" in d for d in plan):
+        return []
+    subqueries = {m.group(1) for d in plan if (m := _SUBQUERY_RE.match(d))}
+    found = []
+    for detail in plan:
+        m = _SCAN_RE.match(detail)
+        if m is None:
+            continue
+        name, covering, index = m.groups()
+        if name.startswith("(") or name in subqueries or name in _SMALL_TABLES:
+            continue
+        if covering or index in partial_indexes:
+            continue
+        found.append(name)
+    return found
+
+
+@pytest.fixture(scope="module")
+def plan_report(tmp_path_factory):
+    monkeypatch = pytest.MonkeyPatch()
+    db, backend = build_plan_db(str(tmp_path_factory.mktemp("plans") / "plans.db"))
+    try:
+        run_workload(db, monkeypatch)
+        conn = backend._conn
+        partial = {
+            r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '% WHERE %'")
+        }
+        report = []
+        for method, sql, params in backend.statements:
+            if method in ("<schema>", "<done>"):
+                continue
+            if not sql.lstrip().upper().startswith(_PLANNED_VERBS):
+                continue
+            report.append((method, " ".join(sql.split()), full_scans(sql, explain(db, sql, params), partial)))
+        yield db, report
+    finally:
+        monkeypatch.undo()
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+class TestQueryPlans:
+    def test_workload_covers_every_public_method(self):
+        public = {
+            name
+            for name, member in inspect.getmembers(KilnDB, predicate=inspect.isfunction)
+            if not name.startswith("_")
+        }
+        covered = {name for name, _ in _workload(pytest.MonkeyPatch())}
+        assert public - covered - _UNPLANNED_METHODS == set()
+
+    def test_no_full_table_scans(self, plan_report):
+        _, report = plan_report
+        assert len(report) > 100
+        offenders = [
+            f"{method}: SCAN {', '.join(scans)} -- {sql[:160]}"
+            for method, sql, scans in report
+            if scans and method not in _FULL_SCAN_METHODS
+        ]
+        assert offenders == []
+
+    def test_hot_queries_use_covering_indexes(self, plan_report):
+        db, _ = plan_report
+        cases = {
+            "SELECT * FROM events WHERE event_type = ? ORDER BY id DESC LIMIT ?": ("event.type1", 50),
+            "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, submitted_at ASC LIMIT ?": ("queued", 50),
+        }
+        for sql, params in cases.items():
+            plan = " ".join(explain(db, sql, params))
+            assert "USING INDEX" in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
+
+
+class TestMigrations:
+    def test_fresh_database_records_every_version(self, tmp_path):
+        db = KilnDB(str(tmp_path / "fresh.db"))
+        try:
+            assert applied_versions(db._conn) == [m.version for m in MIGRATIONS]
+        finally:
+            db.close()
+
+    def test_legacy_database_is_upgraded_once(self, tmp_path):
+        import sqlite3
+
+        path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE safety_audit_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL,
+                tool_name TEXT NOT NULL, safety_level TEXT NOT NULL, action TEXT NOT NULL,
+                agent_id TEXT, printer_name TEXT, details TEXT, created_at REAL,
+                hmac_signature TEXT
+            );
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, event_type TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT '', data TEXT NOT NULL DEFAULT '{}',
+                timestamp REAL NOT NULL, created_at REAL
+            );
+            INSERT INTO events (event_type, data, timestamp) VALUES ('old', '{"a": 1}', 1.0);
+            """
+        )
+        conn.close()
+
+        db = KilnDB(path)
+        try:
+            columns = {row[1] for row in db._conn.execute("PRAGMA table_info(safety_audit_log)")}
+            assert {"hmac_signature", "session_id", "prev_hash"} <= columns
+            assert db.recent_events()[0]["data"] == {"a": 1}
+            indexes = {row[0] for row in db._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            # The old event lands in its own month's partition, indexes included.
+            assert "idx_events_type_id_p197001" in indexes
+            assert db.list_partitions("events")[0]["name"] == "events_p197001"
+        finally:
+            db.close()
+
+        reopened = KilnDB(path)
+        try:
+            assert applied_versions(reopened._conn) == [m.version for m in MIGRATIONS]
+        finally:
+            reopened.close()
+
+    def test_reopen_keeps_dropped_indexes_dropped(self, tmp_path):
+        from kiln.schema_migrations import DropIndex
+
+        dropped = {op.name for m in MIGRATIONS for op in m.operations if isinstance(op, DropIndex)}
+        path = str(tmp_path / "kiln.db")
+        for _ in range(2):
+            db = KilnDB(path)
+            try:
+                indexes = {row[0] for row in db._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            finally:
+                db.close()
+            assert not dropped & indexes
+
+    def test_versions_are_unique_and_ordered(self):
+        versions = [m.version for m in MIGRATIONS]
+        assert versions == sorted(set(versions))
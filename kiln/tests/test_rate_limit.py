@@ -0,0 +1,128 @@
+"""Tests for kiln.rate_limit -- weighted two-window rate limiting."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from kiln.rate_limit import MemoryRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+
+
+class _Clock:
+    def __init__(self, now: float = 6000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter:
+    def test_limit_within_window(self):
+        clock = _Clock()
+        limiter = RateLimiter(3, 60.0, clock=clock)
+        results = [limiter.check("a") for _ in range(4)]
+        assert [r[0] for r in results] == [True, True, True, False]
+        assert [r[1] for r in results[:3]] == [2, 1, 0]
+        # Allowed requests reset at the end of the current window.
+        assert results[0][2] == pytest.approx(6060.0)
+        assert limiter.check("b")[0] is True
+
+    def test_previous_window_decays(self):
+        clock = _Clock()
+        limiter = RateLimiter(4, 60.0, clock=clock)
+        for _ in range(4):
+            assert limiter.check("a")[0]
+        # 15s into the next window: estimate = 4 * 0.75 = 3 -> one more fits.
+        clock.now = 6075.0
+        assert limiter.check("a")[0] is True
+        allowed, remaining, reset_epoch = limiter.check("a")
+        assert allowed is False and remaining == 0
+        # 4 * (1 - f) + 1 <= 3  ->  f >= 0.5, i.e. 30s into the window.
+        assert reset_epoch == pytest.approx(6090.0)
+        clock.now = 6090.0
+        assert limiter.check("a")[0] is True
+
+    def test_denied_until_next_window_when_current_is_full(self):
+        clock = _Clock()
+        limiter = RateLimiter(2, 60.0, clock=clock)
+        limiter.check("a")
+        limiter.check("a")
+        allowed, _, reset_epoch = limiter.check("a")
+        assert not allowed
+        # Next window at 6060; need 2 * (1 - f) <= 1 -> f >= 0.5.
+        assert reset_epoch == pytest.approx(6090.0)
+
+    def test_per_call_limit_and_disabled(self):
+        limiter = RateLimiter(0, 60.0, clock=_Clock())
+        assert not limiter.enabled
+        assert all(limiter.check("a")[0] for _ in range(100))
+        assert limiter.check("a", limit=1)[0] is True
+        assert limiter.check("a", limit=1)[0] is False
+
+    def test_reset(self):
+        limiter = RateLimiter(1, 60.0, clock=_Clock())
+        limiter.check("a")
+        assert limiter.check("a")[0] is False
+        limiter.reset("a")
+        assert limiter.check("a")[0] is True
+
+
+class TestMemoryBackend:
+    def test_idle_keys_are_swept(self):
+        clock = _Clock()
+        backend = MemoryRateLimitBackend(stripes=1)
+        limiter = RateLimiter(5, 60.0, backend=backend, clock=clock)
+        for i in range(100):
+            limiter.check(f"client-{i}")
+        assert len(backend) == 100
+        clock.now += 120.0
+        limiter.check("fresh")
+        assert len(backend) == 1
+
+    def test_concurrent_checks_never_overshoot(self):
+        limiter = RateLimiter(50, 3600.0, backend=MemoryRateLimitBackend(stripes=4), clock=_Clock())
+        allowed: list[bool] = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(25):
+                ok = limiter.check("shared")[0]
+                with lock:
+                    allowed.append(ok)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert allowed.count(True) == 50
+
+
+class TestSQLiteBackend:
+    def test_limit_shared_across_instances(self, tmp_path):
+        path = str(tmp_path / "limits.db")
+        clock = _Clock()
+        first = RateLimiter(3, 60.0, backend=SQLiteRateLimitBackend(path), clock=clock)
+        second = RateLimiter(3, 60.0, backend=SQLiteRateLimitBackend(path), clock=clock)
+        try:
+            assert first.check("a")[0]
+            assert second.check("a")[0]
+            assert first.check("a")[0]
+            assert second.check("a")[0] is False
+        finally:
+            first.backend.close()
+            second.backend.close()
+
+    def test_stale_rows_swept(self, tmp_path):
+        clock = _Clock()
+        backend = SQLiteRateLimitBackend(str(tmp_path / "limits.db"))
+        limiter = RateLimiter(3, 60.0, backend=backend, clock=clock)
+        try:
+            limiter.check("a")
+            limiter.check("b")
+            clock.now += 180.0
+            limiter.check("c")
+            assert len(backend) == 1
+        finally:
+            backend.close()
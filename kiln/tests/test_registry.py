@@ -9,17 +9,19 @@ Covers:
 - get_printers_by_status
 - Thread safety
 - __contains__
+- Shared fleet query pool, per-printer circuit breakers, streaming status
 """
 
 from __future__ import annotations
 
 import threading
+import time
 from unittest.mock import MagicMock, PropertyMock
 
 import pytest
 
 from kiln.printers.base import PrinterAdapter, PrinterCapabilities, PrinterState, PrinterStatus
-from kiln.registry import PrinterNotFoundError, PrinterRegistry
+from kiln.registry import _CIRCUIT_FAILURE_THRESHOLD, PrinterNotFoundError, PrinterRegistry
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -401,3 +403,140 @@ class TestPrinterRegistryThreadSafety:
         t2.join()
 
         assert len(errors) == 0
+
+
+# ---------------------------------------------------------------------------
+# Fleet query pool and circuit breakers
+# ---------------------------------------------------------------------------
+
+class TestFleetQueryPool:
+    """Tests for the long-lived pool and per-printer circuit breakers."""
+
+    def test_pool_reused_across_queries(self):
+        registry = PrinterRegistry()
+        registry.register("a", _make_mock_adapter())
+        registry.get_fleet_status()
+        pool = registry._pool
+        registry.get_idle_printers()
+        assert registry._pool is pool
+        registry.shutdown()
+        assert registry._pool is None
+        assert registry.get_idle_printers() == ["a"]
+
+    def test_max_workers_configurable(self, monkeypatch):
+        assert PrinterRegistry(max_workers=3)._max_workers == 3
+        monkeypatch.setenv("KILN_FLEET_QUERY_WORKERS", "7")
+        assert PrinterRegistry()._max_workers == 7
+
+    def test_circuit_opens_after_repeated_errors(self):
+        registry = PrinterRegistry()
+        adapter = _make_mock_adapter(name="flaky")
+        adapter.get_state.side_effect = Exception("connection refused")
+        registry.register("flaky", adapter)
+
+        for _ in range(_CIRCUIT_FAILURE_THRESHOLD):
+            registry.get_fleet_status()
+        assert adapter.get_state.call_count == _CIRCUIT_FAILURE_THRESHOLD
+        assert registry.get_printer_health()["flaky"]["circuit_open"] is True
+
+        # Skipped while in backoff, still reported offline
+        entry = registry.get_fleet_status()[0]
+        assert entry["state"] == "offline"
+        assert adapter.get_state.call_count == _CIRCUIT_FAILURE_THRESHOLD
+
+    def test_success_closes_circuit(self):
+        registry = PrinterRegistry()
+        adapter = _make_mock_adapter()
+        adapter.get_state.side_effect = Exception("boom")
+        registry.register("p", adapter)
+        for _ in range(_CIRCUIT_FAILURE_THRESHOLD):
+            registry.get_fleet_status()
+
+        registry.reset_printer_health("p")
+        adapter.get_state.side_effect = None
+        assert registry.get_fleet_status()[0]["state"] == "idle"
+        assert registry.get_printer_health()["p"]["consecutive_failures"] == 0
+
+    def test_hung_printer_times_out_and_is_skipped(self):
+        registry = PrinterRegistry()
+        release = threading.Event()
+        slow = _make_mock_adapter(name="slow")
+        slow.get_state.side_effect = lambda: release.wait(5) and None
+        registry.register("slow", slow)
+        registry.register("fast", _make_mock_adapter(name="fast"))
+
+        try:
+            start = time.monotonic()
+            results = list(registry.iter_fleet_status(timeout=0.2))
+            assert time.monotonic() - start < 2.0
+            assert [r["name"] for r in results] == ["fast", "slow"]
+            assert results[1]["state"] == "offline"
+            assert registry.get_printer_health()["slow"]["circuit_open"] is True
+
+            # Next query skips the hung printer without waiting
+            start = time.monotonic()
+            assert registry.get_idle_printers() == ["fast"]
+            assert time.monotonic() - start < 0.2
+            assert slow.get_state.call_count == 1
+        finally:
+            release.set()
+            registry.shutdown()
+
+    def test_hung_printer_not_resubmitted_while_running(self):
+        registry = PrinterRegistry(max_workers=2)
+        release = threading.Event()
+        slow = _make_mock_adapter(name="slow")
+        slow.get_state.side_effect = lambda: release.wait(5) and None
+        registry.register("slow", slow)
+
+        try:
+            list(registry.iter_fleet_status(timeout=0.2))
+            # Let the backoff lapse while the first call is still blocked
+            registry._health["slow"].next_retry_time = 0.0
+            entry = list(registry.iter_fleet_status(timeout=0.2))[0]
+            assert entry["state"] == "offline"
+            assert slow.get_state.call_count == 1
+        finally:
+            release.set()
+            registry.shutdown()
+
+    def test_repeated_timeouts_grow_backoff(self):
+        registry = PrinterRegistry()
+        release = threading.Event()
+        slow = _make_mock_adapter(name="slow")
+        slow.get_state.side_effect = lambda: release.wait(5) and None
+        registry.register("slow", slow)
+
+        try:
+            list(registry.iter_fleet_status(timeout=0.2))
+            first = registry.get_printer_health()["slow"]["retry_in_seconds"]
+            registry._health["slow"].next_retry_time = 0.0
+            list(registry.iter_fleet_status(timeout=0.2))
+            second = registry.get_printer_health()["slow"]["retry_in_seconds"]
+            assert second > first
+            assert registry.get_printer_health()["slow"]["consecutive_failures"] == _CIRCUIT_FAILURE_THRESHOLD + 1
+        finally:
+            release.set()
+            registry.shutdown()
+
+    def test_offline_state_counts_as_failure(self):
+        registry = PrinterRegistry()
+        adapter = _make_mock_adapter(name="octo", connected=False, status=PrinterStatus.OFFLINE)
+        registry.register("octo", adapter)
+
+        for _ in range(_CIRCUIT_FAILURE_THRESHOLD):
+            assert registry.get_printers_by_status(PrinterStatus.OFFLINE) == ["octo"]
+        health = registry.get_printer_health()["octo"]
+        assert health["circuit_open"] is True
+        assert "offline" in health["last_error"]
+        registry.get_fleet_status()
+        assert adapter.get_state.call_count == _CIRCUIT_FAILURE_THRESHOLD
+
+    def test_unregister_clears_health(self):
+        registry = PrinterRegistry()
+        adapter = _make_mock_adapter()
+        adapter.get_state.side_effect = Exception("boom")
+        registry.register("p", adapter)
+        registry.get_fleet_status()
+        registry.unregister("p")
+        assert registry.get_printer_health() == {}
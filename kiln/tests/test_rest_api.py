@@ -249,6 +249,25 @@ class TestCreateApp:
         assert data["status"] == "ok"
         assert "version" in data
 
+    # --- Metrics endpoint ---
+
+    def test_metrics_reports_tool_calls(self, client):
+        from kiln.metrics import TOOL_CALLS
+
+        before = TOOL_CALLS.get({"tool": "printer_status", "status": "ok"})
+        client.post("/api/tools/printer_status", json={})
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE kiln_tool_latency_seconds histogram" in resp.text
+        assert 'kiln_tool_calls_total{tool="printer_status",status="ok"}' in resp.text
+        assert TOOL_CALLS.get({"tool": "printer_status", "status": "ok"}) == before + 1
+
+    def test_metrics_requires_auth_when_configured(self, authed_client):
+        assert authed_client.get("/metrics").status_code == 401
+        resp = authed_client.get("/metrics", headers={"Authorization": "Bearer test-secret-token"})
+        assert resp.status_code == 200
+
     # --- Tools listing ---
 
     def test_tools_endpoint_returns_list(self, client):
@@ -191,3 +191,42 @@ class TestRetentionManagerCustomPolicy:
         p = mgr.get_policy()
         # Custom policy takes precedence over env vars
         assert p.audit_log_days == 7
+
+
+# ---------------------------------------------------------------------------
+# Purging a database
+# ---------------------------------------------------------------------------
+
+
+class TestRetentionManagerWithDB:
+    """apply() drops expired audit and event log partitions."""
+
+    def test_apply_drops_expired_partitions(self, tmp_path, monkeypatch):
+        import time
+        from types import SimpleNamespace
+
+        from kiln import partitions, persistence
+        from kiln.persistence import KilnDB
+
+        two_years_ago = SimpleNamespace(time=lambda: time.time() - 730 * 86400)
+        monkeypatch.setattr(partitions, "time", two_years_ago)
+        monkeypatch.setattr(persistence, "time", two_years_ago)
+        db = KilnDB(str(tmp_path / "kiln.db"))
+        try:
+            db.log_event("old", {})
+            db.log_audit("old_tool", "safe", "executed")
+            monkeypatch.undo()
+            db.log_event("new", {})
+            db.log_audit("new_tool", "safe", "executed")
+
+            mgr = RetentionManager(db=db)
+            dry = mgr.apply(dry_run=True)
+            assert (dry.event_log_expired, dry.audit_log_expired) == (1, 1)
+            assert len(db.list_partitions("events")) == 2
+
+            result = mgr.apply(dry_run=False)
+            assert result.total_expired == 2
+            assert [e["event_type"] for e in db.recent_events()] == ["new"]
+            assert db.verify_audit_log()["verified"] is True
+        finally:
+            db.close()
@@ -48,6 +48,20 @@ class TestToolRateLimiter:
         assert msg is not None
         assert "3 times" in msg
 
+    def test_max_per_minute_exact_in_any_window(self, monkeypatch) -> None:
+        limiter = self._make_limiter()
+        now = [0.0]
+        monkeypatch.setattr("kiln.server.time.monotonic", lambda: now[0])
+        admitted = []
+        for step in range(0, 3000, 5):
+            now[0] = step / 10
+            if limiter.check("start_print", max_per_minute=3) is None:
+                admitted.append(now[0])
+        assert len(admitted) > 3
+        for i, start in enumerate(admitted):
+            in_window = [t for t in admitted[i:] if t - start < 60.0]
+            assert len(in_window) <= 3
+
     def test_different_tools_independent(self) -> None:
         limiter = self._make_limiter()
         limiter.check("tool_a", min_interval_ms=5000, max_per_minute=1)
@@ -61,6 +75,28 @@ class TestToolRateLimiter:
             msg = limiter.check("free_tool", min_interval_ms=0, max_per_minute=0)
             assert msg is None
 
+    def test_repeated_blocks_trigger_cooldown(self) -> None:
+        limiter = self._make_limiter()
+        assert limiter.record_block("set_temperature") is None
+        assert limiter.record_block("set_temperature") is None
+        msg = limiter.record_block("set_temperature")
+        assert msg is not None and "SAFETY ESCALATED" in msg
+        blocked = limiter.check("set_temperature")
+        assert blocked is not None and "emergency cooldown" in blocked
+        assert limiter.check("other_tool") is None
+
+    def test_blocks_outside_window_do_not_escalate(self, monkeypatch) -> None:
+        limiter = self._make_limiter()
+        clock = iter([600.5, 601.0, 665.0, 666.0, 667.0])
+        monkeypatch.setattr("kiln.server.time.monotonic", lambda: next(clock))
+        assert limiter.record_block("send_gcode") is None
+        assert limiter.record_block("send_gcode") is None
+        # Three blocks span 64.5s, wider than the 60s window
+        assert limiter.record_block("send_gcode") is None
+        assert limiter.record_block("send_gcode") is None
+        msg = limiter.record_block("send_gcode")
+        assert msg is not None and "3 times in 60s" in msg
+
 
 # ===================================================================
 # Per-printer temperature limits
@@ -16,6 +16,7 @@ Covers:
 - PrinterError during dispatch
 - Thread safety of active_jobs property
 - Multiple dispatch in single tick (multiple idle printers, multiple queued jobs)
+- Outcome-aware batch assignment and the in-memory outcome matrix
 """
 
 from __future__ import annotations
@@ -37,7 +38,7 @@ from kiln.printers.base import (
 )
 from kiln.queue import JobStatus, PrintQueue
 from kiln.registry import PrinterRegistry
-from kiln.scheduler import JobScheduler
+from kiln.scheduler import JobScheduler, OutcomeMatrix
 
 # ---------------------------------------------------------------------------
 # Helpers -- mock adapter factory
@@ -990,6 +991,16 @@ class TestEmergencyLatchGating:
 # Smart printer routing (persistence-based ranking)
 # ---------------------------------------------------------------------------
 
+def _outcome_row(printer_name, *, total, successes, file_hash=None, material_type=None):
+    return {
+        "printer_name": printer_name,
+        "material_type": material_type,
+        "file_hash": file_hash,
+        "total": total,
+        "successes": successes,
+    }
+
+
 class TestSmartPrinterRouting:
     """Tests for persistence-based printer ranking in dispatch."""
 
@@ -1017,14 +1028,13 @@ class TestSmartPrinterRouting:
         )
         result = scheduler._rank_printers(["printer-a", "printer-b"], job)
         assert result == ["printer-a", "printer-b"]
-        mock_persistence.suggest_printer_for_outcome.assert_not_called()
 
     def test_rank_printers_reorders_by_success_rate(self, queue, registry, event_bus):
         """Printers are reordered so the best success rate comes first."""
         mock_persistence = MagicMock()
-        mock_persistence.suggest_printer_for_outcome.return_value = [
-            {"printer_name": "printer-b", "total_prints": 10, "successes": 9, "success_rate": 0.9},
-            {"printer_name": "printer-a", "total_prints": 10, "successes": 5, "success_rate": 0.5},
+        mock_persistence.print_outcome_counts.return_value = [
+            _outcome_row("printer-b", total=10, successes=9, file_hash="abc123"),
+            _outcome_row("printer-a", total=10, successes=5, file_hash="abc123"),
         ]
         scheduler = JobScheduler(queue, registry, event_bus, persistence=mock_persistence)
         from kiln.queue import JobStatus, PrintJob
@@ -1039,8 +1049,8 @@ class TestSmartPrinterRouting:
     def test_rank_printers_unknown_printers_last(self, queue, registry, event_bus):
         """Printers without history sort after those with history."""
         mock_persistence = MagicMock()
-        mock_persistence.suggest_printer_for_outcome.return_value = [
-            {"printer_name": "printer-b", "total_prints": 5, "successes": 4, "success_rate": 0.8},
+        mock_persistence.print_outcome_counts.return_value = [
+            _outcome_row("printer-b", total=5, successes=4, material_type="PLA"),
         ]
         scheduler = JobScheduler(queue, registry, event_bus, persistence=mock_persistence)
         from kiln.queue import JobStatus, PrintJob
@@ -1056,7 +1066,7 @@ class TestSmartPrinterRouting:
     def test_rank_printers_empty_rankings(self, queue, registry, event_bus):
         """When persistence returns no rankings, list unchanged."""
         mock_persistence = MagicMock()
-        mock_persistence.suggest_printer_for_outcome.return_value = []
+        mock_persistence.print_outcome_counts.return_value = []
         scheduler = JobScheduler(queue, registry, event_bus, persistence=mock_persistence)
         from kiln.queue import JobStatus, PrintJob
         job = PrintJob(
@@ -1070,9 +1080,9 @@ class TestSmartPrinterRouting:
     def test_dispatch_uses_smart_routing(self, queue, registry, event_bus):
         """Full integration: job dispatches to the historically best printer."""
         mock_persistence = MagicMock()
-        mock_persistence.suggest_printer_for_outcome.return_value = [
-            {"printer_name": "printer-b", "total_prints": 20, "successes": 19, "success_rate": 0.95},
-            {"printer_name": "printer-a", "total_prints": 20, "successes": 10, "success_rate": 0.5},
+        mock_persistence.print_outcome_counts.return_value = [
+            _outcome_row("printer-b", total=20, successes=19, file_hash="abc123", material_type="PLA"),
+            _outcome_row("printer-a", total=20, successes=10, file_hash="abc123", material_type="PLA"),
         ]
 
         scheduler = JobScheduler(
@@ -1122,14 +1132,14 @@ class TestSmartPrinterRouting:
         result = scheduler.tick()
 
         assert len(result["dispatched"]) == 1
-        # Without metadata, ranking is not applied
-        mock_persistence.suggest_printer_for_outcome.assert_not_called()
+        # Without metadata, ranking is not applied: first printer wins
+        assert result["dispatched"][0]["printer_name"] == "printer-a"
 
     def test_dispatch_assigned_job_ignores_ranking(self, queue, registry, event_bus):
         """Jobs assigned to a specific printer bypass smart routing."""
         mock_persistence = MagicMock()
-        mock_persistence.suggest_printer_for_outcome.return_value = [
-            {"printer_name": "printer-b", "total_prints": 20, "successes": 19, "success_rate": 0.95},
+        mock_persistence.print_outcome_counts.return_value = [
+            _outcome_row("printer-b", total=20, successes=19, file_hash="abc123"),
         ]
 
         scheduler = JobScheduler(
@@ -1157,6 +1167,90 @@ class TestSmartPrinterRouting:
         # Even though printer-b has better stats, the job is assigned to printer-a
         assert result["dispatched"][0]["printer_name"] == "printer-a"
 
+    def test_batch_assignment_maximises_total_success(self, queue, registry, event_bus):
+        """Two jobs, two printers: the pairing with the best total wins.
+
+        Greedy per-job routing would give the high-priority job printer-a
+        (0.9 vs 0.8) and leave the second job on printer-b (0.1); the
+        batch assignment swaps them for a higher total (0.8 + 0.9).
+        """
+        mock_persistence = MagicMock()
+        mock_persistence.print_outcome_counts.return_value = [
+            _outcome_row("printer-a", total=10, successes=9, file_hash="first"),
+            _outcome_row("printer-b", total=10, successes=8, file_hash="first"),
+            _outcome_row("printer-a", total=10, successes=9, file_hash="second"),
+            _outcome_row("printer-b", total=10, successes=1, file_hash="second"),
+        ]
+        scheduler = JobScheduler(queue, registry, event_bus, max_retries=0, persistence=mock_persistence)
+        registry.register("printer-a", make_mock_adapter(name="printer-a"))
+        registry.register("printer-b", make_mock_adapter(name="printer-b"))
+        first = queue.submit(file_name="first.gcode", submitted_by="t", priority=10, metadata={"file_hash": "first"})
+        second = queue.submit(file_name="second.gcode", submitted_by="t", metadata={"file_hash": "second"})
+
+        result = scheduler.tick()
+
+        placed = {d["job_id"]: d["printer_name"] for d in result["dispatched"]}
+        assert placed == {first: "printer-b", second: "printer-a"}
+
+    def test_outcome_matrix_loaded_once_per_refresh_window(self, queue, registry, event_bus):
+        mock_persistence = MagicMock()
+        mock_persistence.print_outcome_counts.return_value = []
+        scheduler = JobScheduler(queue, registry, event_bus, max_retries=0, persistence=mock_persistence)
+        registry.register("printer-a", make_mock_adapter(name="printer-a"))
+        queue.submit(file_name="a.gcode", submitted_by="t", metadata={"file_hash": "x"})
+        scheduler.tick()
+        scheduler.tick()
+        assert mock_persistence.print_outcome_counts.call_count == 1
+
+    def test_finished_job_updates_matrix(self, queue, registry, event_bus):
+        mock_persistence = MagicMock()
+        mock_persistence.print_outcome_counts.return_value = []
+        mock_persistence.has_print_outcome.return_value = True
+        scheduler = JobScheduler(queue, registry, event_bus, max_retries=0, persistence=mock_persistence)
+        adapter = make_mock_adapter(name="printer-a")
+        registry.register("printer-a", adapter)
+        queue.submit(file_name="a.gcode", submitted_by="t", metadata={"file_hash": "x", "material_type": "PLA"})
+        scheduler.tick()
+        adapter.get_state.return_value = PrinterState(connected=True, state=PrinterStatus.PRINTING)
+        scheduler.tick()
+        adapter.get_state.return_value = PrinterState(connected=True, state=PrinterStatus.IDLE)
+        scheduler.tick()
+
+        assert scheduler._outcomes.success_rate("printer-a", material_type="PLA", file_hash="x") == 1.0
+
+
+class TestOutcomeMatrix:
+    def test_unknown_printer(self):
+        assert OutcomeMatrix().success_rate("p", file_hash="x") is None
+
+    def test_exact_match_preferred(self):
+        matrix = OutcomeMatrix()
+        matrix.load([
+            _outcome_row("p", total=4, successes=4, file_hash="x", material_type="PLA"),
+            _outcome_row("p", total=4, successes=0, file_hash="x", material_type="PETG"),
+        ])
+        assert matrix.success_rate("p", material_type="PLA", file_hash="x") == 1.0
+        # Same file, unseen material: falls back to all materials for the file
+        assert matrix.success_rate("p", material_type="ABS", file_hash="x") == 0.5
+
+    def test_material_fallback(self):
+        matrix = OutcomeMatrix()
+        matrix.load([_outcome_row("p", total=2, successes=1, file_hash="x", material_type="PLA")])
+        assert matrix.success_rate("p", material_type="PLA", file_hash="other") == 0.5
+
+    def test_record_accumulates(self):
+        matrix = OutcomeMatrix()
+        matrix.record("p", material_type="PLA", file_hash="x", success=True)
+        matrix.record("p", material_type="PLA", file_hash="x", success=False)
+        assert matrix.success_rate("p", material_type="PLA", file_hash="x") == 0.5
+        assert len(matrix) == 1
+
+    def test_load_replaces(self):
+        matrix = OutcomeMatrix()
+        matrix.record("p", material_type="PLA", file_hash="x", success=True)
+        matrix.load([])
+        assert matrix.success_rate("p", material_type="PLA", file_hash="x") is None
+
 
 # ---------------------------------------------------------------------------
 # Auto-outcome recording
@@ -0,0 +1,171 @@
+"""Tests for kiln.slice_cache, slice_file(use_cache=True) and kiln.slice_pool."""
+
+from __future__ import annotations
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from kiln.slice_cache import SliceCache, _reset_slice_cache, slice_cache_key
+from kiln.slice_pool import CANCELLED, COMPLETED, FAILED, SlicePool, default_worker_count
+from kiln.slicer import SliceResult, SlicerInfo, slice_file
+
+
+@pytest.fixture()
+def model(tmp_path):
+    path = tmp_path / "part.stl"
+    path.write_bytes(b"solid part\nendsolid part\n")
+    return path
+
+
+@pytest.fixture()
+def cache_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("KILN_SLICE_CACHE_DIR", str(tmp_path / "cache"))
+    _reset_slice_cache()
+    yield tmp_path / "cache"
+    _reset_slice_cache()
+
+
+class TestCacheKey:
+    def test_profile_hashed_by_content(self, tmp_path, model):
+        a = tmp_path / "a.ini"
+        b = tmp_path / "b.ini"
+        a.write_text("layer_height = 0.2\n")
+        b.write_text("layer_height = 0.2\n")
+        assert slice_cache_key(str(model), profile=str(a)) == slice_cache_key(str(model), profile=str(b))
+        b.write_text("layer_height = 0.3\n")
+        assert slice_cache_key(str(model), profile=str(a)) != slice_cache_key(str(model), profile=str(b))
+
+    def test_slicer_version_and_args_matter(self, model):
+        base = slice_cache_key(str(model), slicer="prusa-slicer 2.7.1")
+        assert base != slice_cache_key(str(model), slicer="prusa-slicer 2.8.0")
+        assert base != slice_cache_key(str(model), slicer="prusa-slicer 2.7.1", extra_args=["--center", "100,100"])
+
+    def test_input_content_matters(self, model):
+        before = slice_cache_key(str(model))
+        model.write_bytes(b"solid other\nendsolid other\n")
+        assert slice_cache_key(str(model)) != before
+
+
+class TestSliceCache:
+    def test_put_get_and_stats(self, tmp_path):
+        cache = SliceCache(str(tmp_path / "c"))
+        src = tmp_path / "out.gcode"
+        src.write_text("G1 X1\n")
+        assert cache.get("ab" * 32) is None
+        cache.put("ab" * 32, str(src), {"slicer": "prusa-slicer"})
+        cached = cache.get("ab" * 32)
+        assert cached is not None
+        with open(cached) as fh:
+            assert fh.read() == "G1 X1\n"
+        assert cache.get_metadata("ab" * 32)["slicer"] == "prusa-slicer"
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = SliceCache(str(tmp_path / "c"), max_bytes=250)
+        src = tmp_path / "out.gcode"
+        src.write_bytes(b"x" * 100)
+        keys = ["aa" * 32, "bb" * 32, "cc" * 32]
+        cache.put(keys[0], str(src))
+        cache.put(keys[1], str(src))
+        # Make the first entry the most recently used, then overflow.
+        old = os.stat(cache._entry_path(keys[1])).st_mtime - 10
+        os.utime(cache._entry_path(keys[1]), (old, old))
+        cache.get(keys[0])
+        cache.put(keys[2], str(src))
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+        assert cache.stats().evictions == 1
+
+
+class TestSliceFileCaching:
+    def _slice(self, model, out_dir, mock_run):
+        with (
+            patch(
+                "kiln.slicer.find_slicer", return_value=SlicerInfo(path="/bin/ps", name="prusa-slicer", version="2.7")
+            ),
+            patch("subprocess.run", side_effect=mock_run) as run,
+        ):
+            result = slice_file(str(model), output_dir=str(out_dir), use_cache=True)
+        return result, run
+
+    def test_second_slice_is_served_from_cache(self, tmp_path, model, cache_env):
+        def fake_run(cmd, **kwargs):
+            with open(cmd[cmd.index("--output") + 1], "w") as fh:
+                fh.write("; sliced\nG1 X1\n")
+            return MagicMock(returncode=0, stdout="", stderr="")
+
+        first, run1 = self._slice(model, tmp_path / "o1", fake_run)
+        second, run2 = self._slice(model, tmp_path / "o2", fake_run)
+        assert run1.call_count == 1
+        assert run2.call_count == 0
+        assert not first.cached
+        assert second.cached
+        assert second.output_path == str(tmp_path / "o2" / "part.gcode")
+        with open(second.output_path) as fh:
+            assert fh.read() == "; sliced\nG1 X1\n"
+
+    def test_failed_slice_not_cached(self, tmp_path, model, cache_env):
+        from kiln.slicer import SlicerError
+
+        with pytest.raises(SlicerError):
+            self._slice(model, tmp_path / "o", lambda cmd, **kw: MagicMock(returncode=1, stdout="", stderr="boom"))
+        assert not cache_env.exists() or not any(cache_env.rglob("*.gcode"))
+
+
+class TestSlicePool:
+    def test_default_worker_count_env(self, monkeypatch):
+        monkeypatch.setenv("KILN_SLICE_WORKERS", "3")
+        assert default_worker_count() == 3
+        monkeypatch.delenv("KILN_SLICE_WORKERS")
+        assert 1 <= default_worker_count() <= 8
+
+    def test_runs_in_parallel_and_records_timing(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_slice(path, **kwargs):
+            barrier.wait()
+            return SliceResult(success=True, output_path=path + ".gcode")
+
+        pool = SlicePool(2, slice_fn=fake_slice)
+        try:
+            jobs = pool.wait([pool.submit("a.stl"), pool.submit("b.stl")], timeout=10)
+        finally:
+            pool.shutdown()
+        assert [j.status for j in jobs] == [COMPLETED, COMPLETED]
+        assert jobs[0].result.output_path == "a.stl.gcode"
+        assert jobs[0].run_seconds is not None and jobs[0].wait_seconds is not None
+
+    def test_cancel_queued_job_and_failure(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls: list[dict] = []
+
+        def fake_slice(path, **kwargs):
+            calls.append(kwargs)
+            started.set()
+            release.wait(5)
+            if path == "bad.stl":
+                raise RuntimeError("slicer crashed")
+            return SliceResult(success=True)
+
+        pool = SlicePool(1, slice_fn=fake_slice)
+        try:
+            bad = pool.submit("bad.stl", profile="p.ini")
+            queued = pool.submit("b.stl")
+            assert started.wait(5)
+            assert pool.cancel(queued.id) is True
+            assert pool.cancel(bad.id) is False
+            release.set()
+            pool.wait([bad, queued], timeout=10)
+        finally:
+            pool.shutdown()
+        assert queued.status == CANCELLED
+        assert bad.status == FAILED
+        assert bad.error == "slicer crashed"
+        assert calls == [{"use_cache": True, "profile": "p.ini"}]
+        assert {j.id for j in pool.list_jobs()} == {bad.id, queued.id}
@@ -0,0 +1,215 @@
+"""Tests for the indexed design template store.
+
+Coverage:
+- Loading, lookup, and ``_meta`` handling
+- mtime/size-based reload and explicit invalidation
+- BM25 ranking, field boosts, category filter, top-k limit
+- Prefix and single-edit fuzzy matching
+- Missing / malformed files
+- Shared per-path stores
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from kiln.template_store import (
+    TemplateStore,
+    _reset_template_stores,
+    _within_one_edit,
+    get_template_store,
+)
+
+_TEMPLATES = {
+    "_meta": {"version": "1.0.0"},
+    "phone_stand": {
+        "display_name": "Phone Stand",
+        "description": "Angled stand for a phone on a desk.",
+        "category": "household",
+        "tags": ["dock", "cradle"],
+        "parameters": {"phone_width": {"default": 75}, "angle": {"default": 65}},
+    },
+    "shelf_bracket": {
+        "display_name": "Shelf Bracket",
+        "description": "L-shaped bracket with gusset for wall shelves.",
+        "category": "hardware",
+        "parameters": {"arm_length": {"default": 100}},
+    },
+    "hook": {
+        "display_name": "Wall Hook",
+        "description": "Simple wall hook with screw hole.",
+        "category": "hardware",
+        "parameters": {"hook_radius": {"default": 15}},
+    },
+    "tablet_stand": {
+        "display_name": "Tablet Stand",
+        "description": "Wide stand for tablets and e-readers.",
+        "category": "household",
+        "parameters": {"tablet_thickness": {"default": 10}},
+    },
+}
+
+
+@pytest.fixture()
+def templates_file(tmp_path):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps(_TEMPLATES), encoding="utf-8")
+    return path
+
+
+@pytest.fixture()
+def store(templates_file):
+    return TemplateStore(templates_file)
+
+
+@pytest.fixture(autouse=True)
+def _clean_stores():
+    _reset_template_stores()
+    yield
+    _reset_template_stores()
+
+
+class TestLookup:
+    def test_get_returns_template(self, store):
+        tpl = store.get("hook")
+        assert tpl is not None
+        assert tpl["display_name"] == "Wall Hook"
+
+    def test_meta_is_not_a_template(self, store):
+        assert store.get("_meta") is None
+        assert "_meta" not in store
+        assert "_meta" not in store.ids()
+        assert store.meta == {"version": "1.0.0"}
+
+    def test_ids_preserve_file_order(self, store):
+        assert store.ids() == ["phone_stand", "shelf_bracket", "hook", "tablet_stand"]
+        assert len(store) == 4
+
+    def test_missing_file_is_empty(self, tmp_path):
+        store = TemplateStore(tmp_path / "nope.json")
+        assert not store.exists()
+        assert len(store) == 0
+        assert store.search("hook") == []
+
+    def test_malformed_file_is_empty(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text("{not json", encoding="utf-8")
+        store = TemplateStore(path)
+        assert len(store) == 0
+
+    def test_bundled_templates_load(self):
+        store = get_template_store()
+        assert len(store) > 0
+        assert store.get("phone_stand") is not None
+
+
+class TestReload:
+    def test_reloads_when_file_changes(self, store, templates_file):
+        assert store.get("gear") is None
+        data = dict(_TEMPLATES)
+        data["gear"] = {"display_name": "Spur Gear", "description": "Involute gear."}
+        templates_file.write_text(json.dumps(data), encoding="utf-8")
+        st = templates_file.stat()
+        os.utime(templates_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert store.get("gear") is not None
+        assert store.search("gear")[0].template_id == "gear"
+
+    def test_unchanged_file_is_not_reparsed(self, store, monkeypatch):
+        store.ids()
+        calls = []
+        monkeypatch.setattr("kiln.template_store.json.load", lambda fh: calls.append(1) or {})
+        store.ids()
+        store.search("hook")
+        assert calls == []
+
+    def test_invalidate_forces_reload(self, store, monkeypatch):
+        store.ids()
+        calls = []
+        monkeypatch.setattr("kiln.template_store.json.load", lambda fh: calls.append(1) or {})
+        store.invalidate()
+        assert store.ids() == []
+        assert calls == [1]
+
+
+class TestSearch:
+    def test_exact_match_ranks_first(self, store):
+        results = store.search("phone stand")
+        assert results[0].template_id == "phone_stand"
+        assert "tablet_stand" in [r.template_id for r in results]
+
+    def test_scores_are_normalised(self, store):
+        for r in store.search("wall bracket stand"):
+            assert 0 < r.score <= 1.0
+
+    def test_unmatched_token_lowers_score(self, store):
+        full = store.search("hook")[0].score
+        partial = store.search("hook zzzqqq")[0].score
+        assert partial < full
+
+    def test_parameter_names_are_indexed(self, store):
+        assert store.search("radius")[0].template_id == "hook"
+
+    def test_tags_are_indexed(self, store):
+        assert store.search("cradle")[0].template_id == "phone_stand"
+
+    def test_category_filter(self, store):
+        results = store.search("stand wall", category="hardware")
+        assert results
+        assert all(r.category == "hardware" for r in results)
+
+    def test_limit(self, store):
+        assert len(store.search("stand", limit=1)) == 1
+        assert store.search("stand", limit=0) == []
+
+    def test_prefix_match(self, store):
+        results = store.search("brack")
+        assert results[0].template_id == "shelf_bracket"
+        assert results[0].matched_terms == ["bracket"]
+
+    def test_fuzzy_match(self, store):
+        results = store.search("hoook")
+        assert results[0].template_id == "hook"
+
+    def test_fuzzy_scores_below_exact(self, store):
+        assert store.search("hoook")[0].score < store.search("hook")[0].score
+
+    def test_fuzzy_disabled(self, store):
+        assert store.search("hoook", fuzzy=False) == []
+        assert store.search("brack", fuzzy=False) == []
+
+    def test_no_match(self, store):
+        assert store.search("xylophone") == []
+
+    def test_empty_query(self, store):
+        assert store.search("") == []
+        assert store.search("  ,, ") == []
+
+    def test_ties_break_alphabetically(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_text(json.dumps({"b_widget": {"description": "widget"}, "a_widget": {"description": "widget"}}))
+        results = TemplateStore(path).search("widget")
+        assert [r.template_id for r in results] == ["a_widget", "b_widget"]
+
+
+class TestWithinOneEdit:
+    @pytest.mark.parametrize(
+        "a,b",
+        [("hook", "hook"), ("hook", "hoo"), ("hook", "hooks"), ("hook", "hoak"), ("hook", "ohok")],
+    )
+    def test_one_edit(self, a, b):
+        assert _within_one_edit(a, b)
+
+    @pytest.mark.parametrize("a,b", [("hook", "ho"), ("hook", "book2"), ("hook", "koho")])
+    def test_more_than_one_edit(self, a, b):
+        assert not _within_one_edit(a, b)
+
+
+class TestSharedStores:
+    def test_same_path_returns_same_store(self, templates_file):
+        assert get_template_store(templates_file) is get_template_store(str(templates_file))
+
+    def test_default_store_is_shared(self):
+        assert get_template_store() is get_template_store()
@@ -2,8 +2,35 @@
 
 from __future__ import annotations
 
+import json
+import time
+
+import pytest
+
+import kiln.uptime as uptime_mod
 from kiln.uptime import UptimeTracker
 
+_DAY = 86400.0
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    fake = _Clock(1_700_000_000.0)
+    monkeypatch.setattr(uptime_mod, "time", fake)
+    return fake
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
 
 class TestUptimeTracker:
     def test_empty_report(self, tmp_path):
@@ -75,3 +102,121 @@ class TestSLATracking:
         report = tracker.uptime_report()
         assert report["uptime_1h"] < 99.9
         assert report["sla_met"] is False
+
+
+class TestAppendOnlyLog:
+    def test_each_check_appends_one_line(self, tmp_path):
+        data_file = tmp_path / "uptime.jsonl"
+        tracker = UptimeTracker(data_file=data_file)
+        tracker.record_check(healthy=True, response_ms=10.0)
+        first = data_file.read_text(encoding="utf-8")
+        tracker.record_check(healthy=False, details="x")
+        content = data_file.read_text(encoding="utf-8")
+        assert content.startswith(first)
+        assert [e["healthy"] for e in _lines(data_file)] == [True, False]
+
+    def test_compaction_after_many_appends(self, tmp_path, clock, monkeypatch):
+        monkeypatch.setattr(uptime_mod, "_COMPACT_AFTER_APPENDS", 10)
+        data_file = tmp_path / "uptime.jsonl"
+        tracker = UptimeTracker(data_file=data_file)
+        for i in range(96):
+            clock.now += 1800
+            tracker.record_check(healthy=i % 4 != 0, response_ms=100.0)
+        lines = _lines(data_file)
+        rollups = [e for e in lines if "hour" in e]
+        raw = [e for e in lines if "timestamp" in e]
+        assert rollups
+        assert len(raw) < 96
+        assert sum(e["checks"] for e in rollups) + len(raw) == 96
+
+    def test_reload_after_compaction_matches(self, tmp_path, clock):
+        data_file = tmp_path / "uptime.jsonl"
+        tracker = UptimeTracker(data_file=data_file)
+        for i in range(3 * 24 * 4):
+            clock.now += 900
+            tracker.record_check(healthy=i % 10 != 0, response_ms=float(i % 7))
+        tracker._compact()
+        reloaded = UptimeTracker(data_file=data_file)
+        before, after = tracker.uptime_report(), reloaded.uptime_report()
+        for key in ("uptime_24h", "uptime_7d", "checks_7d", "total_checks", "avg_response_ms_7d"):
+            assert after[key] == before[key], key
+        assert any("hour" in e for e in _lines(data_file))
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        data_file = tmp_path / "uptime.jsonl"
+        tracker = UptimeTracker(data_file=data_file)
+        tracker.record_check(healthy=True)
+        with data_file.open("a", encoding="utf-8") as fh:
+            fh.write('{"timestamp": 1')
+        reloaded = UptimeTracker(data_file=data_file)
+        assert reloaded.uptime_report()["total_checks"] == 1
+        assert len(_lines(data_file)) == 1
+
+    def test_legacy_document_is_migrated(self, tmp_path, monkeypatch):
+        legacy = tmp_path / "uptime.json"
+        new = tmp_path / "uptime.jsonl"
+        now = time.time()
+        legacy.write_text(
+            json.dumps(
+                {
+                    "checks": [
+                        {"timestamp": now - 60, "healthy": True, "response_ms": 20.0, "details": None},
+                        {"timestamp": now - 30, "healthy": False, "response_ms": None, "details": "down"},
+                    ],
+                    "updated_at": now,
+                }
+            ),
+            encoding="utf-8",
+        )
+        monkeypatch.setattr(uptime_mod, "_UPTIME_FILE", new)
+        monkeypatch.setattr(uptime_mod, "_LEGACY_UPTIME_FILE", legacy)
+        tracker = UptimeTracker()
+        assert tracker.uptime_report()["total_checks"] == 2
+        assert tracker.recent_incidents()[0]["details"] == "down"
+        assert not legacy.exists()
+        assert len(_lines(new)) == 2
+
+
+class TestRollupWindows:
+    def test_windows_use_buckets(self, tmp_path, clock):
+        tracker = UptimeTracker(data_file=tmp_path / "uptime.jsonl")
+        for _ in range(10):
+            tracker.record_check(healthy=False, response_ms=500.0)
+        clock.now += 3 * _DAY
+        for _ in range(30):
+            tracker.record_check(healthy=True, response_ms=50.0)
+        report = tracker.uptime_report()
+        assert report["uptime_24h"] == 100.0
+        assert report["uptime_7d"] == 75.0
+        assert report["checks_24h"] == 30
+        assert report["checks_7d"] == 40
+        assert report["avg_response_ms_24h"] == 50.0
+        assert report["avg_response_ms_7d"] == 162.5
+
+    def test_retention_drops_old_checks(self, tmp_path, clock):
+        data_file = tmp_path / "uptime.jsonl"
+        tracker = UptimeTracker(data_file=data_file)
+        tracker.record_check(healthy=False)
+        clock.now += 31 * _DAY
+        tracker.record_check(healthy=True)
+        report = tracker.uptime_report()
+        assert report["total_checks"] == 1
+        assert report["uptime_30d"] == 100.0
+        assert tracker.recent_incidents() == []
+        assert UptimeTracker(data_file=data_file).uptime_report()["total_checks"] == 1
+
+    def test_window_edge_resolves_to_minute(self, tmp_path, clock):
+        tracker = UptimeTracker(data_file=tmp_path / "uptime.jsonl")
+        clock.now = 1_700_000_020.0  # 40 s into a minute
+        tracker.record_check(healthy=False)
+        clock.now += 3600 - 30  # cutoff lands 10 s into that minute
+        tracker.record_check(healthy=True)
+        assert tracker.uptime_report()["checks_24h"] == 2
+        assert tracker.uptime_report()["uptime_1h"] == 100.0
+
+    def test_last_check_survives_reload(self, tmp_path, clock):
+        data_file = tmp_path / "uptime.jsonl"
+        UptimeTracker(data_file=data_file).record_check(healthy=True, response_ms=12.0)
+        last = UptimeTracker(data_file=data_file).uptime_report()["last_check"]
+        assert last["response_ms"] == 12.0
+        assert last["age_seconds"] == 0.0
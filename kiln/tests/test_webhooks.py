@@ -15,6 +15,8 @@ Covers:
 - Empty events set = subscribe to all
 - Thread safety of endpoint registration
 - to_dict serialization
+- Per-endpoint lanes, retry backoff, progress coalescing and batching
+- Dead-letter persistence and replay
 """
 
 from __future__ import annotations
@@ -1025,6 +1027,293 @@ class TestDirectDeliver:
             assert record.status_code == code
 
 
+# ---------------------------------------------------------------------------
+# Per-endpoint lanes, retry scheduling, coalescing and batching
+# ---------------------------------------------------------------------------
+
+class TestDeliveryLanes:
+    """Tests for lane isolation and the retry delay queue."""
+
+    def test_retry_backoff_does_not_hold_a_worker(self):
+        bus = EventBus()
+        mgr = WebhookManager(bus, max_retries=2, retry_delay=1.0, delivery_timeout=1.0, workers=1)
+        calls: list[tuple[str, float]] = []
+
+        def sender(url, payload, headers, timeout):
+            calls.append((url, time.monotonic()))
+            return 500 if "dead" in url else 200
+
+        mgr._send_func = sender
+        mgr.register(url="https://dead.example.com/hook")
+        mgr.register(url="https://ok.example.com/hook")
+        mgr.start()
+        try:
+            started = time.monotonic()
+            bus.publish(Event(type=EventType.JOB_COMPLETED))
+            time.sleep(0.2)
+            # The healthy endpoint is served while the dead one waits to retry.
+            assert [url for url, _ in calls] == ["https://dead.example.com/hook", "https://ok.example.com/hook"]
+            assert calls[1][1] - started < 0.2
+            time.sleep(1.0)
+            assert [url for url, _ in calls].count("https://dead.example.com/hook") == 2
+        finally:
+            mgr.stop()
+
+    def test_retry_holds_lane_order(self):
+        bus = EventBus()
+        mgr = WebhookManager(bus, max_retries=3, retry_delay=0.05, delivery_timeout=1.0, workers=1)
+        sent: list[int] = []
+        failures = iter([500, 500])
+
+        def sender(url, payload, headers, timeout):
+            i = json.loads(payload)["data"]["i"]
+            status = next(failures, 200) if i == 0 else 200
+            if status == 200:
+                sent.append(i)
+            return status
+
+        mgr._send_func = sender
+        mgr.register(url="https://example.com/hook")
+        mgr.start()
+        try:
+            for i in range(4):
+                bus.publish(Event(type=EventType.JOB_COMPLETED, data={"i": i}))
+            time.sleep(0.5)
+            assert sent == [0, 1, 2, 3]
+        finally:
+            mgr.stop()
+
+    def test_failing_lane_backs_off_as_a_whole(self):
+        bus = EventBus()
+        mgr = WebhookManager(bus, max_retries=2, retry_delay=0.2, delivery_timeout=1.0, workers=1)
+        calls: list[float] = []
+
+        def sender(url, payload, headers, timeout):
+            calls.append(time.monotonic())
+            return 503
+
+        mgr._send_func = sender
+        mgr.register(url="https://dead.example.com/hook")
+        mgr.start()
+        try:
+            for i in range(5):
+                bus.publish(Event(type=EventType.JOB_COMPLETED, data={"i": i}))
+            time.sleep(0.05)
+            # Only the head was tried; the rest of the lane waits out the backoff.
+            assert len(calls) == 1
+        finally:
+            mgr.stop()
+
+    def test_slow_endpoint_does_not_stall_others(self):
+        bus = EventBus()
+        mgr = _make_manager(event_bus=bus, max_retries=1)
+        release = threading.Event()
+        fast: list[str] = []
+
+        def sender(url, payload, headers, timeout):
+            if "slow" in url:
+                release.wait(5)
+            else:
+                fast.append(url)
+            return 200
+
+        mgr._send_func = sender
+        mgr.register(url="https://slow.example.com/hook")
+        mgr.register(url="https://fast.example.com/hook")
+        mgr.start()
+        try:
+            for _ in range(5):
+                bus.publish(Event(type=EventType.JOB_COMPLETED))
+            time.sleep(0.2)
+            assert len(fast) == 5
+        finally:
+            release.set()
+            mgr.stop()
+
+    def test_backoff_is_exponential_with_jitter(self):
+        mgr = WebhookManager(EventBus(), retry_delay=1.0, max_retry_delay=5.0)
+        for attempt, (low, high) in enumerate([(0.5, 1.0), (1.0, 2.0), (2.0, 4.0), (2.5, 5.0)], start=1):
+            delays = {mgr._backoff(attempt) for _ in range(20)}
+            assert all(low <= d <= high for d in delays)
+            assert len(delays) > 1
+
+    def test_progress_events_are_coalesced_per_job(self):
+        bus = EventBus()
+        mgr = _make_manager(event_bus=bus, max_retries=1)
+        sender = MagicMock(return_value=200)
+        _inject_sender(mgr, sender)
+        mgr.register(url="https://example.com/hook")
+
+        for pct in (10, 20, 30):
+            mgr._on_event(Event(type=EventType.PRINT_PROGRESS, data={"job_id": "a", "completion": pct}))
+        mgr._on_event(Event(type=EventType.PRINT_PROGRESS, data={"job_id": "b", "completion": 5}))
+        mgr._on_event(Event(type=EventType.JOB_COMPLETED, data={"job_id": "a"}))
+        mgr.start()
+        try:
+            time.sleep(0.2)
+            payloads = [json.loads(c[0][1]) for c in sender.call_args_list]
+            assert [(p["type"], p["data"].get("completion")) for p in payloads] == [
+                ("print.progress", 30),
+                ("print.progress", 5),
+                ("job.completed", None),
+            ]
+        finally:
+            mgr.stop()
+
+    def test_coalescing_can_be_disabled(self):
+        mgr = _make_manager(max_retries=1)
+        sender = MagicMock(return_value=200)
+        _inject_sender(mgr, sender)
+        mgr.register(url="https://example.com/hook", coalesce_progress=False)
+        for pct in (10, 20):
+            mgr._on_event(Event(type=EventType.PRINT_PROGRESS, data={"job_id": "a", "completion": pct}))
+        mgr.start()
+        try:
+            time.sleep(0.2)
+            assert sender.call_count == 2
+        finally:
+            mgr.stop()
+
+    def test_batched_endpoint_receives_one_signed_post(self):
+        mgr = _make_manager(max_retries=1)
+        sender = MagicMock(return_value=200)
+        _inject_sender(mgr, sender)
+        mgr.register(url="https://example.com/hook", secret="s", batch_size=10)
+        for i in range(3):
+            mgr._on_event(Event(type=EventType.JOB_COMPLETED, data={"i": i}))
+        mgr.start()
+        try:
+            time.sleep(0.2)
+            assert sender.call_count == 1
+            _url, payload, headers, _timeout = sender.call_args[0]
+            body = json.loads(payload)
+            assert body["type"] == "batch"
+            assert body["count"] == 3
+            assert [e["data"]["i"] for e in body["events"]] == [0, 1, 2]
+            assert headers["X-Kiln-Signature"] == mgr.compute_signature("s", payload)
+            assert mgr.recent_deliveries()[0].event_type == "batch"
+        finally:
+            mgr.stop()
+
+
+# ---------------------------------------------------------------------------
+# Dead letters
+# ---------------------------------------------------------------------------
+
+class TestDeadLetters:
+    """Tests for dead-lettering and replay."""
+
+    def test_failed_delivery_is_dead_lettered_in_memory(self):
+        mgr = _make_manager(max_retries=2)
+        _inject_sender(mgr, MagicMock(return_value=500))
+        ep = mgr.register(url="https://example.com/hook")
+        mgr._deliver(ep, Event(type=EventType.JOB_FAILED, data={"job_id": "j1"}))
+
+        [entry] = mgr.get_dead_letters()
+        assert entry["webhook_id"] == ep.id
+        assert entry["attempts"] == 2
+        assert json.loads(entry["payload"])["data"] == {"job_id": "j1"}
+        assert mgr.dead_letter_count == 1
+
+    def test_persisted_dead_letters_replay_after_restart(self, tmp_path):
+        from kiln.persistence import KilnDB
+
+        db = KilnDB(db_path=str(tmp_path / "kiln.db"))
+        try:
+            first = WebhookManager(EventBus(), max_retries=1, retry_delay=0.0, persistence=db)
+            _inject_sender(first, MagicMock(return_value=503))
+            ep = first.register(url="https://example.com/hook", secret="old")
+            first._deliver(ep, Event(type=EventType.JOB_FAILED, data={"job_id": "j1"}))
+            assert db.count_webhook_dead_letters() == 1
+
+            # A new manager (e.g. after a restart) sees the persisted entry and
+            # replays it to the endpoint re-registered with the same URL.
+            second = WebhookManager(EventBus(), max_retries=1, retry_delay=0.0, persistence=db)
+            sender = MagicMock(return_value=200)
+            _inject_sender(second, sender)
+            assert second.dead_letter_count == 1
+            second.register(url="https://example.com/hook", secret="new")
+            assert second.replay_dead_letters() == 1
+            # Kept until the replay is actually delivered
+            assert second.dead_letter_count == 1
+            second.start()
+            try:
+                time.sleep(0.2)
+            finally:
+                second.stop()
+            assert second.dead_letter_count == 0
+            _url, payload, headers, _timeout = sender.call_args[0]
+            assert json.loads(payload)["data"] == {"job_id": "j1"}
+            assert headers["X-Kiln-Signature"] == second.compute_signature("new", payload)
+        finally:
+            db.close()
+
+    def test_replay_skips_entries_without_endpoint(self):
+        mgr = _make_manager(max_retries=1)
+        _inject_sender(mgr, MagicMock(return_value=500))
+        ep = mgr.register(url="https://example.com/hook")
+        mgr._deliver(ep, Event(type=EventType.JOB_FAILED))
+        mgr.unregister(ep.id)
+        assert mgr.replay_dead_letters() == 0
+        assert mgr.dead_letter_count == 1
+
+    def test_failed_replay_keeps_single_entry(self):
+        mgr = _make_manager(max_retries=1)
+        _inject_sender(mgr, MagicMock(return_value=500))
+        ep = mgr.register(url="https://example.com/hook")
+        mgr._deliver(ep, Event(type=EventType.JOB_FAILED))
+        [original] = mgr.get_dead_letters()
+
+        assert mgr.replay_dead_letters() == 1
+        # Already queued, so a second replay does not duplicate it
+        assert mgr.replay_dead_letters() == 0
+        mgr.start()
+        try:
+            time.sleep(0.2)
+        finally:
+            mgr.stop()
+        [entry] = mgr.get_dead_letters()
+        assert entry["event_id"] == original["event_id"]
+        assert entry["payload"] == original["payload"]
+
+    def test_replay_dropped_on_stop_stays_dead_lettered(self):
+        mgr = _make_manager(max_retries=1)
+        sender = MagicMock(return_value=500)
+        _inject_sender(mgr, sender)
+        ep = mgr.register(url="https://example.com/hook")
+        mgr._deliver(ep, Event(type=EventType.JOB_FAILED))
+
+        assert mgr.replay_dead_letters() == 1
+        mgr.start()
+        mgr.stop()
+        assert mgr.dead_letter_count == 1
+        # The dropped replay can be queued again
+        sender.return_value = 200
+        assert mgr.replay_dead_letters() == 1
+        mgr.start()
+        try:
+            time.sleep(0.2)
+        finally:
+            mgr.stop()
+        assert mgr.dead_letter_count == 0
+
+
+# ---------------------------------------------------------------------------
+# Pooled sessions
+# ---------------------------------------------------------------------------
+
+class TestSessions:
+    def test_session_reused_and_honours_proxy_environment(self):
+        from kiln.webhooks import _reset_sessions, _session_for
+
+        try:
+            session = _session_for("https://example.com/a")
+            assert _session_for("https://EXAMPLE.com/b") is session
+            assert session.trust_env is True
+        finally:
+            _reset_sessions()
+
+
 # ---------------------------------------------------------------------------
 # _validate_webhook_url (SSRF prevention)
 # ---------------------------------------------------------------------------
@@ -1182,7 +1471,7 @@ class TestDefaultSendRedirectPolicy:
     def test_redirect_blocked_by_default(self, monkeypatch):
         monkeypatch.delenv("KILN_WEBHOOK_ALLOW_REDIRECTS", raising=False)
         monkeypatch.setattr(
-            "requests.post",
+            "requests.Session.post",
             MagicMock(return_value=self._mock_response(302, "https://example.com/next")),
         )
         with pytest.raises(RuntimeError, match="redirect blocked by policy"):
@@ -1199,7 +1488,7 @@ class TestDefaultSendRedirectPolicy:
         validate = MagicMock(return_value=(True, ""))
         monkeypatch.setattr("kiln.webhooks._validate_webhook_url", validate)
         monkeypatch.setattr(
-            "requests.post",
+            "requests.Session.post",
             MagicMock(side_effect=[
                 self._mock_response(302, "https://example.com/next"),
                 self._mock_response(200),
@@ -1217,7 +1506,7 @@ class TestDefaultSendRedirectPolicy:
     def test_redirect_blocks_https_to_http_downgrade(self, monkeypatch):
         monkeypatch.setenv("KILN_WEBHOOK_ALLOW_REDIRECTS", "1")
         monkeypatch.setattr(
-            "requests.post",
+            "requests.Session.post",
             MagicMock(return_value=self._mock_response(302, "http://example.com/next")),
         )
         with pytest.raises(RuntimeError, match="downgrade"):